@@ -0,0 +1,76 @@
+"""Fixtures for the benchmark suite.
+
+Run with:  pytest benchmarks/ [--benchmark-autosave] [--benchmark-compare]
+
+Sizes default to S,M,L; set FPA_BENCH_SIZES=S,M,L,XL to include XL.
+API-call counts are checked against baselines.json (FPA_BENCH_UPDATE=1
+rewrites it); wall-clock baselines use pytest-benchmark's own storage.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from workbooks import generate_workbook
+
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+
+BASELINES = Path(__file__).parent / "baselines.json"
+SIZES = [s.strip() for s in os.getenv("FPA_BENCH_SIZES", "S,M,L").split(",") if s.strip()]
+
+_workbooks: dict = {}
+
+
+@pytest.fixture(params=SIZES)
+def bench_size(request):
+    """Workbook size key (see workbooks.SIZES)."""
+    return request.param
+
+
+@pytest.fixture
+def model(bench_size):
+    """(service, client) for a freshly registered copy of a generated workbook."""
+    size = bench_size
+    if size not in _workbooks:
+        _workbooks[size] = generate_workbook(size)
+    service = FakeSheetsService()
+    spreadsheet_id = service.create(f"Benchmark {size}")
+    service.add(spreadsheet_id, _workbooks[size])
+    client = SheetsClient(spreadsheet_id, service=service)
+    client.get_spreadsheet_info()  # warm the info cache like a connected session
+    service.reset_calls()
+    return service, client
+
+
+@pytest.fixture(scope="session")
+def api_baselines():
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    observed: dict = {}
+    yield baselines, observed
+    if os.getenv("FPA_BENCH_UPDATE"):
+        BASELINES.write_text(json.dumps({**baselines, **observed}, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def measure(benchmark, api_baselines, request):
+    """Benchmark fn and check its API-call count against the stored baseline."""
+    baselines, observed = api_baselines
+
+    def run(service, fn, *args, **kwargs):
+        service.reset_calls()
+        fn(*args, **kwargs)
+        calls = service.call_count
+        key = request.node.name
+        observed[key] = calls
+        benchmark.extra_info["api_calls"] = calls
+        benchmark.extra_info["calls_by_method"] = service.calls_by_method()
+        result = benchmark(fn, *args, **kwargs)
+        if key in baselines and not os.getenv("FPA_BENCH_UPDATE"):
+            assert calls <= baselines[key], (
+                f"{key}: {calls} API calls, baseline {baselines[key]}"
+            )
+        return result
+
+    return run
@@ -0,0 +1,32 @@
+"""Benchmark the vectorized ARR engine on generated contracts."""
+
+import numpy as np
+from workbooks import SIZES, month_ends
+
+from src.analysis.arr import Contracts, compute_arr
+
+
+def _contracts(customers: int, months: int, seed: int = 11) -> tuple[Contracts, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    ends = np.array(month_ends(2026, 1, months))
+    start = rng.uniform(ends[0] - 365, ends[-1], customers)
+    churn = np.where(rng.random(customers) < 0.25, start + rng.uniform(90, 720, customers), np.nan)
+    contracts = Contracts(
+        start=start,
+        arr=rng.choice([12000.0, 24000.0, 60000.0, 120000.0], customers),
+        churn=churn,
+        expansion=rng.random(customers) < 0.2,
+    )
+    return contracts, ends
+
+
+def test_compute_arr(benchmark, bench_size):
+    customers, months = SIZES[bench_size]
+    contracts, ends = _contracts(customers * 2, months)  # ~2 bookings per customer
+    metrics = benchmark(compute_arr, contracts, ends)
+    assert np.allclose(metrics.starting_arr + metrics.net_new_arr, metrics.arr)
+
+
+def test_compute_arr_20k_contracts_60_months(benchmark):
+    contracts, ends = _contracts(20000, 60)
+    benchmark(compute_arr, contracts, ends)
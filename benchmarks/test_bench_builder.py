@@ -0,0 +1,61 @@
+"""Benchmark generating and pushing the full model from a mapping."""
+
+import csv
+import random
+
+from workbooks import DEPARTMENTS, SIZES
+
+from src.builder import Contract, Employee, ModelSpec, OpexLine, build_model, ingest
+from src.builder.ingest import IngestMapping, ingest_source
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+
+
+def _spec(size: str, seed: int = 7) -> ModelSpec:
+    customers, months = SIZES[size]
+    rng = random.Random(seed)
+    employees = [
+        Employee(f"Employee {i}", rng.choice(DEPARTMENTS), f"1/{rng.randint(1, 28)}/2025", 120000)
+        for i in range(max(6, customers // 4))
+    ]
+    contracts = [
+        Contract(f"Customer {i}", f"{rng.randint(1, 12)}/1/2025", rng.randint(10, 200) * 1000)
+        for i in range(customers)
+    ]
+    opex = [OpexLine("Overall", "Rent", 20000), OpexLine("Dept", "Marketing", 15000)]
+    return ModelSpec(2026, 1, months, employees=employees, contracts=contracts, opex=opex)
+
+
+def test_build_model(bench_size, measure):
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Build"), service=service)
+    result = measure(service, build_model, client, _spec(bench_size), replace=True)
+    assert len(result["tabs"]) == 9
+
+
+def test_build_model_arrays(bench_size, measure):
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Build"), service=service)
+    result = measure(service, build_model, client, _spec(bench_size), replace=True, arrays=True)
+    assert len(result["tabs"]) == 9
+
+
+def test_ingest_source(bench_size, measure, tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "INGEST_DIR", str(tmp_path / "ingest"))
+    customers, months = SIZES[bench_size]
+    rng = random.Random(7)
+    path = tmp_path / "crm.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Account", "Close Date", "ACV", "Term"])
+        for i in range(customers * 4):
+            writer.writerow([f"Account {i}", f"{rng.randint(1, 12)}/1/2025", 24000, 24])
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Build"), service=service)
+    build_model(client, ModelSpec(2026, 1, months))
+    mapping = IngestMapping(
+        "arr", {"customer": "Account", "start": "Close Date", "arr": "ACV",
+                "contract_length": "Term"}, acv=True,
+    )
+    result = measure(service, ingest_source, client, str(path), mapping)
+    assert result["rows_written"] == customers * 4
@@ -0,0 +1,29 @@
+"""Benchmark cash projection and runway sweeps across scenarios."""
+
+import numpy as np
+from workbooks import SIZES, month_ends
+
+from src.analysis.cash import project_cash, sweep
+
+
+def _series(months: int, seed: int = 3) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    ends = np.array(month_ends(2026, 1, months))
+    revenue = np.cumsum(rng.uniform(5000, 20000, months)) + 400000
+    cash_out = revenue * 1.3 + rng.uniform(-20000, 20000, months)
+    return ends, revenue, cash_out
+
+
+def test_project_cash(benchmark, bench_size):
+    _, months = SIZES[bench_size]
+    ends, revenue, cash_out = _series(months)
+    projection = benchmark(project_cash, ends, revenue, cash_out, 5_000_000.0)
+    assert np.allclose(projection.ending[-1], 5_000_000 + projection.total_change.sum())
+
+
+def test_sweep_500_variants_60_months(benchmark):
+    ends, revenue, cash_out = _series(60)
+    terms = [(1 - a - b, a, b) for a in np.linspace(0, 0.6, 10) for b in np.linspace(0, 0.4, 5)]
+    burn = list(np.linspace(0.7, 1.3, 10))
+    variants, projection = benchmark(sweep, ends, revenue, cash_out, 5_000_000.0, terms, burn)
+    assert len(variants) == 500 and projection.runway_months.shape == (500,)
@@ -0,0 +1,38 @@
+"""Benchmark the vectorized headcount proration and department rollup."""
+
+import numpy as np
+from workbooks import SIZES, month_ends
+
+from src.analysis.headcount import TEMPLATE_DEPARTMENTS, Employees, planned_hires, rollup
+
+
+def _staff(employees: int, months: int, seed: int = 7) -> tuple[Employees, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    ends = np.array(month_ends(2026, 1, months))
+    start = rng.uniform(ends[0] - 1000, ends[-1], employees).round()
+    leaves = rng.random(employees) < 0.15
+    staff = Employees(
+        names=[f"Employee {k}" for k in range(employees)],
+        departments=rng.choice(np.array(TEMPLATE_DEPARTMENTS, dtype=object), employees),
+        start=start,
+        end=np.where(leaves, start + rng.integers(30, 700, employees), np.nan),
+        salary=rng.choice([80000.0, 120000.0, 180000.0], employees),
+        bonus=rng.choice([0.0, 10000.0], employees),
+        commission=rng.choice([0.0, 30000.0], employees),
+        benefits=np.full(employees, 24000.0),
+    )
+    return staff, ends
+
+
+def test_rollup(benchmark, bench_size):
+    customers, months = SIZES[bench_size]
+    staff, ends = _staff(max(customers // 4, 10), months)
+    result = benchmark(rollup, staff, ends)
+    assert result.hc.sum(axis=0).max() <= len(staff)
+
+
+def test_hiring_plan_5k_hires_60_months(benchmark):
+    staff, ends = _staff(500, 60)
+    hires = planned_hires("Engineering", np.repeat(ends[:-1] + 1, 5000 // 59 + 1)[:5000], 150000)
+    plan = staff.extend(hires)
+    benchmark(rollup, plan, ends)
@@ -0,0 +1,43 @@
+"""Benchmark Monte Carlo paths through the local engines."""
+
+import numpy as np
+import pytest
+from workbooks import SIZES, month_ends
+
+from src.analysis.montecarlo import Drivers, MonteCarloModel, project_paths, simulate
+
+DRIVERS = Drivers.from_spec({
+    "growth": {"dist": "normal", "mean": 0.03, "sd": 0.01},
+    "churn": {"dist": "uniform", "low": 0.005, "high": 0.02},
+    "cac": {"dist": "lognormal", "median": 30000, "sigma": 0.3},
+    "asp": {"dist": "triangular", "low": 20000, "mode": 40000, "high": 90000},
+    "new_customers": {"dist": "normal", "mean": 8, "sd": 2},
+    "hiring_delay": {"dist": "uniform", "low": 0, "high": 4},
+})
+
+
+def _model(months: int) -> MonteCarloModel:
+    hires = np.full(months, 150000.0)
+    hires[:6] = 0
+    return MonteCarloModel(
+        month_ends=np.array(month_ends(2026, 1, months)),
+        base_mrr=np.linspace(500000, 400000, months),
+        staff_cost=np.full(months, 600000.0),
+        hires_cost=hires,
+        other_opex=np.full(months, 100000.0),
+        starting_cash=5_000_000.0,
+    )
+
+
+def test_project_paths_chunk(benchmark, bench_size):
+    _, months = SIZES[bench_size]
+    draws = DRIVERS.sample(np.random.default_rng(0), 2_000)
+    paths = benchmark(project_paths, _model(months), draws)
+    assert paths["cash"].shape == (2_000, months)
+
+
+@pytest.mark.parametrize("workers", [1, None], ids=["inline", "pool"])
+def test_simulate_10k_paths_60_months(benchmark, workers):
+    kwargs = {"paths": 10_000, "workers": workers}
+    result = benchmark.pedantic(simulate, args=(_model(60), DRIVERS), kwargs=kwargs, rounds=3)
+    assert result.arr.shape == (5, 60)
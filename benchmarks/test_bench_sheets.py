@@ -0,0 +1,107 @@
+"""Benchmarks for sheet inspection, scanning and snapshots against the fake service."""
+
+from src.analysis import scan, scenario_cache, snapshot
+from src.analysis.audit import audit_workbook
+from src.analysis.formula_cost import profile_formulas
+from src.analysis.optimizer import propose_rewrites
+from src.analysis.portfolio import Portfolio
+from src.analysis.scan import rescan_sheet, scan_sheet
+from src.sheets.quota import QuotaBucket
+
+
+def test_inspect_sheet_compact(model, measure):
+    service, client = model
+    measure(service, client.inspect_sheet, "ARR", compact=True)
+
+
+def test_inspect_sheet_sample(model, measure):
+    service, client = model
+    measure(service, client.inspect_sheet, "ARR")
+
+
+def test_scan_sheet(model, measure, tmp_path, monkeypatch):
+    service, client = model
+    monkeypatch.setattr(scan, "SCAN_DIR", str(tmp_path))
+    measure(service, scan_sheet, "Headcount Input", client)
+
+
+def test_rescan_sheet_after_write(model, measure, tmp_path, monkeypatch):
+    service, client = model
+    monkeypatch.setattr(scan, "SCAN_DIR", str(tmp_path))
+    scan_sheet("ARR", client)
+
+    def edit_and_rescan():
+        client.write_range("ARR", "B3", [["Acme"]])
+        return rescan_sheet("ARR", client)
+
+    result = measure(service, edit_and_rescan)
+    assert result["rescan"]["mode"] == "writes"
+
+
+def test_audit_workbook(model, measure):
+    service, client = model
+    measure(service, audit_workbook, client)
+
+
+def test_profile_formulas(model, measure):
+    service, client = model
+    result = measure(service, profile_formulas, client)
+    assert result["hotspots"]
+
+
+def test_propose_formula_rewrites(model, measure):
+    service, client = model
+    measure(service, propose_rewrites, client)
+
+
+def test_read_numeric_block(model, measure):
+    service, client = model
+    measure(service, client.read_numeric, "ARR Summary", "A4:ZZ5")
+
+
+def test_snapshot_save_and_diff(model, measure, tmp_path, monkeypatch):
+    service, client = model
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", str(tmp_path))
+
+    def save_and_diff():
+        grid = client.read_numeric("ARR Summary", "A4:ZZ4")
+        mrr = grid.filled()[0, 2:].tolist()
+        months = [str(m) for m in range(len(mrr))]
+        metrics = {
+            "months": months,
+            "by_line": {"Total": {"rev": mrr, "cogs": [0.0] * len(mrr), "cac": [0.0] * len(mrr),
+                                  "gm_adj": mrr}},
+            "total_gm_adj": mrr,
+            "breakeven": None,
+            "breakeven_threshold": 175000,
+        }
+        path_a = snapshot.save_snapshot("base", client.spreadsheet_id, "bench", metrics)
+        scaled = {**metrics, "total_gm_adj": [v * 1.1 for v in mrr]}
+        path_b = snapshot.save_snapshot("after", client.spreadsheet_id, "bench", scaled)
+        snap_a = snapshot.load_snapshot(path_a.rsplit("/", 1)[-1][:-5])
+        snap_b = snapshot.load_snapshot(path_b.rsplit("/", 1)[-1][:-5])
+        return snapshot.diff_snapshots(snap_a, snap_b)
+
+    measure(service, save_and_diff)
+
+
+def test_scenario_cache_hit(model, measure, tmp_path, monkeypatch):
+    service, client = model
+    monkeypatch.setattr(scenario_cache, "CACHE_DIR", str(tmp_path))
+    overrides = {"line": "Enterprise", "cac": "-20%"}
+    miss = scenario_cache.lookup(client, "scenario", overrides)
+    scenario_cache.store(miss["key"], {"months": [], "by_line": {}, "breakeven": None})
+
+    result = measure(service, scenario_cache.lookup, client, "scenario", overrides)
+    assert result["hit"]
+
+
+def test_portfolio_metrics(model, measure):
+    service, client = model
+    workbook = service.workbooks[client.spreadsheet_id]
+    ids = [f"portfolio{i:02d}" for i in range(12)]
+    for spreadsheet_id in ids:
+        service.add(spreadsheet_id, workbook)
+    portfolio = Portfolio(ids, service=service, quota=QuotaBucket(per_minute=60_000))
+    table = measure(service, portfolio.run, "metrics", as_of="2026-12-31")
+    assert len(table["rows"]) == len(ids) and not table["errors"]
@@ -0,0 +1,32 @@
+"""Time-to-prompt guard: cumulative import time of the CLI module."""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+BUDGET_MS = float(os.getenv("FPA_BENCH_STARTUP_MS", "200"))
+
+
+def _import_time_us() -> int:
+    """Cumulative microseconds to import src.agent.core, per python -X importtime."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.agent.core"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(r"\|\s*(\d+)\s*\|\s*src\.agent\.core\s*$", out.stderr, re.MULTILINE)
+    return int(match.group(1))
+
+
+def test_cli_import_time(benchmark):
+    cumulative_us = benchmark.pedantic(_import_time_us, rounds=5, iterations=1)
+    benchmark.extra_info["import_ms"] = cumulative_us / 1000
+    assert cumulative_us / 1000 < BUDGET_MS, (
+        f"src.agent.core imports in {cumulative_us / 1000:.0f}ms (budget {BUDGET_MS:.0f}ms); "
+        "see python -X importtime -c 'import src.agent.core'"
+    )
@@ -0,0 +1,135 @@
+"""Generators for template-conformant benchmark workbooks.
+
+Builds in-memory workbooks following template_specs.md (Monthly Summary date
+row, ARR with per-customer monthly helper columns, Headcount Input with the
+proration formula, ARR Summary MRR row) with cached values filled in, so
+reads behave like a real, recalculated model.
+"""
+
+import random
+from datetime import date
+from pathlib import Path
+
+from src.sheets.local import LocalCell, LocalSheet, LocalWorkbook, _to_serial
+from src.sheets.r1c1 import column_letter
+
+# size -> (customers, months)
+SIZES = {
+    "S": (10, 24),
+    "M": (100, 36),
+    "L": (1000, 60),
+    "XL": (10000, 120),
+}
+
+DEPARTMENTS = ["G&A", "Sales", "Marketing", "Product", "Engineering", "CS"]
+
+ARR_FORMULA = '=IF(AND($C{r}<={c}$1,OR($E{r}="",$E{r}>{c}$1)),$D{r},0)'
+PRORATION_FORMULA = (
+    '=IF(OR($D{r}>{c}$1,AND($E{r}<>"",$E{r}<EOMONTH({c}$1,-1)+1)),0,'
+    'IF(AND($D{r}<=EOMONTH({c}$1,-1)+1,OR($E{r}="",$E{r}>={c}$1)),'
+    '($F{r}+$I{r})/12,'
+    '($F{r}+$I{r})/12*(MIN(IF($E{r}="",{c}$1,$E{r}),{c}$1)-MAX($D{r},EOMONTH({c}$1,-1)+1)+1)/DAY({c}$1)))'
+)
+
+DATE_FORMAT = "M/d/yyyy"
+CURRENCY_FORMAT = "$#,##0"
+
+
+def month_ends(start_year: int, start_month: int, months: int) -> list[float]:
+    """Serial numbers of consecutive month-end dates."""
+    serials = []
+    year, month = start_year, start_month
+    for _ in range(months):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        serials.append(_to_serial(date(next_year, next_month, 1)) - 1)
+        year, month = next_year, next_month
+    return serials
+
+
+def _put(sheet: LocalSheet, row: int, col: int, value, formula=None, fmt=None):
+    sheet.set(row, col, LocalCell(value, formula, fmt))
+
+
+def generate_workbook(size: str, seed: int = 7) -> LocalWorkbook:
+    """Generate a benchmark workbook for one of SIZES."""
+    customers, months = SIZES[size]
+    employees = max(6, customers // 4)
+    rng = random.Random(seed)
+    dates = month_ends(2026, 1, months)
+    first, last = dates[0], dates[-1]
+
+    wb = LocalWorkbook(Path(f"bench-{size}.json"), f"Benchmark {size}")
+
+    summary = LocalSheet("Monthly Summary", 0, 40, months + 2)
+    _put(summary, 1, 0, "Month")
+    for m, serial in enumerate(dates):
+        col = m + 2
+        letter = column_letter(col)
+        formula = "=DATE(2026,1,31)" if m == 0 else f"=EOMONTH({column_letter(col - 1)}2+1,0)"
+        _put(summary, 1, col, serial, formula, DATE_FORMAT)
+        quarter = f"Q{(m % 12) // 3 + 1}-{26 + m // 12}"
+        _put(
+            summary,
+            0,
+            col,
+            quarter,
+            f'=IF({letter}2="","","Q"&ROUNDUP(MONTH({letter}2)/3,0)&"-"&RIGHT(YEAR({letter}2),2))',
+        )
+
+    arr = LocalSheet("ARR", 1, customers + 1, months + 6)
+    headers = ["Customer", "Type", "Start Date", "ARR", "Churn Date", "Contract Length"]
+    for c, header in enumerate(headers):
+        _put(arr, 0, c, header)
+    for m, serial in enumerate(dates):
+        _put(arr, 0, m + 6, serial, f"='Monthly Summary'!{column_letter(m + 2)}$2", DATE_FORMAT)
+    mrr = [0.0] * months
+    for i in range(customers):
+        r = i + 1
+        start = rng.uniform(first - 365, last)
+        churn = rng.uniform(start + 90, last + 365) if rng.random() < 0.25 else ""
+        value = float(rng.choice([12, 24, 60, 120]) * 1000)
+        kind = "New" if rng.random() < 0.8 else "Expansion"
+        row = [f"Customer {i + 1}", kind, start, value, churn, 12]
+        for c, v in enumerate(row):
+            _put(arr, r, c, v, None, DATE_FORMAT if c in (2, 4) and v != "" else None)
+        for m, serial in enumerate(dates):
+            active = start <= serial and (churn == "" or churn > serial)
+            cached = value if active else 0
+            mrr[m] += cached / 12
+            formula = ARR_FORMULA.format(r=r + 1, c=column_letter(m + 6))
+            _put(arr, r, m + 6, cached, formula, CURRENCY_FORMAT)
+
+    hc = LocalSheet("Headcount Input", 2, employees + 1, months + 9)
+    headers = ["Name", "Department", "Title", "Start Date", "End Date", "Base Salary", "Bonus",
+               "Commission", "Benefits"]
+    for c, header in enumerate(headers):
+        _put(hc, 0, c, header)
+    for m, serial in enumerate(dates):
+        _put(hc, 0, m + 9, serial, f"='Monthly Summary'!{column_letter(m + 2)}$2", DATE_FORMAT)
+    for i in range(employees):
+        r = i + 1
+        start = rng.uniform(first - 730, last)
+        end = rng.uniform(start + 60, last + 365) if rng.random() < 0.15 else ""
+        salary = float(rng.randrange(80, 250) * 1000)
+        row = [f"Employee {i + 1}", DEPARTMENTS[i % len(DEPARTMENTS)], "IC", start, end, salary,
+               salary * 0.1, 0.0, salary * 0.2]
+        for c, v in enumerate(row):
+            _put(hc, r, c, v, None, DATE_FORMAT if c in (3, 4) and v != "" else None)
+        for m, serial in enumerate(dates):
+            active = start <= serial and (end == "" or end >= serial - 27)
+            cached = (salary * 1.2) / 12 if active else 0
+            _put(hc, r, m + 9, cached, PRORATION_FORMULA.format(r=r + 1, c=column_letter(m + 9)),
+                 CURRENCY_FORMAT)
+
+    arr_summary = LocalSheet("ARR Summary", 3, 20, months + 2)
+    _put(arr_summary, 3, 0, "MRR")
+    _put(arr_summary, 4, 0, "ARR")
+    for m in range(months):
+        col = column_letter(m + 2)
+        arr_col = column_letter(m + 6)
+        _put(arr_summary, 3, m + 2, mrr[m], f"=SUM('ARR'!{arr_col}$2:{arr_col}${customers + 1})/12",
+             CURRENCY_FORMAT)
+        _put(arr_summary, 4, m + 2, mrr[m] * 12, f"={col}4*12", CURRENCY_FORMAT)
+
+    wb.sheets = [summary, arr, hc, arr_summary]
+    return wb
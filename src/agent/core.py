@@ -1,25 +1,47 @@
 """Core agent loop using Anthropic's Claude API."""
 
+import argparse
 import json
 import os
+import sys
+import threading
+from functools import cache
 from pathlib import Path
 from typing import Any
 
-import anthropic
-from dotenv import load_dotenv
-
+from src.profiling import (
+    JsonlSink,
+    MemorySink,
+    OpenTelemetrySink,
+    build_report,
+    format_report,
+    get_tracer,
+)
 from src.sheets import SheetsClient
 from src.sheets.auth import clear_credentials, show_auth_status
-from src.tools import TOOLS, execute_tool
+from src.tools import TOOLS, ResultStore, execute_tool
+
+from .memory import RECALL_TOOL, ConversationMemory
 
-# Load environment variables from .env file
-load_dotenv()
+# anthropic, dotenv and the Google client libraries are imported where first
+# needed so the CLI prompt appears without waiting on them
 
-# Load the template specs to include in the system prompt
 REPO_ROOT = Path(__file__).parent.parent.parent
-TEMPLATE_SPECS = (REPO_ROOT / "template_specs.md").read_text()
 
-SYSTEM_PROMPT = f"""You are an FP&A (Financial Planning & Analysis) assistant that helps users work with their Google Sheets financial models.
+
+@cache
+def load_env():
+    """Load environment variables from .env (once)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@cache
+def build_system_prompt() -> str:
+    """System prompt with the template specs included (read once, on first use)."""
+    template_specs = (REPO_ROOT / "template_specs.md").read_text()
+    return f"""You are an FP&A (Financial Planning & Analysis) assistant that helps users work with their Google Sheets financial models.
 
 ## Your Capabilities
 - Connect to any Google Sheets spreadsheet the user shares with you
@@ -59,7 +81,7 @@ Only proceed with modifications once the user confirms you understand the model
 The following describes an ideal FP&A model structure. User models may differ - your job is to understand THEIR model, not force it to match this template. Use this as context for what good FP&A models typically contain.
 
 ### Example Template Structure
-{TEMPLATE_SPECS}
+{template_specs}
 
 ## Working with the User
 - Before making changes, read the relevant cells to understand the current state
@@ -71,23 +93,65 @@ The following describes an ideal FP&A model structure. User models may differ -
 """
 
 
+def __getattr__(name: str):
+    # SYSTEM_PROMPT used to be built at import time; keep it importable
+    if name == "SYSTEM_PROMPT":
+        return build_system_prompt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class Agent:
     """Conversational agent for FP&A Google Sheets operations."""
 
-    def __init__(self, spreadsheet_id: str | None = None):
+    def __init__(self, spreadsheet_id: str | None = None, context_budget: int | None = None):
         """Initialize the agent.
 
         Args:
             spreadsheet_id: Optional Google Sheets spreadsheet ID or URL.
                            If not provided, user can connect via chat.
+            context_budget: Approximate token budget for conversation history.
+                            Defaults to FPA_CONTEXT_BUDGET env var, or 60000.
         """
-        self.client = anthropic.Anthropic()
-        # SheetsClient handles None gracefully; user can connect via chat later
+        load_env()
+        self._client = None
+        self._client_lock = threading.Lock()
+        # SheetsClient handles None gracefully; user can connect via chat later.
+        # It connects to Google on first use (or via warm_up()).
         self.sheets = SheetsClient(spreadsheet_id)
 
-        self.messages: list[dict[str, Any]] = []
+        budget = context_budget or int(os.getenv("FPA_CONTEXT_BUDGET", "60000"))
+        self.memory = ConversationMemory(budget_tokens=budget)
+        self.results = ResultStore()
         self.model = os.getenv("ANTHROPIC_MODEL", "claude-sonnet-4-20250514")
 
+    @property
+    def client(self) -> Any:
+        """Anthropic API client, created (and the SDK imported) on first use."""
+        with self._client_lock:
+            if self._client is None:
+                import anthropic
+
+                self._client = anthropic.Anthropic()
+            return self._client
+
+    def warm_up(self) -> threading.Thread:
+        """Import the Anthropic SDK and connect to Sheets in the background."""
+        self.sheets.warm_up()
+        thread = threading.Thread(target=self._warm_client, name="anthropic-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_client(self):
+        try:
+            self.client
+        except Exception:
+            pass  # Raised again by the first chat() call
+
+    @property
+    def messages(self) -> list[dict[str, Any]]:
+        """Current (possibly compacted) conversation history."""
+        return self.memory.messages
+
     def chat(self, user_message: str) -> str:
         """Send a message and get a response, handling any tool calls.
 
@@ -98,21 +162,21 @@ class Agent:
             The assistant's final text response.
         """
         # Add user message to history
-        self.messages.append({"role": "user", "content": user_message})
+        self.memory.append({"role": "user", "content": user_message})
 
         # Run the agent loop
         while True:
             response = self.client.messages.create(
                 model=self.model,
                 max_tokens=4096,
-                system=SYSTEM_PROMPT,
-                tools=TOOLS,
+                system=build_system_prompt(),
+                tools=TOOLS + [RECALL_TOOL],
                 messages=self.messages,
             )
 
             # Collect the assistant's response content
             assistant_content = response.content
-            self.messages.append({"role": "assistant", "content": assistant_content})
+            self.memory.append({"role": "assistant", "content": assistant_content})
 
             # Check if we need to handle tool calls
             if response.stop_reason == "tool_use":
@@ -126,11 +190,17 @@ class Agent:
                         print(f"  [Tool: {tool_name}]")
 
                         try:
-                            result = execute_tool(self.sheets, tool_name, tool_input)
+                            if tool_name == RECALL_TOOL["name"]:
+                                content = self.memory.recall(tool_input["handle"])
+                            else:
+                                result = execute_tool(
+                                    self.sheets, tool_name, tool_input, self.results
+                                )
+                                content = json.dumps(result, default=str)
                             tool_results.append({
                                 "type": "tool_result",
                                 "tool_use_id": block.id,
-                                "content": json.dumps(result, default=str),
+                                "content": content,
                             })
                         except Exception as e:
                             tool_results.append({
@@ -141,7 +211,7 @@ class Agent:
                             })
 
                 # Add tool results and continue the loop
-                self.messages.append({"role": "user", "content": tool_results})
+                self.memory.append({"role": "user", "content": tool_results})
 
             else:
                 # No more tool calls, extract and return the text response
@@ -152,14 +222,21 @@ class Agent:
 
     def reset(self):
         """Clear conversation history."""
-        self.messages = []
+        self.memory.reset()
+        self.results.clear()
 
 
-def run_agent(spreadsheet_id: str | None = None):
+def run_agent(
+    spreadsheet_id: str | None = None,
+    trace_file: str | None = None,
+    otel: bool = False,
+):
     """Run the agent in an interactive CLI loop.
 
     Args:
         spreadsheet_id: Optional spreadsheet ID override.
+        trace_file: Append every tool/API span to this JSONL file.
+        otel: Export spans through OpenTelemetry.
     """
     print("FP&A Agent")
     print("=" * 50)
@@ -168,27 +245,37 @@ def run_agent(spreadsheet_id: str | None = None):
     print("  reset       - Clear conversation history")
     print("  auth        - Show Google authentication status")
     print("  logout      - Clear stored Google credentials")
+    print("  profile     - Show slowest tools, API calls per tab, throttling")
     print("=" * 50)
     print()
+    load_env()
+
+    # Spans are always kept in memory so `profile` works mid-session; local
+    # payloads are only sized for --profile, --trace-file or --otel
+    tracer = get_tracer()
+    spans = MemorySink(payload_sizes=False)
+    tracer.add_sink(spans)
+    trace_file = trace_file or os.getenv("FPA_TRACE_FILE")
+    if trace_file:
+        tracer.add_sink(JsonlSink(trace_file))
+    if otel:
+        try:
+            tracer.add_sink(OpenTelemetrySink())
+        except ImportError as e:
+            print(f"Warning: {e}")
 
-    # Initialize agent (will trigger OAuth if needed)
+    # Initialize agent. Credentials, the Sheets service and the Anthropic SDK
+    # load in the background while the user types; OAuth (if needed) runs on
+    # first use.
     try:
         agent = Agent(spreadsheet_id)
-    except FileNotFoundError as e:
-        print(f"Setup required: {e}")
-        return
     except Exception as e:
         print(f"Error initializing agent: {e}")
         return
+    agent.warm_up()
 
-    # Show connection status on startup
     if agent.sheets.spreadsheet_id:
-        try:
-            info = agent.sheets.get_spreadsheet_info()
-            print(f"Connected to: {info['title']}")
-            print(f"Sheets: {', '.join(s['name'] for s in info['sheets'])}")
-        except Exception as e:
-            print(f"Warning: Could not connect to spreadsheet: {e}")
+        print(f"Spreadsheet: {agent.sheets.spreadsheet_id}")
     else:
         print("No spreadsheet connected yet.")
         print("Share a Google Sheets URL to get started.")
@@ -208,6 +295,11 @@ def run_agent(spreadsheet_id: str | None = None):
             print("Goodbye!")
             break
 
+        if user_input.lower() == "profile":
+            print(format_report(build_report(spans.spans)))
+            print()
+            continue
+
         if user_input.lower() == "reset":
             agent.reset()
             print("Conversation history cleared.\n")
@@ -230,8 +322,33 @@ def run_agent(spreadsheet_id: str | None = None):
 
 
 def main():
-    """Entry point for the CLI."""
-    run_agent()
+    """Entry point for the CLI (`fpa-agent serve` runs the warm daemon instead)."""
+    if sys.argv[1:2] == ["serve"]:
+        from src.daemon.server import serve_main
+
+        serve_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(prog="fpa-agent", description="FP&A Google Sheets agent")
+    parser.add_argument("spreadsheet", nargs="?", help="Spreadsheet URL or ID to connect to")
+    parser.add_argument(
+        "--profile", action="store_true", help="Print a profiling report when the session ends"
+    )
+    parser.add_argument("--trace-file", help="Append tool/API spans to this JSONL file")
+    parser.add_argument(
+        "--otel", action="store_true", help="Export spans via OpenTelemetry (opentelemetry-api)"
+    )
+    args = parser.parse_args()
+
+    spans = MemorySink()
+    if args.profile:
+        get_tracer().add_sink(spans)
+    try:
+        run_agent(args.spreadsheet, trace_file=args.trace_file, otel=args.otel)
+    finally:
+        if args.profile:
+            print()
+            print(format_report(build_report(spans.spans)))
 
 
 if __name__ == "__main__":
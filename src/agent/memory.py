@@ -0,0 +1,182 @@
+"""Bounded conversation memory with tool-result compaction.
+
+Every tool result is sent back to the model on every later API call, so a
+session that inspects a few large tabs quickly pays for the same grids over
+and over. ConversationMemory keeps the most recent tool results verbatim,
+replaces older large ones with a one-line summary plus a handle, and drops
+the oldest exchanges if the history is still over budget. The model can
+re-expand any compacted result with the recall_tool_result tool.
+"""
+
+import json
+from typing import Any
+
+# Rough chars-per-token ratio for JSON-heavy content; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+RECALL_TOOL = {
+    "name": "recall_tool_result",
+    "description": "Re-expand an earlier tool result that was compacted to save context. Pass the handle shown in the compacted summary (e.g. 'r3'). Only use this if you need the full data again.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "handle": {
+                "type": "string",
+                "description": "Handle of the compacted result (e.g. 'r3').",
+            },
+        },
+        "required": ["handle"],
+    },
+}
+
+
+def estimate_tokens(content: Any) -> int:
+    """Estimate the token size of a message content value.
+
+    Handles plain strings, lists of content blocks (dicts or SDK objects),
+    and anything else JSON-serializable.
+    """
+    if isinstance(content, str):
+        return len(content) // CHARS_PER_TOKEN + 1
+    if isinstance(content, list):
+        return sum(estimate_tokens(block) for block in content)
+    if hasattr(content, "model_dump"):  # anthropic SDK content blocks
+        content = content.model_dump()
+    return len(json.dumps(content, default=str)) // CHARS_PER_TOKEN + 1
+
+
+def summarize_result(content: str) -> str:
+    """Build a short description of a serialized tool result."""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return f"text, {len(content):,} chars"
+
+    if isinstance(data, list):
+        rows = len(data)
+        cols = max((len(r) for r in data if isinstance(r, list)), default=0)
+        if cols:
+            first = data[0] if data and isinstance(data[0], list) else []
+            preview = ", ".join(str(v) for v in first[:6])
+            return f"{rows} rows x {cols} cols, first row: [{preview}]"
+        return f"list of {rows} items"
+    if isinstance(data, dict):
+        keys = list(data)
+        shown = ", ".join(keys[:8]) + (", ..." if len(keys) > 8 else "")
+        label = data.get("sheet_name") or data.get("title")
+        prefix = f"'{label}' " if label else ""
+        return f"{prefix}dict with keys [{shown}]"
+    return f"{type(data).__name__} value"
+
+
+class ConversationMemory:
+    """Message history kept under a token budget."""
+
+    def __init__(
+        self,
+        budget_tokens: int = 60_000,
+        keep_recent: int = 2,
+        compact_threshold: int = 500,
+    ):
+        """Initialize the memory.
+
+        Args:
+            budget_tokens: Target upper bound for the estimated history size.
+            keep_recent: Number of most recent tool-result turns kept verbatim.
+            compact_threshold: Tool results smaller than this (in tokens) are
+                               never compacted — the summary would not be
+                               much shorter.
+        """
+        self.budget_tokens = budget_tokens
+        self.keep_recent = keep_recent
+        self.compact_threshold = compact_threshold
+        self.messages: list[dict[str, Any]] = []
+        self._sizes: list[int] = []
+        self._archive: dict[str, str] = {}
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated token size of the current history."""
+        return sum(self._sizes)
+
+    def append(self, message: dict[str, Any]):
+        """Add a message and compact the history if it is over budget."""
+        self.messages.append(message)
+        self._sizes.append(estimate_tokens(message["content"]))
+        if self.total_tokens > self.budget_tokens:
+            self.compact()
+
+    def compact(self):
+        """Shrink the history until it fits the budget.
+
+        Older large tool results are archived first. If that is not enough,
+        whole exchanges are dropped from the front, always cutting at a plain
+        user message so tool_use / tool_result pairs stay intact.
+        """
+        result_turns = [i for i, m in enumerate(self.messages) if _is_tool_result_turn(m)]
+        older = result_turns[: -self.keep_recent] if self.keep_recent else result_turns
+
+        for i in older:
+            if self.total_tokens <= self.budget_tokens:
+                return
+            self._compact_turn(i)
+
+        while self.total_tokens > self.budget_tokens:
+            cut = next(
+                (i for i in range(1, len(self.messages)) if _is_plain_user_turn(self.messages[i])),
+                None,
+            )
+            if cut is None:
+                return  # A single exchange is over budget; nothing safe to drop
+            del self.messages[:cut]
+            del self._sizes[:cut]
+
+    def recall(self, handle: str) -> str:
+        """Return the full content of a compacted tool result."""
+        if handle not in self._archive:
+            raise ValueError(f"Unknown result handle '{handle}'")
+        return self._archive[handle]
+
+    def reset(self):
+        """Clear history and archived results."""
+        self.messages = []
+        self._sizes = []
+        self._archive = {}
+
+    def _compact_turn(self, index: int):
+        """Replace large tool results in one user turn with summaries."""
+        blocks = self.messages[index]["content"]
+        compacted = []
+        for block in blocks:
+            content = block.get("content")
+            if (
+                isinstance(content, str)
+                and not block.get("is_error")
+                and not content.startswith("[Compacted")
+                and estimate_tokens(content) >= self.compact_threshold
+            ):
+                handle = f"r{len(self._archive) + 1}"
+                self._archive[handle] = content
+                block = {
+                    **block,
+                    "content": (
+                        f"[Compacted result {handle}: {summarize_result(content)}. "
+                        f"Call recall_tool_result with handle '{handle}' for full data.]"
+                    ),
+                }
+            compacted.append(block)
+        self.messages[index] = {**self.messages[index], "content": compacted}
+        self._sizes[index] = estimate_tokens(compacted)
+
+
+def _is_tool_result_turn(message: dict[str, Any]) -> bool:
+    content = message.get("content")
+    return (
+        message.get("role") == "user"
+        and isinstance(content, list)
+        and any(isinstance(b, dict) and b.get("type") == "tool_result" for b in content)
+    )
+
+
+def _is_plain_user_turn(message: dict[str, Any]) -> bool:
+    return message.get("role") == "user" and isinstance(message.get("content"), str)
@@ -0,0 +1,201 @@
+"""Vectorized ARR engine: MRR, ARR, customer counts and the ARR waterfall.
+
+The ARR tab evaluates one IF(AND(start<=month, OR(churn="", churn>month)))
+per contract per month, and ARR Summary re-scans the whole block with
+SUMPRODUCT for every metric — O(contracts × months) in Sheets and in any
+cell-by-cell replica. Here each contract becomes two events (start, churn)
+located by binary search against the month-end dates, scatter-added into
+per-month delta arrays and cumsummed: O(contracts log months + months).
+
+Semantics follow template_specs.md (sections 5 and 6):
+
+- a contract counts in month m if start <= month_end[m] and
+  (no churn or churn > month_end[m])
+- New / Expansion ARR: ARR of contracts whose start date falls in the month,
+  split on Type ("Expansion", anything else counts as New)
+- Churned ARR / customers: contracts whose churn date falls in the month
+- Active customers: contracts with ARR > 0 active at month end (the
+  template's COUNTIF over the ARR block)
+
+Contracts with a churn date on or before their start are never active and
+are left out of every metric (the template would count them as both new
+and churned).
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.sheets.numeric import cell_to_serial, serial_to_date
+
+
+@dataclass
+class Contracts:
+    """Column arrays for ARR contracts (one entry per ARR tab row).
+
+    Attributes:
+        start: Start dates as sheet serials.
+        arr: Annual recurring revenue per contract.
+        churn: Churn dates as serials (NaN if not churned).
+        expansion: True for Type="Expansion" rows.
+        names: Customer names (optional, for reporting).
+    """
+
+    start: np.ndarray
+    arr: np.ndarray
+    churn: np.ndarray
+    expansion: np.ndarray
+    names: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+@dataclass
+class ArrMetrics:
+    """Per-month ARR metrics (all arrays have one entry per month).
+
+    starting_arr[0] is the ARR of contracts already active at the end of the
+    month before the first month, so ending = starting + new + expansion -
+    churned holds for every month.
+    """
+
+    months: np.ndarray
+    mrr: np.ndarray
+    arr: np.ndarray
+    starting_arr: np.ndarray
+    new_arr: np.ndarray
+    expansion_arr: np.ndarray
+    churned_arr: np.ndarray
+    net_new_arr: np.ndarray
+    active_customers: np.ndarray
+    new_customers: np.ndarray
+    churned_customers: np.ndarray
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly dict with ISO month-end dates."""
+        result: dict[str, Any] = {"months": [str(d) for d in serial_to_date(self.months)]}
+        for name in (
+            "mrr",
+            "arr",
+            "starting_arr",
+            "new_arr",
+            "expansion_arr",
+            "churned_arr",
+            "net_new_arr",
+        ):
+            result[name] = getattr(self, name).round(2).tolist()
+        for name in ("active_customers", "new_customers", "churned_customers"):
+            result[name] = getattr(self, name).astype(int).tolist()
+        return result
+
+
+def contracts_from_rows(rows: list[list[Any]]) -> Contracts:
+    """Build Contracts from ARR tab rows (A Customer, B Type, C Start, D ARR, E Churn).
+
+    Rows without a start date or ARR are skipped. Values may be unformatted
+    (serials, numbers) or formatted text ("1/15/2026", "$120,000").
+    """
+    names, start, arr, churn, expansion = [], [], [], [], []
+    for row in rows:
+        row = list(row) + [""] * (5 - len(row))
+        s = cell_to_serial(row[2])
+        a = cell_to_serial(row[3])  # Same parsing: plain numbers or "$120,000"
+        if np.isnan(s) or np.isnan(a):
+            continue
+        names.append(str(row[0]))
+        start.append(s)
+        arr.append(a)
+        churn.append(cell_to_serial(row[4]))
+        expansion.append(str(row[1]).strip().lower() == "expansion")
+    return Contracts(
+        start=np.array(start, dtype=float),
+        arr=np.array(arr, dtype=float),
+        churn=np.array(churn, dtype=float),
+        expansion=np.array(expansion, dtype=bool),
+        names=names,
+    )
+
+
+def month_boundaries(month_ends: np.ndarray) -> np.ndarray:
+    """Month ends prefixed with the end of the month before the first one."""
+    month_ends = np.asarray(month_ends, dtype=float)
+    first = serial_to_date(month_ends[0]).astype("datetime64[M]").astype("datetime64[D]")
+    prev_end = (first - np.timedelta64(1, "D") - np.datetime64("1899-12-30", "D")).astype(float)
+    return np.concatenate([[prev_end], month_ends])
+
+
+def compute_arr(contracts: Contracts, month_ends: np.ndarray) -> ArrMetrics:
+    """Compute MRR, ARR, customer counts and the waterfall for every month.
+
+    Args:
+        contracts: Contract arrays (see contracts_from_rows).
+        month_ends: Month-end dates as sheet serials, ascending.
+
+    Returns:
+        ArrMetrics with one value per month.
+    """
+    month_ends = np.asarray(month_ends, dtype=float)
+    n = len(month_ends)
+    bounds = month_boundaries(month_ends)
+
+    churn = np.where(np.isnan(contracts.churn), np.inf, contracts.churn)
+    valid = churn > contracts.start
+    arr = contracts.arr[valid]
+    expansion = contracts.expansion[valid]
+
+    # Event slot k in 0..n+1: k=0 means on/before the prior month end, k in
+    # 1..n means inside month k-1, k=n+1 means after the last month
+    start_idx = np.searchsorted(bounds, contracts.start[valid], side="left")
+    churn_idx = np.searchsorted(bounds, churn[valid], side="left")
+    slots = n + 2
+
+    def scatter(idx: np.ndarray, weights: np.ndarray | None = None) -> np.ndarray:
+        return np.bincount(idx, weights=weights, minlength=slots)[:slots]
+
+    # Level at boundary k = everything started at slot <= k minus churned at slot <= k
+    arr_level = np.cumsum(scatter(start_idx, arr) - scatter(churn_idx, arr))
+    paying = arr > 0
+    count_level = np.cumsum(
+        scatter(start_idx[paying]).astype(float) - scatter(churn_idx[paying]).astype(float)
+    )
+
+    ending = arr_level[1 : n + 1]
+    new_arr = scatter(start_idx[~expansion], arr[~expansion])[1 : n + 1]
+    expansion_arr = scatter(start_idx[expansion], arr[expansion])[1 : n + 1]
+    churned_arr = scatter(churn_idx, arr)[1 : n + 1]
+
+    return ArrMetrics(
+        months=month_ends,
+        mrr=ending / 12,
+        arr=ending,
+        starting_arr=arr_level[:n],
+        new_arr=new_arr,
+        expansion_arr=expansion_arr,
+        churned_arr=churned_arr,
+        net_new_arr=new_arr + expansion_arr - churned_arr,
+        active_customers=count_level[1 : n + 1],
+        new_customers=scatter(start_idx[~expansion]).astype(float)[1 : n + 1],
+        churned_customers=scatter(churn_idx).astype(float)[1 : n + 1],
+    )
+
+
+def arr_from_sheet(
+    client: Any, arr_sheet: str = "ARR", months_sheet: str = "Monthly Summary"
+) -> ArrMetrics:
+    """Read contracts and month-end dates in one batchGet and compute ARR metrics.
+
+    Args:
+        client: A connected SheetsClient.
+        arr_sheet: Tab with contracts in columns A-E from row 2.
+        months_sheet: Tab whose row 2 (from column C) holds month-end dates.
+    """
+    contract_rows, month_rows = client.read_ranges(
+        [(arr_sheet, "A2:E"), (months_sheet, "C2:2")], render_option="UNFORMATTED_VALUE"
+    )
+    month_ends = [cell_to_serial(v) for v in (month_rows[0] if month_rows else [])]
+    month_ends = np.array([m for m in month_ends if not np.isnan(m)])
+    if not len(month_ends):
+        raise ValueError(f"No month-end dates found in '{months_sheet}'!C2:2")
+    return compute_arr(contracts_from_rows(contract_rows), month_ends)
@@ -0,0 +1,794 @@
+"""Rule-based workbook audit — every rule runs in one fused pass over cached grids.
+
+Each rule is a small class that declares the cell features it needs:
+
+    values    displayed values (one extra batched read)
+    trees     parsed formula trees
+    patterns  structural formula patterns (refs replaced by CELL)
+    layout    month header row and label sections of each tab (needs values)
+
+audit_workbook() reads every tab in one FORMULA batchGet (plus one
+FORMATTED_VALUE batchGet when a rule needs values), computes only the
+features some rule asked for, then walks each tab row by row once, handing
+every row to every rule. Formula features are computed once per relative
+(R1C1) form, so a formula dragged across 60 months and down 1,000 rows is
+parsed once, not 60,000 times.
+
+Rules hook in at three points: check_tab (once per tab, before its rows),
+check_row (every row) and finish (once, with the whole workbook, for
+cross-tab checks). Each hook returns finding dicts; the engine adds the tab.
+New rules are registered with @register and picked up by audit_workbook
+and the audit_workbook tool by name.
+"""
+
+import re
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from src.sheets.grid import Grid
+from src.sheets.r1c1 import column_letter, formula_shifter, to_r1c1
+
+from .formula import Call, Literal, Op, Ref, format_number, parse, walk
+from .structure import TabStructure, _find_header_row, _norm, parse_tab
+
+FEATURES = frozenset({"values", "trees", "patterns", "layout"})
+
+ERROR_PREFIXES = ("#REF!", "#VALUE!", "#NAME?", "#DIV/0!", "#N/A", "#NULL!", "#NUM!", "#ERROR!")
+
+
+def formula_pattern(formula: str) -> str:
+    """Normalize a formula to its structural pattern by replacing all cell refs.
+
+    e.g. =SUMIF($A$2:$A$100,B$1,'Sheet'!C5) -> =SUMIF(CELL,CELL,CELL)
+    This lets us compare formulas structurally without caring which cells they ref.
+    """
+    # Replace cross-sheet refs like 'Sheet Name'!A1 or Sheet!A1
+    result = re.sub(r"'[^']+'![A-Z$]{1,3}\$?\d*", "CELL", formula)
+    result = re.sub(r"[A-Za-z_][A-Za-z0-9_]*![A-Z$]{1,3}\$?\d*", "CELL", result)
+    # Replace remaining cell refs like $A$1, A1, $A1, A$1, AA1, etc.
+    result = re.sub(r"\$?[A-Z]{1,3}\$?\d+", "CELL", result)
+    return result
+
+
+def _a1(col: int, row: int) -> str:
+    """A1 text of a 0-based (col, row)."""
+    return f"{column_letter(col)}{row + 1}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Workbook model
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class Tab:
+    """One tab's grids and tab-level features.
+
+    Attributes:
+        name: Tab name.
+        formulas: FORMULA grid of the whole used range (from A1).
+        values: Displayed-value grid of the same extent ("values" feature).
+        structure: Label/section map of the tab ("layout" feature).
+        header_row: 0-based month header row, or None ("layout" feature).
+        months: 0-based column -> (year, month) of the header ("layout" feature).
+    """
+
+    def __init__(self, name: str, formulas: Grid, values: Grid | None = None):
+        self.name = name
+        self.formulas = formulas
+        self.values = values
+        self.structure: TabStructure | None = None
+        self.header_row: int | None = None
+        self.months: dict[int, tuple[int, int]] = {}
+
+
+class Row:
+    """One row of a tab as seen by the rules (0-based indices).
+
+    formulas, trees and patterns are parallel lists over the row's formula
+    cells; cols gives each cell's column. A tree is the parse of the first
+    formula of the tab with the same relative (R1C1) form, so its functions,
+    operators and constants are those of this cell but its references may
+    point at the first copy's cells — rules needing exact references parse
+    the formula text. trees holds None where the formula does not parse.
+    """
+
+    __slots__ = ("index", "label", "cols", "formulas", "statics", "trees", "patterns")
+
+    def __init__(self, index: int, label: str):
+        self.index = index
+        self.label = label
+        self.cols: list[int] = []
+        self.formulas: list[str] = []
+        self.statics: list[tuple[int, Any]] = []  # (col, value) of non-formula cells
+        self.trees: list[Any] = []
+        self.patterns: list[str] = []
+
+    def cell(self, i: int) -> str:
+        """A1 text of the i-th formula cell."""
+        return _a1(self.cols[i], self.index)
+
+    def span(self, first: int = 0, last: int = -1) -> str:
+        """A1 range from the first to the last formula cell of the row."""
+        return f"{self.cell(first)}:{self.cell(last)}"
+
+
+class Workbook:
+    """The audited tabs, keyed by name, with lazily computed column extents."""
+
+    def __init__(self, tabs: dict[str, Tab]):
+        self.tabs = tabs
+        self._runs: dict[tuple[str, int, int], int] = {}
+
+    def run_end(self, sheet: str, col: int, row: int) -> int | None:
+        """Last row of the unbroken run of non-blank cells starting at (row, col).
+
+        None if the cell is blank or outside the tab's used range.
+        """
+        key = (sheet, col, row)
+        if key not in self._runs:
+            grid = self.tabs[sheet].formulas
+            if col >= grid.width or row >= grid.height:
+                return None
+            column = grid.column(col)
+            end = row - 1
+            while end + 1 < grid.height and _filled(column[end + 1]):
+                end += 1
+            self._runs[key] = end
+        end = self._runs[key]
+        return end if end >= row else None
+
+    def is_total(self, sheet: str, row: int) -> bool:
+        """Whether a row's column A label marks it as a total."""
+        grid = self.tabs[sheet].formulas
+        if row >= grid.height or not grid.width:
+            return False
+        label = grid[row, 0]
+        return isinstance(label, str) and "total" in label.lower()
+
+
+def _filled(value: Any) -> bool:
+    return value != "" and value == value  # Blank numeric cells are NaN
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rules
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class Rule:
+    """Base class for audit rules.
+
+    Subclasses set name, description and needs (a subset of FEATURES) and
+    override any of the hooks. Hooks return lists of finding dicts; rules
+    may keep state between calls (a fresh instance is made per audit).
+    """
+
+    name = ""
+    description = ""
+    needs: frozenset[str] = frozenset()
+
+    def check_tab(self, workbook: Workbook, tab: Tab) -> list[dict[str, Any]]:
+        return []
+
+    def check_row(self, workbook: Workbook, tab: Tab, row: Row) -> list[dict[str, Any]]:
+        return []
+
+    def finish(self, workbook: Workbook) -> list[dict[str, Any]]:
+        return []
+
+
+RULES: dict[str, type[Rule]] = {}
+
+
+def register(cls: type[Rule]) -> type[Rule]:
+    """Class decorator adding a rule to RULES (the default rule set)."""
+    unknown = cls.needs - FEATURES
+    if unknown:
+        raise ValueError(f"Rule '{cls.name}' needs unknown features: {sorted(unknown)}")
+    RULES[cls.name] = cls
+    return cls
+
+
+@register
+class ErrorValues(Rule):
+    """Formula cells whose computed value is an error (#REF!, #DIV/0!, ...)."""
+
+    name = "errors"
+    description = "Formula cells that evaluate to an error value"
+    needs = frozenset({"values"})
+
+    def check_row(self, workbook, tab, row):
+        found = []
+        for i, col in enumerate(row.cols):
+            value = tab.values[row.index, col]
+            if isinstance(value, str) and value.startswith(ERROR_PREFIXES):
+                found.append({
+                    "cell": row.cell(i),
+                    "row_label": row.label,
+                    "error": value,
+                    "formula": row.formulas[i],
+                })
+        return found
+
+
+@register
+class StaticInFormulaRows(Rule):
+    """A static value between the first and last formula of a formula row.
+
+    Rows need at least 3 formula cells; the static value is most likely a
+    formula that was overwritten.
+    """
+
+    name = "static_in_formula_rows"
+    description = "Static values sitting inside a row of formulas (overwritten formulas)"
+
+    def check_row(self, workbook, tab, row):
+        if len(row.cols) < 3:
+            return []
+        first, last = row.cols[0], row.cols[-1]
+        return [
+            {"cell": _a1(col, row.index), "row_label": row.label, "value": str(value)}
+            for col, value in row.statics
+            if first <= col <= last
+        ]
+
+
+@register
+class PatternBreaks(Rule):
+    """A formula whose pattern appears once while another pattern dominates the row."""
+
+    name = "pattern_breaks"
+    description = "Formulas that break the structural pattern of their row"
+    needs = frozenset({"patterns"})
+
+    def check_row(self, workbook, tab, row):
+        if len(row.cols) < 4:
+            return []
+        counts = Counter(row.patterns)
+        dominant = max(counts, key=counts.get)
+        return [
+            {
+                "cell": row.cell(i),
+                "row_label": row.label,
+                "formula": row.formulas[i],
+                "dominant_pattern": dominant,
+            }
+            for i, pattern in enumerate(row.patterns)
+            if pattern != dominant and counts[pattern] == 1
+        ]
+
+
+# Unit conversions that are not assumptions (percent, quarter, year, week, days)
+BENIGN_CONSTANTS = frozenset({0, 1, 3, 4, 7, 12, 52, 100, 365})
+
+# Arguments that take a count, index, offset or mode rather than an amount
+_STRUCTURAL_ARGS = {
+    "EOMONTH": {1}, "EDATE": {1}, "DATE": {0, 1, 2}, "WEEKDAY": {1}, "TEXT": {1},
+    "ROUND": {1}, "ROUNDUP": {1}, "ROUNDDOWN": {1}, "LEFT": {1}, "RIGHT": {1}, "MID": {1, 2},
+    "INDEX": {1, 2}, "MATCH": {2}, "VLOOKUP": {2, 3}, "HLOOKUP": {2, 3}, "XLOOKUP": {4, 5},
+    "OFFSET": {1, 2, 3, 4}, "CHOOSE": {0}, "LARGE": {1}, "SMALL": {1},
+}
+
+_CRITERIA_OPERATOR_RE = re.compile(r"^(<>|<=|>=|=|<|>)?(.*)$", re.DOTALL)
+
+
+def _criteria_args(name: str, count: int) -> set[int]:
+    """Argument positions holding criteria in the *IF / *IFS functions."""
+    if name in ("SUMIF", "COUNTIF", "AVERAGEIF"):
+        return {1}
+    if name == "COUNTIFS":
+        return set(range(1, count, 2))
+    if name in ("SUMIFS", "AVERAGEIFS", "MINIFS", "MAXIFS"):
+        return set(range(2, count, 2))
+    return set()
+
+
+def _number(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def hardcoded_constants(node: Any) -> list[str]:
+    """Numbers and labels typed into a formula instead of referenced.
+
+    Flags numeric literals other than BENIGN_CONSTANTS (outside structural
+    arguments such as EOMONTH's month offset or VLOOKUP's column index), and
+    quoted text used as a criterion or compared with "=" / "<>".
+    """
+    found: list[str] = []
+
+    def visit(node: Any, exempt: bool = False, label: bool = False):
+        match node:
+            case Literal(value=bool()):
+                return
+            case Literal(value=str() as text) if label:
+                operator, rest = _CRITERIA_OPERATOR_RE.match(text).groups()
+                number = _number(rest)
+                if number is not None:
+                    if not exempt and number not in BENIGN_CONSTANTS:
+                        found.append(format_number(number))
+                elif rest:
+                    found.append(f'"{text}"')
+            case Literal(value=int() | float() as number):
+                if not exempt and number not in BENIGN_CONSTANTS:
+                    found.append(format_number(number))
+            case Call(name=name, args=args):
+                structural = _STRUCTURAL_ARGS.get(name, ())
+                criteria = _criteria_args(name, len(args))
+                for i, arg in enumerate(args):
+                    visit(arg, exempt or i in structural, i in criteria)
+            case Op(op="-", operands=(operand,)):
+                visit(operand, exempt, label)
+            case Op(op=op, operands=operands):
+                for operand in operands:
+                    visit(operand, exempt, op in ("=", "<>"))
+    visit(node)
+    return found
+
+
+@register
+class HardcodedConstants(Rule):
+    """Formula rows with numbers or labels typed into the formula."""
+
+    name = "hardcoded_constants"
+    description = "Numbers or labels typed into formulas instead of referencing input cells"
+    needs = frozenset({"trees"})
+
+    def __init__(self):
+        self._found: dict[int, list[str]] = {}
+
+    def check_row(self, workbook, tab, row):
+        constants: dict[str, None] = {}
+        cells = []
+        for i, tree in enumerate(row.trees):
+            if tree is None:
+                continue
+            key = id(tree)  # Trees are shared by every copy of a form
+            if key not in self._found:
+                self._found[key] = hardcoded_constants(tree)
+            if self._found[key]:
+                constants.update(dict.fromkeys(self._found[key]))
+                cells.append(i)
+        if not cells:
+            return []
+        return [{
+            "cell": row.cell(cells[0]),
+            "range": row.span(cells[0], cells[-1]),
+            "row_label": row.label,
+            "cells": len(cells),
+            "constants": list(constants),
+            "formula": row.formulas[cells[0]],
+        }]
+
+
+# Functions whose ranges are meant to cover a whole data column
+RANGE_FUNCTIONS = frozenset({
+    "SUMIF", "SUMIFS", "COUNTIF", "COUNTIFS", "AVERAGEIF", "AVERAGEIFS", "MINIFS", "MAXIFS",
+    "SUMPRODUCT", "VLOOKUP", "HLOOKUP", "MATCH", "INDEX", "XLOOKUP", "LOOKUP", "FILTER",
+})
+
+
+def _bounded_ranges(node: Any) -> list[Ref]:
+    """Multi-row ranges with a fixed last row used inside RANGE_FUNCTIONS."""
+    found = []
+    for call in walk(node):
+        if isinstance(call, Call) and call.name in RANGE_FUNCTIONS:
+            found.extend(
+                ref for ref in walk(call)
+                if isinstance(ref, Ref) and ref.col1 is not None and ref.row1 is not None
+                and ref.row2 is not None and ref.row2 > ref.row1
+            )
+    return found
+
+
+@register
+class CappedRanges(Rule):
+    """Lookup and criteria ranges that stop while the data below them continues.
+
+    A range such as ARR!$B$2:$B$100 silently drops row 101 onward once the
+    data grows. Flagged when the cell right below the range is filled, unless
+    that row is labelled as a total; data_ends is the last row of the
+    unbroken run from there.
+    """
+
+    name = "capped_ranges"
+    description = "SUMIF/lookup ranges that end above the last row of their data"
+    needs = frozenset({"trees"})
+
+    def __init__(self):
+        self._candidates: dict[int, bool] = {}
+        self._ranges: dict[str, list[Ref]] = {}
+
+    def check_row(self, workbook, tab, row):
+        groups: dict[tuple[str, int, int], dict[str, Any]] = {}
+        for i, tree in enumerate(row.trees):
+            if tree is None:
+                continue
+            if id(tree) not in self._candidates:
+                self._candidates[id(tree)] = bool(_bounded_ranges(tree))
+            if not self._candidates[id(tree)]:
+                continue
+            formula = row.formulas[i]
+            if formula not in self._ranges:
+                self._ranges[formula] = _bounded_ranges(parse(formula))
+            seen = set()
+            for ref in self._ranges[formula]:
+                sheet = ref.sheet or tab.name
+                if sheet not in workbook.tabs or workbook.is_total(sheet, ref.row2 + 1):
+                    continue
+                ends = [
+                    end for col in range(ref.col1, ref.col2 + 1)
+                    if (end := workbook.run_end(sheet, col, ref.row2 + 1)) is not None
+                ]
+                if not ends:
+                    continue
+                key = (sheet, ref.row1, ref.row2)
+                group = groups.setdefault(key, {
+                    "cell": row.cell(i),
+                    "row_label": row.label,
+                    "range": ref.text,
+                    "range_ends": ref.row2 + 1,
+                    "data_ends": 0,
+                    "cells": 0,
+                    "formula": formula,
+                })
+                group["data_ends"] = max(group["data_ends"], max(ends) + 1)
+                if key not in seen:
+                    seen.add(key)
+                    group["cells"] += 1
+        return list(groups.values())
+
+
+def _month_index(month: tuple[int, int]) -> int:
+    return month[0] * 12 + month[1] - 1
+
+
+def _month_text(month: tuple[int, int]) -> str:
+    return f"{month[0]}-{month[1]:02d}"
+
+
+def _month_at(index: int) -> tuple[int, int]:
+    return index // 12, index % 12 + 1
+
+
+@register
+class MonthHeaders(Rule):
+    """Month header rows that skip, repeat or misalign months.
+
+    - sequence: a header month that breaks the row's usual step (a gap,
+      a repeat or a month out of order)
+    - text: a header month stored as text, which breaks date comparisons
+    - misaligned: a formula in one tab's month column that pulls a
+      different month's column from another tab
+    """
+
+    name = "month_headers"
+    description = "Month headers with gaps, repeats or text dates, and cross-tab month misalignment"
+    needs = frozenset({"layout", "trees"})
+
+    def __init__(self):
+        self._candidates: dict[int, bool] = {}
+        self._refs: dict[str, list[Ref]] = {}
+
+    def check_tab(self, workbook, tab):
+        if tab.header_row is None:
+            return []
+        found = []
+        cols = sorted(tab.months)
+        steps = [
+            _month_index(tab.months[b]) - _month_index(tab.months[a])
+            for a, b in zip(cols, cols[1:], strict=False)
+        ]
+        step = Counter(steps).most_common(1)[0][0] if steps else 1
+        for (a, b), actual in zip(zip(cols, cols[1:], strict=False), steps, strict=True):
+            if actual != step:
+                found.append({
+                    "cell": _a1(b, tab.header_row),
+                    "kind": "sequence",
+                    "month": _month_text(tab.months[b]),
+                    "expected": _month_text(_month_at(_month_index(tab.months[a]) + step)),
+                })
+        for col in cols:
+            raw = tab.formulas[tab.header_row, col]
+            if isinstance(raw, str) and not raw.startswith("="):
+                found.append({
+                    "cell": _a1(col, tab.header_row),
+                    "kind": "text",
+                    "month": _month_text(tab.months[col]),
+                    "value": raw,
+                })
+        return found
+
+    def check_row(self, workbook, tab, row):
+        if not tab.months:
+            return []
+        groups: dict[tuple[str, int], dict[str, Any]] = {}
+        for i, tree in enumerate(row.trees):
+            col = row.cols[i]
+            if tree is None or col not in tab.months:
+                continue
+            if id(tree) not in self._candidates:
+                self._candidates[id(tree)] = any(
+                    isinstance(ref, Ref) and ref.sheet not in (None, tab.name)
+                    for ref in walk(tree)
+                )
+            if not self._candidates[id(tree)]:
+                continue
+            formula = row.formulas[i]
+            if formula not in self._refs:
+                self._refs[formula] = [ref for ref in walk(parse(formula)) if isinstance(ref, Ref)]
+            own = tab.months[col]
+            for ref in self._refs[formula]:
+                other = workbook.tabs.get(ref.sheet) if ref.sheet != tab.name else None
+                if other is None or ref.col1 is None or ref.col1 != ref.col2:
+                    continue
+                month = other.months.get(ref.col1)
+                if month is None or month == own:
+                    continue
+                offset = _month_index(month) - _month_index(own)
+                group = groups.setdefault((ref.sheet, offset), {
+                    "cell": row.cell(i),
+                    "kind": "misaligned",
+                    "row_label": row.label,
+                    "month": _month_text(own),
+                    "references": f"{ref.text} ({_month_text(month)})",
+                    "offset_months": offset,
+                    "cells": 0,
+                })
+                group["cells"] += 1
+        return list(groups.values())
+
+
+@register
+class UnbalancedSections(Rule):
+    """Repeated blocks (business lines, departments) missing rows their siblings have.
+
+    A row label counts as expected when more than half of the tab's sections
+    have it; a section sharing at least half of the expected labels is the
+    same kind of block and is flagged for every expected label it lacks.
+    Needs three or more sections to tell which one is off.
+    """
+
+    name = "unbalanced_sections"
+    description = "Repeated sections missing rows that their sibling sections have"
+    needs = frozenset({"layout"})
+
+    def check_tab(self, workbook, tab):
+        sections = tab.structure.sections if tab.structure else []
+        if len(sections) < 3:
+            return []
+        labels = [{_norm(label): label for label in section.rows} for section in sections]
+        counts = Counter(key for section in labels for key in section)
+        expected = [key for key, n in counts.items() if n * 2 > len(sections)]
+        found = []
+        for section, present in zip(sections, labels, strict=True):
+            missing = [key for key in expected if key not in present]
+            if missing and len(expected) - len(missing) >= len(expected) / 2:
+                found.append({
+                    "cell": f"{tab.structure.label_column}{section.header_row}",
+                    "section": section.name,
+                    "missing": [
+                        next(s[key] for s in labels if key in s) for key in missing
+                    ],
+                    "rows": f"{section.start_row}-{section.end_row}",
+                })
+        return found
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def read_workbook(
+    client: Any, sheet_names: list[str] | None = None, features: frozenset[str] = frozenset()
+) -> Workbook:
+    """Read tabs in one FORMULA batchGet (plus one values batchGet if needed).
+
+    Args:
+        client: A connected SheetsClient.
+        sheet_names: Tabs to read (default: every tab).
+        features: Features the rules need; "values" and "layout" add the
+            displayed-value read, "layout" also maps headers and sections.
+    """
+    info = [s["name"] for s in client.get_spreadsheet_info()["sheets"]]
+    names = sheet_names or info
+    missing = [name for name in names if name not in info]
+    if missing:
+        raise ValueError(f"Sheet '{missing[0]}' not found")
+
+    formula_rows = client.read_ranges([(name, "") for name in names], "FORMULA")
+    value_rows = (
+        client.read_ranges([(name, "") for name in names])
+        if features & {"values", "layout"}
+        else [None] * len(names)
+    )
+    return Workbook({
+        name: make_tab(name, formulas, values, features)
+        for name, formulas, values in zip(names, formula_rows, value_rows, strict=True)
+    })
+
+
+def make_tab(
+    name: str,
+    formulas: list[list[Any]],
+    values: list[list[Any]] | None = None,
+    features: frozenset[str] = frozenset(),
+    height: int = 0,
+    width: int = 0,
+) -> Tab:
+    """Build a Tab from raw FORMULA rows (and displayed-value rows), padded to one extent.
+
+    height and width are minimums; the grids grow to fit the rows given.
+    """
+    height = max(height, len(formulas), len(values or ()))
+    width = max(width, max((len(r) for r in formulas + (values or [])), default=0))
+    tab = Tab(name, Grid.from_rows(formulas, height=height, width=width))
+    if values is not None:
+        tab.values = Grid.from_rows(values, height=height, width=width)
+    if "layout" in features:
+        tab.structure = parse_tab(name, values)
+        tab.header_row, tab.months = _find_header_row(tab.values)
+    return tab
+
+
+def _formula_features(
+    tab: Tab, columns: list, features: frozenset[str], cache: dict[tuple[str, str], tuple]
+) -> list[list[tuple | None]]:
+    """(tree, pattern) of every formula cell, per column, computed once per R1C1 form.
+
+    Walks each column top to bottom: a formula filled down a column is
+    recognised by shifting the run's seed by whole rows (a string join)
+    before falling back to the R1C1 conversion (a regex pass).
+    """
+    result: list[list[tuple | None]] = [[] for _ in columns]
+    for c in range(1, len(columns)):
+        column = columns[c]
+        if not isinstance(column, tuple):  # Numeric columns hold no formulas
+            continue
+        out: list[tuple | None] = [None] * len(column)
+        seed_row, shift, seed = 0, None, None
+        for r, value in enumerate(column):
+            if not (value.__class__ is str and value.startswith("=")):
+                continue
+            if shift is None or value != shift(r - seed_row, 0):
+                form = (tab.name, to_r1c1(value, r, c))
+                if form not in cache:
+                    tree = pattern = None
+                    if "trees" in features:
+                        try:
+                            tree = parse(value)
+                        except ValueError:
+                            tree = None
+                    if "patterns" in features:
+                        pattern = formula_pattern(value)
+                    cache[form] = (tree, pattern)
+                seed_row, shift, seed = r, formula_shifter(value), cache[form]
+            out[r] = seed
+        result[c] = out
+    return result
+
+
+def _scan_row(r: int, columns: list, formula_features: list[list[tuple | None]] | None) -> Row:
+    """Collect a row's formula and static cells and their formula features."""
+    label = columns[0][r] if columns else ""
+    row = Row(r, str(label).strip() if _filled(label) else "")
+    for c in range(1, len(columns)):  # Column A holds labels
+        value = columns[c][r]
+        if not (value.__class__ is str and value.startswith("=")):
+            if _filled(value):
+                row.statics.append((c, value))
+            continue
+        row.cols.append(c)
+        row.formulas.append(value)
+        if formula_features is not None:
+            tree, pattern = formula_features[c][r]
+            row.trees.append(tree)
+            row.patterns.append(pattern)
+    return row
+
+
+def run_rules(
+    workbook: Workbook, rules: list[Rule], rows: dict[str, Iterable[int]] | None = None
+) -> dict[str, list[dict[str, Any]]]:
+    """Run rules over a workbook in one pass; findings per rule name, tab first.
+
+    Args:
+        workbook: The tabs to check.
+        rules: Rule instances.
+        rows: Tab name -> 0-based rows to hand to check_row (default: every
+            row). Used by rescans to re-check only changed rows.
+    """
+    features = frozenset().union(*(rule.needs for rule in rules)) & {"trees", "patterns"}
+    row_rules = [rule for rule in rules if type(rule).check_row is not Rule.check_row]
+    findings: dict[str, list[dict[str, Any]]] = {rule.name: [] for rule in rules}
+    # Kept for the whole run so rules can memoize on tree identity
+    cache: dict[tuple[str, str], tuple] = {}
+    for tab in workbook.tabs.values():
+        for rule in rules:
+            findings[rule.name].extend(
+                {"tab": tab.name, **f} for f in rule.check_tab(workbook, tab)
+            )
+        if not row_rules:
+            continue
+        grid = tab.formulas
+        columns = [grid.column(c) for c in range(grid.width)]
+        formula_features = (
+            _formula_features(tab, columns, features, cache) if features else None
+        )
+        indices = (
+            range(grid.height)
+            if rows is None
+            else sorted(r for r in set(rows.get(tab.name, ())) if 0 <= r < grid.height)
+        )
+        for r in indices:
+            row = _scan_row(r, columns, formula_features)
+            if not row.cols and not row.statics:
+                continue
+            for rule in row_rules:
+                if found := rule.check_row(workbook, tab, row):
+                    findings[rule.name].extend({"tab": tab.name, **f} for f in found)
+    for rule in rules:
+        findings[rule.name].extend(rule.finish(workbook))
+    return findings
+
+
+def audit_workbook(
+    client: Any,
+    sheet_names: list[str] | None = None,
+    rules: list[str | Rule] | None = None,
+) -> dict[str, Any]:
+    """Run audit rules over every cell of the workbook in one fused pass.
+
+    Args:
+        client: A connected SheetsClient.
+        sheet_names: Tabs to audit (default: every tab).
+        rules: Rule names from RULES or Rule instances (default: all of RULES).
+
+    Returns:
+        Dict with keys:
+        - tabs: [{tab, rows, cols, formulas}]
+        - rules: [{rule, description, findings}] (finding counts)
+        - findings: rule name -> [{tab, cell, ...}]
+    """
+    selected: list[Rule] = []
+    for rule in rules or list(RULES):
+        if isinstance(rule, Rule):
+            selected.append(rule)
+        elif rule in RULES:
+            selected.append(RULES[rule]())
+        else:
+            raise ValueError(f"Unknown audit rule '{rule}'. Available: {', '.join(RULES)}")
+    needs = frozenset().union(*(rule.needs for rule in selected))
+    unknown = needs - FEATURES
+    if unknown:
+        raise ValueError(f"Unknown rule features: {sorted(unknown)}")
+
+    workbook = read_workbook(client, sheet_names, needs)
+    findings = run_rules(workbook, selected)
+    return {
+        "tabs": [
+            {
+                "tab": tab.name,
+                "rows": tab.formulas.height,
+                "cols": tab.formulas.width,
+                "formulas": sum(
+                    1 for c in range(tab.formulas.width) for v in tab.formulas.column(c)
+                    if v.__class__ is str and v.startswith("=")
+                ),
+            }
+            for tab in workbook.tabs.values()
+        ],
+        "rules": [
+            {
+                "rule": rule.name,
+                "description": rule.description,
+                "findings": len(findings[rule.name]),
+            }
+            for rule in selected
+        ],
+        "findings": findings,
+    }
@@ -0,0 +1,312 @@
+"""Vectorized cash engine: collections lag, cash balances and runway.
+
+The Cash Flow tab applies payment terms to revenue (template_specs.md,
+section 9), then chains Beginning Cash -> Ending Cash one month at a time:
+
+    Collections[m] = MRR[m]*0.4 + MRR[m-1]*0.4 + MRR[m-2]*0.2
+    Ending Cash[m] = Beginning Cash[m] + Collections[m] - Cash Out[m] + Other[m]
+
+Collections are the revenue series convolved with the payment-term kernel
+(terms[k] = share of a month's revenue collected k months later), and the
+balance chain is a cumulative sum, so a whole projection is a handful of
+array operations. Every input may carry a leading scenario axis, which is
+how a /scenario sweep over payment terms or burn evaluates hundreds of
+variants in one pass.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.sheets.numeric import cell_to_serial, serial_to_date
+
+# 40/40/20 at 30/60/90 days: the template's 0/1/2-month collection lags
+DEFAULT_TERMS = (0.4, 0.4, 0.2)
+
+# (Monthly Summary, Cash Flow) ranges holding the template's cash inputs
+CASH_RANGES = ("C2:10", "C3:10")
+
+
+def collections(
+    revenue: np.ndarray, terms: np.ndarray = DEFAULT_TERMS, prior_revenue: np.ndarray | None = None
+) -> np.ndarray:
+    """Cash collected per month under payment terms.
+
+    Args:
+        revenue: Revenue per month, shape (months,) or (scenarios, months).
+        terms: Share collected at each month of lag, shape (lags,) or
+            (scenarios, lags). Shares need not sum to 1 (bad debt).
+        prior_revenue: Revenue of the months before the first, oldest first,
+            still being collected. Defaults to none (blank cells count as 0).
+
+    Returns:
+        Collections with the broadcast shape of revenue and terms.
+    """
+    revenue = np.asarray(revenue, dtype=float)
+    terms = np.asarray(terms, dtype=float)
+    lags = terms.shape[-1]
+    history = np.zeros(revenue.shape[:-1] + (lags - 1,))
+    if prior_revenue is not None and lags > 1:
+        prior = np.asarray(prior_revenue, dtype=float)[..., -(lags - 1) :]
+        history[..., lags - 1 - prior.shape[-1] :] = prior
+    padded = np.concatenate([history, revenue], axis=-1)
+
+    # Convolution as one shifted multiply-add per lag (lags << months)
+    months = revenue.shape[-1]
+    start = lags - 1
+    out = terms[..., :1] * padded[..., start : start + months]
+    for k in range(1, lags):
+        out = out + terms[..., k : k + 1] * padded[..., start - k : start - k + months]
+    return out
+
+
+@dataclass
+class CashProjection:
+    """Cash Flow rows and runway; arrays have a trailing month axis.
+
+    With scenario inputs, every array gains a leading scenario axis and
+    runway_months / cash_zero_month hold one value per scenario.
+
+    Attributes:
+        cash_zero_month: Index of the first month whose ending cash is <= 0,
+            or -1 if cash stays positive through the horizon.
+        runway_months: Months of cash from the start of the first month.
+            Fractional within the horizon; beyond it, the last month's net
+            burn is extrapolated (inf if the model is cash-flow positive).
+    """
+
+    months: np.ndarray
+    collections: np.ndarray
+    cash_out: np.ndarray
+    burn: np.ndarray
+    other: np.ndarray
+    total_change: np.ndarray
+    beginning: np.ndarray
+    ending: np.ndarray
+    cash_zero_month: np.ndarray
+    runway_months: np.ndarray
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly dict for a single (non-batched) projection."""
+        if self.ending.ndim != 1:
+            raise ValueError("to_dict() needs a single projection; index a scenario first")
+        zero = int(self.cash_zero_month)
+        runway = float(self.runway_months)
+        months = serial_to_date(self.months)
+        result: dict[str, Any] = {"months": [str(d) for d in months]}
+        for name in (
+            "beginning",
+            "collections",
+            "cash_out",
+            "burn",
+            "other",
+            "total_change",
+            "ending",
+        ):
+            result[name] = getattr(self, name).round(2).tolist()
+        result["cash_zero_month"] = str(months[zero]) if zero >= 0 else None
+        result["runway_months"] = round(runway, 1) if np.isfinite(runway) else None
+        return result
+
+    def scenario(self, i: int) -> "CashProjection":
+        """Projection for scenario i of a batch."""
+        return CashProjection(
+            months=self.months,
+            **{
+                name: getattr(self, name)[i]
+                for name in (
+                    "collections",
+                    "cash_out",
+                    "burn",
+                    "other",
+                    "total_change",
+                    "beginning",
+                    "ending",
+                    "cash_zero_month",
+                    "runway_months",
+                )
+            },
+        )
+
+
+def project_cash(
+    month_ends: np.ndarray,
+    revenue: np.ndarray,
+    cash_out: np.ndarray,
+    starting_cash: float | np.ndarray,
+    terms: np.ndarray = DEFAULT_TERMS,
+    other: np.ndarray | float = 0.0,
+    prior_revenue: np.ndarray | None = None,
+) -> CashProjection:
+    """Project collections, balances, cash-zero month and runway.
+
+    Args:
+        month_ends: Month-end dates as sheet serials.
+        revenue: Revenue (MRR) per month; (months,) or (scenarios, months).
+        cash_out: Operating cash out per month; same shapes as revenue.
+        starting_cash: Beginning cash of the first month; scalar or (scenarios,).
+        terms: Payment-term shares per month of lag; (lags,) or (scenarios, lags).
+        other: Interest and other cash items per month (Cash Flow rows 8-10).
+        prior_revenue: Revenue before the first month (see collections).
+
+    Returns:
+        CashProjection broadcast across every scenario axis in the inputs.
+    """
+    month_ends = np.asarray(month_ends, dtype=float)
+    collected = collections(revenue, terms, prior_revenue)
+    cash_out = np.asarray(cash_out, dtype=float)
+    other = np.asarray(other, dtype=float)
+    shape = np.broadcast_shapes(collected.shape, cash_out.shape, other.shape)
+    collected, cash_out, other = (np.broadcast_to(a, shape) for a in (collected, cash_out, other))
+    starting = np.broadcast_to(np.asarray(starting_cash, dtype=float), shape[:-1])[..., None]
+
+    burn = cash_out - collected
+    total_change = other - burn
+    ending = starting + np.cumsum(total_change, axis=-1)
+    beginning = np.concatenate([starting, ending[..., :-1]], axis=-1)
+
+    broke = ending <= 0
+    hit = broke.any(axis=-1)
+    zero = np.where(hit, broke.argmax(axis=-1), -1)
+
+    # Within the horizon: whole months before the cash-zero month plus the
+    # fraction of that month the beginning balance covers
+    idx = np.maximum(zero, 0)[..., None]
+    begin_at = np.take_along_axis(beginning, idx, axis=-1)[..., 0]
+    spent_at = -np.take_along_axis(total_change, idx, axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inside = idx[..., 0] + np.clip(np.nan_to_num(begin_at / spent_at), 0.0, 1.0)
+        net_burn = -total_change[..., -1]
+        beyond = np.where(net_burn > 0, shape[-1] + ending[..., -1] / net_burn, np.inf)
+    runway = np.where(hit, inside, beyond)
+
+    return CashProjection(
+        months=month_ends,
+        collections=collected,
+        cash_out=cash_out,
+        burn=burn,
+        other=other,
+        total_change=total_change,
+        beginning=beginning,
+        ending=ending,
+        cash_zero_month=zero,
+        runway_months=runway,
+    )
+
+
+def sweep(
+    month_ends: np.ndarray,
+    revenue: np.ndarray,
+    cash_out: np.ndarray,
+    starting_cash: float,
+    terms_variants: list[tuple[float, ...]] | None = None,
+    burn_multipliers: list[float] | None = None,
+    other: np.ndarray | float = 0.0,
+    prior_revenue: np.ndarray | None = None,
+) -> tuple[list[dict[str, Any]], CashProjection]:
+    """Project every combination of payment terms and burn multiplier at once.
+
+    Terms variants of different lengths are zero-padded to a common kernel.
+
+    Returns:
+        (variants, projection): one dict per scenario with its inputs, and the
+        batched CashProjection in the same order.
+    """
+    terms_variants = terms_variants or [DEFAULT_TERMS]
+    burn_multipliers = burn_multipliers or [1.0]
+    combos = list(itertools.product(terms_variants, burn_multipliers))
+
+    lags = max(len(t) for t in terms_variants)
+    kernel = np.zeros((len(combos), lags))
+    for i, (t, _) in enumerate(combos):
+        kernel[i, : len(t)] = t
+    scale = np.array([m for _, m in combos])[:, None]
+
+    revenue = np.asarray(revenue, dtype=float)
+    projection = project_cash(
+        month_ends,
+        np.broadcast_to(revenue, (len(combos),) + revenue.shape[-1:]),
+        np.asarray(cash_out, dtype=float) * scale,
+        starting_cash,
+        kernel,
+        other,
+        prior_revenue,
+    )
+    variants = [{"payment_terms": list(t), "burn_multiplier": m} for t, m in combos]
+    return variants, projection
+
+
+def _row(rows: list[list[Any]], index: int, width: int) -> np.ndarray:
+    """One sheet row as floats (blanks and text count as 0), padded to width."""
+    row = rows[index] if index < len(rows) else []
+    values = np.array([cell_to_serial(v) for v in row[:width]] + [np.nan] * (width - len(row)))
+    return np.nan_to_num(values[:width])
+
+
+def cash_inputs_from_sheet(
+    client: Any, cash_sheet: str = "Cash Flow", months_sheet: str = "Monthly Summary"
+) -> dict[str, Any]:
+    """Read month ends, revenue, cash out, other items and starting cash in one batchGet.
+
+    Uses the template layout: Monthly Summary row 2 (month ends) and row 10
+    (Revenue (MRR)); Cash Flow row 3 (Beginning Cash, first month), row 6
+    (Operating Cash Out) and rows 8-10 (interest and other).
+
+    Returns:
+        Keyword arguments for project_cash / sweep.
+    """
+    summary_rows, cash_rows = client.read_ranges(
+        [(months_sheet, CASH_RANGES[0]), (cash_sheet, CASH_RANGES[1])],
+        render_option="UNFORMATTED_VALUE",
+    )
+    return cash_inputs_from_rows(summary_rows, cash_rows, months_sheet)
+
+
+def cash_inputs_from_rows(
+    summary_rows: list[list[Any]], cash_rows: list[list[Any]], months_sheet: str = "Monthly Summary"
+) -> dict[str, Any]:
+    """Cash inputs from already-read CASH_RANGES values (see cash_inputs_from_sheet)."""
+    dates = [cell_to_serial(v) for v in (summary_rows[0] if summary_rows else [])]
+    month_ends = np.array(list(itertools.takewhile(lambda d: not np.isnan(d), dates)))
+    if not len(month_ends):
+        raise ValueError(f"No month-end dates found in '{months_sheet}'!C2:2")
+    n = len(month_ends)
+    starting = _row(cash_rows, 0, 1)[0]
+    other = sum(_row(cash_rows, i, n) for i in (5, 6, 7))  # rows 8-10
+    return {
+        "month_ends": month_ends,
+        "revenue": _row(summary_rows, 8, n),  # row 10
+        "cash_out": _row(cash_rows, 3, n),  # row 6
+        "starting_cash": starting,
+        "other": other,
+    }
+
+
+def cash_from_sheet(
+    client: Any,
+    cash_sheet: str = "Cash Flow",
+    months_sheet: str = "Monthly Summary",
+    terms_variants: list[tuple[float, ...]] | None = None,
+    burn_multipliers: list[float] | None = None,
+) -> dict[str, Any]:
+    """Project cash from the model, or sweep payment terms / burn for runway.
+
+    Without variants, returns the projection under the template's 40/40/20
+    terms. With variants, returns runway and cash-zero month per combination.
+    """
+    inputs = cash_inputs_from_sheet(client, cash_sheet, months_sheet)
+    if not terms_variants and not burn_multipliers:
+        return project_cash(**inputs).to_dict()
+
+    variants, projection = sweep(
+        terms_variants=terms_variants, burn_multipliers=burn_multipliers, **inputs
+    )
+    months = serial_to_date(projection.months)
+    for variant, zero, runway in zip(
+        variants, projection.cash_zero_month, projection.runway_months, strict=True
+    ):
+        variant["cash_zero_month"] = str(months[zero]) if zero >= 0 else None
+        variant["runway_months"] = round(float(runway), 1) if np.isfinite(runway) else None
+    return {"months": [str(d) for d in months], "variants": variants}
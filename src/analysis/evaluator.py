@@ -0,0 +1,628 @@
+"""Local formula evaluator over cached sheet values.
+
+Evaluates a parsed formula against the values last computed by Sheets
+(an UNFORMATTED_VALUE read), so two formulas can be compared on the
+current data without writing either to the spreadsheet. Referenced
+formula cells are taken at their cached value, not re-evaluated.
+
+Ranges evaluate to 2D numpy object arrays and operators broadcast over
+them, as inside SUMPRODUCT or ARRAYFORMULA. Blank cells read as "" and
+count as 0 in arithmetic; error values are formula.Error and propagate.
+Only the functions in FUNCTIONS are supported — anything else raises
+ValueError, so callers can tell "cannot check" from "differs".
+"""
+
+import calendar
+import math
+import re
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+
+from src.sheets.grid import Grid
+
+from .formula import Array, Call, Error, Literal, Name, Node, Op, Ref, format_number, parse
+
+_EPOCH = date(1899, 12, 30)
+
+VALUE = Error("#VALUE!")
+DIV0 = Error("#DIV/0!")
+NA = Error("#N/A")
+REF = Error("#REF!")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scalar semantics
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def to_number(value: Any) -> float | Error:
+    """Coerce a scalar for arithmetic: blank is 0, TRUE is 1, numeric text parses."""
+    if isinstance(value, Error):
+        return value
+    if isinstance(value, bool):
+        return float(value)
+    if _is_number(value):
+        return float(value)
+    if value == "":
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return VALUE
+
+
+def to_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if _is_number(value):
+        return format_number(value)
+    return value
+
+
+def to_bool(value: Any) -> bool | Error:
+    if isinstance(value, Error):
+        return value
+    if isinstance(value, str):
+        if value.upper() in ("TRUE", "FALSE"):
+            return value.upper() == "TRUE"
+        return False if value == "" else VALUE
+    return bool(value)
+
+
+def _type_rank(value: Any) -> int:
+    # Sheets orders numbers < text < booleans
+    return 2 if isinstance(value, bool) else 1 if isinstance(value, str) else 0
+
+
+def _arith(op: str, a: Any, b: Any) -> Any:
+    a, b = to_number(a), to_number(b)
+    if isinstance(a, Error):
+        return a
+    if isinstance(b, Error):
+        return b
+    match op:
+        case "+":
+            return a + b
+        case "-":
+            return a - b
+        case "*":
+            return a * b
+        case "/":
+            return DIV0 if b == 0 else a / b
+        case "^":
+            try:
+                result = a**b
+            except (OverflowError, ZeroDivisionError):
+                return Error("#NUM!")
+            return Error("#NUM!") if isinstance(result, complex) else result
+
+
+def _compare(op: str, a: Any, b: Any) -> Any:
+    if isinstance(a, Error):
+        return a
+    if isinstance(b, Error):
+        return b
+    # A blank compares as 0, "" or FALSE depending on the other side
+    if a == "" and not isinstance(b, str):
+        a = False if isinstance(b, bool) else 0.0
+    if b == "" and not isinstance(a, str):
+        b = False if isinstance(a, bool) else 0.0
+    if _type_rank(a) != _type_rank(b):
+        a, b = _type_rank(a), _type_rank(b)
+    elif isinstance(a, str):
+        a, b = a.lower(), b.lower()
+    match op:
+        case "=":
+            return a == b
+        case "<>":
+            return a != b
+        case "<":
+            return a < b
+        case ">":
+            return a > b
+        case "<=":
+            return a <= b
+        case ">=":
+            return a >= b
+
+
+def _binary(op: str, a: Any, b: Any) -> Any:
+    if op == "&":
+        if isinstance(a, Error):
+            return a
+        return b if isinstance(b, Error) else to_text(a) + to_text(b)
+    if op in ("=", "<>", "<", ">", "<=", ">="):
+        return _compare(op, a, b)
+    return _arith(op, a, b)
+
+
+def _elementwise(fn, *args: Any) -> Any:
+    """Apply a scalar function, broadcasting over any array arguments."""
+    if not any(isinstance(arg, np.ndarray) for arg in args):
+        return fn(*args)
+    try:
+        return np.frompyfunc(fn, len(args), 1)(*args)
+    except ValueError as exc:
+        raise ValueError("Array arguments of different sizes") from exc
+
+
+def _flatten(values: list[Any]) -> list[tuple[Any, bool]]:
+    """(value, from_range) pairs for aggregate functions."""
+    flat = []
+    for value in values:
+        if isinstance(value, np.ndarray):
+            flat.extend((v, True) for v in value.ravel())
+        else:
+            flat.append((value, False))
+    return flat
+
+
+def _numbers(values: list[Any]) -> list[float] | Error:
+    """Numbers for SUM/MIN/MAX/AVERAGE: range cells must already be numbers,
+    direct arguments are coerced."""
+    numbers = []
+    for value, from_range in _flatten(values):
+        if isinstance(value, Error):
+            return value
+        if _is_number(value):
+            numbers.append(float(value))
+        elif not from_range:
+            number = to_number(value)
+            if isinstance(number, Error):
+                return number
+            numbers.append(number)
+    return numbers
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Criteria (SUMIF / COUNTIFS ...)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_CRITERION_RE = re.compile(r"(<=|>=|<>|<|>|=)?(.*)", re.DOTALL)
+
+
+def _wildcard(text: str) -> re.Pattern:
+    """Compile a criterion with * and ? wildcards (~ escapes them)."""
+    parts = []
+    i = 0
+    while i < len(text):
+        if text[i] == "~" and text[i + 1 : i + 2] in ("*", "?", "~"):
+            parts.append(re.escape(text[i + 1]))
+            i += 2
+            continue
+        parts.append({"*": ".*", "?": "."}.get(text[i], re.escape(text[i])))
+        i += 1
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def criterion_matcher(criterion: Any):
+    """A predicate for one SUMIF-style criterion ("New", ">"&date, "<>", 5)."""
+    if isinstance(criterion, Error):
+        return lambda value: False
+    if not isinstance(criterion, str):
+        return lambda value: _is_number(value) and float(value) == float(criterion)
+    op, operand = _CRITERION_RE.fullmatch(criterion).groups()
+    op = op or "="
+    try:
+        number = float(operand)
+    except ValueError:
+        number = None
+
+    if operand == "":
+        # "" and "=" match blanks, "<>" matches anything non-blank
+        return (lambda value: value != "") if op == "<>" else (lambda value: value == "")
+    if number is not None:
+        def numeric(value: Any) -> bool:
+            if not _is_number(value):
+                return op == "<>"
+            return bool(_compare(op, float(value), number))
+
+        return numeric
+    if op in ("=", "<>"):
+        pattern = _wildcard(operand)
+
+        def text(value: Any) -> bool:
+            hit = isinstance(value, str) and pattern.fullmatch(value) is not None
+            return hit if op == "=" else not hit
+
+        return text
+    return lambda value: isinstance(value, str) and bool(_compare(op, value, operand))
+
+
+def _conditional(args: list[Any], pairs_from: int) -> tuple[np.ndarray, None] | tuple[None, Error]:
+    """Mask of cells meeting every (range, criterion) pair in args[pairs_from:]."""
+    pairs = args[pairs_from:]
+    if not pairs or len(pairs) % 2:
+        raise ValueError("Criteria must come in (range, criterion) pairs")
+    mask = None
+    for i in range(0, len(pairs), 2):
+        rng, criterion = pairs[i], pairs[i + 1]
+        if not isinstance(rng, np.ndarray):
+            rng = np.array([[rng]], dtype=object)
+        if isinstance(criterion, np.ndarray):
+            raise ValueError("Array criteria are not supported")
+        match = criterion_matcher(criterion)
+        hits = np.frompyfunc(match, 1, 1)(rng).astype(bool)
+        if mask is not None and hits.shape != mask.shape:
+            return None, VALUE
+        mask = hits if mask is None else mask & hits
+    return mask, None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Dates
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _date(serial: Any) -> date | Error:
+    number = to_number(serial)
+    if isinstance(number, Error):
+        return number
+    if number < 0:
+        return Error("#NUM!")
+    return _EPOCH + timedelta(days=math.floor(number))
+
+
+def _serial(day: date) -> float:
+    return float((day - _EPOCH).days)
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _eomonth(start: Any, months: Any) -> Any:
+    day, months = _date(start), to_number(months)
+    if isinstance(day, Error):
+        return day
+    if isinstance(months, Error):
+        return months
+    moved = _add_months(day.replace(day=1), int(months))
+    return _serial(moved.replace(day=calendar.monthrange(moved.year, moved.month)[1]))
+
+
+def _edate(start: Any, months: Any) -> Any:
+    day, months = _date(start), to_number(months)
+    if isinstance(day, Error):
+        return day
+    return months if isinstance(months, Error) else _serial(_add_months(day, int(months)))
+
+
+def _make_date(year: Any, month: Any, day: Any) -> Any:
+    parts = [to_number(v) for v in (year, month, day)]
+    error = next((p for p in parts if isinstance(p, Error)), None)
+    if error:
+        return error
+    year, month, day = (int(p) for p in parts)
+    if year < 1900:
+        year += 1900
+    first = _add_months(date(year, 1, 1), month - 1)
+    return _serial(first) + day - 1
+
+
+def _date_part(part: str):
+    def get(serial: Any) -> Any:
+        day = _date(serial)
+        return day if isinstance(day, Error) else float(getattr(day, part))
+
+    return get
+
+
+def _round(value: Any, places: Any = 0.0) -> Any:
+    value, places = to_number(value), to_number(places)
+    if isinstance(value, Error):
+        return value
+    if isinstance(places, Error):
+        return places
+    factor = 10 ** int(places)
+    return math.floor(abs(value) * factor + 0.5) / factor * (1 if value >= 0 else -1)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Evaluator
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class Evaluator:
+    """Evaluates formulas against cached values of a spreadsheet's tabs.
+
+    Args:
+        grids: {tab name: Grid of UNFORMATTED values from A1}.
+        grid_sizes: {tab name: (row_count, column_count)}, the bounds of
+                    whole-column and whole-row references.
+    """
+
+    def __init__(self, grids: dict[str, Grid], grid_sizes: dict[str, tuple[int, int]]):
+        self.grids = grids
+        self.grid_sizes = grid_sizes
+        self.overrides: dict[tuple[str, int, int], Any] = {}
+        self._ranges: dict[tuple, np.ndarray] = {}
+        self._parsed: dict[str, Node] = {}
+
+    def set_value(self, sheet: str, row: int, col: int, value: Any) -> None:
+        """Override one cell's value (e.g. a helper cell not yet written)."""
+        self.overrides[(sheet, row, col)] = value
+        self._ranges.clear()
+
+    def _cell(self, sheet: str, row: int, col: int) -> Any:
+        if (sheet, row, col) in self.overrides:
+            return self.overrides[(sheet, row, col)]
+        grid = self.grids[sheet]
+        if row >= grid.height or col >= grid.width:
+            return ""
+        value = grid[row, col]
+        if isinstance(value, str) and value in ERROR_CODES:
+            return Error(value)
+        return value
+
+    def _ref(self, ref: Ref, sheet: str) -> Any:
+        name = ref.sheet or sheet
+        if name not in self.grids:
+            if name in self.grid_sizes:
+                raise ValueError(f"Tab '{name}' was not loaded")
+            return REF
+        if ref.is_cell:
+            return self._cell(name, ref.row1, ref.col1)
+        key = (name, ref.col1, ref.row1, ref.col2, ref.row2)
+        if key not in self._ranges:
+            grid = self.grids[name]
+            rows, cols = self.grid_sizes.get(name, (grid.height, grid.width))
+            height, width = ref.size(rows, cols)
+            r0, c0 = ref.row1 or 0, ref.col1 or 0
+            block = np.empty((height, width), dtype=object)
+            for r in range(height):
+                for c in range(width):
+                    block[r, c] = self._cell(name, r0 + r, c0 + c)
+            self._ranges[key] = block
+        return self._ranges[key]
+
+    def evaluate(self, formula: str | Node, sheet: str) -> Any:
+        """Value of a formula (text or parsed tree) as if it sat in sheet.
+
+        Raises:
+            ValueError: If the formula uses something the evaluator does not
+                        support.
+        """
+        if isinstance(formula, str):
+            if formula not in self._parsed:
+                self._parsed[formula] = parse(formula)
+            formula = self._parsed[formula]
+        return self._eval(formula, sheet)
+
+    def _eval(self, node: Node, sheet: str) -> Any:
+        match node:
+            case Literal():
+                return node.value
+            case Error():
+                return node
+            case Ref():
+                return self._ref(node, sheet)
+            case Op(op="%"):
+                value = self._eval(node.operands[0], sheet)
+                return _elementwise(lambda v: _arith("/", v, 100.0), value)
+            case Op(operands=(operand,)):
+                sign = -1.0 if node.op == "-" else 1.0
+                return _elementwise(lambda v: _arith("*", sign, v), self._eval(operand, sheet))
+            case Op(operands=(left, right)):
+                a, b = self._eval(left, sheet), self._eval(right, sheet)
+                return _elementwise(lambda x, y: _binary(node.op, x, y), a, b)
+            case Call():
+                handler = _LAZY.get(node.name)
+                if handler:
+                    return handler(self, node.args, sheet)
+                function = FUNCTIONS.get(node.name)
+                if function is None:
+                    raise ValueError(f"Unsupported function: {node.name}")
+                return function(*(self._eval(arg, sheet) for arg in node.args))
+            case Array():
+                return np.array(
+                    [[self._eval(item, sheet) for item in row] for row in node.rows], dtype=object
+                )
+            case Name():
+                raise ValueError(f"Unsupported name: {node.name}")
+        raise ValueError(f"Cannot evaluate {node!r}")
+
+
+ERROR_CODES = {"#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A", "#ERROR!"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Functions
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _if(ev: Evaluator, args: tuple, sheet: str) -> Any:
+    condition = ev._eval(args[0], sheet)
+    if isinstance(condition, np.ndarray):
+        yes = ev._eval(args[1], sheet) if len(args) > 1 else True
+        no = ev._eval(args[2], sheet) if len(args) > 2 else False
+
+        def pick(c: Any, y: Any, n: Any) -> Any:
+            flag = to_bool(c)
+            return flag if isinstance(flag, Error) else y if flag else n
+
+        return _elementwise(pick, condition, yes, no)
+    flag = to_bool(condition)
+    if isinstance(flag, Error):
+        return flag
+    if flag:
+        return ev._eval(args[1], sheet) if len(args) > 1 else True
+    return ev._eval(args[2], sheet) if len(args) > 2 else False
+
+
+def _iferror(ev: Evaluator, args: tuple, sheet: str) -> Any:
+    value = ev._eval(args[0], sheet)
+    fallback = ev._eval(args[1], sheet) if len(args) > 1 else ""
+    return _elementwise(lambda v, f: f if isinstance(v, Error) else v, value, fallback)
+
+
+def _logical(all_: bool):
+    def combine(*values: Any) -> Any:
+        flags = []
+        for value, _ in _flatten(list(values)):
+            flag = to_bool(value)
+            if isinstance(flag, Error):
+                return flag
+            flags.append(flag)
+        return all(flags) if all_ else any(flags)
+
+    return combine
+
+
+def _aggregate(reduce):
+    def apply(*values: Any) -> Any:
+        numbers = _numbers(list(values))
+        return numbers if isinstance(numbers, Error) else reduce(numbers)
+
+    return apply
+
+
+def _sumproduct(*arrays: Any) -> Any:
+    arrays = [a if isinstance(a, np.ndarray) else np.array([[a]], dtype=object) for a in arrays]
+    if any(a.shape != arrays[0].shape for a in arrays):
+        return VALUE
+    total = 0.0
+    for cells in zip(*(a.ravel() for a in arrays), strict=True):
+        error = next((v for v in cells if isinstance(v, Error)), None)
+        if error:
+            return error
+        product = 1.0
+        for v in cells:
+            product *= float(v) if _is_number(v) else 0.0
+        total += product
+    return total
+
+
+def _sumifs(sum_range: Any, *pairs: Any) -> Any:
+    mask, error = _conditional([None, *pairs], 1)
+    if error:
+        return error
+    if not isinstance(sum_range, np.ndarray) or sum_range.shape != mask.shape:
+        return VALUE
+    return _sum_masked(sum_range, mask)
+
+
+def _sum_masked(values: np.ndarray, mask: np.ndarray) -> Any:
+    total = 0.0
+    for value in values[mask]:
+        if isinstance(value, Error):
+            return value
+        if _is_number(value):
+            total += float(value)
+    return total
+
+
+def _sumif(rng: Any, criterion: Any, sum_range: Any = None) -> Any:
+    mask, error = _conditional([rng, criterion], 0)
+    if error:
+        return error
+    values = rng if sum_range is None else sum_range
+    if not isinstance(values, np.ndarray) or values.shape != mask.shape:
+        return VALUE
+    return _sum_masked(values, mask)
+
+
+def _countifs(*pairs: Any) -> Any:
+    mask, error = _conditional(list(pairs), 0)
+    return error if error else float(mask.sum())
+
+
+def _match(value: Any, rng: Any, match_type: Any = 1.0) -> Any:
+    if not isinstance(rng, np.ndarray) or 1 not in rng.shape:
+        return NA
+    cells = list(rng.ravel())
+    if to_number(match_type) == 0:
+        for i, cell in enumerate(cells):
+            if _compare("=", cell, value) is True and cell != "":
+                return float(i + 1)
+        return NA
+    ascending = to_number(match_type) > 0
+    best = None
+    for i, cell in enumerate(cells):
+        if cell == "" or _type_rank(cell) != _type_rank(value):
+            continue
+        if _compare("<=" if ascending else ">=", cell, value) is True:
+            best = i
+        else:
+            break
+    return NA if best is None else float(best + 1)
+
+
+def _index(rng: Any, row: Any = 0.0, col: Any = 0.0) -> Any:
+    if not isinstance(rng, np.ndarray):
+        rng = np.array([[rng]], dtype=object)
+    row, col = to_number(row), to_number(col)
+    if isinstance(row, Error):
+        return row
+    if isinstance(col, Error):
+        return col
+    row, col = int(row), int(col)
+    if rng.shape[0] == 1 and col == 0 and rng.shape[1] > 1:
+        row, col = 1, row  # INDEX(row_vector, n)
+    if row < 0 or col < 0 or row > rng.shape[0] or col > rng.shape[1]:
+        return REF
+    if row and col:
+        return rng[row - 1, col - 1]
+    if row:
+        return rng[row - 1 : row, :] if rng.shape[1] > 1 else rng[row - 1, 0]
+    return rng[:, col - 1 : col] if col else rng
+
+
+def _vlookup(value: Any, rng: Any, col: Any, is_sorted: Any = True) -> Any:
+    if not isinstance(rng, np.ndarray):
+        return NA
+    col = to_number(col)
+    if isinstance(col, Error):
+        return col
+    if not 1 <= int(col) <= rng.shape[1]:
+        return REF
+    position = _match(value, rng[:, :1], 1.0 if to_bool(is_sorted) is True else 0.0)
+    if isinstance(position, Error):
+        return position
+    return rng[int(position) - 1, int(col) - 1]
+
+
+def _scalar(fn):
+    """Wrap a scalar function so array arguments broadcast."""
+    return lambda *args: _elementwise(fn, *args)
+
+
+FUNCTIONS = {
+    "SUM": _aggregate(sum),
+    "MIN": _aggregate(lambda n: min(n, default=0.0)),
+    "MAX": _aggregate(lambda n: max(n, default=0.0)),
+    "AVERAGE": _aggregate(lambda n: sum(n) / len(n) if n else DIV0),
+    "COUNT": lambda *v: float(sum(1 for x, _ in _flatten(list(v)) if _is_number(x))),
+    "COUNTA": lambda *v: float(sum(1 for x, _ in _flatten(list(v)) if x != "")),
+    "SUMPRODUCT": _sumproduct,
+    "SUMIF": _sumif,
+    "SUMIFS": _sumifs,
+    "COUNTIF": lambda rng, criterion: _countifs(rng, criterion),
+    "COUNTIFS": _countifs,
+    "AND": _logical(True),
+    "OR": _logical(False),
+    "NOT": _scalar(lambda v: v if isinstance(to_bool(v), Error) else not to_bool(v)),
+    "ABS": _scalar(lambda v: v if isinstance(to_number(v), Error) else abs(to_number(v))),
+    "ROUND": _scalar(_round),
+    "EOMONTH": _scalar(_eomonth),
+    "EDATE": _scalar(_edate),
+    "DATE": _scalar(_make_date),
+    "YEAR": _scalar(_date_part("year")),
+    "MONTH": _scalar(_date_part("month")),
+    "DAY": _scalar(_date_part("day")),
+    "MATCH": _match,
+    "INDEX": _index,
+    "VLOOKUP": _vlookup,
+    "ARRAYFORMULA": lambda value: value,
+}
+
+# Functions that choose which arguments to evaluate
+_LAZY = {"IF": _if, "IFERROR": _iferror}
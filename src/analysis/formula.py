@@ -0,0 +1,424 @@
+"""Formula tokenizer and parser for A1 Sheets formulas.
+
+Parses a formula into a small expression tree (literals, references,
+function calls and operators) so analyses can reason about what a formula
+touches and how it computes, rather than pattern-matching its text:
+
+    parse("=SUMPRODUCT(($B$2:$B$100=$A4)*C$2:C$100)")
+    -> Call("SUMPRODUCT", (Op("*", (Op("=", (Ref(B2:B100), Ref(A4))), Ref(C2:C100))),))
+
+Supported: numbers, strings, TRUE/FALSE, error literals, cell and range
+references (optionally sheet-qualified, including whole columns A:A,
+open-ended ranges A2:A and whole rows 1:1), function calls, named ranges
+and LAMBDA parameters, array literals, and the operators
+= <> < > <= >= & + - * / ^, unary +/- and postfix %.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from src.sheets.r1c1 import column_index
+
+# Recalculated on every edit, whether or not their inputs changed
+VOLATILE_FUNCTIONS = frozenset(
+    {"NOW", "TODAY", "RAND", "RANDBETWEEN", "RANDARRAY", "INDIRECT", "OFFSET"}
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Expression tree
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Literal:
+    """A number, string or boolean constant."""
+
+    value: float | str | bool
+
+
+@dataclass(frozen=True)
+class Error:
+    """An error literal such as #N/A or #REF!."""
+
+    code: str
+
+
+@dataclass(frozen=True)
+class Name:
+    """A named range or LAMBDA parameter."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class Ref:
+    """A cell or range reference. Bounds are 0-based and inclusive.
+
+    A None row bound means the range is open in that direction (A:A has
+    row1 = row2 = None, A2:A has row2 = None); likewise for columns in
+    whole-row references (1:1).
+    """
+
+    sheet: str | None
+    col1: int | None
+    row1: int | None
+    col2: int | None
+    row2: int | None
+    text: str
+
+    @property
+    def is_cell(self) -> bool:
+        return self.col1 == self.col2 and self.row1 == self.row2 and self.row1 is not None
+
+    @property
+    def is_full_column(self) -> bool:
+        """True if the range runs to the bottom of the sheet (A:A, A2:A)."""
+        return self.col1 is not None and self.row2 is None
+
+    @property
+    def is_full_row(self) -> bool:
+        return self.row1 is not None and self.col2 is None
+
+    def size(self, row_count: int = 1000, column_count: int = 26) -> tuple[int, int]:
+        """(rows, columns) covered, resolving open ends against the sheet grid."""
+        rows = (self.row2 if self.row2 is not None else row_count - 1) - (self.row1 or 0) + 1
+        cols = (self.col2 if self.col2 is not None else column_count - 1) - (self.col1 or 0) + 1
+        return max(rows, 0), max(cols, 0)
+
+    def cells(self, row_count: int = 1000, column_count: int = 26) -> int:
+        rows, cols = self.size(row_count, column_count)
+        return rows * cols
+
+
+@dataclass(frozen=True)
+class Call:
+    """A function call, name upper-cased."""
+
+    name: str
+    args: tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Op:
+    """An operator: binary (two operands), unary +/- or postfix % (one)."""
+
+    op: str
+    operands: tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Array:
+    """An array literal {a,b;c,d} as rows of elements."""
+
+    rows: tuple[tuple[Any, ...], ...]
+
+
+Node = Literal | Error | Name | Ref | Call | Op | Array
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Tokenizer
+# ─────────────────────────────────────────────────────────────────────────────
+
+_CELL = r"\$?[A-Z]{1,3}\$?\d+"
+_COL = r"\$?[A-Z]{1,3}"
+_ROW = r"\$?\d+"
+_RANGE = (
+    rf"{_CELL}(?::(?:{_CELL}|{_COL}(?![\d$])))?"  # A1, A1:B5, A2:A
+    rf"|{_COL}:{_COL}"  # A:A, $B:$D
+    rf"|{_ROW}:{_ROW}"  # 1:1
+)
+_SHEET = r"'(?:[^']|'')+'|[A-Za-z_][A-Za-z0-9_.]*"
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+)
+  | (?P<string>"(?:[^"]|"")*")
+  | (?P<ref>(?:(?P<sheet>""" + _SHEET + r""")!)?(?:""" + _RANGE + r""")(?![A-Za-z0-9_(!]))
+  | (?P<func>[A-Za-z_][A-Za-z0-9_.]*(?=\s*\())
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<error>\#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A|ERROR!|SPILL!|CALC!))
+  | (?P<name>[A-Za-z_][A-Za-z0-9_.]*)
+  | (?P<op><=|>=|<>|[-+*/^&=<>%(),;{}])
+    """,
+    re.VERBOSE,
+)
+
+_CELL_PART_RE = re.compile(r"\$?([A-Z]{1,3})?\$?(\d+)?")
+
+
+def tokenize(formula: str) -> list[tuple[str, str]]:
+    """Split a formula (with or without its leading =) into (kind, text) tokens.
+
+    Kinds: string, ref, func, number, error, name, op.
+
+    Raises:
+        ValueError: On a character that starts no token.
+    """
+    text = formula[1:] if formula.startswith("=") else formula
+    tokens: list[tuple[str, str]] = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"Cannot parse formula at position {pos + 1}: {formula!r}")
+        kind = match.lastgroup  # The outer group, "ref", for sheet-qualified refs
+        if kind != "space":
+            tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _bound(part: str) -> tuple[int | None, int | None]:
+    match = _CELL_PART_RE.fullmatch(part)
+    letters, digits = match.groups()
+    return (
+        column_index(letters) if letters else None,
+        int(digits) - 1 if digits else None,
+    )
+
+
+def parse_ref(text: str) -> Ref:
+    """Parse reference text such as 'Tab'!$B$2:$B$100, A:A or 3:3."""
+    sheet = None
+    spec = text
+    if "!" in text:
+        sheet, spec = text.rsplit("!", 1)
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+    start, _, end = spec.partition(":")
+    col1, row1 = _bound(start)
+    col2, row2 = _bound(end) if end else (col1, row1)
+    if end and col2 is None and row2 is not None:  # Whole rows, 1:3
+        return Ref(sheet, None, row1, None, row2, text)
+    return Ref(sheet, col1, row1, col2, row2, text)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Parser
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Binary operators, loosest binding first
+_PRECEDENCE = [("=", "<>", "<", ">", "<=", ">="), ("&",), ("+", "-"), ("*", "/"), ("^",)]
+_BINARY_LEVELS = {op: level for level, ops in enumerate(_PRECEDENCE) for op in ops}
+
+
+class _Parser:
+    def __init__(self, formula: str):
+        self.formula = formula
+        self.tokens = tokenize(formula)
+        self.pos = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, text: str | None = None) -> tuple[str, str]:
+        token = self.peek()
+        if token is None or (text is not None and token != ("op", text)):
+            expected = f"'{text}'" if text else "an expression"
+            found = f"'{token[1]}'" if token else "end of formula"
+            raise ValueError(f"Expected {expected}, found {found} in {self.formula!r}")
+        self.pos += 1
+        return token
+
+    def at(self, *ops: str) -> bool:
+        token = self.peek()
+        return token is not None and token[0] == "op" and token[1] in ops
+
+    def binary(self, min_level: int = 0) -> Node:
+        # Precedence climbing: one loop per operand instead of one call per level
+        node = self.unary()
+        while self.pos < len(self.tokens):
+            kind, op = self.tokens[self.pos]
+            level = _BINARY_LEVELS.get(op) if kind == "op" else None
+            if level is None or level < min_level:
+                break
+            self.pos += 1
+            node = Op(op, (node, self.binary(level + 1)))
+        return node
+
+    def unary(self) -> Node:
+        if self.at("+", "-"):
+            op = self.take()[1]
+            return Op(op, (self.unary(),))
+        node = self.primary()
+        while self.at("%"):
+            self.take()
+            node = Op("%", (node,))
+        return node
+
+    def primary(self) -> Node:
+        kind, text = self.take()
+        match kind:
+            case "number":
+                return Literal(float(text))
+            case "string":
+                return Literal(text[1:-1].replace('""', '"'))
+            case "error":
+                return Error(text)
+            case "ref":
+                return parse_ref(text)
+            case "name":
+                upper = text.upper()
+                return Literal(upper == "TRUE") if upper in ("TRUE", "FALSE") else Name(text)
+            case "func":
+                self.take("(")
+                args: list[Node] = []
+                if not self.at(")"):
+                    args.append(self.argument())
+                    while self.at(","):
+                        self.take()
+                        args.append(self.argument())
+                self.take(")")
+                return Call(text.upper(), tuple(args))
+        if text == "(":
+            node = self.binary()
+            self.take(")")
+            return node
+        if text == "{":
+            rows: list[tuple[Node, ...]] = []
+            row = [self.binary()]
+            while self.at(",", ";"):
+                if self.take()[1] == ";":
+                    rows.append(tuple(row))
+                    row = []
+                row.append(self.binary())
+            rows.append(tuple(row))
+            self.take("}")
+            return Array(tuple(rows))
+        raise ValueError(f"Unexpected '{text}' in {self.formula!r}")
+
+    def argument(self) -> Node:
+        # An omitted argument, e.g. the third in VLOOKUP(a,b,2,)
+        if self.at(",", ")"):
+            return Literal("")
+        return self.binary()
+
+
+def parse(formula: str) -> Node:
+    """Parse a formula into its expression tree.
+
+    Raises:
+        ValueError: If the formula is not well formed.
+    """
+    parser = _Parser(formula)
+    node = parser.binary()
+    if parser.peek() is not None:
+        raise ValueError(f"Unexpected '{parser.peek()[1]}' in {formula!r}")
+    return node
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Tree queries
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def children(node: Node) -> tuple[Any, ...]:
+    match node:
+        case Call():
+            return node.args
+        case Op():
+            return node.operands
+        case Array():
+            return tuple(item for row in node.rows for item in row)
+    return ()
+
+
+def walk(node: Node):
+    """Every node of the tree, parents before children."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(children(current)))
+
+
+def references(node: Node) -> list[Ref]:
+    return [n for n in walk(node) if isinstance(n, Ref)]
+
+
+def functions(node: Node) -> list[str]:
+    return [n.name for n in walk(node) if isinstance(n, Call)]
+
+
+def depth(node: Node) -> int:
+    """Deepest nesting of function calls (=A1+B1 is 0, =SUM(IF(..)) is 2)."""
+    nested = max((depth(child) for child in children(node)), default=0)
+    return nested + 1 if isinstance(node, Call) else nested
+
+
+def transform(node: Node, fn) -> Node:
+    """Rebuild the tree bottom-up, replacing each node with fn(node)."""
+    match node:
+        case Call():
+            node = Call(node.name, tuple(transform(arg, fn) for arg in node.args))
+        case Op():
+            node = Op(node.op, tuple(transform(arg, fn) for arg in node.operands))
+        case Array():
+            node = Array(tuple(tuple(transform(item, fn) for item in row) for row in node.rows))
+    return fn(node)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Formatting
+# ─────────────────────────────────────────────────────────────────────────────
+
+_UNARY_LEVEL = len(_PRECEDENCE)
+_PERCENT_LEVEL = _UNARY_LEVEL + 1
+_ATOM_LEVEL = _PERCENT_LEVEL + 1
+
+
+def _level(node: Node) -> int:
+    if isinstance(node, Op):
+        if node.op == "%":
+            return _PERCENT_LEVEL
+        if len(node.operands) == 1:
+            return _UNARY_LEVEL
+        return next(i for i, ops in enumerate(_PRECEDENCE) if node.op in ops)
+    return _ATOM_LEVEL
+
+
+def format_number(value: float) -> str:
+    """A number as formula text (integral floats without the trailing .0)."""
+    return str(int(value)) if float(value).is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def to_formula(node: Node, prefix: str = "=") -> str:
+    """Format a tree back to formula text, parenthesised only where needed.
+
+    Parsing drops redundant parentheses and whitespace, so to_formula(parse(f))
+    is an equivalent formula, not necessarily the same text.
+    """
+
+    def fmt(node: Node, min_level: int = 0) -> str:
+        match node:
+            case Literal(value=bool() as value):
+                text = "TRUE" if value else "FALSE"
+            case Literal(value=str() as value):
+                text = '"' + value.replace('"', '""') + '"'
+            case Literal(value=value):
+                text = format_number(value)
+            case Error():
+                text = node.code
+            case Name():
+                text = node.name
+            case Ref():
+                text = node.text
+            case Call():
+                text = f"{node.name}({','.join(fmt(arg) for arg in node.args)})"
+            case Array():
+                text = "{" + ";".join(",".join(fmt(i) for i in row) for row in node.rows) + "}"
+            case Op(op="%"):
+                text = fmt(node.operands[0], _PERCENT_LEVEL) + "%"
+            case Op(operands=(operand,)):
+                text = node.op + fmt(operand, _UNARY_LEVEL)
+            case Op(operands=(left, right)):
+                level = _level(node)
+                text = fmt(left, level) + node.op + fmt(right, level + 1)
+            case _:
+                raise ValueError(f"Cannot format {node!r}")
+        return f"({text})" if _level(node) < min_level else text
+
+    return prefix + fmt(node)
@@ -0,0 +1,270 @@
+"""Formula cost profiler — ranks the formulas that make a model slow to recalculate.
+
+Reads every formula of the profiled tabs in one batched FORMULA call
+and estimates each formula's recalculation cost:
+
+    cost = (referenced cells + array elements computed + function calls)
+           x (1 + NESTING_WEIGHT per nesting level beyond the first)
+           x VOLATILE_WEIGHT if it calls a volatile function
+
+Referenced cells count every cell of every range, so SUMPRODUCT over
+$B$2:$B$100 costs ~100 per cell and ~2,400 across a 24-month row. Each
+operator applied to a range (the comparisons and products inside
+SUMPRODUCT or ARRAYFORMULA) builds an intermediate array and adds its
+size; criteria functions such as SUMIFS scan their ranges without one. Whole
+column references (A:A, A2:A) count the referenced tab's full grid height.
+Volatile functions (NOW, TODAY, RAND*, INDIRECT, OFFSET) are recalculated
+on every edit anywhere in the spreadsheet, not only when their inputs
+change, and hide their real dependencies.
+
+Costs are summed per row, tab and structural pattern; rows are the unit
+of the hotspot ranking because a row is what gets refactored.
+"""
+
+from typing import Any
+
+from src.sheets.grid import Grid
+from src.sheets.r1c1 import column_letter, formula_shifter, to_r1c1
+
+from .audit import formula_pattern
+from .formula import VOLATILE_FUNCTIONS, Call, Op, Ref, depth, parse, walk
+
+NESTING_WEIGHT = 0.25
+VOLATILE_WEIGHT = 10
+DEFAULT_ROW_COUNT = 1000  # Grid height assumed for tabs not in the spreadsheet
+
+# Functions that return an array the size of their array arguments
+ELEMENTWISE_FUNCTIONS = frozenset({
+    "ARRAYFORMULA", "IF", "IFERROR", "IFNA", "ABS", "ROUND", "NOT", "N", "VALUE",
+    "EOMONTH", "EDATE", "DATE", "YEAR", "MONTH", "DAY", "LEN", "LEFT", "RIGHT", "UPPER", "LOWER",
+})
+
+
+def formula_cost(
+    formula: str, grid_sizes: dict[str, tuple[int, int]], sheet_name: str
+) -> dict[str, Any]:
+    """Estimate one formula's recalculation cost.
+
+    Args:
+        formula: Formula text in A1 notation.
+        grid_sizes: {tab name: (row_count, column_count)}, used to size whole
+                    column and whole row references.
+        sheet_name: Tab holding the formula (for unqualified references).
+
+    Returns:
+        {"cost", "referenced_cells", "array_work", "calls", "depth",
+        "volatile", "full_column_refs", "unparsed"}. A formula that cannot be parsed
+        costs its length.
+    """
+    try:
+        tree = parse(formula)
+    except ValueError:
+        return {
+            "cost": float(len(formula)),
+            "referenced_cells": 0,
+            "array_work": 0,
+            "calls": 0,
+            "depth": 0,
+            "volatile": [],
+            "full_column_refs": [],
+            "unparsed": True,
+        }
+
+    def size(ref: Ref) -> int:
+        return ref.cells(*grid_sizes.get(ref.sheet or sheet_name, (DEFAULT_ROW_COUNT, 26)))
+
+    cells = calls = array_work = 0
+    volatile: list[str] = []
+    full_columns: list[str] = []
+    for node in walk(tree):
+        if isinstance(node, Call):
+            calls += 1
+            if node.name in VOLATILE_FUNCTIONS and node.name not in volatile:
+                volatile.append(node.name)
+        elif isinstance(node, Ref):
+            cells += size(node)
+            if node.is_full_column or node.is_full_row:
+                full_columns.append(node.text)
+
+    def elements(node: Any) -> int:
+        """Size of the node's result, adding each array operator's work."""
+        nonlocal array_work
+        match node:
+            case Ref():
+                return size(node)
+            case Op():
+                n = max(elements(operand) for operand in node.operands)
+                if n > 1:
+                    array_work += n
+                return n
+            case Call():
+                n = max((elements(arg) for arg in node.args), default=1)
+                return n if node.name in ELEMENTWISE_FUNCTIONS else 1
+        return 1
+
+    elements(tree)
+    nesting = depth(tree)
+    cost = (cells + array_work + calls) * (1 + NESTING_WEIGHT * max(nesting - 1, 0))
+    if volatile:
+        cost *= VOLATILE_WEIGHT
+    return {
+        "cost": cost,
+        "referenced_cells": cells,
+        "array_work": array_work,
+        "calls": calls,
+        "depth": nesting,
+        "volatile": volatile,
+        "full_column_refs": full_columns,
+        "unparsed": False,
+    }
+
+
+def read_formula_grids(client: Any, sheet_names: list[str]) -> dict[str, Grid]:
+    """Formula grids of several whole tabs in one batched read.
+
+    Rows run to the end of each tab's used range; columns to the tab's
+    grid width.
+    """
+    info = {s["name"]: s for s in client.get_spreadsheet_info()["sheets"]}
+    missing = [name for name in sheet_names if name not in info]
+    if missing:
+        raise ValueError(f"Sheet '{missing[0]}' not found")
+
+    reads = client.read_ranges([(name, "") for name in sheet_names], "FORMULA")
+    return {
+        name: Grid.from_rows(rows, width=info[name]["column_count"])
+        for name, rows in zip(sheet_names, reads, strict=True)
+    }
+
+
+def profile_formulas(
+    client: Any, sheet_names: list[str] | None = None, top: int = 20
+) -> dict[str, Any]:
+    """Rank formula rows, tabs and patterns by estimated recalculation cost.
+
+    Args:
+        client: A connected SheetsClient.
+        sheet_names: Tabs to profile (default: every tab).
+        top: Number of hotspot rows, patterns and formulas to return.
+
+    Returns:
+        Dict with keys:
+        - formulas, total_cost
+        - tabs: [{tab, formulas, cost, share, volatile_cells, full_column_cells}]
+        - hotspots: [{tab, row, row_label, range, formulas, cost, share,
+          pattern, volatile, full_column_refs}] (rows, most expensive first)
+        - patterns: [{pattern, formulas, cost, share, example}]
+        - top_formulas: [{cell, formula, pattern, cost, referenced_cells,
+          array_work, calls, depth, volatile, full_column_refs, unparsed}]
+    """
+    info = client.get_spreadsheet_info()["sheets"]
+    sizes = {s["name"]: (s["row_count"], s["column_count"]) for s in info}
+    names = sheet_names or [s["name"] for s in info]
+    grids = read_formula_grids(client, names)
+
+    # A formula dragged across a row or down a block has one relative R1C1
+    # form and the same cost in every copy, so each form is parsed once. Along
+    # a row, a copy is recognised by shifting the run's seed (a string join)
+    # before falling back to the R1C1 conversion (a regex pass).
+    costs: dict[tuple[str, str], dict[str, Any]] = {}
+    formulas: list[dict[str, Any]] = []
+    rows: list[dict[str, Any]] = []
+    for name in names:
+        grid = grids[name]
+        for r in range(grid.height):
+            label = grid[r, 0]
+            row_costs = []
+            seed_col, shift, cost = 0, None, None
+            for c in range(1, grid.width):  # Column A holds labels
+                formula = grid[r, c]
+                if not (isinstance(formula, str) and formula.startswith("=")):
+                    continue
+                if shift is None or formula != shift(0, c - seed_col):
+                    key = (name, to_r1c1(formula, r, c))
+                    if key not in costs:
+                        costs[key] = {
+                            **formula_cost(formula, sizes, name),
+                            "pattern": formula_pattern(formula),
+                        }
+                    seed_col, shift, cost = c, formula_shifter(formula), costs[key]
+                row_costs.append((c, formula, cost))
+                formulas.append({
+                    "tab": name,
+                    "cell": f"'{name}'!{column_letter(c)}{r + 1}",
+                    "formula": formula,
+                    **cost,
+                })
+            if not row_costs:
+                continue
+            patterns: dict[str, int] = {}
+            for _, _, cost in row_costs:
+                patterns[cost["pattern"]] = patterns.get(cost["pattern"], 0) + 1
+            first, last = row_costs[0][0], row_costs[-1][0]
+            rows.append({
+                "tab": name,
+                "row": r + 1,
+                "row_label": str(label).strip() if label != "" else "",
+                "range": f"{column_letter(first)}{r + 1}:{column_letter(last)}{r + 1}",
+                "formulas": len(row_costs),
+                "cost": sum(cost["cost"] for _, _, cost in row_costs),
+                "pattern": max(patterns, key=patterns.get),
+                "volatile": sorted({f for _, _, cost in row_costs for f in cost["volatile"]}),
+                "full_column_refs": sorted({
+                    ref for _, _, cost in row_costs for ref in cost["full_column_refs"]
+                }),
+            })
+
+    total_cost = sum(row["cost"] for row in rows)
+    total = total_cost or 1.0
+
+    def share(cost: float) -> float:
+        return round(cost / total, 4)
+
+    tabs = []
+    for name in names:
+        tab_formulas = [f for f in formulas if f["tab"] == name]
+        cost = sum(row["cost"] for row in rows if row["tab"] == name)
+        tabs.append({
+            "tab": name,
+            "formulas": len(tab_formulas),
+            "cost": round(cost, 1),
+            "share": share(cost),
+            "volatile_cells": sum(1 for f in tab_formulas if f["volatile"]),
+            "full_column_cells": sum(1 for f in tab_formulas if f["full_column_refs"]),
+        })
+
+    patterns: dict[str, dict[str, Any]] = {}
+    for f in formulas:
+        entry = patterns.setdefault(
+            f["pattern"],
+            {"formulas": 0, "cost": 0.0, "example": f["cell"]},
+        )
+        entry["formulas"] += 1
+        entry["cost"] += f["cost"]
+
+    rows.sort(key=lambda row: row["cost"], reverse=True)
+    for row in rows:
+        row["share"] = share(row["cost"])
+        row["cost"] = round(row["cost"], 1)
+    ranked_patterns = sorted(patterns.items(), key=lambda item: item[1]["cost"], reverse=True)
+    top_formulas = sorted(formulas, key=lambda f: f["cost"], reverse=True)[:top]
+    return {
+        "formulas": len(formulas),
+        "total_cost": round(total_cost, 1),
+        "tabs": sorted(tabs, key=lambda tab: tab["cost"], reverse=True),
+        "hotspots": rows[:top],
+        "patterns": [
+            {
+                "pattern": pattern,
+                "formulas": entry["formulas"],
+                "cost": round(entry["cost"], 1),
+                "share": share(entry["cost"]),
+                "example": entry["example"],
+            }
+            for pattern, entry in ranked_patterns[:top]
+        ],
+        "top_formulas": [
+            {**{k: v for k, v in f.items() if k != "tab"}, "cost": round(f["cost"], 1)}
+            for f in top_formulas
+        ],
+    }
@@ -0,0 +1,271 @@
+"""Vectorized headcount proration and department rollup.
+
+Headcount Input evaluates the proration formula (template_specs.md,
+section 3) once per employee per month, and Headcount Summary then runs a
+SUMIF / SUMPRODUCT over the whole block for every department, metric and
+month. Here the (employees × months) cost matrix comes from one broadcast
+of start/end dates against month starts and ends, and each department
+metric is a single scatter-add over employees.
+
+    =IF(OR(D>J1, AND(E<>"", E<EOMONTH(J1,-1)+1)), 0,
+      IF(AND(D<=EOMONTH(J1,-1)+1, OR(E="", E>=J1)), (F+I)/12,
+        (F+I)/12*(MIN(IF(E="",J1,E),J1)-MAX(D,EOMONTH(J1,-1)+1)+1)/DAY(J1)))
+
+Department metrics follow Headcount Summary: HC counts employees with a
+monthly cost > 0, Salary + Benefits sums the cost, and Bonus / Commission
+add annual/12 for every employee with a cost > 0 that month.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from src.sheets.numeric import cell_to_serial, serial_to_date
+
+TEMPLATE_DEPARTMENTS = ["G&A", "Sales", "Marketing", "Product", "Engineering", "CS"]
+
+_EPOCH = np.datetime64("1899-12-30", "D")
+
+
+@dataclass
+class Employees:
+    """Column arrays for Headcount Input rows.
+
+    Attributes:
+        names: Employee names.
+        departments: Department per employee.
+        start: Start dates as sheet serials.
+        end: End dates as serials (NaN if still employed).
+        salary, bonus, commission, benefits: Annual amounts.
+    """
+
+    names: list[str]
+    departments: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    salary: np.ndarray
+    bonus: np.ndarray
+    commission: np.ndarray
+    benefits: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def extend(self, other: "Employees") -> "Employees":
+        """Employees followed by other (e.g. a hiring plan on top of current staff)."""
+        return Employees(
+            names=self.names + other.names,
+            departments=np.concatenate([self.departments, other.departments]),
+            **{
+                f: np.concatenate([getattr(self, f), getattr(other, f)])
+                for f in ("start", "end", "salary", "bonus", "commission", "benefits")
+            },
+        )
+
+
+def planned_hires(
+    department: str,
+    start_dates: list[float] | np.ndarray,
+    salary: float,
+    bonus: float = 0.0,
+    commission: float = 0.0,
+    benefits: float = 0.0,
+) -> Employees:
+    """Employees for a hiring plan: one hire per start date (sheet serials)."""
+    start = np.asarray(start_dates, dtype=float)
+    n = len(start)
+    return Employees(
+        names=[f"Planned {department} {i + 1}" for i in range(n)],
+        departments=np.full(n, department, dtype=object),
+        start=start,
+        end=np.full(n, np.nan),
+        salary=np.full(n, float(salary)),
+        bonus=np.full(n, float(bonus)),
+        commission=np.full(n, float(commission)),
+        benefits=np.full(n, float(benefits)),
+    )
+
+
+def hires_from_plan(plan: list[dict[str, Any]]) -> Employees:
+    """Build Employees from hiring-plan entries.
+
+    Each entry has department, start_date (serial or date text), salary and
+    optionally bonus, commission, benefits and count (hires on that date).
+    """
+    hires = planned_hires("", [], 0.0)
+    for entry in plan:
+        start = cell_to_serial(entry["start_date"])
+        if np.isnan(start):
+            raise ValueError(f"Invalid start_date in hiring plan: {entry['start_date']!r}")
+        hires = hires.extend(
+            planned_hires(
+                entry["department"],
+                np.full(int(entry.get("count", 1)), start),
+                entry["salary"],
+                entry.get("bonus", 0.0),
+                entry.get("commission", 0.0),
+                entry.get("benefits", 0.0),
+            )
+        )
+    return hires
+
+
+def employees_from_rows(rows: list[list[Any]]) -> Employees:
+    """Build Employees from Headcount Input rows (columns A-I).
+
+    Rows without a start date are skipped; blank amounts count as 0.
+    """
+    names, depts, columns = [], [], [[] for _ in range(6)]
+    for row in rows:
+        row = list(row) + [""] * (9 - len(row))
+        start = cell_to_serial(row[3])
+        if np.isnan(start):
+            continue
+        names.append(str(row[0]))
+        depts.append(str(row[1]).strip())
+        columns[0].append(start)
+        columns[1].append(cell_to_serial(row[4]))
+        for i, col in enumerate((5, 6, 7, 8), start=2):
+            value = cell_to_serial(row[col])
+            columns[i].append(0.0 if np.isnan(value) else value)
+    start, end, salary, bonus, commission, benefits = (np.array(c, dtype=float) for c in columns)
+    return Employees(
+        names=names,
+        departments=np.array(depts, dtype=object),
+        start=start,
+        end=end,
+        salary=salary,
+        bonus=bonus,
+        commission=commission,
+        benefits=benefits,
+    )
+
+
+def proration_matrix(employees: Employees, month_ends: np.ndarray) -> np.ndarray:
+    """(employees × months) monthly cost per the Headcount Input proration formula."""
+    month_ends = np.asarray(month_ends, dtype=float)
+    first_days = (
+        serial_to_date(month_ends).astype("datetime64[M]").astype("datetime64[D]") - _EPOCH
+    ).astype(float)
+    days_in_month = month_ends - first_days + 1  # DAY(J1) for a month-end date
+
+    start = employees.start[:, None]
+    end = employees.end[:, None]
+    has_end = ~np.isnan(end)
+    me = month_ends[None, :]
+    ms = first_days[None, :]
+    monthly = ((employees.salary + employees.benefits) / 12)[:, None]
+
+    inactive = (start > me) | (has_end & (end < ms))
+    full = (start <= ms) & (~has_end | (end >= me))
+    last_day = np.minimum(np.where(has_end, end, me), me)
+    partial = monthly * (last_day - np.maximum(start, ms) + 1) / days_in_month
+
+    return np.where(inactive, 0.0, np.where(full, monthly, partial))
+
+
+@dataclass
+class DepartmentRollup:
+    """Headcount Summary metrics: one row per department, one column per month."""
+
+    months: np.ndarray
+    departments: list[str]
+    cost: np.ndarray
+    hc: np.ndarray
+    salary_benefits: np.ndarray
+    bonus: np.ndarray
+    commission: np.ndarray
+    total_comp: np.ndarray
+
+    def totals(self) -> dict[str, np.ndarray]:
+        """Company-wide totals per month."""
+        return {
+            name: getattr(self, name).sum(axis=0)
+            for name in ("hc", "salary_benefits", "bonus", "commission", "total_comp")
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly dict keyed by metric, then department."""
+        result: dict[str, Any] = {
+            "months": [str(d) for d in serial_to_date(self.months)],
+            "departments": self.departments,
+        }
+        for name in ("hc", "salary_benefits", "bonus", "commission", "total_comp"):
+            values = getattr(self, name)
+            values = values.astype(int) if name == "hc" else values.round(2)
+            result[name] = {dept: values[i].tolist() for i, dept in enumerate(self.departments)}
+        return result
+
+
+def rollup(
+    employees: Employees, month_ends: np.ndarray, departments: list[str] | None = None
+) -> DepartmentRollup:
+    """Prorate every employee and group by department.
+
+    Args:
+        employees: Employee arrays.
+        month_ends: Month-end dates as sheet serials.
+        departments: Row order of the result. Defaults to the template's six
+            departments followed by any others in order of appearance;
+            employees in departments not listed are dropped (as SUMIF does).
+
+    Returns:
+        DepartmentRollup with (departments × months) arrays.
+    """
+    month_ends = np.asarray(month_ends, dtype=float)
+    if departments is None:
+        present = list(dict.fromkeys(employees.departments.tolist()))
+        departments = [d for d in TEMPLATE_DEPARTMENTS if d in present]
+        departments += [d for d in present if d not in TEMPLATE_DEPARTMENTS]
+    # (departments × employees) membership matrix: every group-by is one matmul
+    members = np.equal.outer(np.array(departments, dtype=object), employees.departments)
+    members = members.astype(float)
+
+    cost = proration_matrix(employees, month_ends)
+    active = (cost > 0).astype(float)
+
+    hc = members @ active
+    salary_benefits = members @ cost
+    bonus = (members * (employees.bonus / 12)) @ active
+    commission = (members * (employees.commission / 12)) @ active
+
+    return DepartmentRollup(
+        months=month_ends,
+        departments=list(departments),
+        cost=cost,
+        hc=hc,
+        salary_benefits=salary_benefits,
+        bonus=bonus,
+        commission=commission,
+        total_comp=salary_benefits + bonus + commission,
+    )
+
+
+def headcount_from_sheet(
+    client: Any,
+    headcount_sheet: str = "Headcount Input",
+    months_sheet: str = "Monthly Summary",
+    departments: list[str] | None = None,
+    hires: Employees | None = None,
+) -> DepartmentRollup:
+    """Read employees and month-end dates in one batchGet and roll up by department.
+
+    Args:
+        client: A connected SheetsClient.
+        headcount_sheet: Tab with employees in columns A-I from row 2.
+        months_sheet: Tab whose row 2 (from column C) holds month-end dates.
+        departments: Row order of the result (see rollup).
+        hires: Planned hires to add on top of current staff.
+    """
+    employee_rows, month_rows = client.read_ranges(
+        [(headcount_sheet, "A2:I"), (months_sheet, "C2:2")], render_option="UNFORMATTED_VALUE"
+    )
+    month_ends = np.array([cell_to_serial(v) for v in (month_rows[0] if month_rows else [])])
+    month_ends = month_ends[~np.isnan(month_ends)]
+    if not len(month_ends):
+        raise ValueError(f"No month-end dates found in '{months_sheet}'!C2:2")
+    employees = employees_from_rows(employee_rows)
+    if hires is not None:
+        employees = employees.extend(hires)
+    return rollup(employees, month_ends, departments)
@@ -0,0 +1,415 @@
+"""Monte Carlo scenarios over the local ARR, headcount and cash engines.
+
+/scenario evaluates one deterministic what-if. Here each driver (growth,
+churn, CAC, ASP, new customers, hiring delay) is a distribution, and every
+sampled path runs through a vectorized projection built on the same
+engines:
+
+- Revenue: the existing book (compute_arr MRR) decayed by the sampled
+  monthly churn, plus new bookings of new_customers × (1 + growth)^m at
+  ASP / 12, each cohort decaying at the same churn rate
+- Expenses: existing staff and planned hires (headcount rollup), with
+  planned hires' cost curves shifted by the sampled whole-month delay,
+  CAC per new customer, hosting COGS on incremental revenue and the
+  model's other spend held fixed
+- Cash: project_cash with the model's payment terms
+
+Paths are split into chunks with their own seeds (results do not depend
+on the worker count), chunks run in a ProcessPoolExecutor, and workers
+write straight into shared-memory result arrays that the parent reduces to
+percentile bands.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+
+from src.analysis.arr import compute_arr, contracts_from_rows
+from src.analysis.cash import CASH_RANGES, DEFAULT_TERMS, cash_inputs_from_rows, project_cash
+from src.analysis.headcount import employees_from_rows, proration_matrix
+from src.sheets.numeric import serial_to_date
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Per-path results written by workers: name -> True if it has a month axis
+_OUTPUTS = {"arr": True, "ebitda": True, "cash": True, "breakeven": False, "runway": False}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Drivers
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """A driver distribution.
+
+    Kinds and params: fixed (value), normal (mean, sd), uniform (low, high),
+    triangular (low, mode, high), lognormal (median, sigma).
+    """
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.0,)
+
+    _ARITY = {"fixed": 1, "normal": 2, "uniform": 2, "triangular": 3, "lognormal": 2}
+    _KEYS = {
+        "fixed": ("value",),
+        "normal": ("mean", "sd"),
+        "uniform": ("low", "high"),
+        "triangular": ("low", "mode", "high"),
+        "lognormal": ("median", "sigma"),
+    }
+
+    def __post_init__(self):
+        if self.kind not in self._ARITY:
+            raise ValueError(
+                f"Unknown distribution '{self.kind}'. Use one of: {', '.join(self._ARITY)}"
+            )
+        if len(self.params) != self._ARITY[self.kind]:
+            raise ValueError(f"'{self.kind}' takes {', '.join(self._KEYS[self.kind])}")
+
+    @classmethod
+    def from_spec(cls, spec: float | dict[str, Any]) -> "Distribution":
+        """Parse a number (fixed) or {"dist": kind, <param>: value, ...}."""
+        if isinstance(spec, int | float):
+            return cls("fixed", (float(spec),))
+        kind = spec.get("dist", "fixed")
+        keys = cls._KEYS.get(kind)
+        if keys is None:
+            raise ValueError(f"Unknown distribution '{kind}'. Use one of: {', '.join(cls._KEYS)}")
+        missing = [k for k in keys if k not in spec]
+        if missing:
+            raise ValueError(f"'{kind}' distribution is missing: {', '.join(missing)}")
+        return cls(kind, tuple(float(spec[k]) for k in keys))
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        p = self.params
+        match self.kind:
+            case "fixed":
+                return np.full(n, p[0])
+            case "normal":
+                return rng.normal(p[0], p[1], n)
+            case "uniform":
+                return rng.uniform(p[0], p[1], n)
+            case "triangular":
+                return rng.triangular(p[0], p[1], p[2], n)
+            case "lognormal":
+                return p[0] * np.exp(rng.normal(0.0, p[1], n))
+
+
+@dataclass(frozen=True)
+class Drivers:
+    """Distributions for each driver (all default to fixed 0: the model as-is).
+
+    Attributes:
+        growth: Monthly growth rate of new customer bookings.
+        churn: Monthly MRR churn rate on top of contracted churn dates (<= 50%).
+        cac: Acquisition cost per new customer.
+        asp: ARR per new customer.
+        new_customers: New customers booked in the first month.
+        hiring_delay: Months each planned hire slips (rounded, >= 0).
+    """
+
+    growth: Distribution = field(default_factory=Distribution)
+    churn: Distribution = field(default_factory=Distribution)
+    cac: Distribution = field(default_factory=Distribution)
+    asp: Distribution = field(default_factory=Distribution)
+    new_customers: Distribution = field(default_factory=Distribution)
+    hiring_delay: Distribution = field(default_factory=Distribution)
+
+    @classmethod
+    def from_spec(cls, spec: dict[str, Any]) -> "Drivers":
+        """Parse {"growth": {"dist": "normal", "mean": 0.03, "sd": 0.01}, "asp": 24000, ...}."""
+        names = {f.name for f in fields(cls)}
+        unknown = set(spec) - names
+        if unknown:
+            raise ValueError(
+                f"Unknown drivers: {', '.join(sorted(unknown))}. Use: {', '.join(sorted(names))}"
+            )
+        return cls(**{name: Distribution.from_spec(value) for name, value in spec.items()})
+
+    def sample(self, rng: np.random.Generator, n: int) -> dict[str, np.ndarray]:
+        """Draw n values per driver, clipped to their valid ranges."""
+        draws = {f.name: getattr(self, f.name).sample(rng, n) for f in fields(self)}
+        draws["churn"] = np.clip(draws["churn"], 0.0, 0.5)  # keeps (1-c)^-m finite
+        draws["new_customers"] = np.maximum(draws["new_customers"], 0.0)
+        draws["hiring_delay"] = np.maximum(np.rint(draws["hiring_delay"]), 0).astype(int)
+        return draws
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Model and projection
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class MonteCarloModel:
+    """Deterministic inputs shared by every path (one value per month).
+
+    Attributes:
+        month_ends: Month-end dates as sheet serials.
+        base_mrr: MRR of the existing contract book.
+        staff_cost: Total comp of current staff.
+        hires_cost: Total comp of planned hires, on their planned dates.
+        other_opex: All other cash spend (held fixed).
+        starting_cash: Beginning cash of the first month.
+        terms: Payment-term shares per month of lag.
+        cogs_pct: Hosting COGS as a share of incremental revenue.
+    """
+
+    month_ends: np.ndarray
+    base_mrr: np.ndarray
+    staff_cost: np.ndarray
+    hires_cost: np.ndarray
+    other_opex: np.ndarray
+    starting_cash: float
+    terms: tuple[float, ...] = DEFAULT_TERMS
+    cogs_pct: float = 0.15
+
+
+def project_paths(model: MonteCarloModel, draws: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Project every sampled path at once.
+
+    Returns:
+        (paths × months) arr, ebitda and cash; per-path breakeven (index of
+        the first month with EBITDA >= 0, -1 if none) and runway (months).
+    """
+    months = len(model.month_ends)
+    t = np.arange(months)
+    churn = draws["churn"][:, None]
+    survival = (1.0 - churn) ** t  # Share of a cohort left m months after booking
+
+    new_customers = draws["new_customers"][:, None] * (1.0 + draws["growth"][:, None]) ** t
+    new_mrr = new_customers * draws["asp"][:, None] / 12
+    # Cohorts decaying at the churn rate: sum_k new_mrr[k] (1-c)^(m-k)
+    new_book = survival * np.cumsum(new_mrr / survival, axis=1)
+    revenue = model.base_mrr * (1.0 - churn) ** (t + 1) + new_book
+
+    shifted = t - draws["hiring_delay"][:, None]
+    hires = np.where(shifted >= 0, model.hires_cost[np.maximum(shifted, 0)], 0.0)
+    expenses = (
+        model.other_opex
+        + model.staff_cost
+        + hires
+        + new_customers * draws["cac"][:, None]
+        + new_book * model.cogs_pct
+    )
+    ebitda = revenue - expenses
+
+    cash = project_cash(model.month_ends, revenue, expenses, model.starting_cash, model.terms)
+    profitable = ebitda >= 0
+    return {
+        "arr": revenue * 12,
+        "ebitda": ebitda,
+        "cash": cash.ending,
+        "breakeven": np.where(profitable.any(axis=1), profitable.argmax(axis=1), -1),
+        "runway": cash.runway_months,
+    }
+
+
+def _run_chunk(
+    model: MonteCarloModel,
+    drivers: Drivers,
+    seed: np.random.SeedSequence,
+    start: int,
+    stop: int,
+    buffers: dict[str, tuple[str, tuple[int, ...]]],
+):
+    """Worker: sample paths [start, stop) and write them into shared memory."""
+    results = project_paths(model, drivers.sample(np.random.default_rng(seed), stop - start))
+    for name, (shm_name, shape) in buffers.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            np.ndarray(shape, dtype=float, buffer=shm.buf)[start:stop] = results[name]
+        finally:
+            shm.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Simulation
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class MonteCarloResult:
+    """Percentile bands (one row per percentile) and summary probabilities.
+
+    breakeven_month maps each percentile to a month index (-1 if that share
+    of paths never breaks even within the horizon).
+    """
+
+    months: np.ndarray
+    percentiles: tuple[int, ...]
+    arr: np.ndarray
+    ebitda: np.ndarray
+    cash: np.ndarray
+    runway: np.ndarray
+    breakeven_month: np.ndarray
+    prob_breakeven: float
+    prob_cash_out: float
+    paths: int
+    seconds: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-friendly dict keyed by metric, then percentile label (p5, p50...)."""
+        months = serial_to_date(self.months)
+        labels = [f"p{p}" for p in self.percentiles]
+        result: dict[str, Any] = {"months": [str(d) for d in months], "paths": self.paths}
+        for name in ("arr", "ebitda", "cash"):
+            band = getattr(self, name).round(0)
+            result[name] = {label: band[i].tolist() for i, label in enumerate(labels)}
+        result["runway_months"] = {
+            label: round(float(v), 1) if np.isfinite(v) else None
+            for label, v in zip(labels, self.runway, strict=True)
+        }
+        result["breakeven_month"] = {
+            label: str(months[i]) if i >= 0 else None
+            for label, i in zip(labels, self.breakeven_month, strict=True)
+        }
+        result["prob_breakeven"] = round(self.prob_breakeven, 3)
+        result["prob_cash_out"] = round(self.prob_cash_out, 3)
+        result["seconds"] = round(self.seconds, 2)
+        return result
+
+
+def simulate(
+    model: MonteCarloModel,
+    drivers: Drivers,
+    paths: int = 10_000,
+    seed: int = 0,
+    workers: int | None = None,
+    chunk_size: int = 2_000,
+    percentiles: tuple[int, ...] = DEFAULT_PERCENTILES,
+) -> MonteCarloResult:
+    """Sample paths in parallel chunks and reduce them to percentile bands.
+
+    Args:
+        model: Deterministic model inputs.
+        drivers: Driver distributions.
+        paths: Number of sampled paths.
+        seed: Seed for reproducible results (independent of workers).
+        workers: Worker processes (default: CPU count); 1 runs in-process.
+        chunk_size: Paths per vectorized chunk.
+        percentiles: Percentiles to report.
+
+    Returns:
+        MonteCarloResult with percentile bands.
+    """
+    if paths < 1:
+        raise ValueError("paths must be at least 1")
+    started = time.perf_counter()
+    months = len(model.month_ends)
+    bounds = list(range(0, paths, chunk_size)) + [paths]
+    chunks = list(zip(bounds[:-1], bounds[1:], strict=True))
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    shms: dict[str, shared_memory.SharedMemory] = {}
+    try:
+        buffers = {}
+        for name, monthly in _OUTPUTS.items():
+            shape = (paths, months) if monthly else (paths,)
+            shms[name] = shared_memory.SharedMemory(create=True, size=8 * int(np.prod(shape)))
+            buffers[name] = (shms[name].name, shape)
+
+        if workers <= 1:
+            for (start, stop), chunk_seed in zip(chunks, seeds, strict=True):
+                _run_chunk(model, drivers, chunk_seed, start, stop, buffers)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_run_chunk, model, drivers, chunk_seed, start, stop, buffers)
+                    for (start, stop), chunk_seed in zip(chunks, seeds, strict=True)
+                ]
+                for future in futures:
+                    future.result()
+
+        out = {
+            name: np.ndarray(shape, dtype=float, buffer=shms[name].buf)
+            for name, (_, shape) in buffers.items()
+        }
+        breakeven = np.where(out["breakeven"] >= 0, out["breakeven"], np.inf)
+        # inverted_cdf picks actual samples, so "never" (inf) percentiles stay inf
+        breakeven_band = np.percentile(breakeven, percentiles, method="inverted_cdf")
+        result = MonteCarloResult(
+            months=model.month_ends,
+            percentiles=tuple(percentiles),
+            arr=np.percentile(out["arr"], percentiles, axis=0),
+            ebitda=np.percentile(out["ebitda"], percentiles, axis=0),
+            cash=np.percentile(out["cash"], percentiles, axis=0),
+            runway=np.percentile(out["runway"], percentiles, method="inverted_cdf"),
+            breakeven_month=np.where(np.isfinite(breakeven_band), breakeven_band, -1).astype(int),
+            prob_breakeven=float(np.isfinite(breakeven).mean()),
+            prob_cash_out=float((out["cash"].min(axis=1) <= 0).mean()),
+            paths=paths,
+            seconds=0.0,
+        )
+        del out
+    finally:
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# From the sheet
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def model_from_sheet(
+    client: Any,
+    arr_sheet: str = "ARR",
+    headcount_sheet: str = "Headcount Input",
+    months_sheet: str = "Monthly Summary",
+    cash_sheet: str = "Cash Flow",
+    cogs_pct: float = 0.15,
+) -> MonteCarloModel:
+    """Build the deterministic model from ARR, Headcount Input and cash rows in one batchGet.
+
+    Employees starting after the first month are the planned hires that
+    hiring_delay shifts. Other spend is Operating Cash Out less total comp.
+    """
+    contract_rows, employee_rows, summary_rows, cash_rows = client.read_ranges(
+        [
+            (arr_sheet, "A2:E"),
+            (headcount_sheet, "A2:I"),
+            (months_sheet, CASH_RANGES[0]),
+            (cash_sheet, CASH_RANGES[1]),
+        ],
+        render_option="UNFORMATTED_VALUE",
+    )
+    cash = cash_inputs_from_rows(summary_rows, cash_rows, months_sheet)
+    month_ends = cash["month_ends"]
+
+    # Per-employee total comp, as Headcount Summary adds it up
+    employees = employees_from_rows(employee_rows)
+    cost = proration_matrix(employees, month_ends)
+    comp = cost + (cost > 0) * ((employees.bonus + employees.commission) / 12)[:, None]
+    planned = employees.start > month_ends[0]
+    hires_cost = comp[planned].sum(axis=0)
+    staff_cost = comp[~planned].sum(axis=0)
+
+    return MonteCarloModel(
+        month_ends=month_ends,
+        base_mrr=compute_arr(contracts_from_rows(contract_rows), month_ends).mrr,
+        staff_cost=staff_cost,
+        hires_cost=hires_cost,
+        other_opex=np.maximum(cash["cash_out"] - staff_cost - hires_cost, 0.0),
+        starting_cash=float(cash["starting_cash"]),
+        cogs_pct=cogs_pct,
+    )
+
+
+def monte_carlo_from_sheet(
+    client: Any, drivers: dict[str, Any], paths: int = 10_000, seed: int = 0, **sheets: Any
+) -> dict[str, Any]:
+    """Run simulate() on the model read from the sheet and return the bands as a dict."""
+    model = model_from_sheet(client, **sheets)
+    return simulate(model, Drivers.from_spec(drivers), paths=paths, seed=seed).to_dict()
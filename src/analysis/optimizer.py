@@ -0,0 +1,568 @@
+"""Formula optimizer — proposes cheaper equivalent rewrites, validated locally.
+
+Rewrites work on the parsed expression tree of each formula:
+
+- conditional_sum: SUMPRODUCT((range=x)*(range>y)*values) becomes
+  SUMIFS(values, range, x, range, ">"&y) (COUNTIFS without a values
+  range). Sheets evaluates criteria functions without materialising the
+  intermediate boolean arrays.
+- bounded_refs: whole-column references (A:A, $B2:$B) are cut to the
+  referenced tab's used rows plus ROW_HEADROOM.
+- helper_row: a cross-sheet lookup repeated in several rows of the same
+  column is computed once per column in a helper row below the tab's
+  data, and the repeats reference that cell. The row is not proposed if
+  any formula in the spreadsheet (or any other rewrite) reads it, e.g. a
+  SUM over the column or a template's $2:$100 input range.
+
+Every rewritten cell is evaluated before and after by the local evaluator
+on the current values (see evaluator.py). A block is only proposed if all
+of its cells agree; blocks that differ, or use functions the evaluator
+does not support, are reported as rejected. Where Sheets has a cached
+value for a cell, the local result for the original formula must match
+it too, so an evaluator gap can never approve a rewrite.
+
+propose_rewrites() only reads (one spreadsheets.get, two values.batchGet).
+apply_rewrites() re-derives the plan, so it writes exactly what was
+proposed for the current data, and sends the chosen blocks in one
+values.batchUpdate (plus one row append if a helper row is past the grid).
+"""
+
+import math
+import re
+from typing import Any
+
+import numpy as np
+
+from src.sheets.grid import Grid
+from src.sheets.r1c1 import column_letter, to_r1c1
+
+from .evaluator import ERROR_CODES, Evaluator
+from .formula import (
+    Call,
+    Error,
+    Literal,
+    Node,
+    Op,
+    Ref,
+    children,
+    format_number,
+    parse,
+    references,
+    to_formula,
+    transform,
+    walk,
+)
+from .formula_cost import formula_cost, read_formula_grids
+
+# Rows kept below the used range when bounding a whole-column reference
+ROW_HEADROOM = 100
+
+# A helper row must save at least this many lookups per column it occupies
+MIN_HELPER_REPEATS = 2
+
+HELPER_LABEL = "Lookup helper"
+
+LOOKUP_FUNCTIONS = frozenset({
+    "VLOOKUP", "HLOOKUP", "XLOOKUP", "LOOKUP", "INDEX", "MATCH",
+    "SUMIF", "SUMIFS", "COUNTIF", "COUNTIFS", "AVERAGEIF", "AVERAGEIFS", "SUMPRODUCT",
+})
+
+_FLIP = {"=": "=", "<>": "<>", "<": ">", ">": "<", "<=": ">=", ">=": "<="}
+_BOUND_RE = re.compile(r"(\$?)([A-Z]{1,3})(\$?)(\d*)")
+
+# Text that any rewrite needs: SUMPRODUCT, another tab, or a whole-column end
+_CANDIDATE_RE = re.compile(r"SUMPRODUCT|!|:\$?[A-Z]{1,3}(?![\w$])", re.IGNORECASE)
+
+# Text of a formula that may read rows below its own numbers: an open
+# column end, or a reference built at recalculation time
+_UNBOUNDED_RE = re.compile(r":\$?[A-Z]{1,3}(?![\w$])|INDIRECT|OFFSET", re.IGNORECASE)
+_DYNAMIC_REFS = frozenset({"INDIRECT", "OFFSET"})
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Rewrites
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _factors(node: Node) -> list[Node]:
+    if isinstance(node, Op) and node.op == "*" and len(node.operands) == 2:
+        return _factors(node.operands[0]) + _factors(node.operands[1])
+    # --(condition) coerces to a number, as the product would
+    if isinstance(node, Op) and node.op == "-" and len(node.operands) == 1:
+        inner = node.operands[0]
+        if isinstance(inner, Op) and inner.op == "-" and len(inner.operands) == 1:
+            return _factors(inner.operands[0])
+    return [node]
+
+
+def _is_range(node: Node) -> bool:
+    return isinstance(node, Ref) and not node.is_cell
+
+
+def _is_scalar(node: Node) -> bool:
+    return all(r.is_cell for r in references(node)) and not any(
+        isinstance(n, Call) and n.name in ("ARRAYFORMULA", "INDIRECT", "OFFSET") for n in walk(node)
+    )
+
+
+def _criterion(op: str, value: Node) -> Node | None:
+    """The SUMIFS criterion equivalent to comparing a range with value."""
+    if isinstance(value, Literal):
+        if isinstance(value.value, bool):
+            return None
+        if isinstance(value.value, str):
+            # Wildcards and leading operators would be read as criteria syntax
+            if any(ch in value.value for ch in "*?~") or value.value[:1] in ("<", ">", "="):
+                return None
+            return value if op == "=" else Literal(op + value.value)
+        return value if op == "=" else Literal(op + format_number(value.value))
+    return value if op == "=" else Op("&", (Literal(op), value))
+
+
+def conditional_sum(node: Node) -> Node | None:
+    """SUMIFS/COUNTIFS equivalent of a conditional SUMPRODUCT, or None."""
+    if not (isinstance(node, Call) and node.name == "SUMPRODUCT" and node.args):
+        return None
+    pairs: list[Node] = []
+    values: list[Node] = []
+    for factor in (f for arg in node.args for f in _factors(arg)):
+        if _is_range(factor):
+            values.append(factor)
+            continue
+        if not (isinstance(factor, Op) and factor.op in _FLIP and len(factor.operands) == 2):
+            return None
+        left, right = factor.operands
+        if _is_range(left) and _is_scalar(right):
+            rng, op, value = left, factor.op, right
+        elif _is_range(right) and _is_scalar(left):
+            rng, op, value = right, _FLIP[factor.op], left
+        else:
+            return None
+        criterion = _criterion(op, value)
+        if criterion is None:
+            return None
+        pairs += [rng, criterion]
+    if not pairs or len(values) > 1:
+        return None
+    if len({r.size() for r in [*values, *pairs[::2]]}) != 1:
+        return None
+    return Call("SUMIFS", (values[0], *pairs)) if values else Call("COUNTIFS", tuple(pairs))
+
+
+def bound_ref(ref: Ref, sheet: str, used_rows: dict[str, int], row_counts: dict[str, int]) -> Ref:
+    """A whole-column reference cut to the used rows plus headroom."""
+    name = ref.sheet or sheet
+    if not ref.is_full_column or not used_rows.get(name):
+        return ref
+    first = ref.row1 or 0
+    end = max(used_rows[name], first + 1) + ROW_HEADROOM
+    if end >= row_counts.get(name, 0):
+        return ref  # Nothing below to skip
+    prefix, bang, spec = ref.text.rpartition("!")
+    start, _, finish = spec.partition(":")
+    start_col_abs, start_col, start_row_abs, start_row = _BOUND_RE.fullmatch(start).groups()
+    end_col_abs, end_col = _BOUND_RE.fullmatch(finish).groups()[:2]
+    if not start_row:
+        start_row_abs, start_row = "$", "1"
+    text = (
+        f"{prefix}{bang}{start_col_abs}{start_col}{start_row_abs}{start_row}"
+        f":{end_col_abs}{end_col}${end}"
+    )
+    return Ref(ref.sheet, ref.col1, first, ref.col2, end - 1, text)
+
+
+def _lookups(node: Node, sheet: str) -> list[Node]:
+    """Outermost lookup calls in the tree that read another tab."""
+    if isinstance(node, Call) and node.name in LOOKUP_FUNCTIONS:
+        if any(r.sheet not in (None, sheet) for r in references(node)):
+            return [node]
+    return [found for child in children(node) for found in _lookups(child, sheet)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Planning
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        a = np.atleast_2d(np.asarray(a, dtype=object))
+        b = np.atleast_2d(np.asarray(b, dtype=object))
+        return a.shape == b.shape and all(map(_same, a.ravel(), b.ravel()))
+    numeric = [isinstance(v, int | float) and not isinstance(v, bool) for v in (a, b)]
+    if all(numeric):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if any(numeric):
+        return False
+    return a == b
+
+
+def _covers(ref: Ref, formula_tab: str, tab: str, row: int, cols: set[int]) -> bool:
+    """True if ref (in a formula on formula_tab) reaches row of tab in any of cols."""
+    if (ref.sheet or formula_tab) != tab:
+        return False
+    if (ref.row1 is not None and ref.row1 > row) or (ref.row2 is not None and ref.row2 < row):
+        return False
+    return any(
+        (ref.col1 is None or ref.col1 <= c) and (ref.col2 is None or ref.col2 >= c)
+        for c in cols
+    )
+
+
+def _helper_conflict(
+    tab: str, row: int, cols: set[int], formulas: list[tuple[str, str, Node | None]]
+) -> dict[str, str] | None:
+    """Why a helper row at row of tab would change other results, or None.
+
+    formulas are (tab, cell, tree) for every formula that may read the row;
+    a None tree (unparsed) cannot be shown not to.
+    """
+    for formula_tab, cell, tree in formulas:
+        if tree is None:
+            return {"reason": f"Helper row may be read by {cell}, which cannot be parsed"}
+        if any(isinstance(n, Call) and n.name in _DYNAMIC_REFS for n in walk(tree)):
+            return {"reason": f"Helper row may be read by {cell} (dynamic reference)"}
+        for ref in references(tree):
+            if _covers(ref, formula_tab, tab, row, cols):
+                return {"reason": f"Helper row would fall inside {ref.text} read by {cell}"}
+    return None
+
+
+def _a1(tab: str, row: int, first: int, last: int) -> str:
+    return f"{tab}!{column_letter(first)}{row + 1}:{column_letter(last)}{row + 1}"
+
+
+def _plan(client: Any, sheet_names: list[str] | None = None) -> dict[str, Any]:
+    info = {s["name"]: s for s in client.get_spreadsheet_info()["sheets"]}
+    sizes = {name: (s["row_count"], s["column_count"]) for name, s in info.items()}
+    names = sheet_names or list(info)
+    formula_grids = read_formula_grids(client, list(info))  # Every tab: see helper rows
+
+    # Every formula cell that a rewrite could apply to, parsed once per text
+    trees: dict[str, dict[tuple[int, int], Node]] = {}
+    unparsed: list[dict[str, str]] = []
+    parsed: dict[str, Node] = {}
+    for name in names:
+        grid = formula_grids[name]
+        cells = trees[name] = {}
+        for r in range(grid.height):
+            for c in range(1, grid.width):
+                formula = grid[r, c]
+                if not (isinstance(formula, str) and formula.startswith("=")):
+                    continue
+                if not _CANDIDATE_RE.search(formula):
+                    continue
+                if formula not in parsed:
+                    try:
+                        parsed[formula] = parse(formula)
+                    except ValueError as exc:
+                        cell = f"{name}!{column_letter(c)}{r + 1}"
+                        unparsed.append({"cell": cell, "reason": str(exc)})
+                        continue
+                cells[(r, c)] = parsed[formula]
+
+    # Values of the profiled tabs and every tab their formulas read
+    referenced = {
+        ref.sheet
+        for cells in trees.values()
+        for tree in set(cells.values())
+        for ref in references(tree)
+        if ref.sheet in info
+    }
+    value_tabs = [name for name in info if name in referenced or name in names]
+    values = {
+        name: Grid.from_rows(rows)
+        for name, rows in zip(
+            value_tabs,
+            client.read_ranges([(name, "") for name in value_tabs], "UNFORMATTED_VALUE"),
+            strict=True,
+        )
+    }
+    used_rows = {name: grid.height for name, grid in values.items()}
+    row_counts = {name: size[0] for name, size in sizes.items()}
+
+    def optimise(tree: Node, sheet: str) -> tuple[Node, list[str]]:
+        kinds = []
+        summed = transform(tree, lambda n: conditional_sum(n) or n)
+        if summed != tree:
+            kinds.append("conditional_sum")
+        bounded = transform(
+            summed,
+            lambda n: bound_ref(n, sheet, used_rows, row_counts) if isinstance(n, Ref) else n,
+        )
+        if bounded != summed:
+            kinds.append("bounded_refs")
+        return bounded, kinds
+
+    proposals: list[dict[str, Any]] = []
+    for name in names:
+        cells = trees[name]
+
+        # Repeated cross-sheet lookups, grouped by column-relative form
+        occurrences: dict[str, dict[int, list[int]]] = {}
+        lookups: dict[str, dict[int, Node]] = {}
+        for (r, c), tree in cells.items():
+            for sub in dict.fromkeys(_lookups(tree, name)):
+                key = to_r1c1(to_formula(sub), 0, c)
+                occurrences.setdefault(key, {}).setdefault(c, []).append(r)
+                lookups.setdefault(key, {})[c] = sub
+
+        taken: set[tuple[int, int]] = set()
+        next_row = used_rows.get(name, 0) + 1  # Leave one blank row above helpers
+        for key, columns in occurrences.items():
+            covered = {(r, c) for c, rows in columns.items() for r in rows}
+            if len(covered) < MIN_HELPER_REPEATS * len(columns) or covered & taken:
+                continue
+            taken |= covered
+            row = next_row
+            next_row += 1
+            writes: dict[tuple[int, int], Any] = {(row, 0): HELPER_LABEL}
+            before: dict[tuple[int, int], Node] = {}
+            after: dict[tuple[int, int], Node] = {}
+            helpers: dict[tuple[int, int], Node] = {}
+            kinds = ["helper_row"]
+            for c, sub in sorted(lookups[key].items()):
+                helper, extra = optimise(sub, name)
+                helpers[(row, c)] = helper
+                kinds += extra
+                target = Ref(None, c, row, c, row, f"{column_letter(c)}${row + 1}")
+                for r in columns[c]:
+                    replaced = transform(
+                        cells[(r, c)], lambda n, s=sub, t=target: t if n == s else n
+                    )
+                    new, extra = optimise(replaced, name)
+                    before[(r, c)], after[(r, c)] = cells[(r, c)], new
+                    kinds += extra
+            cols = sorted(lookups[key])
+            proposals.append({
+                "id": _a1(name, row, cols[0], cols[-1]),
+                "tab": name,
+                "rewrites": list(dict.fromkeys(kinds)),
+                "description": f"Compute {to_formula(lookups[key][cols[0]])} once per column "
+                f"in row {row + 1} and reference it from {len(covered)} cells",
+                "before": before,
+                "after": after,
+                "helpers": helpers,
+                "writes": writes,
+            })
+
+        # Per-cell rewrites, one block per row
+        rows: dict[int, dict[str, Any]] = {}
+        for (r, c), tree in cells.items():
+            if (r, c) in taken:
+                continue
+            new, kinds = optimise(tree, name)
+            if not kinds:
+                continue
+            block = rows.setdefault(r, {"before": {}, "after": {}, "kinds": []})
+            block["before"][(r, c)], block["after"][(r, c)] = tree, new
+            block["kinds"] += kinds
+        for r, block in sorted(rows.items()):
+            cols = sorted(c for _, c in block["before"])
+            proposals.append({
+                "id": _a1(name, r, cols[0], cols[-1]),
+                "tab": name,
+                "rewrites": list(dict.fromkeys(block["kinds"])),
+                "before": block["before"],
+                "after": block["after"],
+                "helpers": {},
+                "writes": {},
+            })
+
+    # A helper row is new content below the data: reject it where any
+    # formula (as it is, or as another rewrite leaves it) reads that row
+    helper_rows = [p for p in proposals if p["helpers"]]
+    conflicts: dict[int, dict[str, str]] = {}
+    if helper_rows:
+        first_row = min(r for p in helper_rows for r, _ in p["writes"]) + 1
+        readers: list[tuple[str, str, Node | None]] = []
+        for name, grid in formula_grids.items():
+            for r in range(grid.height):
+                for c in range(grid.width):
+                    formula = grid[r, c]
+                    if not (isinstance(formula, str) and formula.startswith("=")):
+                        continue
+                    if not _UNBOUNDED_RE.search(formula) and all(
+                        int(n) < first_row for n in re.findall(r"\d+", formula)
+                    ):
+                        continue
+                    if formula not in parsed:
+                        try:
+                            parsed[formula] = parse(formula)
+                        except ValueError:
+                            parsed[formula] = None
+                    readers.append((name, f"{name}!{column_letter(c)}{r + 1}", parsed[formula]))
+        for proposal in helper_rows:
+            (row, _), *_ = proposal["writes"]
+            cols = {c for _, c in [*proposal["writes"], *proposal["helpers"]]}
+            rewritten = [
+                (other["tab"], f"{other['tab']}!{column_letter(c)}{r + 1}", tree)
+                for other in proposals
+                if other is not proposal
+                for (r, c), tree in {**other["after"], **other["helpers"]}.items()
+            ]
+            conflict = _helper_conflict(proposal["tab"], row, cols, readers + rewritten)
+            if conflict:
+                conflicts[id(proposal)] = conflict
+
+    # Validate every block on the current values, with helper rows filled in
+    evaluator = Evaluator(values, sizes)
+    for proposal in proposals:
+        tab = proposal["tab"]
+        for (r, c), helper in proposal["helpers"].items():
+            try:
+                evaluator.set_value(tab, r, c, evaluator.evaluate(helper, tab))
+            except ValueError:
+                # The originals use the same lookup, so their cells fail validation too
+                evaluator.set_value(tab, r, c, Error("#N/A"))
+
+    accepted, rejected = [], []
+    for proposal in proposals:
+        reason = conflicts.get(id(proposal)) or _validate(proposal, evaluator, values)
+        if reason:
+            rejected.append({"id": proposal["id"], "rewrites": proposal["rewrites"], **reason})
+            continue
+        tab = proposal["tab"]
+        for (r, c), tree in {**proposal["helpers"], **proposal["after"]}.items():
+            proposal["writes"][(r, c)] = to_formula(tree)
+        cost_before = sum(
+            formula_cost(to_formula(tree), sizes, tab)["cost"]
+            for tree in proposal["before"].values()
+        )
+        cost_after = sum(
+            formula_cost(formula, sizes, tab)["cost"]
+            for formula in proposal["writes"].values()
+            if isinstance(formula, str) and formula.startswith("=")
+        )
+        if cost_after >= cost_before:
+            rejected.append({
+                "id": proposal["id"],
+                "rewrites": proposal["rewrites"],
+                "reason": "Not cheaper",
+            })
+            continue
+        (r, c), old = next(iter(proposal["before"].items()))
+        accepted.append({
+            **{k: v for k, v in proposal.items() if k not in ("before", "after", "helpers")},
+            "cells": len(proposal["before"]) + len(proposal["helpers"]),
+            "cost_before": round(cost_before, 1),
+            "cost_after": round(cost_after, 1),
+            "example": {
+                "cell": f"{column_letter(c)}{r + 1}",
+                "before": to_formula(old),
+                "after": proposal["writes"][(r, c)],
+            },
+        })
+    accepted.sort(key=lambda p: p["cost_before"] - p["cost_after"], reverse=True)
+    return {"rewrites": accepted, "rejected": rejected, "unparsed": unparsed, "sizes": info}
+
+
+def _validate(
+    proposal: dict[str, Any], evaluator: Evaluator, values: dict[str, Grid]
+) -> dict[str, str] | None:
+    """None if every rewritten cell matches its original, else why not."""
+    tab = proposal["tab"]
+    grid = values.get(tab)
+    for (r, c), old_tree in proposal["before"].items():
+        cell = f"{column_letter(c)}{r + 1}"
+        try:
+            old = evaluator.evaluate(old_tree, tab)
+            new = evaluator.evaluate(proposal["after"][(r, c)], tab)
+        except ValueError as exc:
+            return {"reason": f"Cannot evaluate locally: {exc}", "cell": cell}
+        cached = grid[r, c] if grid is not None and r < grid.height and c < grid.width else ""
+        if cached != "" and not isinstance(old, np.ndarray):
+            if not _same(Error(cached) if cached in ERROR_CODES else cached, old):
+                return {"reason": "Local evaluation differs from the sheet", "cell": cell}
+        if not _same(old, new):
+            return {"reason": "Rewrite changes the result", "cell": cell}
+    return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Public API
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def propose_rewrites(client: Any, sheet_names: list[str] | None = None) -> dict[str, Any]:
+    """Find cheaper equivalent formulas and validate them on the current data.
+
+    Nothing is written; pass the ids to apply_rewrites once approved.
+
+    Args:
+        client: A connected SheetsClient.
+        sheet_names: Tabs whose formulas to rewrite (default: every tab).
+
+    Returns:
+        {"rewrites": [{id, tab, rewrites, cells, cost_before, cost_after,
+        example: {cell, before, after}, description?}] (biggest saving
+        first), "rejected": [{id, rewrites, reason, cell?}], "unparsed":
+        [{cell, reason}], "cost_before", "cost_after"}.
+    """
+    plan = _plan(client, sheet_names)
+    rewrites = [{k: v for k, v in p.items() if k != "writes"} for p in plan["rewrites"]]
+    return {
+        "rewrites": rewrites,
+        "rejected": plan["rejected"],
+        "unparsed": plan["unparsed"],
+        "cost_before": round(sum(p["cost_before"] for p in rewrites), 1),
+        "cost_after": round(sum(p["cost_after"] for p in rewrites), 1),
+    }
+
+
+def apply_rewrites(
+    client: Any, ids: list[str], sheet_names: list[str] | None = None
+) -> dict[str, Any]:
+    """Write approved rewrites, re-validated against the current data.
+
+    Args:
+        client: A connected SheetsClient.
+        ids: Rewrite ids from propose_rewrites.
+        sheet_names: The tabs passed to propose_rewrites.
+
+    Returns:
+        {"applied": [ids], "cells", "cost_before", "cost_after"}.
+
+    Raises:
+        ValueError: If an id is no longer proposed (the data or formulas
+                    changed since); propose again.
+    """
+    plan = _plan(client, sheet_names)
+    chosen = [p for p in plan["rewrites"] if p["id"] in ids]
+    missing = sorted(set(ids) - {p["id"] for p in chosen})
+    if missing:
+        raise ValueError(
+            f"Rewrites no longer proposed: {', '.join(missing)}. Run propose again."
+        )
+
+    grow = []
+    for tab in dict.fromkeys(p["tab"] for p in chosen):
+        sheet = plan["sizes"][tab]
+        needed = max(r + 1 for p in chosen if p["tab"] == tab for r, _ in p["writes"])
+        if needed > sheet["row_count"]:
+            grow.append({
+                "appendDimension": {
+                    "sheetId": sheet["sheet_id"],
+                    "dimension": "ROWS",
+                    "length": needed - sheet["row_count"],
+                }
+            })
+    if grow:
+        client.batch_update(grow)
+
+    rows: dict[tuple[str, int], dict[int, Any]] = {}
+    for proposal in chosen:
+        for (r, c), value in proposal["writes"].items():
+            rows.setdefault((proposal["tab"], r), {})[c] = value
+    data = []
+    for (tab, r), cells in sorted(rows.items()):
+        first, last = min(cells), max(cells)
+        row = [cells.get(c) for c in range(first, last + 1)]  # None leaves a cell as is
+        data.append((tab, f"{column_letter(first)}{r + 1}:{column_letter(last)}{r + 1}", [row]))
+    client.write_ranges(data)
+    return {
+        "applied": [p["id"] for p in chosen],
+        "cells": sum(len(cells) for cells in rows.values()),
+        "cost_before": round(sum(p["cost_before"] for p in chosen), 1),
+        "cost_after": round(sum(p["cost_after"] for p in chosen), 1),
+    }
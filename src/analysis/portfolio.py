@@ -0,0 +1,322 @@
+"""Run one operation across many spreadsheets in parallel.
+
+A SheetsClient works on one spreadsheet at a time. A Portfolio takes a
+list of spreadsheets (e.g. every portfolio company's model) and runs an
+operation — ARR / burn / runway extraction, the audit rules, a formula
+scan, a saved snapshot, or any function of a client — on all of them in a
+thread pool, returning one consolidated table with a row per spreadsheet.
+
+The workers share one set of credentials and one QuotaBucket, so however
+many run at once the pool stays under the Sheets per-minute quota instead
+of tripping 429 backoffs. Each worker thread builds its Google service once
+and reuses its HTTP connection for every spreadsheet it handles (httplib2
+connections are not thread-safe, so they cannot be shared across threads).
+A spreadsheet that fails (missing tabs, no access) becomes an entry in
+errors; the rest of the table is still returned.
+"""
+
+import contextvars
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from src.sheets import SheetsClient, extract_spreadsheet_id
+from src.sheets.local import is_local_spreadsheet
+from src.sheets.numeric import date_to_serial, serial_to_date
+from src.sheets.quota import QuotaBucket
+
+from .arr import compute_arr, contracts_from_rows
+from .cash import CASH_RANGES, cash_inputs_from_rows, project_cash
+
+DEFAULT_WORKERS = 8
+
+# Columns that are not added up into the totals row
+_NOT_SUMMED = {"runway_months"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Operations (one spreadsheet each)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _read_model(
+    client: Any, arr_sheet: str, months_sheet: str, cash_sheet: str
+) -> tuple[np.ndarray, Any, Any]:
+    """Month ends, ARR metrics and cash projection of one model, in one batchGet.
+
+    The ARR metrics or cash projection is None when the model lacks its tab.
+    """
+    tabs = {s["name"] for s in client.get_spreadsheet_info()["sheets"]}
+    if months_sheet not in tabs:
+        raise ValueError(f"Sheet '{months_sheet}' not found")
+    ranges = [(months_sheet, CASH_RANGES[0])] + [
+        (name, spec)
+        for name, spec in ((arr_sheet, "A2:E"), (cash_sheet, CASH_RANGES[1]))
+        if name in tabs
+    ]
+    read = dict(zip(
+        [name for name, _ in ranges],
+        client.read_ranges(ranges, render_option="UNFORMATTED_VALUE"),
+        strict=True,
+    ))
+    inputs = cash_inputs_from_rows(read[months_sheet], read.get(cash_sheet, []), months_sheet)
+    month_ends = inputs["month_ends"]
+    arr = cash = None
+    if arr_sheet in read:
+        arr = compute_arr(contracts_from_rows(read[arr_sheet]), month_ends)
+    if cash_sheet in read:
+        cash = project_cash(**inputs)
+    return month_ends, arr, cash
+
+
+def _metrics_row(month_ends: np.ndarray, arr: Any, cash: Any, as_of: str | None) -> dict[str, Any]:
+    """ARR, burn and runway at the last month ending on or before as_of."""
+    as_of_serial = date_to_serial(as_of or date.today().isoformat())
+    i = np.searchsorted(month_ends, as_of_serial, side="right") - 1
+    i = min(max(int(i), 0), len(month_ends) - 1)
+
+    row: dict[str, Any] = {"month": str(serial_to_date(month_ends[i]))}
+    if arr is not None:
+        row.update(
+            arr=round(float(arr.arr[i]), 2),
+            net_new_arr=round(float(arr.net_new_arr[i]), 2),
+            customers=int(arr.active_customers[i]),
+        )
+    else:
+        row.update(arr=None, net_new_arr=None, customers=None)
+    if cash is not None:
+        runway = float(cash.runway_months) - (i + 1)
+        row.update(
+            burn=round(float(cash.burn[i]), 2),
+            ending_cash=round(float(cash.ending[i]), 2),
+            runway_months=round(max(runway, 0.0), 1) if np.isfinite(runway) else None,
+        )
+    else:
+        row.update(burn=None, ending_cash=None, runway_months=None)
+    return row
+
+
+def model_metrics(
+    client: Any,
+    as_of: str | None = None,
+    arr_sheet: str = "ARR",
+    months_sheet: str = "Monthly Summary",
+    cash_sheet: str = "Cash Flow",
+) -> dict[str, Any]:
+    """ARR, burn and runway of one model at its latest closed month, in one batchGet.
+
+    Tabs the model does not have are skipped: without a Cash Flow tab, burn,
+    ending_cash and runway_months are None.
+
+    Args:
+        client: A SheetsClient connected to the model.
+        as_of: ISO date; metrics are for the last month ending on or before
+            it (default today). Clamped to the model's horizon.
+        arr_sheet: Tab with contracts in columns A-E from row 2.
+        months_sheet: Tab whose row 2 (from column C) holds month-end dates.
+        cash_sheet: Cash Flow tab in the template layout.
+
+    Returns:
+        Dict with month, arr, net_new_arr, customers, burn, ending_cash,
+        runway_months (from the end of that month).
+    """
+    return _metrics_row(*_read_model(client, arr_sheet, months_sheet, cash_sheet), as_of)
+
+
+def model_snapshot(
+    client: Any,
+    label: str = "portfolio",
+    as_of: str | None = None,
+    arr_sheet: str = "ARR",
+    months_sheet: str = "Monthly Summary",
+    cash_sheet: str = "Cash Flow",
+) -> dict[str, Any]:
+    """Save a snapshot of one model's monthly ARR and cash series (see snapshot.py).
+
+    The snapshot's metrics are {months, series: {arr, net_new_arr,
+    customers, burn, ending_cash}}, one value per month; diff_snapshots
+    compares the series of two snapshots. Reads as model_metrics does.
+
+    Returns:
+        Dict with snapshot_id, then model_metrics' fields at as_of.
+    """
+    from .snapshot import save_snapshot
+
+    month_ends, arr, cash = _read_model(client, arr_sheet, months_sheet, cash_sheet)
+    series: dict[str, np.ndarray] = {}
+    if arr is not None:
+        series.update(arr=arr.arr, net_new_arr=arr.net_new_arr, customers=arr.active_customers)
+    if cash is not None:
+        series.update(burn=cash.burn, ending_cash=cash.ending)
+    metrics = {
+        "months": [str(serial_to_date(m)) for m in month_ends],
+        "series": {name: np.round(values, 2).tolist() for name, values in series.items()},
+    }
+    path = save_snapshot(
+        label, client.spreadsheet_id, client.get_spreadsheet_info()["title"], metrics
+    )
+    snapshot_id = os.path.splitext(os.path.basename(path))[0]
+    return {"snapshot_id": snapshot_id, **_metrics_row(month_ends, arr, cash, as_of)}
+
+
+def model_audit(client: Any, rules: list[str] | None = None) -> dict[str, Any]:
+    """Finding counts per audit rule for one model (see audit_workbook)."""
+    from .audit import audit_workbook
+
+    result = audit_workbook(client, rules=rules)
+    return {
+        "tabs": len(result["tabs"]),
+        **{rule["rule"]: rule["findings"] for rule in result["rules"]},
+    }
+
+
+def model_scan(client: Any, sheet_names: list[str] | None = None) -> dict[str, Any]:
+    """Scan finding counts for one model over every tab (see scan_sheets).
+
+    Each tab's scan is saved, so a later rescan_sheet re-checks only changed rows.
+    """
+    from .scan import SCAN_RULES, scan_sheets
+
+    reports = scan_sheets(client, sheet_names)
+    return {
+        "tabs": len(reports),
+        **{rule: sum(len(report[rule]) for report in reports.values()) for rule in SCAN_RULES},
+    }
+
+
+OPERATIONS: dict[str, Callable[..., dict[str, Any]]] = {
+    "metrics": model_metrics,
+    "audit": model_audit,
+    "scan": model_scan,
+    "snapshot": model_snapshot,
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Portfolio
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class Portfolio:
+    """A set of spreadsheets operated on together by a pool of worker threads."""
+
+    def __init__(
+        self,
+        spreadsheet_ids: list[str],
+        service: Any = None,
+        workers: int = DEFAULT_WORKERS,
+        quota: QuotaBucket | None = None,
+    ):
+        """Initialize the portfolio.
+
+        Args:
+            spreadsheet_ids: Spreadsheet IDs or URLs (local: references work too).
+            service: Optional pre-built Sheets service shared by every worker
+                     (must be thread-safe, like FakeSheetsService). By default
+                     each worker builds one from the shared credentials.
+            workers: Maximum spreadsheets processed at once.
+            quota: API request pacing shared by all workers (default: a
+                   QuotaBucket at FPA_SHEETS_QUOTA requests per minute).
+                   Reads of local: spreadsheets are not paced.
+        """
+        if not spreadsheet_ids:
+            raise ValueError("A portfolio needs at least one spreadsheet")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        ids = (extract_spreadsheet_id(s) for s in spreadsheet_ids)
+        self.spreadsheet_ids = list(dict.fromkeys(ids))
+        self.workers = workers
+        self.quota = quota or QuotaBucket()
+        self._service = service
+        self._credentials: Any = None
+        self._threads = threading.local()
+
+    def _thread_service(self) -> Any:
+        """This worker's Google service, built once per thread from the shared credentials."""
+        service = getattr(self._threads, "service", None)
+        if service is None:
+            from googleapiclient.discovery import build
+
+            service = build("sheets", "v4", credentials=self._credentials)
+            self._threads.service = service
+        return service
+
+    def client(self, spreadsheet_id: str) -> SheetsClient:
+        """A client for one spreadsheet, paced by the portfolio's quota."""
+        if is_local_spreadsheet(spreadsheet_id) and self._service is None:
+            return SheetsClient(spreadsheet_id, quota=self.quota)
+        service = self._service or self._thread_service()
+        return SheetsClient(spreadsheet_id, service=service, quota=self.quota)
+
+    def _run_one(self, fn: Callable[..., dict[str, Any]], spreadsheet_id: str, kwargs: dict):
+        client = self.client(spreadsheet_id)
+        row: dict[str, Any] = {"spreadsheet_id": spreadsheet_id, "title": ""}
+        try:
+            row["title"] = client.get_spreadsheet_info()["title"]
+            return {**row, **fn(client, **kwargs)}, None
+        except Exception as e:  # One broken model must not sink the table
+            return None, {**row, "error": f"{type(e).__name__}: {e}"}
+
+    def run(self, operation: str | Callable[..., dict[str, Any]], **kwargs: Any) -> dict[str, Any]:
+        """Run an operation on every spreadsheet in parallel.
+
+        Args:
+            operation: A name from OPERATIONS ("metrics", "audit", "scan",
+                "snapshot") or any function taking a connected client (and
+                kwargs) and returning a flat dict — one table row.
+            **kwargs: Passed to the operation.
+
+        Returns:
+            Dict with keys:
+            - operation
+            - columns: spreadsheet_id, title, then the operation's fields
+            - rows: one dict per spreadsheet that succeeded, in input order
+            - totals: sums of the numeric columns (runway is not summed)
+            - errors: [{spreadsheet_id, title, error}]
+        """
+        if callable(operation):
+            fn, name = operation, getattr(operation, "__name__", "custom")
+        elif operation in OPERATIONS:
+            fn, name = OPERATIONS[operation], operation
+        else:
+            raise ValueError(
+                f"Unknown portfolio operation '{operation}'. Available: {', '.join(OPERATIONS)}"
+            )
+        if self._service is None and self._credentials is None and not all(
+            is_local_spreadsheet(s) for s in self.spreadsheet_ids
+        ):
+            from src.sheets.auth import get_credentials
+
+            self._credentials = get_credentials()  # Once, before the workers start
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(self.spreadsheet_ids))) as pool:
+            # Each job runs in a copy of this context so its API calls are
+            # traced under the calling tool
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._run_one, fn, sid, kwargs)
+                for sid in self.spreadsheet_ids
+            ]
+            outcomes = [future.result() for future in futures]
+
+        rows = [row for row, _ in outcomes if row is not None]
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        totals = {}
+        for column in columns[2:]:
+            values = [row.get(column) for row in rows]
+            numbers = [v for v in values if isinstance(v, int | float) and not isinstance(v, bool)]
+            if column not in _NOT_SUMMED and numbers and len(numbers) == len(
+                [v for v in values if v is not None]
+            ):
+                totals[column] = round(sum(numbers), 2)
+        return {
+            "operation": name,
+            "columns": columns or ["spreadsheet_id", "title"],
+            "rows": rows,
+            "totals": totals,
+            "errors": [error for _, error in outcomes if error is not None],
+        }
@@ -1,21 +1,160 @@
-"""Full formula scan — detects errors, static values in formula rows, and pattern breaks."""
+"""Full formula scan — detects errors, static values in formula rows, and pattern breaks.
 
+The checks are the errors, static_in_formula_rows and pattern_breaks rules
+of the audit engine (src/analysis/audit.py), run over a single tab.
+
+Every scan saves content hashes of each row (its formulas and its
+displayed values) and the report under ~/.fpa-agent/scans/, keyed by
+spreadsheet ID. rescan_sheet() then re-checks only rows whose hashes
+changed and merges their findings into the saved report. After a /modify
+it reads the tab's values but not all of its formulas: the client logs the
+rows it wrote, and formulas are fetched only for those rows and for rows
+whose values recalculated.
+"""
+
+import hashlib
+import json
+import os
 import re
 from typing import Any
 
+from src.sheets.r1c1 import column_index, column_letter
 
-def _formula_pattern(formula: str) -> str:
-    """Normalize a formula to its structural pattern by replacing all cell refs.
+from .audit import RULES, Workbook, make_tab, run_rules
+from .storage import storage_name
+
+SCAN_RULES = ["errors", "static_in_formula_rows", "pattern_breaks"]
+
+SCAN_DIR = os.path.expanduser("~/.fpa-agent/scans")
+
+_CELL_RE = re.compile(r"([A-Z]+)(\d+)")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Saved scans
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _scan_path(spreadsheet_id: str) -> str:
+    return os.path.join(SCAN_DIR, f"{storage_name(spreadsheet_id)}.json")
+
+
+def _load_scans(spreadsheet_id: str) -> dict[str, Any]:
+    path = _scan_path(spreadsheet_id)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_scan(
+    spreadsheet_id: str,
+    sheet_name: str,
+    formula_hashes: list[str],
+    value_hashes: list[str],
+    report: dict[str, Any],
+):
+    scans = _load_scans(spreadsheet_id)
+    scans[sheet_name] = {"formulas": formula_hashes, "values": value_hashes, "report": report}
+    os.makedirs(SCAN_DIR, exist_ok=True)
+    with open(_scan_path(spreadsheet_id), "w") as f:
+        json.dump(scans, f)
+
+
+def _row_hash(cells: list[Any]) -> str:
+    """Content hash of one row as the API returns it (trailing blanks trimmed)."""
+    text = json.dumps(cells, separators=(",", ":"), default=str)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+_BLANK_ROW = _row_hash([])
+
+
+def _cell_key(finding: dict[str, Any]) -> tuple[int, int]:
+    """(row, column) of a finding's cell, for row-major ordering."""
+    letters, row = _CELL_RE.fullmatch(finding["cell"]).groups()
+    return int(row), column_index(letters)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scans
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _check(
+    sheet_name: str,
+    formulas: list[list[Any]],
+    values: list[list[Any]],
+    rows: set[int] | None = None,
+    height: int = 0,
+    width: int = 0,
+) -> dict[str, list[dict[str, Any]]]:
+    """Run the scan rules over a tab's rows (or only the given rows)."""
+    rules = [RULES[name]() for name in SCAN_RULES]
+    features = frozenset().union(*(rule.needs for rule in rules))
+    tab = make_tab(sheet_name, formulas, values, features, height, width)
+    findings = run_rules(
+        Workbook({sheet_name: tab}), rules, None if rows is None else {sheet_name: rows}
+    )
+    return {
+        rule: [{k: v for k, v in f.items() if k != "tab"} for f in findings[rule]]
+        for rule in SCAN_RULES
+    }
+
+
+def _sheet(client: Any, sheet_name: str) -> dict[str, Any]:
+    for sheet in client.get_spreadsheet_info()["sheets"]:
+        if sheet["name"] == sheet_name:
+            return sheet
+    raise ValueError(f"Sheet '{sheet_name}' not found")
+
+
+def _read_tab(client: Any, sheet_name: str) -> tuple[list[list[Any]], list[list[Any]]]:
+    """Formula rows and displayed-value rows of a whole tab."""
+    _sheet(client, sheet_name)
+    (formulas,) = client.read_ranges([(sheet_name, "")], "FORMULA")
+    (values,) = client.read_ranges([(sheet_name, "")])
+    return formulas, values
+
+
+def _hashes(rows: list[list[Any]]) -> list[str]:
+    return [_row_hash(row) for row in rows]
 
-    e.g. =SUMIF($A$2:$A$100,B$1,'Sheet'!C5) -> =SUMIF(CELL,CELL,CELL)
-    This lets us compare formulas structurally without caring which cells they ref.
-    """
-    # Replace cross-sheet refs like 'Sheet Name'!A1 or Sheet!A1
-    result = re.sub(r"'[^']+'![A-Z$]{1,3}\$?\d*", "CELL", formula)
-    result = re.sub(r"[A-Za-z_][A-Za-z0-9_]*![A-Z$]{1,3}\$?\d*", "CELL", result)
-    # Replace remaining cell refs like $A$1, A1, $A1, A$1, AA1, etc.
-    result = re.sub(r"\$?[A-Z]{1,3}\$?\d+", "CELL", result)
-    return result
+
+def _at(hashes: list[str], r: int) -> str:
+    return hashes[r] if r < len(hashes) else _BLANK_ROW
+
+
+def _trim(hashes: list[str]) -> list[str]:
+    while hashes and hashes[-1] == _BLANK_ROW:
+        hashes = hashes[:-1]
+    return hashes
+
+
+def _spans(rows: set[int]) -> list[tuple[int, int]]:
+    """Sorted rows as [first, last] runs of consecutive rows."""
+    spans: list[tuple[int, int]] = []
+    for r in sorted(rows):
+        if spans and spans[-1][1] == r - 1:
+            spans[-1] = (spans[-1][0], r)
+        else:
+            spans.append((r, r))
+    return spans
+
+
+def _scan(
+    client: Any, sheet_name: str, formulas: list[list[Any]], values: list[list[Any]]
+) -> dict[str, Any]:
+    """Check a whole tab's rows and save the report with their hashes."""
+    client.pop_written(sheet_name)  # Everything written so far is in this read
+    report = {
+        "sheet_name": sheet_name,
+        "rows_scanned": max(len(formulas), len(values)),
+        "cols_scanned": max((len(r) for r in formulas + values), default=0),
+        **_check(sheet_name, formulas, values),
+    }
+    _save_scan(client.spreadsheet_id, sheet_name, _hashes(formulas), _hashes(values), report)
+    return report
 
 
 def scan_sheet(sheet_name: str, client: Any) -> dict[str, Any]:
@@ -26,6 +165,8 @@ def scan_sheet(sheet_name: str, client: Any) -> dict[str, Any]:
     - Static values sitting inside a formula row (likely overwritten formulas)
     - Formula pattern breaks (a cell whose structure differs from the row norm)
 
+    The report and per-row hashes are saved for rescan_sheet.
+
     Args:
         sheet_name: Name of the sheet to scan.
         client: SheetsClient instance connected to the spreadsheet.
@@ -37,102 +178,110 @@ def scan_sheet(sheet_name: str, client: Any) -> dict[str, Any]:
         - static_in_formula_rows: list of {cell, row_label, value}
         - pattern_breaks: list of {cell, row_label, formula, dominant_pattern}
     """
-    info = client.get_spreadsheet_info()
-    sheet_info = next((s for s in info["sheets"] if s["name"] == sheet_name), None)
-    if not sheet_info:
-        raise ValueError(f"Sheet '{sheet_name}' not found")
-
-    col_count = min(sheet_info["column_count"], 52)
-    end_col = client._col_index_to_letter(col_count - 1)
-
-    # Find actual data extent via column A
-    col_a_vals = client.read_range(sheet_name, "A1:A1000")
-    last_row = max(
-        (i + 1 for i, r in enumerate(col_a_vals) if r and r[0]),
-        default=0,
-    )
+    formulas, values = _read_tab(client, sheet_name)
+    return _scan(client, sheet_name, formulas, values)
+
+
+def scan_sheets(client: Any, sheet_names: list[str] | None = None) -> dict[str, dict[str, Any]]:
+    """scan_sheet() over several tabs, reading them all in two batched calls.
 
-    if last_row == 0:
-        return {
-            "sheet_name": sheet_name,
-            "rows_scanned": 0,
-            "cols_scanned": col_count,
-            "errors": [],
-            "static_in_formula_rows": [],
-            "pattern_breaks": [],
-        }
-
-    # Two API calls — formulas and display values for the whole sheet
-    formulas = client.read_formulas(sheet_name, f"A1:{end_col}{last_row}")
-    values = client.read_range(sheet_name, f"A1:{end_col}{last_row}")
-
-    errors: list[dict] = []
-    static_in_formula_rows: list[dict] = []
-    pattern_breaks: list[dict] = []
-
-    error_prefixes = ("#REF!", "#VALUE!", "#NAME?", "#DIV/0!", "#N/A", "#NULL!", "#NUM!", "#ERROR!")
-
-    for row_idx in range(last_row):
-        formula_row = formulas[row_idx] if row_idx < len(formulas) else []
-        value_row = values[row_idx] if row_idx < len(values) else []
-        row_label = str(formula_row[0]).strip() if formula_row and formula_row[0] else ""
-
-        formula_cols: list[tuple[int, str]] = []  # (col_idx, formula)
-        static_cols: list[tuple[int, str]] = []   # (col_idx, value)
-
-        for col_idx in range(1, col_count):  # skip col A (labels)
-            formula = formula_row[col_idx] if col_idx < len(formula_row) else ""
-            value = value_row[col_idx] if col_idx < len(value_row) else ""
-
-            if isinstance(formula, str) and formula.startswith("="):
-                formula_cols.append((col_idx, formula))
-                # Check if the computed value is an error
-                if isinstance(value, str) and any(value.startswith(e) for e in error_prefixes):
-                    errors.append({
-                        "cell": f"{client._col_index_to_letter(col_idx)}{row_idx + 1}",
-                        "row_label": row_label,
-                        "error": value,
-                        "formula": formula,
-                    })
-            elif formula or value:
-                static_cols.append((col_idx, str(formula or value)))
-
-        # Static-in-formula-row: a non-formula cell sitting between the first
-        # and last formula column of a row that has at least 3 formula cells
-        if len(formula_cols) >= 3:
-            first_fc = formula_cols[0][0]
-            last_fc = formula_cols[-1][0]
-            for col_idx, val in static_cols:
-                if first_fc <= col_idx <= last_fc:
-                    static_in_formula_rows.append({
-                        "cell": f"{client._col_index_to_letter(col_idx)}{row_idx + 1}",
-                        "row_label": row_label,
-                        "value": val,
-                    })
-
-        # Pattern-break: a formula whose structural pattern appears only once
-        # while a different pattern dominates the rest of the row
-        if len(formula_cols) >= 4:
-            patterns = [(_formula_pattern(f), col_idx, f) for col_idx, f in formula_cols]
-            counts: dict[str, int] = {}
-            for pat, _, _ in patterns:
-                counts[pat] = counts.get(pat, 0) + 1
-            dominant = max(counts, key=counts.get)
-
-            for pat, col_idx, formula in patterns:
-                if pat != dominant and counts[pat] == 1:
-                    pattern_breaks.append({
-                        "cell": f"{client._col_index_to_letter(col_idx)}{row_idx + 1}",
-                        "row_label": row_label,
-                        "formula": formula,
-                        "dominant_pattern": dominant,
-                    })
+    Args:
+        client: SheetsClient instance connected to the spreadsheet.
+        sheet_names: Tabs to scan (default: every tab).
 
+    Returns:
+        {tab name: scan_sheet report}; each is saved for rescan_sheet.
+    """
+    info = [s["name"] for s in client.get_spreadsheet_info()["sheets"]]
+    names = sheet_names or info
+    missing = [name for name in names if name not in info]
+    if missing:
+        raise ValueError(f"Sheet '{missing[0]}' not found")
+
+    all_formulas = client.read_ranges([(name, "") for name in names], "FORMULA")
+    all_values = client.read_ranges([(name, "") for name in names])
     return {
+        name: _scan(client, name, formulas, values)
+        for name, formulas, values in zip(names, all_formulas, all_values, strict=True)
+    }
+
+
+def rescan_sheet(sheet_name: str, client: Any) -> dict[str, Any]:
+    """Re-scan a sheet, re-checking only rows changed since its last scan.
+
+    The tab's displayed values are always read again and compared row by
+    row with the saved hashes, so rows that recalculated because of an edit
+    elsewhere (a #DIV/0! after a divisor was zeroed) are picked up. When
+    every write since the last scan went through the client with known
+    rows (mode "writes"), formulas are fetched only for the written rows
+    and the rows whose values changed. Otherwise all formulas are read and
+    compared too (mode "hashes"). Either way only changed rows are
+    re-checked; their findings replace the saved ones. With no saved scan
+    this is a full scan_sheet (mode "full").
+
+    Args:
+        sheet_name: Name of the sheet to scan.
+        client: SheetsClient instance connected to the spreadsheet.
+
+    Returns:
+        The scan_sheet report, plus rescan: {mode, rows_read, rows_changed},
+        where rows_read counts rows whose formulas were read.
+    """
+    saved = _load_scans(client.spreadsheet_id).get(sheet_name)
+    if saved is None or "formulas" not in saved:  # Never scanned, or an older save
+        report = scan_sheet(sheet_name, client)
+        rows = report["rows_scanned"]
+        return {**report, "rescan": {"mode": "full", "rows_read": rows, "rows_changed": rows}}
+    prior, old_formulas, old_values = saved["report"], saved["formulas"], saved["values"]
+
+    spans = client.pop_written(sheet_name)
+    if spans is not None:
+        mode = "writes"
+        column_count = _sheet(client, sheet_name)["column_count"]
+        (values,) = client.read_ranges([(sheet_name, "")])
+        new_values = _hashes(values)
+        height = max(len(old_formulas), len(old_values), len(values))
+        height = max([height] + [last + 1 for _, last in spans])
+        recalculated = {r for r in range(height) if _at(old_values, r) != _at(new_values, r)}
+        read = recalculated | {r for first, last in spans for r in range(first, last + 1)}
+        fetch = _spans(read)
+        # Full-height rows, blank outside the fetched rows, so cells keep their addresses
+        formulas: list[list[Any]] = [[] for _ in range(height)]
+        if fetch:
+            last_col = column_letter(column_count - 1)
+            ranges = [(sheet_name, f"A{first + 1}:{last_col}{last + 1}") for first, last in fetch]
+            fetched = client.read_ranges(ranges, "FORMULA")
+            for (first, _), span_rows in zip(fetch, fetched, strict=True):
+                formulas[first:first + len(span_rows)] = span_rows
+        new_formulas = [_at(old_formulas, r) for r in range(height)]
+        for r in read:
+            new_formulas[r] = _row_hash(formulas[r])
+        width = max(prior["cols_scanned"], max((len(r) for r in formulas + values), default=0))
+    else:
+        mode = "hashes"
+        formulas, values = _read_tab(client, sheet_name)
+        new_formulas, new_values = _hashes(formulas), _hashes(values)
+        height = max(len(old_formulas), len(old_values), len(formulas), len(values))
+        read = set(range(height))
+        width = max((len(r) for r in formulas + values), default=0)
+
+    changed = {
+        r for r in read
+        if _at(old_formulas, r) != _at(new_formulas, r) or _at(old_values, r) != _at(new_values, r)
+    }
+    new_formulas, new_values = _trim(new_formulas), _trim(new_values)
+
+    report = {
         "sheet_name": sheet_name,
-        "rows_scanned": last_row,
-        "cols_scanned": col_count,
-        "errors": errors,
-        "static_in_formula_rows": static_in_formula_rows,
-        "pattern_breaks": pattern_breaks,
+        "rows_scanned": max(len(new_formulas), len(new_values)),
+        "cols_scanned": width,
+        **{rule: prior[rule] for rule in SCAN_RULES},
     }
+    if changed:
+        found = _check(sheet_name, formulas, values, changed, height, width)
+        for rule in SCAN_RULES:
+            kept = [f for f in prior[rule] if _cell_key(f)[0] - 1 not in changed]
+            report[rule] = sorted(kept + found[rule], key=_cell_key)
+    _save_scan(client.spreadsheet_id, sheet_name, new_formulas, new_values, report)
+    rescan = {"mode": mode, "rows_read": len(read), "rows_changed": len(changed)}
+    return {**report, "rescan": rescan}
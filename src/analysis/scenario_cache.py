@@ -0,0 +1,263 @@
+"""Content-addressed cache of scenario, breakeven and snapshot results.
+
+A scenario result depends only on the model's inputs and logic and on the
+overrides applied, so it is stored under a key derived from both:
+
+- a fingerprint of every tab: a hash of the tab read with
+  valueRenderOption=FORMULA (constants as entered, formulas as text), so
+  editing any assumption or formula changes that tab's hash and nothing
+  computed from it leaks in
+- the canonicalized overrides ({"Line": " Enterprise", "CAC": "-20%"}
+  and {"cac": -0.2, "line": "enterprise"} hash the same)
+
+Looking a scenario up costs one batchGet. On a miss, entries for the same
+spreadsheet whose tab hashes no longer match are deleted, so an edit to a
+driving input invalidates exactly the entries built on the old values.
+Entries live as JSON files in a size-bounded LRU (access time = file
+mtime).
+
+Storage: ~/.fpa-agent/scenarios/<spreadsheet>/<key>.json
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any
+
+from .storage import storage_name
+
+CACHE_DIR = os.path.expanduser("~/.fpa-agent/scenarios")
+
+# Default size bound; FPA_SCENARIO_CACHE_MB overrides it
+DEFAULT_MAX_MB = 64
+
+KINDS = ("scenario", "breakeven", "snapshot")
+
+# Lookups waiting for their result: key -> entry metadata
+_pending: dict[str, dict[str, Any]] = {}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Keys
+# ─────────────────────────────────────────────────────────────────────────────
+
+_NUMBER = re.compile(r"^([+-]?)\$?([\d,]*\.?\d+)(%?)$")
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize labels, numbers and percentages so equivalent overrides compare equal."""
+    if isinstance(value, dict):
+        return {" ".join(str(k).split()).lower(): _canonical(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int | float):
+        return float(f"{float(value):.12g}")
+    text = " ".join(str(value).split()).lower()
+    match = _NUMBER.match(text.replace(" ", ""))
+    if match:
+        sign, digits, percent = match.groups()
+        number = float(digits.replace(",", "")) * (-1 if sign == "-" else 1)
+        return _canonical(number / 100 if percent else number)
+    return text
+
+
+def canonical_overrides(overrides: dict[str, Any] | None) -> str:
+    """Canonical JSON for an override set (key order, case and formatting ignored)."""
+    return json.dumps(_canonical(overrides or {}), sort_keys=True, separators=(",", ":"))
+
+
+def fingerprint(client: Any, tabs: list[str] | None = None) -> dict[str, str]:
+    """Hash every tab's inputs and formulas in one batchGet.
+
+    Args:
+        client: A connected SheetsClient.
+        tabs: Tabs the result depends on (default: all tabs).
+
+    Returns:
+        {tab name: content hash}.
+    """
+    if tabs is None:
+        tabs = [s["name"] for s in client.get_spreadsheet_info()["sheets"]]
+    contents = client.read_ranges([(tab, "") for tab in tabs], render_option="FORMULA")
+    return {
+        tab: hashlib.sha256(json.dumps(rows, default=str).encode()).hexdigest()[:16]
+        for tab, rows in zip(tabs, contents, strict=True)
+    }
+
+
+def entry_key(kind: str, overrides: str, tabs: dict[str, str]) -> str:
+    """Content address of a result: kind, canonical overrides and tab hashes."""
+    payload = json.dumps([kind, overrides, sorted(tabs.items())])
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Storage
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _spreadsheet_dir(spreadsheet_id: str) -> str:
+    return os.path.join(CACHE_DIR, storage_name(spreadsheet_id))
+
+
+def _entries(directory: str) -> list[os.DirEntry]:
+    if not os.path.isdir(directory):
+        return []
+    return [e for e in os.scandir(directory) if e.name.endswith(".json")]
+
+
+def max_bytes() -> int:
+    """Cache size bound in bytes."""
+    return int(float(os.environ.get("FPA_SCENARIO_CACHE_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+
+
+def invalidate(spreadsheet_id: str, tabs: dict[str, str]) -> int:
+    """Delete entries built on tab contents that have since changed.
+
+    Args:
+        spreadsheet_id: The spreadsheet ID.
+        tabs: Current {tab: hash}; entries depending on a tab with a different
+              (or missing) hash are removed. Tabs not listed are not checked.
+
+    Returns:
+        Number of entries removed.
+    """
+    removed = 0
+    for entry in _entries(_spreadsheet_dir(spreadsheet_id)):
+        try:
+            with open(entry.path) as f:
+                depends = json.load(f)["tabs"]
+        except (OSError, ValueError, KeyError):
+            depends = None  # Unreadable entry: drop it
+        if depends is None or any(
+            name in tabs and tabs[name] != digest for name, digest in depends.items()
+        ):
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+
+def evict(limit: int | None = None) -> int:
+    """Remove least recently used entries until the cache fits in limit bytes.
+
+    Returns:
+        Number of entries removed.
+    """
+    limit = max_bytes() if limit is None else limit
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    files = [
+        (e.stat().st_mtime, e.stat().st_size, e.path)
+        for d in os.scandir(CACHE_DIR)
+        if d.is_dir()
+        for e in _entries(d.path)
+    ]
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= limit:
+            break
+        os.remove(path)
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear(spreadsheet_id: str | None = None) -> int:
+    """Remove every entry (for one spreadsheet, or all). Returns the count."""
+    if spreadsheet_id:
+        dirs = [_spreadsheet_dir(spreadsheet_id)]
+    elif os.path.isdir(CACHE_DIR):
+        dirs = [d.path for d in os.scandir(CACHE_DIR) if d.is_dir()]
+    else:
+        dirs = []
+    removed = 0
+    for directory in dirs:
+        for entry in _entries(directory):
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Lookup / store
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def lookup(
+    client: Any,
+    kind: str,
+    overrides: dict[str, Any] | None = None,
+    tabs: list[str] | None = None,
+) -> dict[str, Any]:
+    """Return a cached result for this model state and override set, if any.
+
+    On a miss, stale entries for the spreadsheet are invalidated and the key
+    is remembered so store() can save the result once it is computed.
+
+    Args:
+        client: A connected SheetsClient.
+        kind: "scenario", "breakeven" or "snapshot".
+        overrides: The scenario's assumption overrides (empty for the base case).
+        tabs: Tabs the result depends on (default: all tabs).
+
+    Returns:
+        {"hit": True, "key", "result", "cached_at"} or
+        {"hit": False, "key", "invalidated"}.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind '{kind}'. Use one of: {', '.join(KINDS)}")
+    spreadsheet_id = client.spreadsheet_id
+    hashes = fingerprint(client, tabs)
+    canonical = canonical_overrides(overrides)
+    key = entry_key(kind, canonical, hashes)
+    path = os.path.join(_spreadsheet_dir(spreadsheet_id), f"{key}.json")
+
+    if os.path.exists(path):
+        with open(path) as f:
+            entry = json.load(f)
+        os.utime(path)  # Mark as recently used
+        return {
+            "hit": True,
+            "key": key,
+            "result": entry["result"],
+            "cached_at": entry["created_at"],
+        }
+
+    _pending[key] = {
+        "kind": kind,
+        "spreadsheet_id": spreadsheet_id,
+        "overrides": json.loads(canonical),
+        "tabs": hashes,
+    }
+    return {"hit": False, "key": key, "invalidated": invalidate(spreadsheet_id, hashes)}
+
+
+def store(key: str, result: Any) -> dict[str, Any]:
+    """Save the result for a key returned by a lookup() miss.
+
+    Args:
+        key: The key from lookup().
+        result: JSON-serializable result, e.g. snapshot-style metrics
+                ({months, by_line: {line: {rev, cogs, cac, gm_adj}}, breakeven}).
+
+    Returns:
+        {"key", "path", "bytes", "evicted"}.
+    """
+    meta = _pending.pop(key, None)
+    if meta is None:
+        raise ValueError(f"Unknown scenario key '{key}'. Call lookup first for this model state.")
+    directory = _spreadsheet_dir(meta["spreadsheet_id"])
+    os.makedirs(directory, exist_ok=True)
+    entry = {**meta, "key": key, "created_at": datetime.now().isoformat(), "result": result}
+
+    path = os.path.join(directory, f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)  # Atomic: readers never see a partial entry
+    return {"key": key, "path": path, "bytes": os.path.getsize(path), "evicted": evict()}
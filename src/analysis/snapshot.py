@@ -6,6 +6,7 @@ breakeven month) so you can compare before/after a change.
 Storage: ~/.fpa-agent/snapshots/<timestamp>.json
 """
 
+import itertools
 import json
 import os
 from datetime import datetime
@@ -32,27 +33,33 @@ def save_snapshot(
             - total_gm_adj: list of floats (sum across all lines)
             - breakeven: str | None — e.g. "Jun-27"
             - breakeven_threshold: float — e.g. 175000
+            or, for portfolio snapshots (portfolio.model_snapshot), months
+            plus series: {metric: list of floats}.
 
     Returns:
         Path to the saved snapshot file.
     """
     os.makedirs(SNAPSHOT_DIR, exist_ok=True)
 
-    snapshot_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:20]
-    snapshot = {
-        "id": snapshot_id,
-        "label": label,
-        "created_at": datetime.now().isoformat(),
-        "spreadsheet_id": spreadsheet_id,
-        "spreadsheet_title": spreadsheet_title,
-        "metrics": metrics,
-    }
-
-    path = os.path.join(SNAPSHOT_DIR, f"{snapshot_id}.json")
-    with open(path, "w") as f:
-        json.dump(snapshot, f, indent=2)
-
-    return path
+    created_at = datetime.now()
+    stamp = created_at.strftime("%Y%m%d_%H%M%S_%f")[:20]
+    for n in itertools.count():  # Snapshots saved in the same instant get a suffix
+        snapshot_id = f"{stamp}_{n}" if n else stamp
+        snapshot = {
+            "id": snapshot_id,
+            "label": label,
+            "created_at": created_at.isoformat(),
+            "spreadsheet_id": spreadsheet_id,
+            "spreadsheet_title": spreadsheet_title,
+            "metrics": metrics,
+        }
+        path = os.path.join(SNAPSHOT_DIR, f"{snapshot_id}.json")
+        try:
+            with open(path, "x") as f:
+                json.dump(snapshot, f, indent=2)
+        except FileExistsError:
+            continue
+        return path
 
 
 def list_snapshots() -> list[dict[str, Any]]:
@@ -109,6 +116,7 @@ def diff_snapshots(snap_a: dict[str, Any], snap_b: dict[str, Any]) -> dict[str,
         - from / to: snapshot metadata
         - months: list of common months
         - line_diffs: {line: {metric: {before, after, delta}}} — only changed lines
+        - series_diffs: {metric: {before, after, delta}} — only changed series
         - total_gm_adj: {before, after, delta}
         - breakeven_before / breakeven_after
     """
@@ -150,6 +158,19 @@ def diff_snapshots(snap_a: dict[str, Any], snap_b: dict[str, Any]) -> dict[str,
         if line_changed:
             line_diffs[line] = line_diff
 
+    series_a: dict = snap_a["metrics"].get("series", {})
+    series_b: dict = snap_b["metrics"].get("series", {})
+    series_diffs: dict = {}
+    for metric in sorted(set(series_a) | set(series_b)):
+        va = align(series_a.get(metric, []), months_a)
+        vb = align(series_b.get(metric, []), months_b)
+        if va != vb:
+            delta = [
+                round(b - a, 2) if a is not None and b is not None else None
+                for a, b in zip(va, vb)
+            ]
+            series_diffs[metric] = {"before": va, "after": vb, "delta": delta}
+
     total_a = align(snap_a["metrics"].get("total_gm_adj", []), months_a)
     total_b = align(snap_b["metrics"].get("total_gm_adj", []), months_b)
     total_delta = [
@@ -170,6 +191,7 @@ def diff_snapshots(snap_a: dict[str, Any], snap_b: dict[str, Any]) -> dict[str,
         },
         "months": common_months,
         "line_diffs": line_diffs,
+        "series_diffs": series_diffs,
         "total_gm_adj": {
             "before": total_a,
             "after": total_b,
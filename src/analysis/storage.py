@@ -0,0 +1,21 @@
+"""File names for per-spreadsheet state saved under ~/.fpa-agent/.
+
+Structure maps, scan hashes and the scenario cache each keep one file or
+directory per spreadsheet, named after its ID.
+"""
+
+import hashlib
+import re
+
+
+def storage_name(spreadsheet_id: str) -> str:
+    """A file-system-safe name for a spreadsheet ID.
+
+    Sheets IDs are used as they are. Other references (local: paths and the
+    like) are sanitized, cut to their last 60 characters and suffixed with
+    a hash of the full reference, so names stay short and unique.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", spreadsheet_id)
+    if safe != spreadsheet_id:
+        safe = f"{safe[-60:]}_{hashlib.sha1(spreadsheet_id.encode()).hexdigest()[:8]}"
+    return safe
@@ -0,0 +1,513 @@
+"""Model structure map: where every labelled row and month column lives.
+
+Skills used to re-parse tabs like Revenue Build on every /scenario,
+/breakeven and /snapshot call just to find the month columns and the
+Revenue / COGS / CAC rows of each business line. build_structure() does
+that once for every tab in a single batchGet:
+
+- header row: the row with the most month headers, mapped month -> column
+- label column: the text column left of the months (usually A)
+- rows: label -> row for every labelled row (first occurrence)
+- sections: blocks introduced by a label-only row (e.g. "Enterprise", or
+  the department blocks in Costs by Department) with their own label map,
+  so repeated labels like "Revenue" or "Salary" stay addressable
+- COGS splits: "CS Subtotal" / "Less: CS to COGS" / "CS Total (OpEx)" /
+  "CS (COGS)" row sets per department
+
+The map is saved per spreadsheet with a content hash of each tab's label
+column and header row. Later commands check those hashes with one cheap
+read (stale_tabs), re-read only the tabs that changed shape, and resolve
+"Enterprise revenue, Mar'27" to a cell without reading the tabs again.
+
+Storage: ~/.fpa-agent/structure/<spreadsheet_id>.json
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Any
+
+from src.sheets.grid import Grid
+from src.sheets.r1c1 import column_letter
+
+from .storage import storage_name
+
+STRUCTURE_DIR = os.path.expanduser("~/.fpa-agent/structure")
+
+# A header row needs at least this many month cells
+MIN_MONTH_HEADERS = 3
+# Month header rows are looked for in the first N rows of a tab
+HEADER_SCAN_ROWS = 10
+# get_model_structure omits per-row labels for tabs with more rows than this
+MAX_SUMMARY_ROWS = 200
+
+_MONTHS = {
+    name: i + 1
+    for i, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+    )
+}
+_MONTH_NAME = {v: k.capitalize() for k, v in _MONTHS.items()}
+
+# 1/31/2026, 2026-01-31, Jan'26, Jan-26, Jan 2026, January 2026, Jan-2026
+_NUMERIC_DATE_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{2,4})$")
+_ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})(?:-(\d{1,2}))?$")
+_NAMED_MONTH_RE = re.compile(r"^([A-Za-z]{3})[A-Za-z]*\.?[\s'\-/]*(\d{2}|\d{4})$")
+_SPLIT_RE = re.compile(r"^less:?\s*(.+?)\s+to\s+cogs$", re.IGNORECASE)
+
+_memory: dict[str, "ModelStructure"] = {}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Month parsing
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def parse_month(value: Any) -> tuple[int, int] | None:
+    """(year, month) for a month header or reference, else None.
+
+    Accepts date/datetime objects and strings like "1/31/2026", "2026-01-31",
+    "Jan'26", "Jan-26", "Jan 2026" or "January 2026".
+    """
+    if isinstance(value, datetime | date):
+        return value.year, value.month
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if m := _NUMERIC_DATE_RE.match(text):
+        month, year = int(m.group(1)), int(m.group(3))
+    elif m := _ISO_DATE_RE.match(text):
+        year, month = int(m.group(1)), int(m.group(2))
+    elif m := _NAMED_MONTH_RE.match(text):
+        month = _MONTHS.get(m.group(1).lower())
+        if month is None:
+            return None
+        year = int(m.group(2))
+    else:
+        return None
+    if year < 100:
+        year += 2000
+    return (year, month) if 1 <= month <= 12 else None
+
+
+def month_label(year: int, month: int) -> str:
+    """Display label used in structure maps, e.g. Mar'27."""
+    return f"{_MONTH_NAME[month]}'{year % 100:02d}"
+
+
+def _norm(label: str) -> str:
+    return " ".join(label.replace("*", "").strip().rstrip(":").lower().split())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Structure types
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Section:
+    """A block of rows introduced by a label-only header row (1-based rows)."""
+
+    name: str
+    header_row: int
+    start_row: int
+    end_row: int
+    rows: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class TabStructure:
+    """Row/column map of one tab.
+
+    Attributes:
+        name: Tab name.
+        label_column: Column letter holding row labels.
+        header_row: 1-based row holding month headers (None if the tab has none).
+        months: Month label (e.g. "Mar'27") -> column letter, in column order.
+        rows: Row label -> 1-based row (first occurrence).
+        sections: Label-only header rows and the rows under them.
+        cogs_splits: Department -> rows of its OpEx/COGS split
+            (subtotal, to_cogs, opex_total, cogs).
+        content_hash: Hash of the label column and header row.
+    """
+
+    name: str
+    label_column: str = "A"
+    header_row: int | None = None
+    months: dict[str, str] = field(default_factory=dict)
+    rows: dict[str, int] = field(default_factory=dict)
+    sections: list[Section] = field(default_factory=list)
+    cogs_splits: dict[str, dict[str, int]] = field(default_factory=dict)
+    content_hash: str = ""
+
+    def __post_init__(self):
+        self._index: dict[str, int] | None = None
+
+    def find_row(self, label: str, section: str | None = None) -> int | None:
+        """1-based row of a label (case-insensitive), optionally within a section."""
+        if section is not None:
+            wanted = _norm(section)
+            for sec in self.sections:
+                if _norm(sec.name) == wanted:
+                    for name, row in sec.rows.items():
+                        if _norm(name) == _norm(label):
+                            return row
+            return None
+        if self._index is None:
+            self._index = {}
+            for name, row in self.rows.items():
+                self._index.setdefault(_norm(name), row)
+        return self._index.get(_norm(label))
+
+    def month_column(self, month: Any) -> str | None:
+        """Column letter for a month (any form parse_month accepts)."""
+        parsed = parse_month(month)
+        return self.months.get(month_label(*parsed)) if parsed else None
+
+    def summary(self, include_rows: bool = True) -> dict[str, Any]:
+        """Compact description for the model (and for printing in skill output)."""
+        result: dict[str, Any] = {"label_column": self.label_column}
+        if self.months:
+            labels = list(self.months)
+            cols = list(self.months.values())
+            result["header_row"] = self.header_row
+            result["months"] = f"{cols[0]}–{cols[-1]} ({labels[0]}–{labels[-1]})"
+        if self.sections:
+            result["sections"] = {
+                sec.name: {"rows": f"{sec.start_row}-{sec.end_row}", "labels": sec.rows}
+                if include_rows
+                else f"{sec.start_row}-{sec.end_row}"
+                for sec in self.sections
+            }
+        if include_rows:
+            result["rows"] = self.rows
+        else:
+            result["labelled_rows"] = len(self.rows)
+        if self.cogs_splits:
+            result["cogs_splits"] = self.cogs_splits
+        return result
+
+
+@dataclass
+class ModelStructure:
+    """Structure map of every tab in a spreadsheet."""
+
+    spreadsheet_id: str
+    built_at: str
+    tabs: dict[str, TabStructure]
+
+    def resolve(
+        self, query: str, month: Any = None, sheet_name: str | None = None
+    ) -> dict[str, Any]:
+        """Resolve a row label (and optional month) to a cell, with no API reads.
+
+        Args:
+            query: Row label, optionally prefixed or suffixed by its section
+                   ("Enterprise revenue", "Revenue Enterprise", "CS Subtotal").
+                   A trailing ", <month>" is treated as the month.
+            month: Month in any form parse_month accepts (e.g. "Mar'27").
+            sheet_name: Restrict the search to one tab.
+
+        Returns:
+            Dict with sheet_name, row, column, cell (A1 incl. tab), section and month.
+
+        Raises:
+            ValueError: If nothing matches, or the label matches in several tabs.
+        """
+        if month is None and "," in query:
+            head, tail = query.rsplit(",", 1)
+            if parse_month(tail):
+                query, month = head, tail.strip()
+        if sheet_name is not None and sheet_name not in self.tabs:
+            raise ValueError(f"Sheet '{sheet_name}' is not in the structure map")
+
+        tabs = [self.tabs[sheet_name]] if sheet_name else list(self.tabs.values())
+        matches = [m for tab in tabs for m in _match_rows(tab, query)]
+        if month is not None:
+            matches = [(tab, row, sec) for tab, row, sec in matches if tab.month_column(month)]
+        if not matches:
+            where = f" in '{sheet_name}'" if sheet_name else ""
+            suffix = f" with a {month} column" if month is not None else ""
+            raise ValueError(f"No row labelled '{query}'{where}{suffix}")
+        if len({tab.name for tab, _, _ in matches}) > 1:
+            found = ", ".join(f"'{tab.name}'!{row}" for tab, row, _ in matches)
+            raise ValueError(f"'{query}' matches rows in several tabs ({found}); pass sheet_name")
+
+        tab, row, section = matches[0]
+        result: dict[str, Any] = {"sheet_name": tab.name, "row": row, "section": section}
+        if month is not None:
+            column = tab.month_column(month)
+            result.update({
+                "column": column,
+                "month": month_label(*parse_month(month)),
+                "cell": f"'{tab.name}'!{column}{row}",
+            })
+        else:
+            result["cell"] = f"'{tab.name}'!{row}:{row}"
+        return result
+
+    def summary(self, sheet_name: str | None = None) -> dict[str, Any]:
+        """Per-tab summaries (rows omitted for very long tabs)."""
+        if sheet_name is not None and sheet_name not in self.tabs:
+            raise ValueError(f"Sheet '{sheet_name}' is not in the structure map")
+        tabs = [self.tabs[sheet_name]] if sheet_name else self.tabs.values()
+        return {
+            "spreadsheet_id": self.spreadsheet_id,
+            "built_at": self.built_at,
+            "tabs": {
+                tab.name: tab.summary(include_rows=len(tab.rows) <= MAX_SUMMARY_ROWS)
+                for tab in tabs
+            },
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "spreadsheet_id": self.spreadsheet_id,
+            "built_at": self.built_at,
+            "tabs": {name: asdict(tab) for name, tab in self.tabs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ModelStructure":
+        tabs = {}
+        for name, tab in data["tabs"].items():
+            sections = [Section(**s) for s in tab.pop("sections", [])]
+            tabs[name] = TabStructure(**tab, sections=sections)
+        return cls(data["spreadsheet_id"], data["built_at"], tabs)
+
+
+def _match_rows(tab: TabStructure, query: str) -> list[tuple[TabStructure, int, str | None]]:
+    """Rows of a tab matching a query, directly or as section + label."""
+    row = tab.find_row(query)
+    if row is not None:
+        return [(tab, row, None)]
+    wanted = _norm(query)
+    matches = []
+    for sec in tab.sections:
+        name = _norm(sec.name)
+        for label, row in sec.rows.items():
+            label = _norm(label)
+            if wanted in (f"{name} {label}", f"{label} {name}"):
+                matches.append((tab, row, sec.name))
+    return matches
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Discovery
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _find_header_row(grid: Grid) -> tuple[int | None, dict[int, tuple[int, int]]]:
+    """0-based header row with the most month cells, and its col -> (year, month)."""
+    best_row, best = None, {}
+    for r in range(min(grid.height, HEADER_SCAN_ROWS)):
+        months = {c: m for c, cell in enumerate(grid.row(r)) if (m := parse_month(cell))}
+        if len(months) >= MIN_MONTH_HEADERS and len(months) > len(best):
+            best_row, best = r, months
+    return best_row, best
+
+
+def _find_label_column(grid: Grid, first_month_col: int | None) -> int:
+    """Text-heaviest column left of the months (first three columns if none)."""
+    limit = first_month_col if first_month_col else min(grid.width, 3)
+    best_col, best_count = 0, 0
+    for c in range(limit):
+        count = sum(
+            1
+            for cell in grid.column(c)
+            if isinstance(cell, str) and cell.strip() and parse_month(cell) is None
+            and re.search(r"[A-Za-z]", cell)
+        )
+        if count > best_count:
+            best_col, best_count = c, count
+    return best_col
+
+
+def _content_hash(labels: list[Any], header: list[Any]) -> str:
+    """Hash of a tab's label column and header row (trailing blanks ignored)."""
+
+    def trimmed(cells: list[Any]) -> list[str]:
+        cells = ["" if c is None else str(c) for c in cells]
+        while cells and cells[-1] == "":
+            cells.pop()
+        return cells
+
+    payload = json.dumps([trimmed(labels), trimmed(header)])
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def parse_tab(name: str, rows: list[list[Any]]) -> TabStructure:
+    """Build the structure of one tab from its formatted values."""
+    grid = Grid.from_rows(rows)
+    header_row, months = _find_header_row(grid)
+    first_month_col = min(months) if months else None
+    label_col = _find_label_column(grid, first_month_col)
+    data_cols = sorted(months) if months else list(range(label_col + 1, grid.width))
+
+    tab = TabStructure(name=name, label_column=column_letter(label_col), header_row=None)
+    if header_row is not None:
+        tab.header_row = header_row + 1
+        tab.months = {month_label(*months[c]): column_letter(c) for c in sorted(months)}
+
+    section: Section | None = None
+    for r in range(grid.height):
+        if r == header_row:
+            continue
+        label = grid[r, label_col] if label_col < grid.width else ""
+        label = label.strip() if isinstance(label, str) else ""
+        if not label:
+            if all(cell == "" for cell in grid.row(r)):
+                section = None  # A blank row ends the current block
+            continue
+        has_values = any(grid[r, c] != "" for c in data_cols)
+        if not has_values:
+            section = Section(name=label, header_row=r + 1, start_row=0, end_row=0)
+            tab.sections.append(section)
+            continue
+        tab.rows.setdefault(label, r + 1)
+        if section is not None:
+            section.rows.setdefault(label, r + 1)
+            section.start_row = section.start_row or r + 1
+            section.end_row = r + 1
+
+    # Keep only sections that actually head rows
+    tab.sections = [s for s in tab.sections if s.rows]
+    tab.cogs_splits = _detect_cogs_splits(tab)
+
+    labels = [grid[r, label_col] for r in range(grid.height)] if label_col < grid.width else []
+    header = list(grid.row(header_row)) if header_row is not None else []
+    tab.content_hash = _content_hash(labels, header)
+    return tab
+
+
+def _detect_cogs_splits(tab: TabStructure) -> dict[str, dict[str, int]]:
+    """Find "Less: <Dept> to COGS" rows and the subtotal/total/COGS rows around them."""
+    splits: dict[str, dict[str, int]] = {}
+    for label, row in tab.rows.items():
+        m = _SPLIT_RE.match(label.strip())
+        if not m:
+            continue
+        dept = m.group(1).strip()
+        split = {"to_cogs": row}
+        for key, candidates in (
+            ("subtotal", [f"{dept} Subtotal"]),
+            ("opex_total", [f"{dept} Total (OpEx)", f"{dept} Total"]),
+            ("cogs", [f"{dept} (COGS)"]),
+        ):
+            for candidate in candidates:
+                if (found := tab.find_row(candidate)) is not None:
+                    split[key] = found
+                    break
+        splits[dept] = split
+    return splits
+
+
+def build_structure(
+    client: Any, base: "ModelStructure | None" = None, stale: list[str] | None = None
+) -> "ModelStructure":
+    """Read every tab once (one batchGet) and build the structure map.
+
+    Args:
+        client: A connected SheetsClient (or daemon proxy).
+        base: A previous map of the spreadsheet to update: only its stale
+              tabs are read again, the rest are kept.
+        stale: base's stale tabs, if already known (default: stale_tabs()).
+
+    Returns:
+        The ModelStructure (not yet saved; see get_structure).
+    """
+    info = client.get_spreadsheet_info()
+    names = [s["name"] for s in info["sheets"]]
+    if base is not None and stale is None:
+        stale = stale_tabs(client, base)
+    reread = names if base is None else [name for name in names if name in stale]
+    contents = client.read_ranges([(name, "") for name in reread])
+    parsed = {name: parse_tab(name, rows) for name, rows in zip(reread, contents)}
+    tabs = {name: parsed[name] if name in parsed else base.tabs[name] for name in names}
+    return ModelStructure(client.spreadsheet_id, datetime.now().isoformat(), tabs)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Persistence
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _structure_path(spreadsheet_id: str) -> str:
+    return os.path.join(STRUCTURE_DIR, f"{storage_name(spreadsheet_id)}.json")
+
+
+def save_structure(structure: ModelStructure) -> str:
+    """Persist a structure map and return the file path."""
+    os.makedirs(STRUCTURE_DIR, exist_ok=True)
+    path = _structure_path(structure.spreadsheet_id)
+    with open(path, "w") as f:
+        json.dump(structure.to_dict(), f, indent=2)
+    _memory[structure.spreadsheet_id] = structure
+    return path
+
+
+def load_structure(spreadsheet_id: str) -> ModelStructure | None:
+    """The saved structure map for a spreadsheet, or None."""
+    if spreadsheet_id in _memory:
+        return _memory[spreadsheet_id]
+    path = _structure_path(spreadsheet_id)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        structure = ModelStructure.from_dict(json.load(f))
+    _memory[spreadsheet_id] = structure
+    return structure
+
+
+def get_structure(client: Any, refresh: bool = False) -> ModelStructure:
+    """Structure map for the client's spreadsheet, building or updating it as needed.
+
+    A saved map is first checked with stale_tabs() (one small batchGet of
+    label columns and header rows); tabs whose shape changed — rows
+    inserted by a /modify, or edited by hand — are re-read and re-parsed
+    before the map is returned, so a label never resolves to a moved cell.
+
+    Args:
+        client: A connected SheetsClient.
+        refresh: Rebuild every tab from the sheet even if a saved map exists.
+    """
+    saved = None if refresh else load_structure(client.spreadsheet_id)
+    stale = None if saved is None else stale_tabs(client, saved)
+    if saved is not None and not stale:
+        return saved
+    structure = build_structure(client, base=saved, stale=stale)
+    save_structure(structure)
+    return structure
+
+
+def stale_tabs(client: Any, structure: ModelStructure) -> list[str]:
+    """Tabs whose label column or header row changed since the map was built.
+
+    Reads only those two ranges per tab, in one batchGet. Tabs added or
+    removed since the map was built are reported too.
+    """
+    info = client.get_spreadsheet_info()
+    names = [s["name"] for s in info["sheets"]]
+    known = [n for n in names if n in structure.tabs]
+
+    ranges: list[tuple[str, str]] = []
+    for name in known:
+        tab = structure.tabs[name]
+        ranges.append((name, f"{tab.label_column}:{tab.label_column}"))
+        if tab.header_row is not None:
+            ranges.append((name, f"{tab.header_row}:{tab.header_row}"))
+    contents = iter(client.read_ranges(ranges))
+
+    stale = [n for n in names if n not in structure.tabs]
+    stale += [n for n in structure.tabs if n not in names]
+    for name in known:
+        tab = structure.tabs[name]
+        labels = [row[0] if row else "" for row in next(contents)]
+        header_rows = next(contents) if tab.header_row is not None else []
+        header = header_rows[0] if header_rows else []
+        if _content_hash(labels, header) != tab.content_hash:
+            stale.append(name)
+    return stale
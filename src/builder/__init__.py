@@ -0,0 +1,21 @@
+"""Deterministic generation of the 9-tab model from a confirmed mapping."""
+
+from .ingest import IngestMapping, ingest_source
+from .push import build_model, push_tabs
+from .refactor import refactor_to_arrays
+from .spec import Contract, Employee, ModelSpec, OpexLine
+from .tabs import Tab, build_tabs
+
+__all__ = [
+    "ModelSpec",
+    "Employee",
+    "Contract",
+    "OpexLine",
+    "Tab",
+    "build_tabs",
+    "push_tabs",
+    "build_model",
+    "refactor_to_arrays",
+    "IngestMapping",
+    "ingest_source",
+]
@@ -0,0 +1,68 @@
+"""Array formulas that replace the per-cell helper blocks.
+
+Headcount Input (J+), ARR (G+) and OpEx Assumptions (F+) hold one formula
+per row per month. Each block can instead be a single ARRAYFORMULA in its
+top-left cell that broadcasts the row's inputs (a column range) against
+the month-end header (a row range). The expressions mirror the per-cell
+template formulas operation for operation, so results are identical:
+
+- AND/OR become * and + of comparisons (they aggregate inside arrays)
+- MIN/MAX of two values become IF comparisons
+- EOMONTH(d,-1)+1 becomes DATE(YEAR(d),MONTH(d),1), the same serial
+"""
+
+import re
+
+from src.sheets.r1c1 import column_index, column_letter
+
+_OPEX_ROW = re.compile(r"=\$E(\d+)(?:\*('(?:[^']|'')+'!)([A-Z]+)(\d+))?")
+
+
+def _months(first_col: int, months: int) -> str:
+    """Month-end header row range, e.g. J$1:AG$1."""
+    return f"{column_letter(first_col)}$1:{column_letter(first_col + months - 1)}$1"
+
+
+def arr_block(first_row: int, last_row: int, first_col: int, months: int) -> str:
+    """ARR helper block: each contract's ARR while active in the month, else 0."""
+    c, d, e = (f"${x}{first_row}:${x}{last_row}" for x in "CDE")
+    me = _months(first_col, months)
+    return f'=ARRAYFORMULA(IF(({c}<={me})*(({e}="")+({e}>{me})),{d},0))'
+
+
+def proration_block(first_row: int, last_row: int, first_col: int, months: int) -> str:
+    """Headcount Input block: prorated monthly Salary + Benefits per employee."""
+    d, e, f, i = (f"${x}{first_row}:${x}{last_row}" for x in "DEFI")
+    me = _months(first_col, months)
+    ms = f"DATE(YEAR({me}),MONTH({me}),1)"
+    monthly = f"({f}+{i})/12"
+    end = f'IF({e}="",{me},IF({e}<{me},{e},{me}))'
+    start = f"IF({d}>{ms},{d},{ms})"
+    return (
+        f'=ARRAYFORMULA(IF(({d}>{me})+(({e}<>"")*({e}<{ms})),0,'
+        f'IF(({d}<={ms})*(({e}="")+({e}>={me})),{monthly},'
+        f"{monthly}*({end}-{start}+1)/DAY({me}))))"
+    )
+
+
+def opex_row(formula: str, row: int, first_col: int, months: int) -> str | None:
+    """Array version of one OpEx Assumptions row, from its first-month formula.
+
+    Args:
+        formula: The row's first-month formula, "=$E{row}" (Fixed) or
+                 "=$E{row}*'Tab'!C4" (scaled by a monthly driver).
+        row: Sheet row of the formula.
+        first_col: 0-based column of the first month.
+        months: Number of month columns.
+
+    Returns:
+        The array formula, or None if the formula is not a template scaling.
+    """
+    match = _OPEX_ROW.fullmatch(formula)
+    if not match or int(match[1]) != row:
+        return None
+    _, sheet, col, driver_row = match.groups()
+    if sheet is None:
+        return f"=MAP({_months(first_col, months)},LAMBDA(month,$E{row}))"
+    end = column_letter(column_index(col) + months - 1)
+    return f"=ARRAYFORMULA($E{row}*{sheet}{col}{driver_row}:{end}{driver_row})"
@@ -0,0 +1,597 @@
+"""Streaming ingestion of CSV / XLSX source data into Headcount Input and ARR.
+
+A CRM export or HRIS dump with thousands of rows is not something to read
+into a conversation and write back out as inline arrays. ingest_source()
+streams the file instead: rows are parsed and validated one at a time
+under the confirmed Phase 1 mapping of skills/fpa-model.md (column
+mapping, ACV → ARR conversion, date coercion, department names), then
+written to the tab in chunks sized to the API's request limits.
+
+Each chunk costs two requests, one batchUpdate (grid growth, the helper
+formulas filled down from one seed, number formats) and one values
+update, and is sent by a background writer while the next chunk is
+parsed, so reading the source overlaps the network round trips. Chunks go
+to explicit rows rather than values.append, so a retried or resumed chunk
+overwrites its own rows instead of adding them twice. Progress is saved
+after every chunk under ~/.fpa-agent/ingest/; an interrupted run picks up
+at the next unwritten source row when called again.
+"""
+
+import contextvars
+import csv
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any
+
+from src.sheets.client import repeat_formula_request
+from src.sheets.compact import parse_number
+from src.sheets.r1c1 import column_letter
+
+from .arrays import arr_block, proration_block
+from .push import _number_format
+from .spec import DEFAULT_DEPARTMENTS, Contract, Employee
+from .tabs import (
+    ARR,
+    ARR_FIRST_COL,
+    CURRENCY,
+    DATE,
+    HI,
+    HI_FIRST_COL,
+    arr_formula,
+    contract_row,
+    employee_row,
+    proration_formula,
+)
+
+INGEST_DIR = os.path.expanduser("~/.fpa-agent/ingest")
+
+# Rows per chunk, and the JSON size of one chunk's values: the API accepts
+# requests up to ~10 MB but recommends staying near 2 MB for latency
+MAX_CHUNK_ROWS = 5000
+MAX_CHUNK_BYTES = 1_000_000
+
+DEFAULT_BENEFITS_RATE = 0.2
+DEFAULT_CONTRACT_LENGTH = 12
+
+# Rejected rows listed in the result (all are counted)
+MAX_REJECTS_SHOWN = 20
+
+_DATE_FORMATS = (
+    "%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%Y/%m/%d", "%m-%d-%Y",
+    "%d-%b-%Y", "%d %b %Y", "%b %d, %Y", "%B %d, %Y", "%b %d %Y", "%B %d %Y",
+)
+_EXCEL_EPOCH = date(1899, 12, 30)
+_TYPES = {"new": "New", "expansion": "Expansion", "upsell": "Expansion"}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Targets and mapping
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class Target:
+    """An input tab rows can be ingested into.
+
+    Attributes:
+        fields: Mapping field names, in column order from A.
+        required: Fields every row must have.
+        formula: Per-row helper formula for (row, month column letter).
+        block: ARRAYFORMULA helper block for (first row, last row, first col, months).
+        formats: (first_col, last_col, pattern) number formats of the data columns.
+    """
+
+    tab: str
+    fields: tuple[str, ...]
+    required: tuple[str, ...]
+    first_month_col: int
+    formula: Callable[[int, str], str]
+    block: Callable[[int, int, int, int], str]
+    formats: tuple[tuple[int, int, str], ...]
+
+
+TARGETS = {
+    "arr": Target(
+        ARR,
+        ("customer", "type", "start", "arr", "churn", "contract_length"),
+        ("customer", "start", "arr"),
+        ARR_FIRST_COL,
+        arr_formula,
+        arr_block,
+        ((2, 2, DATE), (4, 4, DATE), (3, 3, CURRENCY)),
+    ),
+    "headcount": Target(
+        HI,
+        ("name", "department", "title", "start", "end", "salary", "bonus", "commission",
+         "benefits"),
+        ("name", "department", "start", "salary"),
+        HI_FIRST_COL,
+        proration_formula,
+        proration_block,
+        ((3, 4, DATE), (5, 8, CURRENCY)),
+    ),
+}
+
+
+@dataclass
+class IngestMapping:
+    """The confirmed mapping of one source file onto an input tab.
+
+    Attributes:
+        target: "arr" (ARR tab) or "headcount" (Headcount Input).
+        columns: Target field → source column header. ARR fields: customer,
+            type, start, arr, churn, contract_length. Headcount fields: name,
+            department, title, start, end, salary, bonus, commission,
+            benefits.
+        acv: The arr column holds total contract value; ARR is
+            ACV ÷ contract months × 12.
+        departments: Source department name → standard name. Names already
+            standard (any case) need no entry.
+        standard_departments: The model's department names.
+        benefits_rate: Benefits as a share of salary where the source has none.
+    """
+
+    target: str
+    columns: dict[str, str]
+    acv: bool = False
+    departments: dict[str, str] = field(default_factory=dict)
+    standard_departments: tuple[str, ...] = DEFAULT_DEPARTMENTS
+    benefits_rate: float = DEFAULT_BENEFITS_RATE
+
+    def __post_init__(self):
+        if self.target not in TARGETS:
+            raise ValueError(
+                f"Unknown ingest target '{self.target}'. Available: {', '.join(TARGETS)}"
+            )
+        target = TARGETS[self.target]
+        unknown = sorted(set(self.columns) - set(target.fields))
+        if unknown:
+            raise ValueError(
+                f"Unknown {self.target} fields: {', '.join(unknown)}. "
+                f"Available: {', '.join(target.fields)}"
+            )
+        missing = [f for f in target.required if f not in self.columns]
+        if missing:
+            raise ValueError(f"Mapping is missing required fields: {', '.join(missing)}")
+        standard = {d.lower(): d for d in self.standard_departments}
+        self._departments = dict(standard)
+        for source, name in self.departments.items():
+            if name.lower() not in standard:
+                raise ValueError(
+                    f"Department '{source}' maps to '{name}', which is not one of "
+                    f"{', '.join(self.standard_departments)}"
+                )
+            self._departments[source.strip().lower()] = standard[name.lower()]
+
+    def department(self, value: Any) -> str:
+        """Standard department name for a source value."""
+        name = _text(value)
+        if name.lower() not in self._departments:
+            raise ValueError(f"unknown department '{name}'")
+        return self._departments[name.lower()]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Row conversion
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def coerce_date(value: Any) -> date | None:
+    """A source date as a date: date/datetime objects, Excel serials or common text forms.
+
+    Raises:
+        ValueError: If the value is not blank and not a recognizable date.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return _EXCEL_EPOCH + timedelta(days=int(value))
+    text = _text(value)
+    if not text:
+        return None
+    try:
+        return date.fromisoformat(text[:10])  # Also ISO timestamps
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"not a date: '{text}'")
+
+
+def _amount(record: dict[str, Any], name: str, default: float | None = None) -> float | None:
+    value = record.get(name)
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    if not _text(value):
+        return default
+    number = parse_number(value)
+    if number is None:
+        raise ValueError(f"{name} is not a number: '{_text(value)}'")
+    return number
+
+
+def _required(record: dict[str, Any], name: str) -> Any:
+    if not _text(record.get(name)):
+        raise ValueError(f"missing {name}")
+    return record[name]
+
+
+def _contract(mapping: IngestMapping, record: dict[str, Any]) -> list[Any]:
+    customer = _text(_required(record, "customer"))
+    start = coerce_date(_required(record, "start"))
+    length = _amount(record, "contract_length", DEFAULT_CONTRACT_LENGTH)
+    if length <= 0:
+        raise ValueError(f"contract_length must be positive, got {length:g}")
+    amount = _amount(record, "arr")
+    if amount is None:
+        raise ValueError("missing arr")
+    if amount < 0:
+        raise ValueError(f"arr is negative: {amount:g}")
+    if mapping.acv:
+        amount = amount / length * 12
+    churn = coerce_date(record.get("churn"))
+    if churn is not None and churn < start:
+        raise ValueError(f"churn {churn} is before start {start}")
+    kind = _text(record.get("type"))
+    return contract_row(Contract(
+        customer,
+        start,
+        round(amount, 2),
+        type=_TYPES.get(kind.lower(), kind) or "New",
+        churn=churn,
+        contract_length=int(length) if length == int(length) else length,
+    ))
+
+
+def _employee(mapping: IngestMapping, record: dict[str, Any]) -> list[Any]:
+    name = _text(_required(record, "name"))
+    department = mapping.department(_required(record, "department"))
+    start = coerce_date(_required(record, "start"))
+    end = coerce_date(record.get("end"))
+    if end is not None and end < start:
+        raise ValueError(f"end {end} is before start {start}")
+    salary = _amount(record, "salary")
+    if salary is None:
+        raise ValueError("missing salary")
+    if salary <= 0:
+        raise ValueError(f"salary must be positive, got {salary:g}")
+    return employee_row(Employee(
+        name,
+        department,
+        start,
+        salary,
+        title=_text(record.get("title")),
+        end=end,
+        bonus=_amount(record, "bonus", 0.0),
+        commission=_amount(record, "commission", 0.0),
+        benefits=_amount(record, "benefits", round(salary * mapping.benefits_rate, 2)),
+    ))
+
+
+_CONVERTERS = {"arr": _contract, "headcount": _employee}
+
+
+def convert_row(mapping: IngestMapping, record: dict[str, Any]) -> list[Any]:
+    """One tab row (columns from A) from a source record keyed by target field.
+
+    Raises:
+        ValueError: If the record fails validation; the message says why.
+    """
+    return _CONVERTERS[mapping.target](mapping, record)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Source files
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def iter_source(path: str, sheet: str | None = None) -> Iterator[list[Any]]:
+    """Rows of a CSV or XLSX file, header row first, read lazily.
+
+    Args:
+        path: .csv (UTF-8, with or without BOM) or .xlsx file.
+        sheet: Worksheet of an XLSX file (default: the first).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+    elif ext in (".xlsx", ".xlsm"):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError(
+                "Reading .xlsx sources requires openpyxl: pip install 'fpa-agent[xlsx]'"
+            ) from None
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            for row in worksheet.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported source file '{path}': expected .csv or .xlsx")
+
+
+def _field_indexes(header: list[Any], mapping: IngestMapping) -> dict[str, int]:
+    """Source column index of each mapped field, matching headers case-insensitively."""
+    positions = {_text(h).lower(): i for i, h in reversed(list(enumerate(header)))}
+    missing = [h for h in mapping.columns.values() if h.strip().lower() not in positions]
+    if missing:
+        raise ValueError(
+            f"Source has no column {', '.join(repr(h) for h in missing)}. "
+            f"Headers: {', '.join(_text(h) for h in header if _text(h))}"
+        )
+    return {f: positions[h.strip().lower()] for f, h in mapping.columns.items()}
+
+
+@dataclass
+class _Chunk:
+    rows: list[list[Any]]
+    source_rows: int  # Source rows consumed, including rejected and blank ones
+    rejected: list[dict[str, Any]]
+
+
+def _chunks(
+    rows: Iterator[list[Any]],
+    mapping: IngestMapping,
+    indexes: dict[str, int],
+    first_source_row: int,
+    max_rows: int,
+) -> Iterator[_Chunk]:
+    """Validated tab rows in chunks of at most max_rows rows and MAX_CHUNK_BYTES."""
+    chunk = _Chunk([], 0, [])
+    size = 0
+    for number, row in enumerate(rows, first_source_row):
+        chunk.source_rows += 1
+        if any(_text(v) for v in row):
+            record = {f: row[i] if i < len(row) else None for f, i in indexes.items()}
+            try:
+                converted = convert_row(mapping, record)
+            except ValueError as e:
+                chunk.rejected.append({"row": number, "error": str(e)})
+            else:
+                chunk.rows.append(converted)
+                size += len(json.dumps(converted, default=str)) + 1
+        if len(chunk.rows) >= max_rows or size >= MAX_CHUNK_BYTES:
+            yield chunk
+            chunk, size = _Chunk([], 0, []), 0
+    if chunk.source_rows:
+        yield chunk
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Progress
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _checkpoint_path(spreadsheet_id: str, tab: str, path: str) -> str:
+    key = json.dumps([spreadsheet_id, tab, os.path.abspath(path)])
+    return os.path.join(INGEST_DIR, f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.json")
+
+
+def _load_checkpoint(path: str) -> dict[str, Any] | None:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, state: dict[str, Any]):
+    os.makedirs(INGEST_DIR, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)  # A crash mid-save leaves the previous checkpoint
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Ingestion
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _tab_layout(client: Any, target: Target) -> dict[str, Any]:
+    """First free row, month count and helper mode of the tab, in one batchGet."""
+    column_a, header = client.read_ranges([(target.tab, "A:A"), (target.tab, "1:2")], "FORMULA")
+    row1 = header[0] if header else []
+    row2 = header[1] if len(header) > 1 else []
+    months = max(0, len(row1) - target.first_month_col)
+    seed = row2[target.first_month_col] if len(row2) > target.first_month_col else ""
+    array = isinstance(seed, str) and seed.upper().startswith("=ARRAYFORMULA(")
+    return {
+        "first_row": max(len(column_a), 1) + 1,
+        "months": months,
+        "helpers": "none" if not months else "array" if array else "filled",
+    }
+
+
+def _chunk_requests(
+    sheet: dict[str, Any], target: Target, state: dict[str, Any], count: int
+) -> list[dict[str, Any]]:
+    """Grid growth, helper formulas and number formats for the next count rows."""
+    start = state["next_row"] - 1  # 0-based
+    end = start + count
+    requests: list[dict[str, Any]] = []
+    if end > sheet["row_count"]:
+        grow = max(end - sheet["row_count"], sheet["row_count"])  # Doubling: few resizes
+        requests.append({
+            "appendDimension": {"sheetId": sheet["sheet_id"], "dimension": "ROWS", "length": grow}
+        })
+        sheet["row_count"] += grow
+    months = state["months"]
+    formats = list(target.formats)
+    if months:
+        first = target.first_month_col
+        formats.append((first, first + months - 1, CURRENCY))
+        if state["helpers"] == "filled":
+            formula = target.formula(start + 1, column_letter(first))
+            requests.append(
+                repeat_formula_request(sheet["sheet_id"], start, first, formula, months, count)
+            )
+    for first_col, last_col, pattern in formats:
+        requests.append({
+            "repeatCell": {
+                "range": {
+                    "sheetId": sheet["sheet_id"],
+                    "startRowIndex": start,
+                    "endRowIndex": end,
+                    "startColumnIndex": first_col,
+                    "endColumnIndex": last_col + 1,
+                },
+                "cell": {"userEnteredFormat": {"numberFormat": _number_format(pattern)}},
+                "fields": "userEnteredFormat.numberFormat",
+            }
+        })
+    return requests
+
+
+def ingest_source(
+    client: Any,
+    path: str,
+    mapping: IngestMapping,
+    sheet: str | None = None,
+    chunk_rows: int = MAX_CHUNK_ROWS,
+    restart: bool = False,
+) -> dict[str, Any]:
+    """Stream a CSV / XLSX file into the model's ARR or Headcount Input tab.
+
+    Rows are appended below the tab's last used row. Each gets the tab's
+    helper formulas (filled per row, or by extending the ARRAYFORMULA block
+    of an arrays build) and number formats. Rows failing validation are
+    skipped and reported with their source row number.
+
+    If a run fails part way, calling again with the same arguments resumes
+    after the last written chunk. Pass restart=True to ignore saved progress
+    (rows written so far stay in the tab).
+
+    Summary formulas built by build_model cover input rows up to
+    max(100, rows at build time); after a large ingest, run audit_workbook's
+    capped_ranges rule to find ranges that no longer reach the data.
+
+    Args:
+        client: SheetsClient connected to the model.
+        path: Source .csv or .xlsx file.
+        mapping: The confirmed IngestMapping.
+        sheet: Worksheet of an XLSX source (default: the first).
+        chunk_rows: Maximum tab rows per write.
+        restart: Start from the first source row even if progress was saved.
+
+    Returns:
+        Dict with keys:
+        - tab, source
+        - rows_read: source data rows processed (including resumed ones)
+        - rows_written, rows_rejected
+        - rejected: first MAX_REJECTS_SHOWN of {row, error}
+        - first_row, last_row: sheet rows written (last_row None if none)
+        - chunks: writes made by this call
+        - resumed_from: source rows skipped from an earlier run
+        - helpers: "filled", "array" or "none" (tab has no month columns)
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be at least 1")
+    target = TARGETS[mapping.target]
+    info = next(
+        (s for s in client.get_spreadsheet_info()["sheets"] if s["name"] == target.tab), None
+    )
+    if info is None:
+        raise ValueError(f"Sheet '{target.tab}' not found — build the model first")
+    tab = dict(info)
+
+    checkpoint = _checkpoint_path(client.spreadsheet_id, target.tab, path)
+    fingerprint = _fingerprint(path)
+    state = None if restart else _load_checkpoint(checkpoint)
+    if state is not None and state["fingerprint"] != fingerprint:
+        raise ValueError(
+            f"'{path}' changed since its ingest was interrupted after "
+            f"{state['source_rows']} rows; pass restart=True to ingest it from the start"
+        )
+    if state is None:
+        state = {
+            "fingerprint": fingerprint,
+            **_tab_layout(client, target),
+            "source_rows": 0,
+            "written": 0,
+            "rejected": 0,
+            "rejects": [],
+        }
+        state["next_row"] = state["first_row"]
+    resumed_from = state["source_rows"]
+
+    rows = iter_source(path, sheet)
+    try:
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"'{path}' is empty")
+        indexes = _field_indexes(header, mapping)
+        skipped = islice(rows, state["source_rows"], None)
+        chunks = _chunks(skipped, mapping, indexes, state["source_rows"] + 2, chunk_rows)
+
+        def write(chunk: _Chunk):
+            if chunk.rows:
+                requests = _chunk_requests(tab, target, state, len(chunk.rows))
+                client.batch_update(requests)
+                client.write_range(target.tab, f"A{state['next_row']}", chunk.rows)
+            state["next_row"] += len(chunk.rows)
+            state["source_rows"] += chunk.source_rows
+            state["written"] += len(chunk.rows)
+            state["rejected"] += len(chunk.rejected)
+            room = MAX_REJECTS_SHOWN - len(state["rejects"])
+            state["rejects"] += chunk.rejected[:max(room, 0)]
+            _save_checkpoint(checkpoint, state)
+
+        # One write in flight while the next chunk is parsed (clients are not
+        # thread-safe, so writes themselves never overlap)
+        sent = 0
+        pending: Future | None = None
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            for chunk in chunks:
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(contextvars.copy_context().run, write, chunk)
+                sent += bool(chunk.rows)
+            if pending is not None:
+                pending.result()
+    finally:
+        rows.close()
+
+    last_row = state["next_row"] - 1
+    if state["helpers"] == "array" and state["written"]:
+        # The block in row 2 broadcasts over a fixed row range; stretch it
+        block = target.block(2, last_row, target.first_month_col, state["months"])
+        client.write_range(target.tab, f"{column_letter(target.first_month_col)}2", [[block]])
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return {
+        "tab": target.tab,
+        "source": os.path.basename(path),
+        "rows_read": state["source_rows"],
+        "rows_written": state["written"],
+        "rows_rejected": state["rejected"],
+        "rejected": state["rejects"],
+        "first_row": state["first_row"],
+        "last_row": last_row if state["written"] else None,
+        "chunks": sent,
+        "resumed_from": resumed_from,
+        "helpers": state["helpers"],
+    }
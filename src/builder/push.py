@@ -0,0 +1,213 @@
+"""Push generated tabs to a spreadsheet in two write requests.
+
+The whole model is created by one spreadsheets.batchUpdate (every addSheet
+with its grid size and frozen panes, plus every number format) and one
+values.batchUpdate carrying every value and formula, instead of the
+per-range writes and per-row verification of a hand build.
+
+Month-column rows are one formula shifted across the horizon, and input
+rows repeat the same formula one row down. Those runs and blocks go into
+the batchUpdate as a single repeatCell each (one seed formula; Sheets
+shifts it per cell), and are left out of the values payload.
+"""
+
+from typing import Any
+
+from src.sheets.client import repeat_formula_request
+from src.sheets.r1c1 import formula_shifter
+
+from .spec import ModelSpec
+from .tabs import Tab, build_tabs
+
+NUMBER_FORMAT_TYPES = {"$": "CURRENCY", "%": "PERCENT", "/": "DATE"}
+
+# Shortest run of shifted copies worth a repeatCell
+MIN_FILL_SPAN = 2
+
+
+def _number_format(pattern: str) -> dict[str, str]:
+    kind = next((t for mark, t in NUMBER_FORMAT_TYPES.items() if mark in pattern), "NUMBER")
+    return {"type": kind, "pattern": pattern}
+
+
+def _is_formula(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("=")
+
+
+def find_fills(tab: Tab) -> list[tuple[int, int, int, int, str]]:
+    """Blocks of the tab that one seed formula reproduces when filled.
+
+    A run is a seed followed by its copies shifted one column at a time;
+    runs with the same columns on consecutive rows whose seeds are the
+    first seed shifted down merge into one block.
+
+    Returns:
+        (row, col, rows, span, seed) blocks, 0-based.
+    """
+    runs: list[tuple[int, int, int, str]] = []
+    for r, cells in enumerate(tab.rows):
+        c = 0
+        while c < len(cells):
+            seed = cells[c]
+            span = 1
+            if _is_formula(seed):
+                shift = formula_shifter(seed)
+                while c + span < len(cells) and cells[c + span] == shift(0, span):
+                    span += 1
+            if span >= MIN_FILL_SPAN:
+                runs.append((r, c, span, seed))
+            c += span
+
+    blocks: list[tuple[int, int, int, int, str]] = []
+    open_blocks: dict[tuple[int, int], int] = {}  # (col, span) -> index in blocks
+    for r, c, span, seed in runs:
+        i = open_blocks.get((c, span))
+        if i is not None:
+            row, _, rows, _, first = blocks[i]
+            if row + rows == r and seed == formula_shifter(first)(rows, 0):
+                blocks[i] = (row, c, rows + 1, span, first)
+                continue
+        open_blocks[(c, span)] = len(blocks)
+        blocks.append((r, c, 1, span, seed))
+    return blocks
+
+
+def _without_fills(tab: Tab, fills: list[tuple[int, int, int, int, str]]) -> list[list[Any]]:
+    """Tab rows with filled cells set to None (skipped by the values write)."""
+    rows = [list(cells) for cells in tab.rows]
+    for row, col, height, span, _ in fills:
+        for r in range(row, row + height):
+            rows[r][col : col + span] = [None] * span
+    for cells in rows:
+        while cells and cells[-1] is None:
+            cells.pop()
+    return rows
+
+
+def sheet_requests(
+    tabs: list[Tab],
+    existing: dict[str, int],
+    replace: bool = False,
+    fills: dict[str, list[tuple[int, int, int, int, str]]] | None = None,
+) -> list[dict[str, Any]]:
+    """batchUpdate requests creating the tabs (and replacing existing ones).
+
+    Args:
+        tabs: Generated tabs.
+        existing: {tab name: sheetId} already in the spreadsheet.
+        replace: Delete tabs with the same names. Old tabs are renamed
+                 first and deleted last, so the spreadsheet never runs out
+                 of sheets mid-batch.
+        fills: {tab name: find_fills() blocks} to send as repeatCell.
+
+    Raises:
+        ValueError: If a tab already exists and replace is False.
+    """
+    clashes = [tab.name for tab in tabs if tab.name in existing]
+    if clashes and not replace:
+        raise ValueError(
+            f"Tabs already exist: {', '.join(clashes)}. Pass replace=True to rebuild them."
+        )
+
+    requests: list[dict[str, Any]] = [
+        {
+            "updateSheetProperties": {
+                "properties": {"sheetId": existing[name], "title": f"_replaced_{existing[name]}"},
+                "fields": "title",
+            }
+        }
+        for name in clashes
+    ]
+    next_id = max(existing.values(), default=0) + 1
+    for offset, tab in enumerate(tabs):
+        sheet_id = next_id + offset
+        requests.append({
+            "addSheet": {
+                "properties": {
+                    "sheetId": sheet_id,
+                    "title": tab.name,
+                    "gridProperties": {
+                        "rowCount": max(1000, tab.height),
+                        "columnCount": max(26, tab.width),
+                        "frozenRowCount": tab.frozen_rows,
+                        "frozenColumnCount": tab.frozen_columns,
+                    },
+                }
+            }
+        })
+        for row, col, rows, span, seed in (fills or {}).get(tab.name, []):
+            requests.append(repeat_formula_request(sheet_id, row, col, seed, span, rows))
+        for start_row, end_row, start_col, end_col, pattern in tab.formats:
+            requests.append({
+                "repeatCell": {
+                    "range": {
+                        "sheetId": sheet_id,
+                        "startRowIndex": start_row,
+                        "endRowIndex": end_row,
+                        "startColumnIndex": start_col,
+                        "endColumnIndex": end_col,
+                    },
+                    "cell": {"userEnteredFormat": {"numberFormat": _number_format(pattern)}},
+                    "fields": "userEnteredFormat.numberFormat",
+                }
+            })
+    requests += [{"deleteSheet": {"sheetId": existing[name]}} for name in clashes]
+    return requests
+
+
+def push_tabs(
+    client: Any, tabs: list[Tab], replace: bool = False, fill: bool = True
+) -> dict[str, Any]:
+    """Create the tabs and write their contents.
+
+    Args:
+        client: A connected SheetsClient.
+        tabs: Generated tabs (see build_tabs).
+        replace: Rebuild tabs that already exist instead of raising.
+        fill: Send repeated formulas as server-side fills (False writes
+              every formula string, as a hand build would).
+
+    Returns:
+        {"tabs", "replaced", "cells", "formulas", "fills", "filled_cells",
+        "format_ranges"}.
+    """
+    existing = {s["name"]: s["sheet_id"] for s in client.get_spreadsheet_info()["sheets"]}
+    fills = {tab.name: find_fills(tab) if fill else [] for tab in tabs}
+    client.batch_update(sheet_requests(tabs, existing, replace, fills))
+    client.write_ranges([(tab.name, "A1", _without_fills(tab, fills[tab.name])) for tab in tabs])
+
+    cells = [value for tab in tabs for row in tab.rows for value in row if value != ""]
+    blocks = [block for tab_fills in fills.values() for block in tab_fills]
+    return {
+        "tabs": [tab.name for tab in tabs],
+        "replaced": [tab.name for tab in tabs if tab.name in existing],
+        "cells": len(cells),
+        "formulas": sum(1 for v in cells if _is_formula(v)),
+        "fills": len(blocks),
+        "filled_cells": sum(rows * span for _, _, rows, span, _ in blocks),
+        "format_ranges": sum(len(tab.formats) for tab in tabs),
+    }
+
+
+def build_model(
+    client: Any,
+    spec: ModelSpec,
+    replace: bool = False,
+    fill: bool = True,
+    arrays: bool = False,
+) -> dict[str, Any]:
+    """Generate the full 9-tab model from a confirmed spec and push it.
+
+    Args:
+        client: A connected SheetsClient.
+        spec: The confirmed model mapping.
+        replace: Rebuild tabs that already exist instead of raising.
+        fill: Send repeated formulas as server-side fills.
+        arrays: One array formula per helper block instead of per-cell
+                formulas (see arrays.py).
+
+    Returns:
+        push_tabs() summary plus the forecast horizon.
+    """
+    tabs = build_tabs(spec, arrays)
+    return {**push_tabs(client, tabs, replace, fill), "months": spec.months}
@@ -0,0 +1,182 @@
+"""Convert an existing model's per-cell helper blocks to array formulas, verified.
+
+Only blocks that still hold the exact template formulas are converted (a
+hand-edited cell means the block no longer computes what the array would).
+With verify=True the block values are read before the swap and again
+after it. Any block whose results differ in any cell is restored to its
+original per-cell formulas in the same pass.
+
+API calls: one FORMULA read, one values write; with verification two
+value reads and, only on a mismatch, one more write.
+"""
+
+from typing import Any
+
+from src.sheets.r1c1 import column_letter, formula_shifter
+
+from .arrays import arr_block, opex_row, proration_block
+from .tabs import (
+    ARR,
+    ARR_FIRST_COL,
+    HI,
+    HI_FIRST_COL,
+    OA,
+    OA_FIRST_COL,
+    arr_formula,
+    proration_formula,
+)
+
+_ARRAY_PREFIXES = ("=ARRAYFORMULA(", "=MAP(")
+
+# Per-row template blocks: first month column, per-cell formula, array formula
+_ROW_BLOCKS = {
+    HI: (HI_FIRST_COL, proration_formula, proration_block),
+    ARR: (ARR_FIRST_COL, arr_formula, arr_block),
+}
+
+
+def _pad(rows: list[list[Any]], height: int, width: int) -> list[list[Any]]:
+    """Rows as a height x width block (reads drop trailing empty cells)."""
+    rows = (rows + [[]] * height)[:height]
+    return [(list(row) + [""] * width)[:width] for row in rows]
+
+
+def _header_months(grid: list[list[Any]], first_col: int) -> int:
+    header = grid[0] if grid else []
+    months = 0
+    while first_col + months < len(header) and header[first_col + months] != "":
+        months += 1
+    return months
+
+
+def _a1(row: int, col: int, rows: int, cols: int) -> str:
+    return f"{column_letter(col)}{row}:{column_letter(col + cols - 1)}{row + rows - 1}"
+
+
+def find_blocks(
+    tab: str, grid: list[list[Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, str]]]:
+    """Convertible blocks of one helper tab, read with FORMULA rendering.
+
+    Returns:
+        (blocks, skipped). Each block has tab, row (1-based), col (0-based),
+        formulas (the per-cell block) and array (its replacement).
+    """
+    first_col = OA_FIRST_COL if tab == OA else _ROW_BLOCKS[tab][0]
+    months = _header_months(grid, first_col)
+    if not months:
+        return [], [{"tab": tab, "reason": "No month headers"}]
+
+    if tab in _ROW_BLOCKS:
+        _, per_cell, array = _ROW_BLOCKS[tab]
+        last = max((i + 1 for i, row in enumerate(grid) if i and row and row[0] != ""), default=1)
+        if last < 2:
+            return [], [{"tab": tab, "reason": "No data rows"}]
+        formulas = _pad([row[first_col:] for row in grid[1:last]], last - 1, months)
+        cols = [column_letter(first_col + m) for m in range(months)]
+        for i, row in enumerate(formulas):
+            r = i + 2
+            for m, value in enumerate(row):
+                if value != per_cell(r, cols[m]):
+                    reason = (
+                        "Already an array formula"
+                        if str(value).startswith(_ARRAY_PREFIXES)
+                        else f"{cols[m]}{r} differs from the template formula"
+                    )
+                    return [], [{"tab": tab, "reason": reason}]
+        block = {
+            "tab": tab,
+            "row": 2,
+            "col": first_col,
+            "formulas": formulas,
+            "array": array(2, last, first_col, months),
+        }
+        return [block], []
+
+    blocks, skipped = [], []
+    for i, row in enumerate(grid[1:], start=2):
+        cells = _pad([row[first_col:]], 1, months)[0]
+        seed = cells[0]
+        if not (isinstance(seed, str) and seed.startswith("=")):
+            continue  # Constant rows (e.g. % of CS without a CS department)
+        array = opex_row(seed, i, first_col, months)
+        shift = formula_shifter(seed)
+        if array is None or any(value != shift(0, m) for m, value in enumerate(cells)):
+            if not seed.startswith(_ARRAY_PREFIXES):
+                skipped.append({"tab": tab, "reason": f"Row {i} is not a template scaling row"})
+            continue
+        blocks.append({"tab": tab, "row": i, "col": first_col, "formulas": [cells], "array": array})
+    return blocks, skipped
+
+
+def refactor_to_arrays(client: Any, verify: bool = True) -> dict[str, Any]:
+    """Replace per-cell helper formulas with array formulas, verifying results.
+
+    Args:
+        client: A connected SheetsClient.
+        verify: Compare every block's values before and after and roll back
+                blocks that differ.
+
+    Returns:
+        {"converted": [{tab, range, formulas_replaced}], "rolled_back":
+        [{tab, range, first_mismatch}], "skipped": [{tab, reason}],
+        "formulas_before", "formulas_after"}.
+    """
+    names = {s["name"] for s in client.get_spreadsheet_info()["sheets"]}
+    tabs = [tab for tab in (HI, ARR, OA) if tab in names]
+    skipped = [{"tab": tab, "reason": "Tab not found"} for tab in (HI, ARR, OA) if tab not in names]
+    blocks: list[dict[str, Any]] = []
+    for tab, grid in zip(tabs, client.read_ranges([(t, "") for t in tabs], "FORMULA"), strict=True):
+        found, missed = find_blocks(tab, grid)
+        blocks += found
+        skipped += missed
+
+    report: dict[str, Any] = {"converted": [], "rolled_back": [], "skipped": skipped}
+    if not blocks:
+        return {**report, "formulas_before": 0, "formulas_after": 0}
+
+    for block in blocks:
+        height, width = len(block["formulas"]), len(block["formulas"][0])
+        block["range"] = _a1(block["row"], block["col"], height, width)
+        block["cells"] = height * width
+    ranges = [(b["tab"], b["range"]) for b in blocks]
+    before = client.read_ranges(ranges, "UNFORMATTED_VALUE") if verify else None
+
+    def array_values(block: dict[str, Any]) -> list[list[Any]]:
+        height, width = len(block["formulas"]), len(block["formulas"][0])
+        values = [[""] * width for _ in range(height)]
+        values[0][0] = block["array"]  # The rest must be empty for the array to spill
+        return values
+
+    client.write_ranges([(b["tab"], b["range"], array_values(b)) for b in blocks])
+
+    failed: list[dict[str, Any]] = []
+    if verify:
+        after = client.read_ranges(ranges, "UNFORMATTED_VALUE")
+        for block, old, new in zip(blocks, before, after, strict=True):
+            height, width = len(block["formulas"]), len(block["formulas"][0])
+            old, new = _pad(old, height, width), _pad(new, height, width)
+            if old == new:
+                continue
+            r, c = next(
+                (r, c)
+                for r in range(height)
+                for c in range(width)
+                if old[r][c] != new[r][c]
+            )
+            failed.append(block)
+            report["rolled_back"].append({
+                "tab": block["tab"],
+                "range": block["range"],
+                "first_mismatch": f"{column_letter(block['col'] + c)}{block['row'] + r}",
+            })
+        if failed:
+            client.write_ranges([(b["tab"], b["range"], b["formulas"]) for b in failed])
+
+    converted = [b for b in blocks if b not in failed]
+    report["converted"] = [
+        {"tab": b["tab"], "range": b["range"], "formulas_replaced": b["cells"]} for b in converted
+    ]
+    report["formulas_before"] = sum(b["cells"] for b in blocks)
+    report["formulas_after"] = len(converted) + sum(b["cells"] for b in failed)
+    return report
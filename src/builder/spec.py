@@ -0,0 +1,147 @@
+"""The confirmed model mapping the builder works from.
+
+A ModelSpec is what Phase 1 of skills/fpa-model.md ends with: departments,
+employees, ARR contracts, OpEx assumptions, horizon, starting cash and
+payment terms. Dates are M/D/YYYY strings or datetime.date objects.
+"""
+
+from dataclasses import dataclass, field, fields
+from datetime import date
+from typing import Any
+
+DEFAULT_DEPARTMENTS = ("G&A", "Sales", "Marketing", "Product", "Engineering", "CS")
+
+# Scaling types understood by OpEx Assumptions
+SCALING_TYPES = ("Fixed", "Per HC", "% of Revenue", "% of CS")
+SCOPES = ("COGS", "Dept", "Overall")
+
+
+def format_date(value: date | str | None) -> str:
+    """M/D/YYYY text (written USER_ENTERED, so Sheets stores a real date)."""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, date):
+        return f"{value.month}/{value.day}/{value.year}"
+    return str(value).strip()
+
+
+@dataclass
+class Employee:
+    """One Headcount Input row (annual amounts)."""
+
+    name: str
+    department: str
+    start: date | str
+    salary: float
+    title: str = ""
+    end: date | str | None = None
+    bonus: float = 0.0
+    commission: float = 0.0
+    benefits: float = 0.0
+
+
+@dataclass
+class Contract:
+    """One ARR row."""
+
+    customer: str
+    start: date | str
+    arr: float
+    type: str = "New"
+    churn: date | str | None = None
+    contract_length: int = 12
+
+
+@dataclass
+class OpexLine:
+    """One OpEx Assumptions row.
+
+    Attributes:
+        scope: COGS, Dept (direct to the department named in category) or
+            Overall (allocated by headcount share).
+        category: Department name for Dept scope, otherwise a grouping label.
+        scaling: Fixed (monthly amount), Per HC, % of Revenue or % of CS.
+        rate: Amount or rate for the scaling type.
+    """
+
+    scope: str
+    category: str
+    rate: float
+    subcategory: str = ""
+    scaling: str = "Fixed"
+
+
+@dataclass
+class ModelSpec:
+    """Everything needed to generate the 9-tab model.
+
+    Attributes:
+        start_year, start_month: First forecast month.
+        months: Planning horizon.
+        departments: Department names, in section order.
+        cs_department: Department whose cost is split into COGS (None: no split).
+        hosting_pct: Hosting COGS as a share of revenue.
+        cs_cogs_pct: Share of CS cost allocated to COGS.
+        payment_terms: Share of revenue collected 0, 1, 2... months after billing.
+        starting_cash: Beginning cash of the first month.
+    """
+
+    start_year: int
+    start_month: int
+    months: int = 24
+    departments: list[str] = field(default_factory=lambda: list(DEFAULT_DEPARTMENTS))
+    employees: list[Employee] = field(default_factory=list)
+    contracts: list[Contract] = field(default_factory=list)
+    opex: list[OpexLine] = field(default_factory=list)
+    starting_cash: float = 0.0
+    payment_terms: tuple[float, ...] = (0.4, 0.4, 0.2)
+    hosting_pct: float = 0.15
+    cs_cogs_pct: float = 0.4
+    cs_department: str | None = "CS"
+
+    def __post_init__(self):
+        self.validate()
+
+    def validate(self):
+        """Raise ValueError on a mapping the template cannot represent."""
+        if not 1 <= self.start_month <= 12:
+            raise ValueError(f"start_month must be 1-12, got {self.start_month}")
+        if self.months < 1:
+            raise ValueError("months must be at least 1")
+        if not self.departments or len(set(self.departments)) != len(self.departments):
+            raise ValueError("departments must be a non-empty list of unique names")
+        if not self.payment_terms:
+            raise ValueError("payment_terms needs at least one share")
+        if self.cs_department is not None and self.cs_department not in self.departments:
+            self.cs_department = None
+        unknown = sorted({e.department for e in self.employees} - set(self.departments))
+        if unknown:
+            raise ValueError(f"Employees in unknown departments: {', '.join(unknown)}")
+        for line in self.opex:
+            if line.scope not in SCOPES:
+                raise ValueError(f"OpEx scope must be one of {', '.join(SCOPES)}: {line.scope!r}")
+            if line.scaling not in SCALING_TYPES:
+                raise ValueError(
+                    f"OpEx scaling must be one of {', '.join(SCALING_TYPES)}: {line.scaling!r}"
+                )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ModelSpec":
+        """Build a spec from JSON (e.g. the build_model tool input)."""
+        items = {"employees": Employee, "contracts": Contract, "opex": OpexLine}
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown model spec fields: {', '.join(sorted(unknown))}")
+        kwargs: dict[str, Any] = {}
+        for name, value in data.items():
+            if name in items:
+                try:
+                    kwargs[name] = [items[name](**item) for item in value]
+                except TypeError as e:
+                    raise ValueError(f"Invalid {name} entry: {e}") from None
+            elif name == "payment_terms":
+                kwargs[name] = tuple(value)
+            else:
+                kwargs[name] = value
+        return cls(**kwargs)
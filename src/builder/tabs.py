@@ -0,0 +1,694 @@
+"""Generate every tab of the model in memory from template_specs.md patterns.
+
+Each tab is a grid of values and formulas (written USER_ENTERED) plus
+number-format blocks and frozen panes. Row numbers follow the template for
+the six default departments; other department lists shift the
+department-driven blocks (Headcount Summary, Costs by Department and the
+OpEx rows of the summaries) the same way a hand build would.
+"""
+
+import calendar
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.sheets.r1c1 import column_letter
+
+from .arrays import arr_block, opex_row, proration_block
+from .spec import Contract, Employee, ModelSpec, format_date
+
+CURRENCY = "$#,##0"
+PERCENT = "0.0%"
+DATE = "M/d/yyyy"
+COUNT = "0"
+RATIO = "0.00"
+
+# Ranges over input tabs reach at least this row, so rows can be added by hand
+MIN_RANGE_END = 100
+
+MS, QS = "Monthly Summary", "Quarterly Summary"
+HI, HS = "Headcount Input", "Headcount Summary"
+ARR, AS = "ARR", "ARR Summary"
+OA, CD, CF = "OpEx Assumptions", "Costs by Department", "Cash Flow"
+
+# First month column (0-based) per tab
+SUMMARY_FIRST_COL = 2  # C
+HI_FIRST_COL = 9  # J
+ARR_FIRST_COL = 6  # G
+OA_FIRST_COL = 5  # F
+
+# OpEx Assumptions fixed rows
+OA_HOSTING_ROW = 3
+OA_CS_ROW = 4
+OA_FIRST_LINE_ROW = 5
+
+
+@dataclass
+class Tab:
+    """One tab's cells, number formats and frozen panes.
+
+    Attributes:
+        rows: Cell values and formulas; rows[0] is sheet row 1.
+        formats: (start_row, end_row, start_col, end_col, pattern) blocks,
+            0-based and end-exclusive like a GridRange.
+    """
+
+    name: str
+    rows: list[list[Any]] = field(default_factory=list)
+    formats: list[tuple[int, int, int, int, str]] = field(default_factory=list)
+    frozen_rows: int = 0
+    frozen_columns: int = 0
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+    @property
+    def width(self) -> int:
+        return max((len(r) for r in self.rows), default=0)
+
+    def put(self, row: int, col: int, value: Any):
+        """Set the cell at sheet row (1-based) and column index (0-based)."""
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        if len(cells) <= col:
+            cells.extend([""] * (col + 1 - len(cells)))
+        cells[col] = value
+
+    def put_row(self, row: int, label: str, values: list[Any], first_col: int, fmt: str = ""):
+        """Label in column A and one value per month from first_col, optionally formatted."""
+        if label:
+            self.put(row, 0, label)
+        for i, value in enumerate(values):
+            self.put(row, first_col + i, value)
+        if fmt and values:
+            self.format(row, row, first_col, first_col + len(values) - 1, fmt)
+
+    def format(self, first_row: int, last_row: int, first_col: int, last_col: int, pattern: str):
+        """Apply a number format to sheet rows and column indices (inclusive)."""
+        self.formats.append((first_row - 1, last_row, first_col, last_col + 1, pattern))
+
+    def get(self, row: int, col: int) -> Any:
+        """Cell at sheet row (1-based) and column index, "" if unset."""
+        if row > len(self.rows) or col >= len(self.rows[row - 1]):
+            return ""
+        return self.rows[row - 1][col]
+
+
+@dataclass
+class Layout:
+    """Row numbers that depend on the department list."""
+
+    departments: list[str]
+    cs: str | None
+
+    def __post_init__(self):
+        n = len(self.departments)
+        # Headcount Summary: five blocks of header, one row per department, total
+        self.hs_blocks = {
+            key: 3 + k * (n + 3)
+            for k, key in enumerate(("hc", "salary", "bonus", "commission", "total_comp"))
+        }
+
+        # Costs by Department: one section per department, then totals and COGS
+        self.cd_sections: dict[str, dict[str, int]] = {}
+        row = 3
+        for dept in self.departments:
+            rows = {"header": row, "salary": row + 1, "bonus": row + 2, "allocated": row + 3}
+            if dept == self.cs:
+                rows.update(subtotal=row + 4, less_cogs=row + 5, total=row + 6)
+            else:
+                rows["total"] = row + 4
+            self.cd_sections[dept] = rows
+            row = rows["total"] + 2
+        self.cd_total_opex = row
+        self.cd_cogs_header = row + 2
+        self.cd_hosting = row + 3
+        self.cd_cs_cogs = row + 4 if self.cs else None
+        self.cd_total_cogs = self.cd_hosting + (2 if self.cs else 1)
+        self.cd_total_expenses = self.cd_total_cogs + 1
+
+        # Monthly / Quarterly Summary: fixed top, one OpEx row per department
+        self.ms_dept = {dept: 16 + i for i, dept in enumerate(self.departments)}
+        self.ms_total_opex = 16 + n
+        self.ms_ebitda = self.ms_total_opex + 2
+        self.ms_op_margin = self.ms_ebitda + 1
+        self.ms_saas_header = self.ms_op_margin + 3
+        self.ms_magic = self.ms_saas_header + 1
+        self.ms_nna_burn = self.ms_saas_header + 2
+        self.ms_nrr = self.ms_saas_header + 3
+        self.ms_cash_header = self.ms_nrr + 2
+        self.ms_burn = self.ms_cash_header + 1
+        self.ms_ending_cash = self.ms_cash_header + 2
+
+    def hs_row(self, block: str, dept: str) -> int:
+        return self.hs_blocks[block] + 1 + self.departments.index(dept)
+
+    def hs_total(self, block: str) -> int:
+        return self.hs_blocks[block] + 1 + len(self.departments)
+
+
+def _quarter_label(c: str) -> str:
+    return f'=IF({c}2="","","Q"&ROUNDUP(MONTH({c}2)/3,0)&"-"&RIGHT(YEAR({c}2),2))'
+
+
+def _summary_header(tab: Tab, months: int):
+    """Quarter labels (row 1) and month-end dates from Monthly Summary (row 2)."""
+    cols = [column_letter(SUMMARY_FIRST_COL + m) for m in range(months)]
+    tab.put_row(1, "", [_quarter_label(c) for c in cols], SUMMARY_FIRST_COL)
+    dates = [f"='{MS}'!{c}$2" for c in cols]
+    tab.put_row(2, "", dates, SUMMARY_FIRST_COL, DATE)
+    tab.frozen_rows, tab.frozen_columns = 2, 2
+
+
+def _month_cols(first_col: int, months: int) -> list[str]:
+    return [column_letter(first_col + m) for m in range(months)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Input tabs
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def proration_formula(r: int, c: str) -> str:
+    """Headcount Input monthly cost (prorated Salary + Benefits) for row r, column c."""
+    return (
+        f'=IF(OR($D{r}>{c}$1,AND($E{r}<>"",$E{r}<EOMONTH({c}$1,-1)+1)),0,'
+        f'IF(AND($D{r}<=EOMONTH({c}$1,-1)+1,OR($E{r}="",$E{r}>={c}$1)),'
+        f"($F{r}+$I{r})/12,"
+        f'($F{r}+$I{r})/12*(MIN(IF($E{r}="",{c}$1,$E{r}),{c}$1)'
+        f"-MAX($D{r},EOMONTH({c}$1,-1)+1)+1)/DAY({c}$1)))"
+    )
+
+
+def arr_formula(r: int, c: str) -> str:
+    """ARR helper cell: the contract's ARR while active in the month, else 0."""
+    return f'=IF(AND($C{r}<={c}$1,OR($E{r}="",$E{r}>{c}$1)),$D{r},0)'
+
+
+def employee_row(e: Employee) -> list[Any]:
+    """Headcount Input columns A-I for one employee."""
+    return [
+        e.name,
+        e.department,
+        e.title,
+        format_date(e.start),
+        format_date(e.end),
+        e.salary,
+        e.bonus,
+        e.commission,
+        e.benefits,
+    ]
+
+
+def contract_row(contract: Contract) -> list[Any]:
+    """ARR columns A-F for one contract."""
+    return [
+        contract.customer,
+        contract.type,
+        format_date(contract.start),
+        contract.arr,
+        format_date(contract.churn),
+        contract.contract_length,
+    ]
+
+
+def headcount_input(spec: ModelSpec, arrays: bool = False) -> Tab:
+    tab = Tab(HI, frozen_rows=1, frozen_columns=1)
+    headers = [
+        "Name",
+        "Department",
+        "Title",
+        "Start Date",
+        "End Date",
+        "Base Salary",
+        "Bonus",
+        "Commission",
+        "Benefits",
+    ]
+    cols = _month_cols(HI_FIRST_COL, spec.months)
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    tab.rows.append(headers)
+    tab.put_row(1, "", [f"='{MS}'!{c}$2" for c in summary], HI_FIRST_COL, DATE)
+
+    for i, e in enumerate(spec.employees):
+        r = i + 2
+        tab.rows.append(employee_row(e))
+        if not arrays:
+            tab.put_row(r, "", [proration_formula(r, c) for c in cols], HI_FIRST_COL)
+    last = len(spec.employees) + 1
+    if arrays and spec.employees:
+        tab.put(2, HI_FIRST_COL, proration_block(2, last, HI_FIRST_COL, spec.months))
+    if spec.employees:
+        tab.format(2, last, 3, 4, DATE)
+        tab.format(2, last, 5, 8, CURRENCY)
+        tab.format(2, last, HI_FIRST_COL, HI_FIRST_COL + spec.months - 1, CURRENCY)
+    return tab
+
+
+def arr_input(spec: ModelSpec, arrays: bool = False) -> Tab:
+    tab = Tab(ARR, frozen_rows=1, frozen_columns=1)
+    tab.rows.append(["Customer", "Type", "Start Date", "ARR", "Churn Date", "Contract Length"])
+    cols = _month_cols(ARR_FIRST_COL, spec.months)
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    tab.put_row(1, "", [f"='{MS}'!{c}$2" for c in summary], ARR_FIRST_COL, DATE)
+
+    for i, contract in enumerate(spec.contracts):
+        r = i + 2
+        tab.rows.append(contract_row(contract))
+        if not arrays:
+            tab.put_row(r, "", [arr_formula(r, c) for c in cols], ARR_FIRST_COL)
+    last = len(spec.contracts) + 1
+    if arrays and spec.contracts:
+        tab.put(2, ARR_FIRST_COL, arr_block(2, last, ARR_FIRST_COL, spec.months))
+    if spec.contracts:
+        tab.format(2, last, 2, 2, DATE)
+        tab.format(2, last, 4, 4, DATE)
+        tab.format(2, last, 3, 3, CURRENCY)
+        tab.format(2, last, ARR_FIRST_COL, ARR_FIRST_COL + spec.months - 1, CURRENCY)
+    return tab
+
+
+def opex_assumptions(spec: ModelSpec, layout: Layout, arrays: bool = False) -> Tab:
+    tab = Tab(OA, frozen_rows=1, frozen_columns=2)
+    tab.rows.append(["Scope", "Category", "Subcategory", "Scaling Type", "Rate/Amount"])
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    tab.put_row(1, "", [f"='{MS}'!{c}$2" for c in summary], OA_FIRST_COL, DATE)
+    hc_total = layout.hs_total("hc")
+    cs_subtotal = layout.cd_sections[layout.cs]["subtotal"] if layout.cs else None
+
+    def monthly(r: int, scaling: str) -> list[str]:
+        match scaling:
+            case "Fixed":
+                return [f"=$E{r}" for _ in summary]
+            case "Per HC":
+                return [f"=$E{r}*'{HS}'!{c}{hc_total}" for c in summary]
+            case "% of Revenue":
+                return [f"=$E{r}*'{AS}'!{c}4" for c in summary]
+            case _:  # % of CS
+                if cs_subtotal is None:
+                    return [0 for _ in summary]
+                return [f"=$E{r}*'{CD}'!{c}{cs_subtotal}" for c in summary]
+
+    lines = [
+        ("COGS", "Hosting", "AWS/Cloud", "% of Revenue", spec.hosting_pct),
+        ("COGS", "CS", "Allocation to COGS", "% of CS", spec.cs_cogs_pct),
+    ] + [(o.scope, o.category, o.subcategory, o.scaling, o.rate) for o in spec.opex]
+    for i, (scope, category, subcategory, scaling, rate) in enumerate(lines):
+        r = OA_HOSTING_ROW + i
+        tab.put(r, 0, scope)
+        tab.put(r, 1, category)
+        tab.put(r, 2, subcategory)
+        tab.put(r, 3, scaling)
+        tab.put(r, 4, rate)
+        tab.format(r, r, 4, 4, PERCENT if scaling.startswith("%") else CURRENCY)
+        values = monthly(r, scaling)
+        if arrays and isinstance(values[0], str):
+            tab.put(r, OA_FIRST_COL, opex_row(values[0], r, OA_FIRST_COL, spec.months))
+            tab.format(r, r, OA_FIRST_COL, OA_FIRST_COL + spec.months - 1, CURRENCY)
+        else:
+            tab.put_row(r, "", values, OA_FIRST_COL, CURRENCY)
+    return tab
+
+
+
+
+def _range_end(rows: int) -> int:
+    return max(MIN_RANGE_END, rows)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Summary tabs
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def headcount_summary(spec: ModelSpec, layout: Layout) -> Tab:
+    tab = Tab(HS)
+    _summary_header(tab, spec.months)
+    end = _range_end(len(spec.employees) + 1)
+    dept = f"'{HI}'!$B$2:$B${end}"
+    sections = {
+        "hc": ("Month-ending Headcount", "Total HC", COUNT),
+        "salary": ("Salary + Benefits", "Total Salary + Benefits", CURRENCY),
+        "bonus": ("Bonus", "Total Bonus", CURRENCY),
+        "commission": ("Commission", "Total Commission", CURRENCY),
+        "total_comp": ("Total Compensation", "Total", CURRENCY),
+    }
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    cols = _month_cols(HI_FIRST_COL, spec.months)
+
+    def formula(block: str, d: str, r: int, c: str, h: str) -> str:
+        cost = f"'{HI}'!{h}$2:{h}${end}"
+        match block:
+            case "hc":
+                return f"=SUMPRODUCT(({dept}=$A{r})*({cost}>0))"
+            case "salary":
+                return f"=SUMIF({dept},$A{r},{cost})"
+            case "bonus" | "commission":
+                amount = "G" if block == "bonus" else "H"
+                return (
+                    f"=SUMPRODUCT(({dept}=$A{r})*({cost}>0)"
+                    f"*('{HI}'!${amount}$2:${amount}${end}/12))"
+                )
+        parts = (layout.hs_row(b, d) for b in ("salary", "bonus", "commission"))
+        return "=" + "+".join(f"{c}{p}" for p in parts)
+
+    for block, (title, total_label, fmt) in sections.items():
+        tab.put(layout.hs_blocks[block], 0, title)
+        for d in layout.departments:
+            r = layout.hs_row(block, d)
+            values = [formula(block, d, r, c, h) for c, h in zip(summary, cols, strict=True)]
+            tab.put_row(r, d, values, SUMMARY_FIRST_COL, fmt)
+        first, total = layout.hs_row(block, layout.departments[0]), layout.hs_total(block)
+        values = [f"=SUM({c}{first}:{c}{total - 1})" for c in summary]
+        tab.put_row(total, total_label, values, SUMMARY_FIRST_COL, fmt)
+    return tab
+
+
+def arr_summary(spec: ModelSpec) -> Tab:
+    tab = Tab(AS)
+    _summary_header(tab, spec.months)
+    end = _range_end(len(spec.contracts) + 1)
+    kind, start, arr, churn = (f"'{ARR}'!${col}$2:${col}${end}" for col in "BCDE")
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    cols = _month_cols(ARR_FIRST_COL, spec.months)
+
+    def started(c: str) -> str:
+        return f"({start}>EOMONTH({c}$2,-1))*({start}<={c}$2)"
+
+    def churned(c: str) -> str:
+        return f'({churn}<>"")*({churn}>EOMONTH({c}$2,-1))*({churn}<={c}$2)'
+
+    tab.put(3, 0, "Revenue")
+    rows = [
+        (4, "MRR", [f"=SUM('{ARR}'!{a}2:{a}{end})/12" for a in cols], CURRENCY),
+        (5, "ARR", [f"={c}4*12" for c in summary], CURRENCY),
+        (8, "Active Customers", [f"=COUNTIF('{ARR}'!{a}2:{a}{end},\">0\")" for a in cols], COUNT),
+        (9, "New Customers", [f'=SUMPRODUCT(({kind}="New")*{started(c)})' for c in summary], COUNT),
+        (10, "Churned Customers", [f"=SUMPRODUCT({churned(c)})" for c in summary], COUNT),
+        (
+            13,
+            "New ARR",
+            [f'=SUMPRODUCT(({kind}="New")*{started(c)}*{arr})' for c in summary],
+            CURRENCY,
+        ),
+        (
+            14,
+            "Expansion ARR",
+            [f'=SUMPRODUCT(({kind}="Expansion")*{started(c)}*{arr})' for c in summary],
+            CURRENCY,
+        ),
+        (15, "Churned ARR", [f"=SUMPRODUCT({churned(c)}*{arr})" for c in summary], CURRENCY),
+        (16, "Net New ARR", [f"={c}13+{c}14-{c}15" for c in summary], CURRENCY),
+    ]
+    tab.put(7, 0, "Customers")
+    tab.put(12, 0, "ARR Movement")
+    for r, label, values, fmt in rows:
+        tab.put_row(r, label, values, SUMMARY_FIRST_COL, fmt)
+    return tab
+
+
+def costs_by_department(spec: ModelSpec, layout: Layout) -> Tab:
+    tab = Tab(CD)
+    _summary_header(tab, spec.months)
+    end = _range_end(OA_FIRST_LINE_ROW + len(spec.opex) - 1)
+    scope, category = f"'{OA}'!$A$2:$A${end}", f"'{OA}'!$B$2:$B${end}"
+    hc_total = layout.hs_total("hc")
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    pairs = list(zip(summary, _month_cols(OA_FIRST_COL, spec.months), strict=True))
+
+    def allocated(d: str, h: int, c: str, o: str) -> str:
+        cost = f"'{OA}'!{o}$2:{o}${end}"
+        total, dept = f"'{HS}'!{c}{hc_total}", f"'{HS}'!{c}{layout.hs_row('hc', d)}"
+        return (
+            f'=IF({total}=0,0,{dept}/{total}*SUMIF({scope},"Overall",{cost}))'
+            f'+SUMIFS({cost},{scope},"Dept",{category},$A{h})'
+        )
+
+    for d, rows in layout.cd_sections.items():
+        h = rows["header"]
+        salary, bonus = layout.hs_row("salary", d), layout.hs_row("bonus", d)
+        commission = layout.hs_row("commission", d)
+        tab.put(h, 0, d)
+        lines = [
+            ("salary", "Salary + Benefits", [f"='{HS}'!{c}{salary}" for c in summary]),
+            (
+                "bonus",
+                "Bonus + Commission",
+                [f"='{HS}'!{c}{bonus}+'{HS}'!{c}{commission}" for c in summary],
+            ),
+            ("allocated", "Allocated OpEx", [allocated(d, h, c, o) for c, o in pairs]),
+        ]
+        sum_row = rows.get("subtotal", rows["total"])
+        sum_values = [f"=SUM({c}{h + 1}:{c}{h + 3})" for c in summary]
+        if "subtotal" in rows:
+            lines += [
+                ("subtotal", f"{d} Subtotal", sum_values),
+                (
+                    "less_cogs",
+                    f"Less: {d} to COGS",
+                    [f"=-{c}{sum_row}*'{OA}'!$E${OA_CS_ROW}" for c in summary],
+                ),
+                (
+                    "total",
+                    f"{d} Total (OpEx)",
+                    [f"={c}{sum_row}+{c}{rows['less_cogs']}" for c in summary],
+                ),
+            ]
+        else:
+            lines.append(("total", f"Total {d}", sum_values))
+        for key, label, values in lines:
+            tab.put_row(rows[key], label, values, SUMMARY_FIRST_COL, CURRENCY)
+
+    totals = [rows["total"] for rows in layout.cd_sections.values()]
+    tab.put_row(
+        layout.cd_total_opex,
+        "Total Operating Expenses",
+        ["=" + "+".join(f"{c}{t}" for t in totals) for c in summary],
+        SUMMARY_FIRST_COL,
+        CURRENCY,
+    )
+    tab.put(layout.cd_cogs_header, 0, "COGS")
+    tab.put_row(
+        layout.cd_hosting,
+        "Hosting",
+        [f"='{OA}'!{o}{OA_HOSTING_ROW}" for _, o in pairs],
+        SUMMARY_FIRST_COL,
+        CURRENCY,
+    )
+    if layout.cs:
+        subtotal = layout.cd_sections[layout.cs]["subtotal"]
+        tab.put_row(
+            layout.cd_cs_cogs,
+            f"{layout.cs} (COGS)",
+            [f"={c}{subtotal}*'{OA}'!$E${OA_CS_ROW}" for c in summary],
+            SUMMARY_FIRST_COL,
+            CURRENCY,
+        )
+    cogs = f"{layout.cd_hosting}:{{c}}{layout.cd_total_cogs - 1}"
+    tab.put_row(
+        layout.cd_total_cogs,
+        "Total COGS",
+        [f"=SUM({c}{cogs.format(c=c)})" for c in summary],
+        SUMMARY_FIRST_COL,
+        CURRENCY,
+    )
+    tab.put_row(
+        layout.cd_total_expenses,
+        "Total Expenses",
+        [f"={c}{layout.cd_total_opex}+{c}{layout.cd_total_cogs}" for c in summary],
+        SUMMARY_FIRST_COL,
+        CURRENCY,
+    )
+    return tab
+
+
+def cash_flow(spec: ModelSpec, layout: Layout) -> Tab:
+    tab = Tab(CF)
+    _summary_header(tab, spec.months)
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    prev = [""] + summary[:-1]
+
+    def collections(m: int) -> str:
+        parts = [
+            f"'{AS}'!{summary[m - lag]}4*{share:g}"
+            for lag, share in enumerate(spec.payment_terms)
+            if m - lag >= 0
+        ]
+        return "=" + "+".join(parts)
+
+    rows = [
+        (
+            3,
+            "Beginning Cash Balance",
+            [spec.starting_cash] + [f"={p}13" for p in prev[1:]],
+        ),
+        (5, "Cash Collections", [collections(m) for m in range(spec.months)]),
+        (6, "Operating Cash Out", [f"='{CD}'!{c}{layout.cd_total_expenses}" for c in summary]),
+        (7, "Operating Cash Burn", [f"={c}6-{c}5" for c in summary]),
+        (8, "Interest Income", [0] * spec.months),
+        (9, "Interest Expense", [0] * spec.months),
+        (10, "Other", [0] * spec.months),
+        (11, "Total Cash Change", [f"=-{c}7+SUM({c}8:{c}10)" for c in summary]),
+        (13, "Ending Cash Balance", [f"={c}3+{c}11" for c in summary]),
+    ]
+    for r, label, values in rows:
+        tab.put_row(r, label, values, SUMMARY_FIRST_COL, CURRENCY)
+    return tab
+
+
+def _summary_lines(layout: Layout) -> list[tuple[int, str, str, str]]:
+    """(row, label, quarterly aggregation, format) for Monthly/Quarterly Summary."""
+    lines = [
+        (4, "Starting ARR", "first", CURRENCY),
+        (5, "New ARR", "sum", CURRENCY),
+        (6, "Expansion ARR", "sum", CURRENCY),
+        (7, "Churned ARR", "sum", CURRENCY),
+        (8, "Ending ARR", "last", CURRENCY),
+        (10, "Revenue (MRR)", "sum", CURRENCY),
+        (11, "Cost of Revenue (COGS)", "sum", CURRENCY),
+        (12, "Gross Profit", "sum", CURRENCY),
+        (13, "Gross Margin %", "average", PERCENT),
+    ]
+    lines += [(r, d, "sum", CURRENCY) for d, r in layout.ms_dept.items()]
+    lines += [
+        (layout.ms_total_opex, "Total Operating Expenses", "sum", CURRENCY),
+        (layout.ms_ebitda, "Operating Income (EBITDA)", "sum", CURRENCY),
+        (layout.ms_op_margin, "Operating Margin %", "average", PERCENT),
+        (layout.ms_magic, "Magic Number", "average", RATIO),
+        (layout.ms_nna_burn, "Net New ARR / Burn", "average", RATIO),
+        (layout.ms_nrr, "NRR", "average", PERCENT),
+        (layout.ms_burn, "Operating Cash Burn", "sum", CURRENCY),
+        (layout.ms_ending_cash, "Ending Cash Balance", "last", CURRENCY),
+    ]
+    return lines
+
+
+def _summary_headers(tab: Tab, layout: Layout):
+    tab.put(3, 0, "ARR Waterfall")
+    tab.put(9, 0, "Income Statement")
+    tab.put(15, 0, "Operating Expenses")
+    tab.put(layout.ms_saas_header, 0, "SaaS Metrics")
+    tab.put(layout.ms_cash_header, 0, "Cash")
+
+
+def monthly_summary(spec: ModelSpec, layout: Layout) -> Tab:
+    tab = Tab(MS)
+    _summary_header(tab, spec.months)
+    summary = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    last_day = calendar.monthrange(spec.start_year, spec.start_month)[1]
+    dates = [f"=DATE({spec.start_year},{spec.start_month},{last_day})"]
+    dates += [f"=EOMONTH({p}2+1,0)" for p in summary[:-1]]
+    tab.put_row(2, "", dates, SUMMARY_FIRST_COL, DATE)
+
+    net_new = "({c}5+{c}6-{c}7)"
+    sm = [layout.ms_dept[d] for d in ("Sales", "Marketing") if d in layout.ms_dept]
+    burn = layout.ms_burn
+    dept_totals = {d: rows["total"] for d, rows in layout.cd_sections.items()}
+
+    def formula(r: int, m: int) -> Any:
+        c, p = summary[m], summary[m - 1] if m else ""
+        match r:
+            case 4:
+                return f"='{AS}'!C5-'{AS}'!C16" if m == 0 else f"={p}8"
+            case 5 | 6 | 7:
+                return f"='{AS}'!{c}{r + 8}"
+            case 8:
+                return f"={c}4+{c}5+{c}6-{c}7"
+            case 10:
+                return f"='{AS}'!{c}4"
+            case 11:
+                return f"='{CD}'!{c}{layout.cd_total_cogs}"
+            case 12:
+                return f"={c}10-{c}11"
+            case 13:
+                return f"=IF({c}10=0,0,{c}12/{c}10)"
+            case layout.ms_total_opex:
+                return f"='{CD}'!{c}{layout.cd_total_opex}"
+            case layout.ms_ebitda:
+                return f"={c}12-{c}{layout.ms_total_opex}"
+            case layout.ms_op_margin:
+                return f"=IF({c}10=0,0,{c}{layout.ms_ebitda}/{c}10)"
+            case layout.ms_magic:
+                if m == 0 or not sm:
+                    return ""
+                spend = "+".join(f"{p}{s}" for s in sm)
+                return f"=IF(({spend})=0,0,{net_new.format(c=c)}/({spend}))"
+            case layout.ms_nna_burn:
+                return f"=IF({c}{burn}<=0,0,{net_new.format(c=c)}/{c}{burn})"
+            case layout.ms_nrr:
+                return f"=IF({c}4=0,0,({c}4+{c}6-{c}7)/{c}4)"
+            case layout.ms_burn:
+                return f"='{CF}'!{c}7"
+            case layout.ms_ending_cash:
+                return f"='{CF}'!{c}13"
+        dept = next(d for d, row in layout.ms_dept.items() if row == r)
+        return f"='{CD}'!{c}{dept_totals[dept]}"
+
+    _summary_headers(tab, layout)
+    for r, label, _, fmt in _summary_lines(layout):
+        tab.put_row(r, label, [formula(r, m) for m in range(spec.months)], SUMMARY_FIRST_COL, fmt)
+    return tab
+
+
+def quarters(spec: ModelSpec) -> list[tuple[str, int]]:
+    """(label, index of the quarter's last month) for each quarter in the horizon."""
+    result: list[tuple[str, int]] = []
+    for m in range(spec.months):
+        year, month = divmod(spec.start_year * 12 + spec.start_month - 1 + m, 12)
+        label = f"Q{month // 3 + 1}-{year % 100:02d}"
+        if result and result[-1][0] == label:
+            result[-1] = (label, m)
+        else:
+            result.append((label, m))
+    return result
+
+
+def quarterly_summary(spec: ModelSpec, layout: Layout) -> Tab:
+    tab = Tab(QS, frozen_rows=2, frozen_columns=2)
+    periods = quarters(spec)
+    last = column_letter(SUMMARY_FIRST_COL + spec.months - 1)
+    cols = _month_cols(SUMMARY_FIRST_COL, len(periods))
+    labels = f"'{MS}'!$C$1:${last}$1"
+    ms_cols = _month_cols(SUMMARY_FIRST_COL, spec.months)
+    tab.put_row(1, "", [label for label, _ in periods], SUMMARY_FIRST_COL)
+    dates = [f"='{MS}'!{ms_cols[m]}$2" for _, m in periods]
+    tab.put_row(2, "", dates, SUMMARY_FIRST_COL, DATE)
+
+    def formula(r: int, agg: str, c: str) -> str:
+        values = f"'{MS}'!$C{r}:${last}{r}"
+        match agg:
+            case "sum":
+                return f"=SUMIF({labels},{c}$1,{values})"
+            case "average":
+                return f"=AVERAGEIF({labels},{c}$1,{values})"
+            case "first":
+                return f"=INDEX({values},MATCH({c}$1,{labels},0))"
+        return f"=INDEX({values},MATCH({c}$1,{labels},0)+COUNTIF({labels},{c}$1)-1)"
+
+    _summary_headers(tab, layout)
+    for r, label, agg, fmt in _summary_lines(layout):
+        tab.put_row(r, label, [formula(r, agg, c) for c in cols], SUMMARY_FIRST_COL, fmt)
+    return tab
+
+
+def build_tabs(spec: ModelSpec, arrays: bool = False) -> list[Tab]:
+    """Every tab of the model, in template order.
+
+    Args:
+        spec: The confirmed model mapping.
+        arrays: Emit one array formula per helper block (Headcount Input,
+                ARR, each OpEx Assumptions row) instead of per-cell formulas.
+    """
+    layout = Layout(list(spec.departments), spec.cs_department)
+    return [
+        monthly_summary(spec, layout),
+        quarterly_summary(spec, layout),
+        headcount_input(spec, arrays),
+        headcount_summary(spec, layout),
+        arr_input(spec, arrays),
+        arr_summary(spec),
+        opex_assumptions(spec, layout, arrays),
+        costs_by_department(spec, layout),
+        cash_flow(spec, layout),
+    ]
@@ -0,0 +1,7 @@
+"""Warm daemon (`fpa-agent serve`) and its SheetsClient-compatible proxy."""
+
+from .protocol import DaemonError
+from .proxy import DaemonClient, connect
+from .server import DaemonServer, serve_main
+
+__all__ = ["DaemonClient", "DaemonError", "DaemonServer", "connect", "serve_main"]
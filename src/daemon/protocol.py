@@ -0,0 +1,146 @@
+"""Wire format shared by the daemon and its proxy client.
+
+Requests and responses are single JSON objects, one per line:
+
+    -> {"id": 1, "spreadsheet_id": "abc", "method": "read_range", "args": [...], "kwargs": {...}}
+    <- {"id": 1, "result": ...}
+    <- {"id": 1, "error": {"type": "ValueError", "message": "..."}}
+
+Values JSON cannot carry natively (NumericRange) are tagged with "__type__";
+NumPy results and formula errors from evaluate travel as plain lists,
+numbers and error codes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SOCKET_PATH = Path.home() / ".fpa-agent" / "daemon.sock"
+
+# SheetsClient methods callable through the daemon
+PROXIED_METHODS = frozenset({
+    "get_spreadsheet_info",
+    "read_range",
+    "read_formulas",
+    "read_numeric",
+    "read_ranges",
+    "inspect_sheet",
+    "get_sheet_id",
+    "write_range",
+    "write_ranges",
+    "append_rows",
+    "clear_range",
+    "batch_update",
+    "set_freeze",
+    "format_range",
+    "fill_formula_row",
+    "fill_formula_block",
+    "save_local",
+    "pop_written",
+})
+
+# Operations the daemon runs on a session's cached state (see server.DaemonSession)
+SESSION_METHODS = frozenset({"model_structure", "resolve_cell", "evaluate"})
+
+# Proxied methods that leave the spreadsheet unchanged (others drop cached values)
+READ_METHODS = frozenset({
+    "get_spreadsheet_info",
+    "read_range",
+    "read_formulas",
+    "read_numeric",
+    "read_ranges",
+    "inspect_sheet",
+    "get_sheet_id",
+    "save_local",
+    "pop_written",
+})
+
+# Errors re-raised with their original type on the proxy side; anything else
+# arrives as DaemonError
+PASSTHROUGH_ERRORS = {
+    "ValueError": ValueError,
+    "KeyError": KeyError,
+    "FileNotFoundError": FileNotFoundError,
+    "RuntimeError": RuntimeError,
+}
+
+
+class DaemonError(RuntimeError):
+    """An error raised inside the daemon that has no local equivalent."""
+
+
+def socket_path(path: str | Path | None = None) -> Path:
+    """Socket path: explicit, else FPA_DAEMON_SOCKET, else ~/.fpa-agent/daemon.sock."""
+    if path:
+        return Path(path).expanduser()
+    env = os.getenv("FPA_DAEMON_SOCKET")
+    return Path(env).expanduser() if env else DEFAULT_SOCKET_PATH
+
+
+def _encode_value(value: Any) -> Any:
+    import numpy as np
+
+    from src.analysis.formula import Error
+    from src.sheets.numeric import NumericRange
+
+    if isinstance(value, np.ndarray | np.generic):
+        return value.tolist()
+    if isinstance(value, Error):
+        return value.code
+
+    if isinstance(value, NumericRange):
+        return {
+            "__type__": "NumericRange",
+            "sheet_name": value.sheet_name,
+            "range_spec": value.range_spec,
+            "origin_row": value.origin_row,
+            "origin_col": value.origin_col,
+            "values": [[None if v != v else v for v in row] for row in value.values.tolist()],
+            "row_labels": value.row_labels,
+        }
+    raise TypeError(f"Cannot send {type(value).__name__} over the daemon socket")
+
+
+def _decode_value(obj: dict[str, Any]) -> Any:
+    if obj.get("__type__") == "NumericRange":
+        import numpy as np
+
+        from src.sheets.numeric import NumericRange
+
+        values = np.array(
+            [[np.nan if v is None else v for v in row] for row in obj["values"]], dtype=float
+        ).reshape(len(obj["values"]), -1)
+        return NumericRange(
+            obj["sheet_name"],
+            obj["range_spec"],
+            obj["origin_row"],
+            obj["origin_col"],
+            values,
+            np.isnan(values),
+            obj["row_labels"],
+        )
+    return obj
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    """Serialize one message as a JSON line."""
+    return (json.dumps(message, default=_encode_value) + "\n").encode()
+
+
+def decode(line: bytes) -> dict[str, Any]:
+    """Parse one JSON line."""
+    return json.loads(line, object_hook=_decode_value)
+
+
+def error_payload(e: BaseException) -> dict[str, str]:
+    message = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+    return {"type": type(e).__name__, "message": str(message)}
+
+
+def raise_error(payload: dict[str, str]):
+    """Re-raise a daemon error locally."""
+    error_type = PASSTHROUGH_ERRORS.get(payload["type"])
+    if error_type is not None:
+        raise error_type(payload["message"])
+    raise DaemonError(f"{payload['type']}: {payload['message']}")
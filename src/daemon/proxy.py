@@ -0,0 +1,138 @@
+"""Thin client for the warm daemon with the SheetsClient interface.
+
+    from src.daemon import connect
+    client = connect("https://docs.google.com/spreadsheets/d/.../edit")
+    client.read_range("ARR", "A1:F20")
+
+connect() returns a DaemonClient when `fpa-agent serve` is running and falls
+back to a regular in-process SheetsClient otherwise, so callers do not need
+to care which one they got. A DaemonClient also runs model_structure,
+resolve_cell and evaluate on the daemon's cached structure map and values;
+in-process, use src.analysis.structure.get_structure() and
+src.analysis.evaluator.Evaluator.
+"""
+
+import itertools
+import os
+import socket
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from src.sheets.url import extract_spreadsheet_id
+
+from . import protocol
+
+DEFAULT_TIMEOUT = 300.0
+
+
+class DaemonClient:
+    """Proxies SheetsClient calls to a running daemon over its Unix socket."""
+
+    def __init__(
+        self,
+        spreadsheet_id: str | None = None,
+        socket_path: str | Path | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """Connect to the daemon.
+
+        Args:
+            spreadsheet_id: Spreadsheet ID or URL (default: SPREADSHEET_ID env var).
+            socket_path: Daemon socket (default: FPA_DAEMON_SOCKET or ~/.fpa-agent/daemon.sock).
+            timeout: Seconds to wait for a single response.
+
+        Raises:
+            OSError: If no daemon is listening on the socket.
+        """
+        raw_id = spreadsheet_id or os.getenv("SPREADSHEET_ID")
+        self.spreadsheet_id = extract_spreadsheet_id(raw_id) if raw_id else None
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(str(protocol.socket_path(socket_path)))
+        except OSError:
+            self._sock.close()
+            raise
+        self._reader = self._sock.makefile("rb")
+        self._ids = itertools.count(1)
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        return self._request(method, self.spreadsheet_id, list(args), kwargs)
+
+    def _request(
+        self, method: str, spreadsheet_id: str | None, args: list, kwargs: dict[str, Any]
+    ) -> Any:
+        self._sock.sendall(protocol.encode({
+            "id": next(self._ids),
+            "spreadsheet_id": spreadsheet_id,
+            "method": method,
+            "args": args,
+            "kwargs": kwargs,
+        }))
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = protocol.decode(line)
+        if "error" in response:
+            protocol.raise_error(response["error"])
+        return response["result"]
+
+    def __getattr__(self, name: str) -> Any:
+        if name in protocol.PROXIED_METHODS:
+            return partial(self._call, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def model_structure(
+        self, sheet_name: str | None = None, refresh: bool = False
+    ) -> dict[str, Any]:
+        """The daemon-held structure map's summary (as the get_model_structure tool)."""
+        return self._call("model_structure", sheet_name=sheet_name, refresh=refresh)
+
+    def resolve_cell(
+        self, label: str, month: Any = None, sheet_name: str | None = None
+    ) -> dict[str, Any]:
+        """Resolve a row label (and month) with the daemon-held structure map."""
+        return self._call("resolve_cell", label, month=month, sheet_name=sheet_name)
+
+    def evaluate(self, formula: str, sheet_name: str, refresh: bool = False) -> Any:
+        """Evaluate a formula on the daemon's cached values (re-read after writes)."""
+        return self._call("evaluate", formula, sheet_name, refresh=refresh)
+
+    def set_spreadsheet(self, url_or_id: str) -> dict[str, Any]:
+        """Switch to a different spreadsheet (the daemon keeps both warm)."""
+        self.spreadsheet_id = extract_spreadsheet_id(url_or_id)
+        return self.get_spreadsheet_info()
+
+    def ping(self) -> dict[str, Any]:
+        """Daemon pid, uptime and per-spreadsheet session stats."""
+        return self._call("ping")
+
+    def invalidate(self, all_spreadsheets: bool = False) -> list[str]:
+        """Drop the daemon's warm session for this spreadsheet (or all of them)."""
+        target = None if all_spreadsheets else self.spreadsheet_id
+        return self._request("invalidate", target, [], {})
+
+    def shutdown(self):
+        """Ask the daemon to exit."""
+        self._call("shutdown")
+
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc: Any):
+        self.close()
+
+
+def connect(spreadsheet_id: str | None = None, socket_path: str | Path | None = None) -> Any:
+    """A DaemonClient if the daemon is running, else an in-process SheetsClient."""
+    try:
+        return DaemonClient(spreadsheet_id, socket_path)
+    except OSError:
+        from src.sheets import SheetsClient
+
+        return SheetsClient(spreadsheet_id)
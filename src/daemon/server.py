@@ -0,0 +1,290 @@
+"""`fpa-agent serve`: a long-lived process holding warm Sheets sessions.
+
+Every skill invocation used to construct a fresh SheetsClient: load the OAuth
+token, build the API service and re-read sheet metadata before doing any
+work. The daemon does that once per spreadsheet and keeps the result: one
+DaemonSession per spreadsheet holds a connected client (with its metadata
+cache) plus a cache of derived state: the structure map behind
+model_structure / resolve_cell, and the Evaluator behind evaluate.
+Clients talk to it over a Unix socket with the JSON-lines protocol in
+protocol.py; see proxy.DaemonClient.
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.sheets import SheetsClient
+from src.sheets.local import is_local_spreadsheet
+from src.sheets.url import extract_spreadsheet_id
+
+from .protocol import (
+    PROXIED_METHODS,
+    READ_METHODS,
+    SESSION_METHODS,
+    decode,
+    encode,
+    error_payload,
+    socket_path,
+)
+
+
+class DaemonSession:
+    """Warm state for one spreadsheet."""
+
+    def __init__(self, client: SheetsClient):
+        self.client = client
+        self.lock = threading.Lock()  # SheetsClient is not thread-safe
+        self.cache: dict[str, Any] = {}  # Derived state: "structure", "evaluator"
+        self.calls = 0
+        self.last_used = time.monotonic()
+
+    def structure(self, refresh: bool = False) -> Any:
+        """The structure map (get_structure), revalidated against tab shapes on each use."""
+        from src.analysis.structure import get_structure
+
+        self.cache["structure"] = get_structure(self.client, refresh=refresh)
+        return self.cache["structure"]
+
+    def model_structure(self, sheet_name: str | None = None, refresh: bool = False) -> Any:
+        """Same result as the get_model_structure tool."""
+        return self.structure(refresh).summary(sheet_name)
+
+    def resolve_cell(
+        self, label: str, month: Any = None, sheet_name: str | None = None
+    ) -> dict[str, Any]:
+        """Same result as the resolve_cell tool."""
+        return self.structure().resolve(label, month=month, sheet_name=sheet_name)
+
+    def evaluate(self, formula: str, sheet_name: str, refresh: bool = False) -> Any:
+        """Evaluate a formula against every tab's values, read once and kept until a write."""
+        if refresh or "evaluator" not in self.cache:
+            from src.analysis.evaluator import Evaluator
+            from src.sheets.grid import Grid
+
+            info = self.client.get_spreadsheet_info()["sheets"]
+            names = [s["name"] for s in info]
+            rows = self.client.read_ranges([(name, "") for name in names], "UNFORMATTED_VALUE")
+            self.cache["evaluator"] = Evaluator(
+                {name: Grid.from_rows(r) for name, r in zip(names, rows, strict=True)},
+                {s["name"]: (s["row_count"], s["column_count"]) for s in info},
+            )
+        return self.cache["evaluator"].evaluate(formula, sheet_name)
+
+
+class SessionPool:
+    """Creates and keeps one DaemonSession per spreadsheet.
+
+    Google credentials are loaded once and shared; each session gets its own
+    API service because the underlying HTTP transport is not thread-safe.
+    """
+
+    def __init__(self):
+        self._sessions: dict[str, DaemonSession] = {}
+        self._lock = threading.Lock()
+        self._credentials = None
+
+    def get(self, spreadsheet_id: str) -> DaemonSession:
+        spreadsheet_id = extract_spreadsheet_id(spreadsheet_id)
+        with self._lock:
+            session = self._sessions.get(spreadsheet_id)
+            if session is None:
+                session = DaemonSession(self._new_client(spreadsheet_id))
+                self._sessions[spreadsheet_id] = session
+        session.last_used = time.monotonic()
+        return session
+
+    def _new_client(self, spreadsheet_id: str) -> SheetsClient:
+        if is_local_spreadsheet(spreadsheet_id):
+            return SheetsClient(spreadsheet_id)
+        from googleapiclient.discovery import build
+
+        from src.sheets.auth import get_credentials
+
+        if self._credentials is None:
+            self._credentials = get_credentials(interactive=False)
+        service = build("sheets", "v4", credentials=self._credentials)
+        return SheetsClient(spreadsheet_id, service=service)
+
+    def invalidate(self, spreadsheet_id: str | None = None) -> list[str]:
+        """Drop one session (or all), forcing a fresh client on next use."""
+        with self._lock:
+            if spreadsheet_id is None:
+                dropped = list(self._sessions)
+                self._sessions.clear()
+            else:
+                key = extract_spreadsheet_id(spreadsheet_id)
+                dropped = [key] if self._sessions.pop(key, None) else []
+        return dropped
+
+    def status(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                sid: {
+                    "calls": s.calls,
+                    "idle_seconds": round(now - s.last_used, 1),
+                    "cached": sorted(s.cache),
+                }
+                for sid, s in self._sessions.items()
+            }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            self.server.touch()
+            try:
+                request = decode(line)
+            except ValueError as e:
+                self.wfile.write(encode({"id": None, "error": error_payload(e)}))
+                continue
+            response = {"id": request.get("id")}
+            try:
+                response["result"] = self.server.dispatch(request)
+            except Exception as e:
+                response["error"] = error_payload(e)
+            self.wfile.write(encode(response))
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix-socket server dispatching requests to warm sessions."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str | Path | None = None, idle_timeout: float | None = None):
+        """Bind the socket (removing a stale one left by a dead daemon).
+
+        Args:
+            path: Socket path (default: FPA_DAEMON_SOCKET or ~/.fpa-agent/daemon.sock).
+            idle_timeout: Shut down after this many seconds without requests.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the path.
+        """
+        self.path = socket_path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if _is_listening(self.path):
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()
+        super().__init__(str(self.path), _Handler)
+        os.chmod(self.path, 0o600)
+
+        self.pool = SessionPool()
+        self.idle_timeout = idle_timeout
+        self.started = time.monotonic()
+        self._last_request = self.started
+
+    def touch(self):
+        self._last_request = time.monotonic()
+
+    def dispatch(self, request: dict[str, Any]) -> Any:
+        """Run one request and return its result."""
+        method = request.get("method", "")
+        args = request.get("args", [])
+        kwargs = request.get("kwargs", {})
+
+        match method:
+            case "ping":
+                return {
+                    "pid": os.getpid(),
+                    "uptime": round(time.monotonic() - self.started, 1),
+                    "sessions": self.pool.status(),
+                }
+            case "invalidate":
+                return self.pool.invalidate(request.get("spreadsheet_id"))
+            case "shutdown":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return True
+
+        if method not in PROXIED_METHODS and method not in SESSION_METHODS:
+            raise ValueError(f"Unknown daemon method: {method}")
+        spreadsheet_id = request.get("spreadsheet_id")
+        if not spreadsheet_id:
+            raise ValueError("No spreadsheet connected. Pass a spreadsheet ID or URL to connect().")
+        session = self.pool.get(spreadsheet_id)
+        with session.lock:
+            session.calls += 1
+            if method in SESSION_METHODS:
+                return getattr(session, method)(*args, **kwargs)
+            if method not in READ_METHODS:
+                session.cache.pop("evaluator", None)  # Its values may have changed
+            return getattr(session.client, method)(*args, **kwargs)
+
+    def serve_forever(self, poll_interval: float = 0.5):
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 5.0))
+            if time.monotonic() - self._last_request >= self.idle_timeout:
+                self.shutdown()
+                return
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def serve_main(argv: list[str] | None = None):
+    """Entry point for `fpa-agent serve`."""
+    parser = argparse.ArgumentParser(
+        prog="fpa-agent serve", description="Run the warm Sheets daemon on a Unix socket"
+    )
+    parser.add_argument("--socket", help="Socket path (default: ~/.fpa-agent/daemon.sock)")
+    parser.add_argument(
+        "--idle-timeout", type=float, help="Exit after this many seconds without requests"
+    )
+    parser.add_argument("--stop", action="store_true", help="Stop a running daemon and exit")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        from .proxy import DaemonClient
+
+        try:
+            with DaemonClient(socket_path=args.socket) as client:
+                client.shutdown()
+            print("Daemon stopped.")
+        except OSError:
+            print("No daemon running.")
+        return
+
+    from src.agent.core import load_env
+
+    load_env()
+    try:
+        server = DaemonServer(args.socket, idle_timeout=args.idle_timeout)
+    except RuntimeError as e:
+        print(e)
+        return
+    print(f"fpa-agent daemon listening on {server.path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,16 @@
+"""Instrumentation for tool calls and Sheets API requests."""
+
+from .report import build_report, format_report
+from .sinks import JsonlSink, MemorySink, OpenTelemetrySink
+from .spans import Span, Tracer, get_tracer
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "MemorySink",
+    "JsonlSink",
+    "OpenTelemetrySink",
+    "build_report",
+    "format_report",
+]
@@ -0,0 +1,103 @@
+"""Session profiling report built from recorded spans."""
+
+from collections.abc import Iterable
+from typing import Any
+
+from .spans import Span
+
+
+def sheet_of(range_spec: str) -> str:
+    """Tab name of an A1 range ("'ARR'!A1:B2" -> "ARR"); "" if unqualified."""
+    if "!" not in range_spec:
+        return ""
+    return range_spec.rsplit("!", 1)[0].strip("'").replace("''", "'")
+
+
+def build_report(spans: Iterable[Span], top: int = 10) -> dict[str, Any]:
+    """Summarize spans into slowest tools, calls per tab/method and throttling.
+
+    Args:
+        spans: Finished spans (e.g. MemorySink.spans).
+        top: Number of tools to list in slowest_tools.
+
+    Returns:
+        Dict with totals, slowest_tools, calls_per_tab and calls_per_method.
+    """
+    tools: dict[str, dict[str, Any]] = {}
+    tabs: dict[str, dict[str, Any]] = {}
+    methods: dict[str, dict[str, Any]] = {}
+    totals = {
+        "tool_calls": 0,
+        "api_calls": 0,
+        "api_time": 0.0,
+        "retries": 0,
+        "throttled": 0.0,
+        "bytes_sent": 0,
+        "bytes_received": 0,
+        "errors": 0,
+    }
+
+    for span in spans:
+        if span.kind == "tool":
+            totals["tool_calls"] += 1
+            entry = tools.setdefault(
+                span.name, {"tool": span.name, "calls": 0, "total": 0.0, "max": 0.0}
+            )
+            entry["calls"] += 1
+            entry["total"] += span.latency
+            entry["max"] = max(entry["max"], span.latency)
+            continue
+
+        totals["api_calls"] += 1
+        totals["api_time"] += span.latency
+        totals["retries"] += span.retries
+        totals["throttled"] += span.throttled
+        totals["bytes_sent"] += span.request_bytes
+        totals["bytes_received"] += span.response_bytes
+        totals["errors"] += span.status != "ok"
+
+        method = methods.setdefault(span.name, {"calls": 0, "time": 0.0})
+        method["calls"] += 1
+        method["time"] += span.latency
+
+        for tab in {sheet_of(r) for r in span.ranges} or {""}:
+            entry = tabs.setdefault(tab or "(unqualified)", {"calls": 0, "time": 0.0, "bytes": 0})
+            entry["calls"] += 1
+            entry["time"] += span.latency
+            entry["bytes"] += span.response_bytes
+
+    slowest = sorted(tools.values(), key=lambda t: t["total"], reverse=True)[:top]
+    return {
+        "totals": totals,
+        "slowest_tools": slowest,
+        "calls_per_tab": dict(sorted(tabs.items(), key=lambda kv: -kv[1]["calls"])),
+        "calls_per_method": dict(sorted(methods.items(), key=lambda kv: -kv[1]["calls"])),
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Render build_report() output as a plain-text table for the CLI."""
+    totals = report["totals"]
+    if not totals["tool_calls"] and not totals["api_calls"]:
+        return "No tool or API calls recorded yet."
+
+    lines = [
+        f"Tool calls: {totals['tool_calls']}   API calls: {totals['api_calls']} "
+        f"({totals['api_time']:.2f}s)   Retries: {totals['retries']}   "
+        f"Throttled: {totals['throttled']:.2f}s   Errors: {totals['errors']}",
+        f"Bytes sent: {totals['bytes_sent']:,}   Bytes received: {totals['bytes_received']:,}",
+        "",
+        "Slowest tools:",
+    ]
+    for t in report["slowest_tools"]:
+        lines.append(
+            f"  {t['tool']:<28} {t['calls']:>4} calls  {t['total']:>8.2f}s total  "
+            f"{t['max']:>7.2f}s max"
+        )
+    lines += ["", "API calls per tab:"]
+    for tab, t in report["calls_per_tab"].items():
+        lines.append(f"  {tab:<28} {t['calls']:>4} calls  {t['time']:>8.2f}s  {t['bytes']:>10,} B")
+    lines += ["", "API calls per method:"]
+    for method, m in report["calls_per_method"].items():
+        lines.append(f"  {method:<28} {m['calls']:>4} calls  {m['time']:>8.2f}s")
+    return "\n".join(lines)
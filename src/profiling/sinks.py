@@ -0,0 +1,73 @@
+"""Span sinks: in-memory, JSONL file and OpenTelemetry."""
+
+import json
+from collections import deque
+from pathlib import Path
+
+from .spans import Span
+
+DEFAULT_MEMORY_SPANS = 100_000
+
+
+class MemorySink:
+    """Keeps the most recent spans in memory for the session report.
+
+    With payload_sizes=False the sink does not ask for local-backend request
+    and response sizes, so keeping it attached costs no serialization.
+    """
+
+    def __init__(self, max_spans: int = DEFAULT_MEMORY_SPANS, payload_sizes: bool = True):
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self.payload_sizes = payload_sizes
+
+    def emit(self, span: Span):
+        self.spans.append(span)
+
+    def clear(self):
+        self.spans.clear()
+
+
+class JsonlSink:
+    """Appends one JSON object per span to a file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def emit(self, span: Span):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(span.to_dict()) + "\n")
+
+
+class OpenTelemetrySink:
+    """Forwards spans to the configured OpenTelemetry tracer provider.
+
+    Requires the opentelemetry-api package; exporters are configured the
+    usual OpenTelemetry way (SDK + OTLP exporter, env vars, etc.).
+    """
+
+    def __init__(self, service_name: str = "fpa-agent"):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry export requires the opentelemetry-api package. "
+                "Install it with: pip install opentelemetry-api opentelemetry-sdk"
+            ) from e
+        self._tracer = trace.get_tracer(service_name)
+
+    def emit(self, span: Span):
+        start_ns = int(span.start * 1e9)
+        otel_span = self._tracer.start_span(f"{span.kind}:{span.name}", start_time=start_ns)
+        otel_span.set_attributes({
+            "fpa.span_id": span.span_id,
+            "fpa.parent_id": span.parent_id or "",
+            "fpa.tool": span.tool,
+            "fpa.ranges": span.ranges,
+            "fpa.request_bytes": span.request_bytes,
+            "fpa.response_bytes": span.response_bytes,
+            "fpa.retries": span.retries,
+            "fpa.throttled_s": span.throttled,
+            "fpa.status": span.status,
+        })
+        otel_span.end(end_time=start_ns + int(span.latency * 1e9))
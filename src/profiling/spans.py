@@ -0,0 +1,216 @@
+"""Spans for tool calls and the Sheets API requests they trigger.
+
+A tool span covers one execute_tool call; each API request executed while it
+is open becomes a child api span recording method, ranges, payload bytes,
+latency, retries and time spent backing off after 429s. Spans are handed to
+the tracer's sinks as they finish; with no sinks attached, nothing beyond a
+couple of clock reads happens per call.
+
+Payload sizes of googleapiclient requests are the lengths already at hand
+(the request body string and the HTTP response content), so recording them
+costs nothing. Local-backend requests have no wire form and are measured by
+serializing them, which only happens while a sink asks for payload sizes.
+"""
+
+import contextvars
+import json
+import re
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Protocol
+from urllib.parse import parse_qs, unquote, urlparse
+
+# "range" keys of a serialized values.batchUpdate body (quotes inside cell text are escaped)
+_BODY_RANGE_RE = re.compile(r'"range":\s*"((?:[^"\\]|\\.)*)"')
+
+
+@dataclass
+class Span:
+    """One finished tool call or API request.
+
+    Attributes:
+        kind: "tool" or "api".
+        name: Tool name, or API method (e.g. "values.get").
+        span_id: Unique ID of this span.
+        parent_id: span_id of the enclosing tool span (api spans only).
+        tool: Name of the enclosing tool ("" outside any tool).
+        ranges: A1 ranges the request touched.
+        start: Wall-clock start time (epoch seconds).
+        latency: Duration in seconds, including retries and backoff.
+        request_bytes: Size of the request body (0 if not measured).
+        response_bytes: Size of the JSON response (0 if not measured).
+        retries: Number of retried attempts.
+        throttled: Seconds spent backing off after 429 responses.
+        status: "ok" or the error (HTTP status or exception type).
+    """
+
+    kind: str
+    name: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: str | None = None
+    tool: str = ""
+    ranges: list[str] = field(default_factory=list)
+    start: float = 0.0
+    latency: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    throttled: float = 0.0
+    status: str = "ok"
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class Sink(Protocol):
+    """Anything that accepts finished spans."""
+
+    def emit(self, span: Span) -> None: ...
+
+
+_current_tool: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "fpa_current_tool", default=None
+)
+
+
+class Tracer:
+    """Records spans and fans them out to sinks."""
+
+    def __init__(self, sinks: list[Sink] | None = None):
+        self.sinks: list[Sink] = list(sinks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    @property
+    def payload_sizes(self) -> bool:
+        """Whether any sink wants local-backend payload sizes (opt out: payload_sizes=False)."""
+        return any(getattr(sink, "payload_sizes", True) for sink in self.sinks)
+
+    def add_sink(self, sink: Sink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink: Sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def emit(self, span: Span):
+        for sink in self.sinks:
+            sink.emit(span)
+
+    @contextmanager
+    def tool(self, name: str) -> Iterator[Span | None]:
+        """Open a tool span; API spans recorded inside it become its children."""
+        if not self.enabled:
+            yield None
+            return
+        span = Span(kind="tool", name=name, tool=name, start=time.time())
+        token = _current_tool.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.status = type(e).__name__
+            raise
+        finally:
+            span.latency = time.perf_counter() - started
+            _current_tool.reset(token)
+            self.emit(span)
+
+    def watch(self, request: Any):
+        """Have a googleapiclient request note its response size as the body is parsed."""
+        postproc = getattr(request, "postproc", None)
+        if not self.enabled or postproc is None or hasattr(request, "response_bytes"):
+            return
+
+        def sized(resp: Any, content: bytes) -> Any:
+            request.response_bytes = len(content or b"")
+            return postproc(resp, content)
+
+        request.response_bytes = 0
+        request.postproc = sized
+
+    def record_api(
+        self,
+        request: Any,
+        response: Any,
+        latency: float,
+        retries: int = 0,
+        throttled: float = 0.0,
+        status: str = "ok",
+    ):
+        """Record one executed API request (no-op when no sinks are attached)."""
+        if not self.enabled:
+            return
+        sizes = self.payload_sizes
+        method, ranges, request_bytes = describe_request(request, sizes)
+        if hasattr(request, "methodId"):
+            response_bytes = getattr(request, "response_bytes", 0)
+        elif sizes and response is not None:
+            response_bytes = len(json.dumps(response, default=str))
+        else:
+            response_bytes = 0
+        parent = _current_tool.get()
+        span = Span(
+            kind="api",
+            name=method,
+            parent_id=parent.span_id if parent else None,
+            tool=parent.name if parent else "",
+            ranges=ranges,
+            start=time.time() - latency,
+            latency=latency,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            retries=retries,
+            throttled=throttled,
+            status=status,
+        )
+        if parent:
+            parent.retries += retries
+            parent.throttled += throttled
+        self.emit(span)
+
+
+def describe_request(request: Any, sizes: bool = True) -> tuple[str, list[str], int]:
+    """(method, ranges, request body bytes) for a googleapiclient or local request.
+
+    A googleapiclient body is already a string, so its length is free and its
+    ranges are picked out without parsing it. A local request body is only
+    serialized to measure it when sizes is True.
+    """
+    if hasattr(request, "methodId"):  # googleapiclient.http.HttpRequest
+        method = request.methodId.removeprefix("sheets.")
+        if method.startswith("spreadsheets.values."):
+            method = method.removeprefix("spreadsheets.")
+        url = urlparse(request.uri)
+        ranges = parse_qs(url.query).get("ranges", [])
+        if "/values/" in url.path:
+            ranges = [unquote(url.path.split("/values/", 1)[1]).split(":append")[0]]
+        body = request.body or ""
+        if not ranges and body:
+            ranges = [json.loads(f'"{r}"') for r in _BODY_RANGE_RE.findall(body)]
+        return method, ranges, len(body)
+
+    kwargs = getattr(request, "kwargs", {})
+    method = getattr(request, "method", type(request).__name__)
+    ranges = kwargs.get("ranges") or ([kwargs["a1"]] if "a1" in kwargs else [])
+    body = kwargs.get("body")
+    request_bytes = len(json.dumps(body, default=str)) if body and sizes else 0
+    return method, list(ranges) or _body_ranges(body or {}), request_bytes
+
+
+def _body_ranges(body: dict[str, Any]) -> list[str]:
+    """Ranges named in a values.batchUpdate body."""
+    return [d["range"] for d in body.get("data", []) if isinstance(d, dict) and "range" in d]
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer used by SheetsClient and execute_tool."""
+    return _tracer
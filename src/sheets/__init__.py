@@ -9,5 +9,15 @@ __all__ = [
     "clear_credentials",
     "show_auth_status",
     "SheetsClient",
+    "NumericRange",
     "extract_spreadsheet_id",
 ]
+
+
+def __getattr__(name: str):
+    # NumericRange pulls in numpy; only import it when asked for
+    if name == "NumericRange":
+        from .numeric import NumericRange
+
+        return NumericRange
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
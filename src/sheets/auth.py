@@ -26,9 +26,11 @@ For Corporate/Google Workspace Users:
 import json
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
+# The Google auth libraries are imported where used to keep CLI startup fast
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
 # Scopes determine what the app can access
 # spreadsheets = read/write sheets (not other Drive files)
@@ -63,18 +65,25 @@ def get_credentials_path() -> Path:
     return Path("credentials.json")
 
 
-def get_credentials() -> Credentials:
+def get_credentials(interactive: bool = True) -> "Credentials":
     """Load or create Google OAuth credentials.
 
     First-time users will see a browser window to authorize the app.
     The token is then saved locally for future use.
 
+    Args:
+        interactive: If False, never start the browser flow; raise instead
+                     when no saved (or refreshable) token is available.
+
     Returns:
         Valid Google OAuth credentials.
 
     Raises:
         FileNotFoundError: If credentials.json doesn't exist and no valid token exists.
+        RuntimeError: If interactive is False and the browser flow would be needed.
     """
+    from google.oauth2.credentials import Credentials
+
     token_path = get_token_path()
     credentials_path = get_credentials_path()
 
@@ -113,7 +122,12 @@ def get_credentials() -> Credentials:
                 creds = None
 
         if not creds:
+            if not interactive:
+                raise RuntimeError("Google authorization required (no usable saved token)")
+
             # Need to run the OAuth flow
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             if not credentials_path.exists():
                 raise FileNotFoundError(
                     f"\nOAuth credentials file not found at: {credentials_path}\n\n"
@@ -176,6 +190,8 @@ def show_auth_status():
     if token_path.exists():
         print(f"  ✓ Found at: {token_path}")
         try:
+            from google.oauth2.credentials import Credentials
+
             creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
             if creds.valid:
                 print("  ✓ Token is valid")
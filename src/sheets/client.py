@@ -1,27 +1,108 @@
 """Google Sheets API client wrapper."""
 
 import os
+import threading
 import time
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from src.profiling import get_tracer
 
 from .auth import get_credentials
+from .compact import compact_rows
+from .grid import Grid
+from .local import LocalSpreadsheets, is_local_spreadsheet
 from .url import extract_spreadsheet_id
 
+if TYPE_CHECKING:
+    from .numeric import NumericRange
+
 _RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+# Compact inspection reads the whole used range, so it can afford wider tabs
+_COMPACT_MAX_COLUMNS = 130
+_COMPACT_MAX_ROWS = 2000
+
+# batchUpdate requests whose "range" / "destination" rows they write
+_RANGE_REQUESTS = {"repeatCell": "range", "copyPaste": "destination", "cutPaste": "destination"}
+# batchUpdate requests that move existing rows or cells (positions are unknown after)
+_MOVE_REQUESTS = {"insertDimension", "deleteDimension", "moveDimension", "insertRange",
+                  "deleteRange", "sortRange", "updateCells"}
+
+# batchUpdate requests that change the tab list or grid sizes
+_SHEET_REQUESTS = {
+    "addSheet",
+    "deleteSheet",
+    "duplicateSheet",
+    "updateSheetProperties",
+    "appendDimension",
+    "insertDimension",
+    "deleteDimension",
+}
+
+
+def repeat_formula_request(
+    sheet_id: int, row: int, col: int, formula: str, span: int, rows: int = 1
+) -> dict[str, Any]:
+    """repeatCell request filling one seed formula over a block.
+
+    Sheets shifts the seed's relative references for every cell, exactly as
+    dragging it would, so only one copy of the formula text is sent.
+
+    Args:
+        sheet_id: Numeric sheet ID.
+        row: 0-based row of the seed (top-left) cell.
+        col: 0-based column of the seed cell.
+        formula: Formula as it reads in the seed cell.
+        span: Number of columns to fill, including the seed.
+        rows: Number of rows to fill, including the seed.
+    """
+    return {
+        "repeatCell": {
+            "range": {
+                "sheetId": sheet_id,
+                "startRowIndex": row,
+                "endRowIndex": row + rows,
+                "startColumnIndex": col,
+                "endColumnIndex": col + span,
+            },
+            "cell": {"userEnteredValue": {"formulaValue": formula}},
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _classify_columns(formulas: Grid) -> tuple[set[int], set[int]]:
+    """Split column indices into those holding formulas and those holding static data."""
+    formula_columns = set()
+    data_columns = set()
+    for col_idx in range(formulas.width):
+        for cell in formulas.column(col_idx):
+            if isinstance(cell, str) and cell.startswith("="):
+                formula_columns.add(col_idx)
+            elif cell and cell == cell:  # Non-empty, non-formula (NaN = blank)
+                data_columns.add(col_idx)
+    return formula_columns, data_columns
+
 
 class SheetsClient:
     """High-level client for Google Sheets operations."""
 
-    def __init__(self, spreadsheet_id: str | None = None):
+    def __init__(
+        self, spreadsheet_id: str | None = None, service: Any = None, quota: Any = None
+    ):
         """Initialize the Sheets client.
 
         Args:
             spreadsheet_id: The ID of the spreadsheet to work with, or a full URL.
-                           Defaults to SPREADSHEET_ID env var.
+                           Defaults to SPREADSHEET_ID env var. A local: reference
+                           (or FPA_SHEETS_BACKEND=local) selects the offline
+                           backend in src.sheets.local.
+            service: Optional pre-built Sheets service (anything with a
+                     spreadsheets() resource). Skips OAuth and discovery.
+            quota: Optional QuotaBucket (src.sheets.quota) every API request
+                   waits on; share one between clients running in parallel.
+                   Requests to the local backend do not wait.
         """
         raw_id = spreadsheet_id or os.getenv("SPREADSHEET_ID")
         if raw_id:
@@ -29,10 +110,83 @@ class SheetsClient:
         else:
             self.spreadsheet_id = None  # No spreadsheet set yet
 
-        creds = get_credentials()
-        self._service = build("sheets", "v4", credentials=creds)
-        self._sheets = self._service.spreadsheets()
+        self._service = service
+        self._injected = service is not None
+        self._remote = service.spreadsheets() if service is not None else None
+        self._local: LocalSpreadsheets | None = None
         self._info_cache: dict[str, Any] | None = None
+        self._quota = quota
+        # Rows written through this client until pop_written() takes them,
+        # keyed by tab name (values writes) or sheet ID (batchUpdate): 0-based
+        # [first, last] spans, or None once positions are unknown
+        self._written: dict[str | int, list[list[int]] | None] = {}
+        # The Google service is built on first use (or by warm_up()), so
+        # constructing a client never blocks on OAuth or discovery
+        self._connect_lock = threading.Lock()
+        self._warmup: threading.Thread | None = None
+
+    def _connect_remote(self, interactive: bool = True):
+        """Authenticate and build the Google Sheets service (once)."""
+        with self._connect_lock:
+            if self._remote is not None:
+                return
+            from googleapiclient.discovery import build
+
+            creds = get_credentials(interactive=interactive)
+            self._service = build("sheets", "v4", credentials=creds)
+            self._remote = self._service.spreadsheets()
+
+    def warm_up(self) -> threading.Thread | None:
+        """Load credentials and build the Google service in a background thread.
+
+        Lets the CLI show its prompt immediately while the slow part of
+        connecting happens behind it. The browser OAuth flow is never started
+        from the background; if it is needed, or anything else fails, the
+        first real call connects (and raises) in the foreground instead.
+
+        Returns:
+            The warm-up thread, or None if there is nothing to do.
+        """
+        if self._remote is not None or is_local_spreadsheet(self.spreadsheet_id):
+            return None
+        if self._warmup is None:
+
+            def connect():
+                try:
+                    self._connect_remote(interactive=False)
+                except Exception:
+                    pass  # Retried by the first foreground call
+
+            self._warmup = threading.Thread(target=connect, name="sheets-warmup", daemon=True)
+            self._warmup.start()
+        return self._warmup
+
+    @property
+    def _is_local(self) -> bool:
+        """Whether requests go to the local backend rather than an API."""
+        return not self._injected and is_local_spreadsheet(self.spreadsheet_id)
+
+    @property
+    def _sheets(self) -> Any:
+        """The spreadsheets resource for the current spreadsheet (Google or local)."""
+        if self._is_local:
+            if self._local is None:
+                self._local = LocalSpreadsheets()
+            return self._local
+        if self._remote is None:
+            self._connect_remote()
+        return self._remote
+
+    def save_local(self, path: str | None = None):
+        """Persist a local-backend spreadsheet to its file (or to path).
+
+        Raises:
+            ValueError: If the current spreadsheet is not a local one.
+        """
+        self._require_spreadsheet()
+        if self._local is None or not is_local_spreadsheet(self.spreadsheet_id):
+            raise ValueError("save_local() only applies to local: spreadsheets")
+        self._local.save(self.spreadsheet_id, Path(path) if path else None)
 
     def set_spreadsheet(self, url_or_id: str) -> dict[str, Any]:
         """Switch to a different spreadsheet.
@@ -45,6 +199,7 @@ class SheetsClient:
         """
         self.spreadsheet_id = extract_spreadsheet_id(url_or_id)
         self._info_cache = None
+        self._written = {}
         return self.get_spreadsheet_info()
 
     def _require_spreadsheet(self):
@@ -64,16 +219,37 @@ class SheetsClient:
         Returns:
             API response.
         """
+        tracer = get_tracer()
+        tracer.watch(request)
+        started = time.perf_counter()
+        throttled = 0.0
         delay = 1.0
         for attempt in range(retries + 1):
+            if self._quota is not None and not self._is_local:  # Local files have no quota
+                throttled += self._quota.acquire()
             try:
-                return request.execute()
-            except HttpError as e:
+                response = request.execute()
+            except Exception as e:
+                from googleapiclient.errors import HttpError
+
+                if not isinstance(e, HttpError):
+                    raise
                 if e.status_code in _RETRYABLE_STATUS_CODES and attempt < retries:
                     time.sleep(delay)
+                    if e.status_code == 429:
+                        throttled += delay
                     delay *= 2
                 else:
+                    tracer.record_api(
+                        request, None, time.perf_counter() - started, attempt, throttled,
+                        status=str(e.status_code),
+                    )
                     raise
+            else:
+                tracer.record_api(
+                    request, response, time.perf_counter() - started, attempt, throttled
+                )
+                return response
 
     # ─────────────────────────────────────────────────────────────────────────
     # Read operations
@@ -114,6 +290,79 @@ class SheetsClient:
         )
         return result.get("values", [])
 
+    def read_numeric(
+        self, sheet_name: str, range_spec: str, dates_as_serial: bool = True
+    ) -> "NumericRange":
+        """Read a range as exact numbers (valueRenderOption=UNFORMATTED_VALUE).
+
+        Unlike read_range, currency and percentage cells come back as the
+        underlying numbers rather than display strings, so no re-parsing or
+        display rounding. Row labels are taken from column A; if the range
+        does not start at column A, column A is fetched in the same call.
+
+        Args:
+            sheet_name: Name of the sheet (tab).
+            range_spec: A1 notation range (e.g., "C4:Z20").
+            dates_as_serial: Return dates as serial day numbers (default) so
+                             they land in the numeric array. If False, dates
+                             are formatted strings and are masked.
+
+        Returns:
+            NumericRange with a float array, blank/non-numeric mask and
+            label index.
+        """
+        from .numeric import NumericRange, to_numeric_array
+
+        self._require_spreadsheet()
+        origin_col, origin_row = self._parse_cell_ref(range_spec.split(":")[0])
+        origin_col = origin_col or 0
+        origin_row = origin_row or 0
+        end_col, end_row = self._parse_cell_ref(range_spec.split(":")[-1])
+
+        ranges = [f"'{sheet_name}'!{range_spec}"]
+        if origin_col > 0:
+            label_end = end_row + 1 if end_row is not None else ""
+            ranges.append(f"'{sheet_name}'!A{origin_row + 1}:A{label_end}")
+
+        result = self._execute(
+            self._sheets.values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=ranges,
+                valueRenderOption="UNFORMATTED_VALUE",
+                dateTimeRenderOption="SERIAL_NUMBER" if dates_as_serial else "FORMATTED_STRING",
+            )
+        )
+        value_ranges = result.get("valueRanges", [])
+        rows = value_ranges[0].get("values", []) if value_ranges else []
+
+        # Shape comes from the requested range when bounded, else from the data
+        height = end_row - origin_row + 1 if end_row is not None else len(rows)
+        width = (
+            end_col - origin_col + 1
+            if end_col is not None
+            else max((len(r) for r in rows), default=0)
+        )
+        values, mask = to_numeric_array(rows, height, width)
+
+        if origin_col > 0:
+            label_rows = value_ranges[1].get("values", []) if len(value_ranges) > 1 else []
+        else:
+            label_rows = rows
+        row_labels = [
+            str(label_rows[i][0]).strip() if i < len(label_rows) and label_rows[i] else ""
+            for i in range(height)
+        ]
+
+        return NumericRange(
+            sheet_name=sheet_name,
+            range_spec=range_spec,
+            origin_row=origin_row,
+            origin_col=origin_col,
+            values=values,
+            mask=mask,
+            row_labels=row_labels,
+        )
+
     def read_range(self, sheet_name: str, range_spec: str) -> list[list[Any]]:
         """Read values from a range.
 
@@ -138,7 +387,42 @@ class SheetsClient:
         """
         return self._read_range(sheet_name, range_spec, "FORMULA")
 
-    def inspect_sheet(self, sheet_name: str, sample_rows: int = 20) -> dict[str, Any]:
+    def read_ranges(
+        self, ranges: list[tuple[str, str]], render_option: str = "FORMATTED_VALUE"
+    ) -> list[list[list[Any]]]:
+        """Read several ranges, from any tabs, in a single values.batchGet call.
+
+        Args:
+            ranges: (sheet_name, range_spec) pairs. An empty range_spec reads
+                    the tab's whole used range.
+            render_option: valueRenderOption (FORMATTED_VALUE, UNFORMATTED_VALUE
+                           or FORMULA).
+
+        Returns:
+            One 2D list of cell values per requested range, in order.
+        """
+        self._require_spreadsheet()
+        if not ranges:
+            return []
+        a1_ranges = [
+            f"'{sheet_name}'!{spec}" if spec else f"'{sheet_name}'" for sheet_name, spec in ranges
+        ]
+        result = self._execute(
+            self._sheets.values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=a1_ranges,
+                valueRenderOption=render_option,
+            )
+        )
+        value_ranges = result.get("valueRanges", [])
+        return [
+            value_ranges[i].get("values", []) if i < len(value_ranges) else []
+            for i in range(len(ranges))
+        ]
+
+    def inspect_sheet(
+        self, sheet_name: str, sample_rows: int = 20, compact: bool = False
+    ) -> dict[str, Any]:
         """Get a comprehensive view of a sheet's structure for analysis.
 
         Returns headers, sample data, sample formulas, and identifies which
@@ -147,6 +431,11 @@ class SheetsClient:
         Args:
             sheet_name: Name of the sheet to inspect.
             sample_rows: Number of rows to sample (default 20).
+            compact: If True, read the whole used range and return a
+                     structural encoding ("rows") instead of raw sample
+                     arrays — see src.sheets.compact. Much smaller for
+                     large month-column tabs. Covers at most 2,000 rows
+                     and 130 columns, setting "truncated" past either.
 
         Returns:
             Dict with structure information:
@@ -166,6 +455,9 @@ class SheetsClient:
         if not sheet_info:
             raise ValueError(f"Sheet '{sheet_name}' not found")
 
+        if compact:
+            return self._inspect_compact(sheet_name, sheet_info)
+
         col_count = min(sheet_info["column_count"], 50)  # Cap at 50 columns
         end_col = self._col_index_to_letter(col_count - 1)
 
@@ -179,15 +471,9 @@ class SheetsClient:
         formulas = self.read_formulas(sheet_name, sample_range)
 
         # Analyze which columns have formulas
-        formula_columns = set()
-        data_columns = set()
-
-        for row in formulas[1:]:  # Skip header row
-            for col_idx, cell in enumerate(row):
-                if isinstance(cell, str) and cell.startswith("="):
-                    formula_columns.add(col_idx)
-                elif cell:  # Non-empty, non-formula
-                    data_columns.add(col_idx)
+        formula_columns, data_columns = _classify_columns(
+            Grid.from_rows(formulas).slice(rows=slice(1, None))  # Skip header row
+        )
 
         # Get row labels (column A) from already-fetched values
         row_labels = [row[0] if row else "" for row in values]
@@ -212,6 +498,43 @@ class SheetsClient:
             "column_count": len(headers),
         }
 
+    def _inspect_compact(self, sheet_name: str, sheet_info: dict[str, Any]) -> dict[str, Any]:
+        """Compact variant of inspect_sheet covering the used range, up to the size caps.
+
+        Column A is read in full so estimated_row_count is the real extent;
+        "truncated" is set when rows or columns past the caps are left out.
+        """
+        col_count = min(sheet_info["column_count"], _COMPACT_MAX_COLUMNS)
+        end_col = self._col_index_to_letter(col_count - 1)
+
+        col_a = self.read_range(sheet_name, "A:A")
+        last_row = max((i + 1 for i, r in enumerate(col_a) if r and r[0]), default=1)
+
+        data_range = f"A1:{end_col}{min(last_row, _COMPACT_MAX_ROWS)}"
+        values = self.read_range(sheet_name, data_range)
+        formulas = self.read_formulas(sheet_name, data_range)
+
+        formula_columns, data_columns = _classify_columns(
+            Grid.from_rows(formulas).slice(rows=slice(1, None))
+        )
+
+        headers = values[0] if values else []
+        return {
+            "sheet_name": sheet_name,
+            "encoding": "compact",
+            "headers": headers,
+            "rows": compact_rows(values, formulas),
+            "formula_columns": sorted(formula_columns),
+            "data_columns": sorted(data_columns),
+            "estimated_row_count": last_row,
+            "column_count": len(headers),
+            "grid_row_count": sheet_info["row_count"],
+            "grid_column_count": sheet_info["column_count"],
+            "truncated": (
+                last_row > _COMPACT_MAX_ROWS or sheet_info["column_count"] > _COMPACT_MAX_COLUMNS
+            ),
+        }
+
     def _col_index_to_letter(self, index: int) -> str:
         """Convert a 0-based column index to letter (0=A, 25=Z, 26=AA)."""
         result = ""
@@ -233,6 +556,43 @@ class SheetsClient:
     # Write operations
     # ─────────────────────────────────────────────────────────────────────────
 
+    def _note_rows(self, key: str | int, start: int | None, end: int | None):
+        """Record a written row span (end exclusive; open-ended means unknown rows)."""
+        spans = self._written.get(key, [])
+        if spans is None:
+            return
+        if start is None or end is None:
+            self._written[key] = None
+            return
+        spans.append([start, end - 1])
+        self._written[key] = spans
+
+    def _note_write(self, sheet_name: str, range_spec: str, rows: int = 0):
+        """Record the rows a values write covers (the range, or the values it spills to)."""
+        bounds = self._a1_to_grid_range(range_spec, 0)
+        start, end = bounds.get("startRowIndex"), bounds.get("endRowIndex")
+        if start is not None and rows:
+            end = max(end or 0, start + rows)
+        self._note_rows(sheet_name, start, end)
+
+    def pop_written(self, sheet_name: str) -> list[list[int]] | None:
+        """Rows written to a tab through this client since the last call.
+
+        Used by rescan_sheet to re-read only what a /modify changed.
+
+        Returns:
+            Sorted 0-based [first, last] row spans, or None if nothing was
+            recorded or row positions are unknown (appends, inserted or
+            deleted rows and columns, whole-column writes).
+        """
+        keys: list[str | int] = [sheet_name]
+        if any(isinstance(key, int) for key in self._written):
+            keys.append(self.get_sheet_id(sheet_name))
+        recorded = [self._written.pop(key) for key in keys if key in self._written]
+        if not recorded or any(spans is None for spans in recorded):
+            return None
+        return sorted(span for spans in recorded for span in spans)
+
     def write_range(
         self,
         sheet_name: str,
@@ -253,6 +613,7 @@ class SheetsClient:
             API response with update details.
         """
         self._require_spreadsheet()
+        self._note_write(sheet_name, range_spec, len(values))
         return self._execute(
             self._sheets.values().update(
                 spreadsheetId=self.spreadsheet_id,
@@ -262,6 +623,37 @@ class SheetsClient:
             )
         )
 
+    def write_ranges(
+        self, data: list[tuple[str, str, list[list[Any]]]], raw: bool = False
+    ) -> dict[str, Any]:
+        """Write several ranges, on any tabs, in a single values.batchUpdate call.
+
+        Args:
+            data: (sheet_name, range_spec, values) triples.
+            raw: If True, values are written as-is. If False, values are parsed
+                 as if typed in (formulas, dates, numbers).
+
+        Returns:
+            API response with totals and one response per range.
+        """
+        self._require_spreadsheet()
+        if not data:
+            return {"totalUpdatedCells": 0, "responses": []}
+        for sheet_name, range_spec, values in data:
+            self._note_write(sheet_name, range_spec, len(values))
+        return self._execute(
+            self._sheets.values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={
+                    "valueInputOption": "RAW" if raw else "USER_ENTERED",
+                    "data": [
+                        {"range": f"'{sheet_name}'!{range_spec}", "values": values}
+                        for sheet_name, range_spec, values in data
+                    ],
+                },
+            )
+        )
+
     def append_rows(
         self,
         sheet_name: str,
@@ -279,6 +671,7 @@ class SheetsClient:
             API response with update details.
         """
         self._require_spreadsheet()
+        self._written[sheet_name] = None  # The table's end is found server-side
         return self._execute(
             self._sheets.values().append(
                 spreadsheetId=self.spreadsheet_id,
@@ -300,6 +693,7 @@ class SheetsClient:
             API response.
         """
         self._require_spreadsheet()
+        self._note_write(sheet_name, range_spec)
         return self._execute(
             self._sheets.values().clear(
                 spreadsheetId=self.spreadsheet_id,
@@ -324,12 +718,37 @@ class SheetsClient:
             API response.
         """
         self._require_spreadsheet()
-        return self._execute(
+        for request in requests:
+            for kind, body in request.items():
+                if kind in _RANGE_REQUESTS:
+                    grid_range = body.get(_RANGE_REQUESTS[kind], {})
+                    self._note_rows(
+                        grid_range.get("sheetId", 0),
+                        grid_range.get("startRowIndex"),
+                        grid_range.get("endRowIndex"),
+                    )
+                elif kind == "autoFill":
+                    fill = body.get("sourceAndDestination", {})
+                    grid_range = body.get("range") or fill.get("source", {})
+                    if fill.get("dimension") == "ROWS":  # Grows downwards past the source
+                        grid_range = {**grid_range, "endRowIndex": None}
+                    self._note_rows(
+                        grid_range.get("sheetId", 0),
+                        grid_range.get("startRowIndex"),
+                        grid_range.get("endRowIndex"),
+                    )
+                elif kind in _MOVE_REQUESTS:
+                    grid_range = body.get("range") or body.get("source") or {}
+                    self._written[grid_range.get("sheetId", 0)] = None
+        response = self._execute(
             self._sheets.batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
                 body={"requests": requests},
             )
         )
+        if any(k in _SHEET_REQUESTS for request in requests for k in request):
+            self._info_cache = None  # Tabs were added, removed or resized
+        return response
 
     # ─────────────────────────────────────────────────────────────────────────
     # Formatting helpers
@@ -419,6 +838,104 @@ class SheetsClient:
             }
         ])
 
+    # ─────────────────────────────────────────────────────────────────────────
+    # Server-side fills
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _grow_columns(self, sheet_name: str, end_column: int) -> list[dict[str, Any]]:
+        """appendDimension request if the tab is narrower than end_column, else nothing."""
+        sheet = next(s for s in self.get_spreadsheet_info()["sheets"] if s["name"] == sheet_name)
+        missing = end_column - sheet["column_count"]
+        if missing <= 0:
+            return []
+        return [
+            {
+                "appendDimension": {
+                    "sheetId": sheet["sheet_id"],
+                    "dimension": "COLUMNS",
+                    "length": missing,
+                }
+            }
+        ]
+
+    def fill_formula_row(
+        self, sheet_name: str, anchor_cell: str, formula: str, span: int
+    ) -> dict[str, Any]:
+        """Write a formula once and let Sheets fill it across a row.
+
+        Sends a single repeatCell instead of one shifted formula string per
+        column: =SUM('ARR'!G2:G100)/12 anchored at C4 with span 24 fills
+        C4:Z4 as if dragged.
+
+        Args:
+            sheet_name: Name of the sheet.
+            anchor_cell: A1 cell holding the seed formula (e.g. "C4").
+            formula: Formula as it reads in the anchor cell.
+            span: Number of columns to fill, including the anchor.
+
+        Returns:
+            API response.
+        """
+        if span < 1:
+            raise ValueError("span must be at least 1")
+        sheet_id = self.get_sheet_id(sheet_name)
+        col, row = self._parse_cell_ref(anchor_cell)
+        if col is None or row is None:
+            raise ValueError(f"Anchor must be a single cell, got '{anchor_cell}'")
+        requests = self._grow_columns(sheet_name, col + span)
+        requests.append(repeat_formula_request(sheet_id, row, col, formula, span))
+        return self.batch_update(requests)
+
+    def fill_formula_block(
+        self, sheet_name: str, source_range: str, span: int, method: str = "copyPaste"
+    ) -> dict[str, Any]:
+        """Replicate an existing block of formulas to the right, server-side.
+
+        Typical use is extending the horizon: the last month column's
+        formulas (e.g. "Z4:Z40") are copied into the next span columns with
+        relative references shifted. No formula text is sent at all.
+
+        Args:
+            sheet_name: Name of the sheet.
+            source_range: A1 block to replicate (one or more columns).
+            span: Number of columns to fill after the block.
+            method: "copyPaste" (tile the block, formulas and formats) or
+                    "autoFill" (drag-fill; constants continue as a series).
+
+        Returns:
+            API response.
+        """
+        if span < 1:
+            raise ValueError("span must be at least 1")
+        if method not in ("copyPaste", "autoFill"):
+            raise ValueError(f"Unknown fill method '{method}'. Use copyPaste or autoFill")
+        source = self._a1_to_grid_range(source_range, self.get_sheet_id(sheet_name))
+        if not {"startRowIndex", "endRowIndex", "startColumnIndex"} <= source.keys():
+            raise ValueError(f"Source must be a bounded block, got '{source_range}'")
+        source_end = source.get("endColumnIndex", source["startColumnIndex"] + 1)
+        requests = self._grow_columns(sheet_name, source_end + span)
+        if method == "autoFill":
+            requests.append({
+                "autoFill": {
+                    "sourceAndDestination": {
+                        "source": source,
+                        "dimension": "COLUMNS",
+                        "fillLength": span,
+                    }
+                }
+            })
+        else:
+            destination = {**source, "startColumnIndex": source_end}
+            destination["endColumnIndex"] = source_end + span
+            requests.append({
+                "copyPaste": {
+                    "source": source,
+                    "destination": destination,
+                    "pasteType": "PASTE_NORMAL",
+                }
+            })
+        return self.batch_update(requests)
+
     def _a1_to_grid_range(self, range_spec: str, sheet_id: int) -> dict[str, Any]:
         """Convert A1 notation to GridRange format.
 
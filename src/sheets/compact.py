@@ -0,0 +1,195 @@
+"""Compact structural encoding of a sheet for the model.
+
+Instead of raw 2D sample arrays, each formula row is described by its label,
+its dominant R1C1 pattern and the column span it covers, with only the cells
+that deviate listed explicitly. Runs of rows sharing the same pattern, and
+runs of static data rows, collapse into a single block entry.
+"""
+
+import re
+from collections import Counter
+from typing import Any
+
+from .r1c1 import column_letter, to_r1c1
+
+_DATE_RE = re.compile(r"^\d{1,4}[/-]\d{1,2}[/-]\d{1,4}$")
+_MAX_EXCEPTIONS = 20
+
+
+def parse_number(value: Any) -> float | None:
+    """Parse a displayed number ("$1,234", "(500)", "15%") into a float.
+
+    Returns None for blanks, text and dates. Percentages are returned as
+    fractions and accounting-style parentheses as negatives.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    text = str(value).strip()
+    if not text or _DATE_RE.match(text):
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    percent = text.endswith("%")
+    cleaned = text.strip("()").replace("$", "").replace(",", "").rstrip("%").strip()
+    try:
+        number = float(cleaned)
+    except ValueError:
+        return None
+    if percent:
+        number /= 100
+    return -number if negative else number
+
+
+def cell_type(value: Any) -> str:
+    """Classify a displayed cell value as number, date, text or blank."""
+    if value is None or value == "":
+        return "blank"
+    if isinstance(value, str) and _DATE_RE.match(value.strip()):
+        return "date"
+    return "text" if parse_number(value) is None else "number"
+
+
+def _span(first: int, last: int) -> str:
+    return f"{column_letter(first)}:{column_letter(last)}"
+
+
+def _encode_row(row_idx: int, values: list[Any], formulas: list[Any]) -> dict[str, Any]:
+    """Describe one row: label, dominant formula pattern, span and exceptions."""
+    width = max(len(values), len(formulas))
+    values = list(values) + [""] * (width - len(values))
+    formulas = list(formulas) + [""] * (width - len(formulas))
+
+    label = str(values[0]).strip() if width else ""
+    entry: dict[str, Any] = {"row": row_idx + 1, "label": label}
+
+    patterns: dict[int, str] = {}
+    statics: dict[int, Any] = {}
+    for col in range(1, width):
+        formula = formulas[col]
+        if isinstance(formula, str) and formula.startswith("="):
+            patterns[col] = to_r1c1(formula, row_idx, col)
+        elif formula != "" or values[col] != "":
+            statics[col] = values[col] if values[col] != "" else formula
+
+    if not patterns:
+        if statics:
+            entry["values"] = {column_letter(c): v for c, v in statics.items()}
+        return entry
+
+    dominant, _ = Counter(patterns.values()).most_common(1)[0]
+    cols = [c for c, p in patterns.items() if p == dominant]
+    first, last = cols[0], cols[-1]
+    entry["pattern"] = dominant
+    entry["span"] = _span(first, last)
+
+    exceptions: dict[str, Any] = {}
+    for col in range(first, last + 1):
+        if col in patterns and patterns[col] != dominant:
+            exceptions[f"{column_letter(col)}{row_idx + 1}"] = formulas[col]
+        elif col in statics:
+            exceptions[f"{column_letter(col)}{row_idx + 1}"] = statics[col]
+    for col, pattern in patterns.items():
+        if (col < first or col > last) and pattern != dominant:
+            exceptions[f"{column_letter(col)}{row_idx + 1}"] = formulas[col]
+
+    outside = {c: v for c, v in statics.items() if c < first or c > last}
+    if outside:
+        entry["values"] = {column_letter(c): v for c, v in outside.items()}
+    if exceptions:
+        entry["exceptions"] = exceptions
+    return entry
+
+
+def _column_types(entries: list[dict[str, Any]]) -> dict[str, str]:
+    """Summarize the static columns of a run of rows by value type."""
+    types: dict[str, set[str]] = {}
+    for entry in entries:
+        for col, value in entry.get("values", {}).items():
+            types.setdefault(col, set()).add(cell_type(value))
+    ordered = sorted(types.items(), key=lambda item: (len(item[0]), item[0]))
+    return {col: "|".join(sorted(t - {"blank"}) or ["blank"]) for col, t in ordered}
+
+
+def _merge_block(entries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Collapse a run of similar row entries into one block entry."""
+    first, last = entries[0], entries[-1]
+    block: dict[str, Any] = {
+        "rows": f"{first['row']}-{last['row']}",
+        "labels": [first["label"], "...", last["label"]],
+    }
+    if "pattern" in first:
+        block["pattern"] = first["pattern"]
+        block["span"] = first["span"]
+    data = _column_types(entries)
+    if data:
+        block["data"] = data
+    if "pattern" not in first:
+        block["sample"] = first.get("values", {})
+
+    exceptions: dict[str, Any] = {}
+    for entry in entries:
+        exceptions.update(entry.get("exceptions", {}))
+    if exceptions:
+        shown = dict(list(exceptions.items())[:_MAX_EXCEPTIONS])
+        block["exceptions"] = shown
+        if len(exceptions) > _MAX_EXCEPTIONS:
+            block["more_exceptions"] = len(exceptions) - _MAX_EXCEPTIONS
+    return block
+
+
+def _block_key(entry: dict[str, Any]) -> tuple | None:
+    """Rows with the same key can be merged into one block (None = never merge)."""
+    if "pattern" in entry:
+        return ("formula", entry["pattern"], entry["span"])
+    if "values" in entry:
+        return ("data",)
+    return None  # label-only rows (section headers) stay on their own
+
+
+def compact_rows(
+    values: list[list[Any]],
+    formulas: list[list[Any]],
+    start_row: int = 1,
+    min_block: int = 3,
+) -> list[dict[str, Any]]:
+    """Encode sheet rows compactly.
+
+    Args:
+        values: 2D list of displayed values (ragged rows are fine).
+        formulas: 2D list of formulas for the same range.
+        start_row: 0-based index of the first row to encode (default skips
+                   the header row).
+        min_block: Minimum run length before similar rows are merged.
+
+    Returns:
+        List of row entries ({row, label, pattern, span, exceptions, values})
+        and block entries ({rows, labels, pattern, span, data, exceptions}).
+    """
+    height = max(len(values), len(formulas))
+    entries = []
+    for row_idx in range(start_row, height):
+        value_row = values[row_idx] if row_idx < len(values) else []
+        formula_row = formulas[row_idx] if row_idx < len(formulas) else []
+        entry = _encode_row(row_idx, value_row, formula_row)
+        if entry["label"] or len(entry) > 2:
+            entries.append(entry)
+
+    result: list[dict[str, Any]] = []
+    run: list[dict[str, Any]] = []
+    for entry in entries + [None]:
+        key = _block_key(entry) if entry else None
+        if (
+            run
+            and key is not None
+            and key == _block_key(run[-1])
+            and entry["row"] == run[-1]["row"] + 1
+        ):
+            run.append(entry)
+            continue
+        if len(run) >= min_block:
+            result.append(_merge_block(run))
+        else:
+            result.extend(run)
+        run = [entry] if entry else []
+    return result
@@ -0,0 +1,158 @@
+"""In-process fake of the Sheets v4 service for tests and benchmarks.
+
+FakeSheetsService reuses the local backend's value and batchUpdate
+semantics over purely in-memory workbooks, and adds what the real API does
+to us: per-call latency, per-minute read/write quotas (HTTP 429) and
+transient server errors (HTTP 503). It records every call, with the size of
+its request body, so tests can assert on API-call counts and payloads.
+
+    service = FakeSheetsService(latency=0.05, read_quota_per_minute=60)
+    spreadsheet_id = service.create("Benchmark model")
+    client = SheetsClient(spreadsheet_id, service=service)
+"""
+
+import itertools
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from .local import LocalRequest, LocalSpreadsheets, LocalWorkbook
+
+_WRITE_METHODS = {
+    "spreadsheets.batchUpdate",
+    "values.update",
+    "values.batchUpdate",
+    "values.append",
+    "values.clear",
+}
+
+
+def http_error(status: int, reason: str) -> HttpError:
+    """Build an HttpError the way googleapiclient raises it."""
+    resp = httplib2.Response({"status": status, "reason": reason})
+    return HttpError(resp, f'{{"error": {{"code": {status}, "message": "{reason}"}}}}'.encode())
+
+
+class FakeRequest(LocalRequest):
+    """Request whose execute() goes through the service's fault injection."""
+
+    def __init__(self, service: "FakeSheetsService", method: str, func, **kwargs: Any):
+        super().__init__(method, func, **kwargs)
+        self._service = service
+
+    def execute(self) -> Any:
+        self._service._before_call(self.method, self.kwargs)
+        return super().execute()
+
+
+class FakeSpreadsheets(LocalSpreadsheets):
+    """spreadsheets() resource over the service's in-memory workbooks."""
+
+    def __init__(self, service: "FakeSheetsService"):
+        super().__init__()
+        self._service = service
+        self._workbooks = service.workbooks
+
+    def workbook(self, spreadsheet_id: str) -> LocalWorkbook:
+        if spreadsheet_id not in self._workbooks:
+            raise http_error(404, f"Requested entity was not found: {spreadsheet_id}")
+        return self._workbooks[spreadsheet_id]
+
+    def _request(self, method: str, func, **kwargs: Any) -> FakeRequest:
+        return FakeRequest(self._service, method, func, **kwargs)
+
+
+class FakeSheetsService:
+    """Stand-in for ``build("sheets", "v4")`` with injectable latency and errors."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        read_quota_per_minute: int | None = None,
+        write_quota_per_minute: int | None = None,
+        fail_every: int | None = None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """Initialize the fake service.
+
+        Args:
+            latency: Seconds to sleep on every call (simulated round trip).
+            read_quota_per_minute: Reads allowed per rolling minute before 429s.
+            write_quota_per_minute: Writes allowed per rolling minute before 429s.
+            fail_every: If set, every Nth call fails with a retryable 503.
+            clock: Monotonic clock used for quota windows (injectable for tests).
+            sleep: Sleep function used for latency (injectable for tests).
+        """
+        self.latency = latency
+        self.read_quota_per_minute = read_quota_per_minute
+        self.write_quota_per_minute = write_quota_per_minute
+        self.fail_every = fail_every
+        self._clock = clock
+        self._sleep = sleep
+        self.workbooks: dict[str, LocalWorkbook] = {}
+        self.calls: list[dict[str, Any]] = []
+        self._reads: deque[float] = deque()
+        self._writes: deque[float] = deque()
+        self._ids = itertools.count(1)
+
+    def spreadsheets(self) -> FakeSpreadsheets:
+        return FakeSpreadsheets(self)
+
+    def create(self, title: str = "Untitled spreadsheet", spreadsheet_id: str | None = None) -> str:
+        """Create an empty in-memory spreadsheet and return its ID."""
+        spreadsheet_id = spreadsheet_id or f"fake{next(self._ids):040d}"
+        self.workbooks[spreadsheet_id] = LocalWorkbook(Path(f"{spreadsheet_id}.json"), title)
+        return spreadsheet_id
+
+    def add(self, spreadsheet_id: str, workbook: LocalWorkbook):
+        """Register an already-built workbook (e.g. from a generator)."""
+        self.workbooks[spreadsheet_id] = workbook
+
+    @property
+    def call_count(self) -> int:
+        return len(self.calls)
+
+    def calls_by_method(self) -> dict[str, int]:
+        """Number of recorded calls per API method."""
+        counts: dict[str, int] = {}
+        for call in self.calls:
+            counts[call["method"]] = counts.get(call["method"], 0) + 1
+        return counts
+
+    def payload_bytes(self, method: str | None = None) -> int:
+        """Total JSON size of recorded request bodies (optionally for one method)."""
+        return sum(c["bytes"] for c in self.calls if method is None or c["method"] == method)
+
+    def reset_calls(self):
+        self.calls = []
+
+    def _before_call(self, method: str, kwargs: dict[str, Any]):
+        """Record the call, then apply latency, quotas and injected failures."""
+        body = kwargs.get("body")
+        self.calls.append({
+            "method": method,
+            "range": kwargs.get("a1") or kwargs.get("ranges"),
+            "bytes": len(json.dumps(body, default=str)) if body is not None else 0,
+        })
+        if self.latency:
+            self._sleep(self.latency)
+
+        if self.fail_every and len(self.calls) % self.fail_every == 0:
+            raise http_error(503, "The service is currently unavailable.")
+
+        is_write = method in _WRITE_METHODS
+        window = self._writes if is_write else self._reads
+        quota = self.write_quota_per_minute if is_write else self.read_quota_per_minute
+        now = self._clock()
+        while window and now - window[0] >= 60:
+            window.popleft()
+        if quota is not None and len(window) >= quota:
+            kind = "Write" if is_write else "Read"
+            raise http_error(429, f"Quota exceeded for quota metric '{kind} requests'")
+        window.append(now)
@@ -0,0 +1,177 @@
+"""Compact column-oriented grid for sheet reads.
+
+The Sheets API returns ragged list-of-lists with trailing blanks omitted,
+which forces a bounds check on every cell access and keeps one boxed
+Python object per cell alive. Grid pads once at construction and stores
+each column either as an array('d') (all-numeric columns, NaN for blanks)
+or as a tuple of interned strings, so repeated display values like "$0"
+or identical formulas share one object. Row views and sub-grids share the
+underlying columns instead of copying them.
+"""
+
+import math
+import sys
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+Column = array | tuple
+
+
+def _build_column(cells: list[Any]) -> Column:
+    """Store a column as a float array if every non-blank cell is a number."""
+    numeric = any(isinstance(v, int | float) for v in cells) and all(
+        v == "" or (isinstance(v, int | float) and not isinstance(v, bool)) for v in cells
+    )
+    if numeric:
+        return array("d", (math.nan if v == "" else float(v) for v in cells))
+    return tuple(sys.intern(v) if isinstance(v, str) else v for v in cells)
+
+
+class RowView:
+    """A read-only view of one grid row (no copying)."""
+
+    __slots__ = ("_grid", "_row")
+
+    def __init__(self, grid: "Grid", row: int):
+        self._grid = grid
+        self._row = row
+
+    def __getitem__(self, col: int) -> Any:
+        return self._grid[self._row, col]
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __iter__(self) -> Iterator[Any]:
+        grid = self._grid
+        return (grid[self._row, c] for c in range(grid.width))
+
+    def __repr__(self) -> str:
+        return f"RowView({list(self)!r})"
+
+
+class Grid:
+    """Rectangular, padded, column-oriented view of a sheet range.
+
+    Blank cells read as "" regardless of column type. Indices are 0-based
+    and relative to the top-left of the grid; origin_row / origin_col give
+    the sheet position of that corner.
+    """
+
+    __slots__ = ("_columns", "_row0", "height", "width", "origin_row", "origin_col", "_labels")
+
+    def __init__(
+        self,
+        columns: list[Column],
+        height: int,
+        row0: int = 0,
+        origin_row: int = 0,
+        origin_col: int = 0,
+    ):
+        self._columns = columns
+        self._row0 = row0
+        self.height = height
+        self.width = len(columns)
+        self.origin_row = origin_row
+        self.origin_col = origin_col
+        self._labels: dict[str, int] | None = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: list[list[Any]],
+        height: int | None = None,
+        width: int | None = None,
+        origin_row: int = 0,
+        origin_col: int = 0,
+    ) -> "Grid":
+        """Build a grid from an API values response (ragged rows are padded).
+
+        Args:
+            rows: 2D list as returned by read_range / read_formulas.
+            height: Number of rows (default: len(rows)). Extra rows are blank.
+            width: Number of columns (default: longest row).
+            origin_row: 0-based sheet row of rows[0].
+            origin_col: 0-based sheet column of rows[*][0].
+        """
+        height = len(rows) if height is None else height
+        width = max((len(r) for r in rows), default=0) if width is None else width
+        padded = [list(r[:width]) + [""] * (width - len(r)) for r in rows[:height]]
+        padded.extend([[""] * width for _ in range(height - len(padded))])
+        columns = [_build_column(list(cells)) for cells in zip(*padded)] if height else [
+            _build_column([]) for _ in range(width)
+        ]
+        return cls(columns, height, origin_row=origin_row, origin_col=origin_col)
+
+    def __getitem__(self, key: tuple[int, int]) -> Any:
+        row, col = key
+        if not (0 <= row < self.height):
+            raise IndexError(f"Row {row} out of range (height {self.height})")
+        value = self._columns[col][self._row0 + row]
+        if isinstance(value, float) and math.isnan(value):
+            return ""
+        return value
+
+    def row(self, row: int) -> RowView:
+        """View of one row."""
+        if not (0 <= row < self.height):
+            raise IndexError(f"Row {row} out of range (height {self.height})")
+        return RowView(self, row)
+
+    def rows(self) -> Iterator[RowView]:
+        """Iterate over row views."""
+        return (RowView(self, r) for r in range(self.height))
+
+    def column(self, col: int) -> Column:
+        """The stored column: array('d') for numeric columns, else a tuple.
+
+        For a sub-grid this is sliced to the grid's rows (a copy of the
+        column only, not the grid).
+        """
+        column = self._columns[col]
+        if self._row0 == 0 and len(column) == self.height:
+            return column
+        return column[self._row0 : self._row0 + self.height]
+
+    def is_numeric(self, col: int) -> bool:
+        """Whether a column is stored as a float array."""
+        return isinstance(self._columns[col], array)
+
+    def find(self, label: str) -> int | None:
+        """Row index of the first row whose first column equals label."""
+        if self._labels is None:
+            self._labels = {}
+            first = self._columns[0] if self._columns else ()
+            for r in range(self.height):
+                value = first[self._row0 + r]
+                if isinstance(value, str) and value and value.strip() not in self._labels:
+                    self._labels[value.strip()] = r
+        return self._labels.get(label.strip())
+
+    def slice(self, rows: slice = slice(None), cols: slice = slice(None)) -> "Grid":
+        """Sub-grid sharing this grid's column storage (step must be 1)."""
+        r_start, r_stop, r_step = rows.indices(self.height)
+        c_start, c_stop, c_step = cols.indices(self.width)
+        if r_step != 1 or c_step != 1:
+            raise ValueError("Grid slices must be contiguous")
+        return Grid(
+            self._columns[c_start:c_stop],
+            max(0, r_stop - r_start),
+            row0=self._row0 + r_start,
+            origin_row=self.origin_row + r_start,
+            origin_col=self.origin_col + c_start,
+        )
+
+    def to_rows(self) -> list[list[Any]]:
+        """Convert back to API-style rows with trailing blanks trimmed."""
+        result = []
+        for view in self.rows():
+            row = list(view)
+            while row and row[-1] == "":
+                row.pop()
+            result.append(row)
+        return result
+
+    def __repr__(self) -> str:
+        return f"Grid({self.height}x{self.width} at R{self.origin_row + 1}C{self.origin_col + 1})"
@@ -0,0 +1,818 @@
+"""Offline backend serving the Sheets v4 spreadsheets resource from local files.
+
+LocalSpreadsheets stands in for ``build("sheets", "v4").spreadsheets()``, so
+every SheetsClient method (reads, formula reads, read_numeric, writes,
+append, clear, formatting, batch_update) runs unchanged against an exported
+``.xlsx`` workbook or an on-disk JSON grid store, at memory speed and
+without network.
+
+Select it with a ``local:`` spreadsheet URL, e.g. ``local:exports/model.xlsx``
+or ``local:///abs/path/model.json``, or set ``FPA_SHEETS_BACKEND=local`` to
+resolve plain spreadsheet IDs to ``$FPA_LOCAL_DIR/<id>.json`` (or ``.xlsx``),
+which must exist. A ``local:`` path to a new ``.json`` file starts an empty
+workbook there.
+
+Formulas are stored but not recalculated. Formula cells read back the cached
+value from the source file (xlsx saved by Excel/Sheets, or a JSON store
+written by save()), or blank if they were written locally. Use
+sync_to_sheets() to push a local workbook to a live spreadsheet.
+"""
+
+import json
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from .compact import parse_number
+from .r1c1 import column_index, column_letter, formula_shifter
+
+LOCAL_SCHEME = "local:"
+
+_DATE_INPUT_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$|^(\d{4})-(\d{2})-(\d{2})$")
+_SERIAL_EPOCH = date(1899, 12, 30)
+_FORMAT_LITERAL_RE = re.compile(r'"[^"]*"|\\.')
+_MONTH_TOKEN_RE = re.compile(r'yyyy|yy|m{1,4}|"[^"]*"|\\.', re.IGNORECASE)
+_DEFAULT_ROWS = 1000
+_DEFAULT_COLUMNS = 26
+
+
+def is_local_spreadsheet(url_or_id: str | None) -> bool:
+    """Whether a spreadsheet reference points at the local backend."""
+    if not url_or_id:
+        return False
+    return url_or_id.startswith(LOCAL_SCHEME) or os.getenv("FPA_SHEETS_BACKEND") == "local"
+
+
+def local_path(url_or_id: str) -> Path:
+    """Resolve a local spreadsheet reference to a file path."""
+    if url_or_id.startswith(LOCAL_SCHEME):
+        raw = url_or_id[len(LOCAL_SCHEME) :]
+        if raw.startswith("//"):
+            raw = raw[2:]
+        return Path(raw).expanduser()
+    base = Path(os.getenv("FPA_LOCAL_DIR", "~/.fpa-agent/local")).expanduser()
+    xlsx = base / f"{url_or_id}.xlsx"
+    return xlsx if xlsx.exists() else base / f"{url_or_id}.json"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Value conversion
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _to_serial(d: date | datetime) -> float:
+    if isinstance(d, datetime):
+        delta = d - datetime(1899, 12, 30)
+        return delta.days + delta.seconds / 86400
+    return float((d - _SERIAL_EPOCH).days)
+
+
+def _from_serial(serial: float) -> date:
+    return date.fromordinal(_SERIAL_EPOCH.toordinal() + int(serial))
+
+
+def _decimals(pattern: str) -> int:
+    section = pattern.split(";")[0]
+    if "." not in section:
+        return 0
+    return len(re.match(r"0*", section.split(".", 1)[1]).group(0))
+
+
+def _date_codes(pattern: str) -> str:
+    """A number format's codes, lowercased, without quoted or escaped literals."""
+    return _FORMAT_LITERAL_RE.sub("", pattern).lower()
+
+
+def _is_date_format(pattern: str) -> bool:
+    """Whether a format shows a date: a year with a day or month (M/d/yyyy, mmm yyyy)."""
+    codes = _date_codes(pattern)
+    return "y" in codes and ("d" in codes or "m" in codes)
+
+
+def _format_month(d: date, pattern: str) -> str:
+    """Render a month-and-year format (mmm yyyy, MMM-yy, yyyy-mm) the way Sheets does."""
+    tokens = {
+        "yyyy": str(d.year),
+        "yy": f"{d.year % 100:02d}",
+        "mmmm": d.strftime("%B"),
+        "mmm": d.strftime("%b"),
+        "mm": f"{d.month:02d}",
+        "m": str(d.month),
+    }
+    return _MONTH_TOKEN_RE.sub(
+        lambda m: tokens.get(m.group(0).lower(), m.group(0).strip('"\\')), pattern
+    )
+
+
+def format_value(value: Any, pattern: str | None) -> Any:
+    """Render a stored value the way FORMATTED_VALUE would (common patterns only)."""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, str):
+        return value
+    pattern = pattern or ""
+    if _is_date_format(pattern):
+        d = _from_serial(value)
+        if "d" not in _date_codes(pattern):
+            return _format_month(d, pattern)
+        return f"{d.month}/{d.day}/{d.year}"
+    decimals = _decimals(pattern)
+    if "%" in pattern:
+        return f"{value * 100:.{decimals}f}%"
+    if "$" in pattern:
+        text = f"${abs(value):,.{decimals}f}"
+        return f"-{text}" if value < 0 else text
+    if "#,##0" in pattern:
+        return f"{value:,.{decimals}f}"
+    if pattern.startswith("0"):
+        return f"{value:.{decimals}f}"
+    if float(value).is_integer():
+        return str(int(value))
+    return format(value, ".10g")
+
+
+def parse_user_entered(value: Any) -> tuple[Any, str | None, str | None]:
+    """Interpret a USER_ENTERED input as (value, formula, number_format)."""
+    if not isinstance(value, str):
+        return value, None, None
+    text = value.strip()
+    if text.startswith("="):
+        return "", text, None
+    match = _DATE_INPUT_RE.match(text)
+    if match:
+        if match.group(1):
+            month, day, year = (int(g) for g in match.group(1, 2, 3))
+        else:
+            year, month, day = (int(g) for g in match.group(4, 5, 6))
+        return _to_serial(date(year, month, day)), None, "M/d/yyyy"
+    number = parse_number(text)
+    if number is not None:
+        fraction = re.search(r"\.(\d+)", text)
+        suffix = "." + "0" * len(fraction.group(1)) if fraction else ""
+        if text.endswith("%"):
+            return number, None, f"0{suffix}%"
+        if "$" in text:
+            return number, None, f"$#,##0{suffix}"
+        return number, None, None
+    return value, None, None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Workbook model
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class LocalCell:
+    """One stored cell: value (cached result for formulas), formula and number format."""
+
+    __slots__ = ("value", "formula", "number_format")
+
+    def __init__(
+        self, value: Any = "", formula: str | None = None, number_format: str | None = None
+    ):
+        self.value = value
+        self.formula = formula
+        self.number_format = number_format
+
+
+class LocalSheet:
+    """One tab: sparse cell map plus grid properties."""
+
+    def __init__(self, name: str, sheet_id: int, row_count: int = 0, column_count: int = 0):
+        self.name = name
+        self.sheet_id = sheet_id
+        self.cells: dict[tuple[int, int], LocalCell] = {}
+        self.row_count = row_count or _DEFAULT_ROWS
+        self.column_count = column_count or _DEFAULT_COLUMNS
+        self.frozen_rows = 0
+        self.frozen_columns = 0
+        self._extent = (0, 0)
+
+    def used_extent(self) -> tuple[int, int]:
+        """(rows, columns) covering every cell ever written (never shrinks)."""
+        return self._extent
+
+    def set(self, row: int, col: int, cell: LocalCell | None):
+        empty = cell is None or (
+            cell.value in ("", None) and not cell.formula and not cell.number_format
+        )
+        if empty:
+            self.cells.pop((row, col), None)
+            return
+        self.cells[(row, col)] = cell
+        rows, cols = self._extent
+        if row >= rows or col >= cols:
+            self._extent = (max(rows, row + 1), max(cols, col + 1))
+            self.row_count = max(self.row_count, row + 1)
+            self.column_count = max(self.column_count, col + 1)
+
+
+class LocalWorkbook:
+    """A spreadsheet held in memory, loaded from and saved to a local file."""
+
+    def __init__(self, path: Path, title: str | None = None):
+        self.path = path
+        self.title = title or path.stem
+        self.sheets: list[LocalSheet] = []
+
+    @classmethod
+    def load(cls, path: Path, create: bool = False) -> "LocalWorkbook":
+        """Load a workbook from .xlsx or .json.
+
+        Args:
+            path: Workbook file.
+            create: Start an empty workbook if a .json file does not exist yet.
+
+        Raises:
+            FileNotFoundError: If the file does not exist and create is False.
+        """
+        if path.suffix.lower() == ".xlsx":
+            return cls._load_xlsx(path)
+        workbook = cls(path)
+        if not path.exists() and not create:
+            raise FileNotFoundError(f"No local workbook at {path}")
+        if path.exists():
+            data = json.loads(path.read_text())
+            workbook.title = data.get("title", workbook.title)
+            for spec in data.get("sheets", []):
+                sheet = LocalSheet(
+                    spec["name"], spec["sheet_id"], spec.get("row_count"), spec.get("column_count")
+                )
+                for ref, (value, formula, number_format) in spec.get("cells", {}).items():
+                    col, row = _parse_cell(ref)
+                    sheet.set(row, col, LocalCell(value, formula, number_format))
+                workbook.sheets.append(sheet)
+        return workbook
+
+    @classmethod
+    def _load_xlsx(cls, path: Path) -> "LocalWorkbook":
+        try:
+            import openpyxl
+        except ImportError as e:
+            raise ImportError(
+                "Reading .xlsx files requires openpyxl: pip install 'fpa-agent[xlsx]'"
+            ) from e
+
+        formulas_wb = openpyxl.load_workbook(path, data_only=False)
+        values_wb = openpyxl.load_workbook(path, data_only=True)
+        workbook = cls(path)
+        for index, ws in enumerate(formulas_wb.worksheets):
+            cached = values_wb[ws.title]
+            sheet = LocalSheet(ws.title, index, ws.max_row, ws.max_column)
+            for row in ws.iter_rows():
+                for cell in row:
+                    raw = cell.value
+                    if raw is None:
+                        continue
+                    formula = raw if isinstance(raw, str) and raw.startswith("=") else None
+                    value = cached.cell(row=cell.row, column=cell.column).value if formula else raw
+                    if isinstance(value, date | datetime):
+                        value = _to_serial(value)
+                    fmt = cell.number_format if cell.number_format != "General" else None
+                    value = "" if value is None else value
+                    sheet.set(cell.row - 1, cell.column - 1, LocalCell(value, formula, fmt))
+            workbook.sheets.append(sheet)
+        return workbook
+
+    def save(self, path: Path | None = None):
+        """Write the workbook back to .json or .xlsx."""
+        path = path or self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".xlsx":
+            self._save_xlsx(path)
+            return
+        data = {
+            "title": self.title,
+            "sheets": [
+                {
+                    "name": s.name,
+                    "sheet_id": s.sheet_id,
+                    "row_count": s.row_count,
+                    "column_count": s.column_count,
+                    "cells": {
+                        f"{column_letter(c)}{r + 1}": [cell.value, cell.formula, cell.number_format]
+                        for (r, c), cell in sorted(s.cells.items())
+                    },
+                }
+                for s in self.sheets
+            ],
+        }
+        path.write_text(json.dumps(data))
+
+    def _save_xlsx(self, path: Path):
+        import openpyxl
+
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+        for sheet in self.sheets:
+            ws = wb.create_sheet(sheet.name)
+            for (r, c), cell in sheet.cells.items():
+                target = ws.cell(row=r + 1, column=c + 1, value=cell.formula or cell.value)
+                if cell.number_format:
+                    target.number_format = cell.number_format
+        wb.save(path)
+
+    def sheet(self, name: str) -> LocalSheet:
+        for sheet in self.sheets:
+            if sheet.name == name:
+                return sheet
+        raise ValueError(f"Unable to parse range: sheet '{name}' not found")
+
+    def sheet_by_id(self, sheet_id: int) -> LocalSheet:
+        for sheet in self.sheets:
+            if sheet.sheet_id == sheet_id:
+                return sheet
+        raise ValueError(f"No sheet with id {sheet_id}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Range parsing
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _parse_cell(ref: str) -> tuple[int | None, int | None]:
+    """'B5' -> (1, 4); 'B' -> (1, None); '5' -> (None, 4)."""
+    ref = ref.replace("$", "")
+    letters = "".join(ch for ch in ref if ch.isalpha())
+    digits = "".join(ch for ch in ref if ch.isdigit())
+    return (
+        column_index(letters) if letters else None,
+        int(digits) - 1 if digits else None,
+    )
+
+
+def split_range(a1: str) -> tuple[str, str]:
+    """Split "'Sheet Name'!A1:B2" into ("Sheet Name", "A1:B2")."""
+    if "!" not in a1:
+        return a1.strip("'").replace("''", "'"), ""
+    sheet, rng = a1.rsplit("!", 1)
+    return sheet.strip("'").replace("''", "'"), rng
+
+
+def resolve_range(sheet: LocalSheet, rng: str) -> tuple[int, int, int, int]:
+    """Resolve an A1 range to inclusive-exclusive (r0, c0, r1, c1) bounds."""
+    used_rows, used_cols = sheet.used_extent()
+    if not rng:
+        return 0, 0, max(used_rows, 1), max(used_cols, 1)
+    start, _, end = rng.partition(":")
+    end = end or start
+    c0, r0 = _parse_cell(start)
+    c1, r1 = _parse_cell(end)
+    return (
+        r0 if r0 is not None else 0,
+        c0 if c0 is not None else 0,
+        (r1 + 1) if r1 is not None else max(used_rows, 1),
+        (c1 + 1) if c1 is not None else max(used_cols, 1),
+    )
+
+
+def _a1(sheet: LocalSheet, r0: int, c0: int, r1: int, c1: int) -> str:
+    quoted = sheet.name.replace("'", "''")
+    return f"'{quoted}'!{column_letter(c0)}{r0 + 1}:{column_letter(c1 - 1)}{r1}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Resource stand-ins
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class LocalRequest:
+    """Deferred call with the googleapiclient request interface (execute())."""
+
+    def __init__(self, method: str, func, **kwargs):
+        self.method = method
+        self.kwargs = kwargs
+        self._func = func
+
+    def execute(self) -> Any:
+        return self._func(**self.kwargs)
+
+
+class LocalSpreadsheets:
+    """Drop-in for the Sheets v4 ``spreadsheets()`` resource over local workbooks."""
+
+    def __init__(self):
+        self._workbooks: dict[str, LocalWorkbook] = {}
+
+    def workbook(self, spreadsheet_id: str) -> LocalWorkbook:
+        """Load (once) and return the workbook for a local spreadsheet reference.
+
+        A local: reference names its file, so a new .json path starts an empty
+        workbook there; a plain ID (FPA_SHEETS_BACKEND=local) must resolve to
+        an existing file, so a mistyped ID fails instead of opening a blank one.
+        """
+        if spreadsheet_id not in self._workbooks:
+            self._workbooks[spreadsheet_id] = LocalWorkbook.load(
+                local_path(spreadsheet_id), create=spreadsheet_id.startswith(LOCAL_SCHEME)
+            )
+        return self._workbooks[spreadsheet_id]
+
+    def save(self, spreadsheet_id: str, path: Path | None = None):
+        """Persist a workbook (to its source file by default)."""
+        self.workbook(spreadsheet_id).save(path)
+
+    def _request(self, method: str, func, **kwargs: Any) -> LocalRequest:
+        """Create a request object; subclasses can wrap execution (see src.sheets.fake)."""
+        return LocalRequest(method, func, **kwargs)
+
+    # spreadsheets.get / spreadsheets.batchUpdate
+
+    def get(self, spreadsheetId: str, **_: Any) -> LocalRequest:
+        return self._request("spreadsheets.get", self._get, spreadsheetId=spreadsheetId)
+
+    def batchUpdate(self, spreadsheetId: str, body: dict[str, Any]) -> LocalRequest:
+        return self._request(
+            "spreadsheets.batchUpdate", self._batch_update, spreadsheetId=spreadsheetId, body=body
+        )
+
+    def values(self) -> "LocalValues":
+        return LocalValues(self)
+
+    def _get(self, spreadsheetId: str) -> dict[str, Any]:
+        wb = self.workbook(spreadsheetId)
+        return {
+            "spreadsheetId": spreadsheetId,
+            "properties": {"title": wb.title},
+            "sheets": [
+                {
+                    "properties": {
+                        "sheetId": s.sheet_id,
+                        "title": s.name,
+                        "index": i,
+                        "gridProperties": {
+                            "rowCount": s.row_count,
+                            "columnCount": s.column_count,
+                            "frozenRowCount": s.frozen_rows,
+                            "frozenColumnCount": s.frozen_columns,
+                        },
+                    }
+                }
+                for i, s in enumerate(wb.sheets)
+            ],
+        }
+
+    def _batch_update(self, spreadsheetId: str, body: dict[str, Any]) -> dict[str, Any]:
+        wb = self.workbook(spreadsheetId)
+        replies = []
+        for request in body.get("requests", []):
+            (kind, spec), = request.items()
+            handler = getattr(self, f"_req_{kind}", None)
+            if handler is None:
+                raise ValueError(f"Request type '{kind}' is not supported by the local backend")
+            replies.append(handler(wb, spec) or {})
+        return {"spreadsheetId": spreadsheetId, "replies": replies}
+
+    # batchUpdate request handlers — the subset SheetsClient uses
+
+    def _req_addSheet(self, wb: LocalWorkbook, spec: dict[str, Any]) -> dict[str, Any]:
+        props = spec.get("properties", {})
+        sheet_id = props.get("sheetId", max((s.sheet_id for s in wb.sheets), default=-1) + 1)
+        grid = props.get("gridProperties", {})
+        sheet = LocalSheet(
+            props.get("title", f"Sheet{len(wb.sheets) + 1}"),
+            sheet_id,
+            grid.get("rowCount", _DEFAULT_ROWS),
+            grid.get("columnCount", _DEFAULT_COLUMNS),
+        )
+        sheet.frozen_rows = grid.get("frozenRowCount", 0)
+        sheet.frozen_columns = grid.get("frozenColumnCount", 0)
+        wb.sheets.append(sheet)
+        return {"addSheet": {"properties": {"sheetId": sheet.sheet_id, "title": sheet.name}}}
+
+    def _req_deleteSheet(self, wb: LocalWorkbook, spec: dict[str, Any]):
+        wb.sheets.remove(wb.sheet_by_id(spec["sheetId"]))
+
+    def _req_updateSheetProperties(self, wb: LocalWorkbook, spec: dict[str, Any]):
+        props = spec["properties"]
+        sheet = wb.sheet_by_id(props["sheetId"])
+        grid = props.get("gridProperties", {})
+        sheet.frozen_rows = grid.get("frozenRowCount", sheet.frozen_rows)
+        sheet.frozen_columns = grid.get("frozenColumnCount", sheet.frozen_columns)
+        sheet.row_count = grid.get("rowCount", sheet.row_count)
+        sheet.column_count = grid.get("columnCount", sheet.column_count)
+        if "title" in props:
+            sheet.name = props["title"]
+
+    def _req_repeatCell(self, wb: LocalWorkbook, spec: dict[str, Any]):
+        rng = spec["range"]
+        sheet = wb.sheet_by_id(rng.get("sheetId", 0))
+        r0, c0, r1, c1 = _grid_bounds(sheet, rng)
+        cell_spec = spec.get("cell", {})
+        pattern = cell_spec.get("userEnteredFormat", {}).get("numberFormat", {}).get("pattern")
+        entered = cell_spec.get("userEnteredValue")
+        if entered is not None and "formulaValue" in entered:
+            shift = formula_shifter(entered["formulaValue"])
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                existing = sheet.cells.get((r, c)) or LocalCell()
+                if pattern is not None:
+                    existing.number_format = pattern
+                if entered is not None:
+                    if "formulaValue" in entered:
+                        # repeatCell shifts relative references like a fill
+                        existing.formula = shift(r - r0, c - c0)
+                        existing.value = ""
+                    else:
+                        existing.formula = None
+                        existing.value = next(iter(entered.values()))
+                sheet.set(r, c, existing)
+
+    def _req_appendDimension(self, wb: LocalWorkbook, spec: dict[str, Any]):
+        sheet = wb.sheet_by_id(spec["sheetId"])
+        if spec["dimension"] == "ROWS":
+            sheet.row_count += spec["length"]
+        else:
+            sheet.column_count += spec["length"]
+
+    def _paste(
+        self,
+        sheet: LocalSheet,
+        source: tuple[int, int, int, int],
+        targets: list[tuple[int, int]],
+        paste_type: str = "PASTE_NORMAL",
+    ):
+        """Copy source cells onto targets, tiling the block and shifting formulas."""
+        r0, c0, r1, c1 = source
+        height, width = r1 - r0, c1 - c0
+        snapshot = {(r, c): sheet.cells.get((r, c)) for r in range(r0, r1) for c in range(c0, c1)}
+        shifters = {
+            key: formula_shifter(cell.formula)
+            for key, cell in snapshot.items()
+            if cell is not None and cell.formula
+        }
+        for r, c in targets:
+            sr, sc = r0 + (r - r0) % height, c0 + (c - c0) % width
+            cell = snapshot[(sr, sc)] or LocalCell()
+            existing = sheet.cells.get((r, c)) or LocalCell()
+            formula = shifters[(sr, sc)](r - sr, c - sc) if cell.formula else None
+            match paste_type:
+                case "PASTE_VALUES":
+                    pasted = LocalCell(cell.value, None, existing.number_format)
+                case "PASTE_FORMAT":
+                    pasted = LocalCell(existing.value, existing.formula, cell.number_format)
+                case "PASTE_FORMULA":
+                    value = "" if formula else cell.value
+                    pasted = LocalCell(value, formula, existing.number_format)
+                case _:
+                    pasted = LocalCell("" if formula else cell.value, formula, cell.number_format)
+            sheet.set(r, c, pasted)
+
+    def _req_copyPaste(self, wb: LocalWorkbook, spec: dict[str, Any]):
+        # Formula results are not evaluated locally, so pasted formulas read as ""
+        source = spec["source"]
+        sheet = wb.sheet_by_id(source.get("sheetId", 0))
+        target = wb.sheet_by_id(spec["destination"].get("sheetId", 0))
+        if target is not sheet:
+            raise ValueError("copyPaste across tabs is not supported by the local backend")
+        r0, c0, r1, c1 = _grid_bounds(sheet, spec["destination"])
+        targets = [(r, c) for r in range(r0, r1) for c in range(c0, c1)]
+        self._paste(sheet, _grid_bounds(sheet, source), targets, spec.get("pasteType", ""))
+
+    def _req_autoFill(self, wb: LocalWorkbook, spec: dict[str, Any]):
+        # Formulas shift as in Sheets; constants repeat rather than extending a series
+        if "sourceAndDestination" not in spec:
+            raise ValueError("autoFill needs sourceAndDestination in the local backend")
+        fill = spec["sourceAndDestination"]
+        sheet = wb.sheet_by_id(fill["source"].get("sheetId", 0))
+        r0, c0, r1, c1 = _grid_bounds(sheet, fill["source"])
+        length = fill["fillLength"]
+        if fill["dimension"] == "ROWS":
+            rows = range(r1, r1 + length) if length > 0 else range(r0 + length, r0)
+            targets = [(r, c) for r in rows for c in range(c0, c1)]
+        else:
+            cols = range(c1, c1 + length) if length > 0 else range(c0 + length, c0)
+            targets = [(r, c) for r in range(r0, r1) for c in cols]
+        self._paste(sheet, (r0, c0, r1, c1), targets)
+
+
+class LocalValues:
+    """Drop-in for ``spreadsheets().values()``."""
+
+    def __init__(self, parent: LocalSpreadsheets):
+        self._parent = parent
+
+    def get(self, spreadsheetId: str, range: str, **options: Any) -> LocalRequest:
+        return self._parent._request(
+            "values.get", self._get, spreadsheetId=spreadsheetId, a1=range, **options
+        )
+
+    def batchGet(self, spreadsheetId: str, ranges: list[str], **options: Any) -> LocalRequest:
+        return self._parent._request(
+            "values.batchGet",
+            self._batch_get,
+            spreadsheetId=spreadsheetId,
+            ranges=ranges,
+            **options,
+        )
+
+    def update(
+        self, spreadsheetId: str, range: str, valueInputOption: str, body: dict[str, Any]
+    ) -> LocalRequest:
+        return self._parent._request(
+            "values.update",
+            self._update,
+            spreadsheetId=spreadsheetId,
+            a1=range,
+            valueInputOption=valueInputOption,
+            body=body,
+        )
+
+    def batchUpdate(self, spreadsheetId: str, body: dict[str, Any]) -> LocalRequest:
+        return self._parent._request(
+            "values.batchUpdate", self._batch_update, spreadsheetId=spreadsheetId, body=body
+        )
+
+    def append(
+        self,
+        spreadsheetId: str,
+        range: str,
+        valueInputOption: str,
+        body: dict[str, Any],
+        insertDataOption: str = "OVERWRITE",
+    ) -> LocalRequest:
+        return self._parent._request(
+            "values.append",
+            self._append,
+            spreadsheetId=spreadsheetId,
+            a1=range,
+            valueInputOption=valueInputOption,
+            body=body,
+        )
+
+    def clear(self, spreadsheetId: str, range: str, body: dict | None = None) -> LocalRequest:
+        return self._parent._request(
+            "values.clear", self._clear, spreadsheetId=spreadsheetId, a1=range
+        )
+
+    def _get(
+        self,
+        spreadsheetId: str,
+        a1: str,
+        valueRenderOption: str = "FORMATTED_VALUE",
+        dateTimeRenderOption: str = "SERIAL_NUMBER",
+        **_: Any,
+    ) -> dict[str, Any]:
+        wb = self._parent.workbook(spreadsheetId)
+        sheet_name, rng = split_range(a1)
+        sheet = wb.sheet(sheet_name)
+        r0, c0, r1, c1 = resolve_range(sheet, rng)
+
+        rows: list[list[Any]] = []
+        for r in range(r0, r1):
+            row = []
+            for c in range(c0, c1):
+                cell = sheet.cells.get((r, c))
+                row.append(_render(cell, valueRenderOption, dateTimeRenderOption))
+            while row and row[-1] == "":
+                row.pop()
+            rows.append(row)
+        while rows and not rows[-1]:
+            rows.pop()
+
+        result: dict[str, Any] = {"range": _a1(sheet, r0, c0, r1, c1), "majorDimension": "ROWS"}
+        if rows:
+            result["values"] = rows
+        return result
+
+    def _batch_get(self, spreadsheetId: str, ranges: list[str], **options: Any) -> dict[str, Any]:
+        return {
+            "spreadsheetId": spreadsheetId,
+            "valueRanges": [self._get(spreadsheetId, rng, **options) for rng in ranges],
+        }
+
+    def _write(
+        self, sheet: LocalSheet, r0: int, c0: int, values: list[list[Any]], raw: bool
+    ) -> dict[str, Any]:
+        for i, row in enumerate(values):
+            for j, value in enumerate(row):
+                if value is None:
+                    continue  # None leaves the cell unchanged, as in the API
+                existing = sheet.cells.get((r0 + i, c0 + j))
+                fmt = existing.number_format if existing else None
+                if raw:
+                    cell = LocalCell(value, None, fmt)
+                else:
+                    parsed, formula, parsed_fmt = parse_user_entered(value)
+                    cell = LocalCell(parsed, formula, parsed_fmt or fmt)
+                sheet.set(r0 + i, c0 + j, cell)
+        height = len(values)
+        width = max((len(r) for r in values), default=0)
+        return {
+            "updatedRange": _a1(sheet, r0, c0, r0 + height, c0 + max(width, 1)),
+            "updatedRows": height,
+            "updatedColumns": width,
+            "updatedCells": sum(len(r) for r in values),
+        }
+
+    def _update(
+        self, spreadsheetId: str, a1: str, valueInputOption: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        sheet_name, rng = split_range(a1)
+        sheet = self._parent.workbook(spreadsheetId).sheet(sheet_name)
+        r0, c0, _, _ = resolve_range(sheet, rng)
+        result = self._write(sheet, r0, c0, body.get("values", []), valueInputOption == "RAW")
+        return {"spreadsheetId": spreadsheetId, **result}
+
+    def _batch_update(self, spreadsheetId: str, body: dict[str, Any]) -> dict[str, Any]:
+        option = body.get("valueInputOption", "USER_ENTERED")
+        responses = [
+            self._update(spreadsheetId, data["range"], option, {"values": data["values"]})
+            for data in body.get("data", [])
+        ]
+        return {
+            "spreadsheetId": spreadsheetId,
+            "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+            "responses": responses,
+        }
+
+    def _append(
+        self, spreadsheetId: str, a1: str, valueInputOption: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        sheet_name, rng = split_range(a1)
+        sheet = self._parent.workbook(spreadsheetId).sheet(sheet_name)
+        _, c0, _, _ = resolve_range(sheet, rng)
+        # The table ends after the last non-empty row
+        next_row = max((r for r, _ in sheet.cells), default=-1) + 1
+        values = body.get("values", [])
+        result = self._write(sheet, next_row, c0, values, valueInputOption == "RAW")
+        return {
+            "spreadsheetId": spreadsheetId,
+            "updates": {"spreadsheetId": spreadsheetId, **result},
+        }
+
+    def _clear(self, spreadsheetId: str, a1: str) -> dict[str, Any]:
+        sheet_name, rng = split_range(a1)
+        sheet = self._parent.workbook(spreadsheetId).sheet(sheet_name)
+        r0, c0, r1, c1 = resolve_range(sheet, rng)
+        for (r, c) in list(sheet.cells):
+            if r0 <= r < r1 and c0 <= c < c1:
+                # Clearing keeps formatting
+                cell = sheet.cells[(r, c)]
+                sheet.set(r, c, LocalCell("", None, cell.number_format))
+        return {"spreadsheetId": spreadsheetId, "clearedRange": _a1(sheet, r0, c0, r1, c1)}
+
+
+def _grid_bounds(sheet: LocalSheet, grid_range: dict[str, Any]) -> tuple[int, int, int, int]:
+    used_rows, used_cols = sheet.used_extent()
+    return (
+        grid_range.get("startRowIndex", 0),
+        grid_range.get("startColumnIndex", 0),
+        grid_range.get("endRowIndex", max(used_rows, sheet.row_count)),
+        grid_range.get("endColumnIndex", max(used_cols, sheet.column_count)),
+    )
+
+
+def _render(cell: LocalCell | None, value_option: str, date_option: str) -> Any:
+    if cell is None:
+        return ""
+    if value_option == "FORMULA":
+        return cell.formula or cell.value
+    if value_option == "UNFORMATTED_VALUE":
+        if (
+            date_option == "FORMATTED_STRING"
+            and cell.number_format
+            and _is_date_format(cell.number_format)
+        ):
+            return format_value(cell.value, cell.number_format)
+        return cell.value
+    return format_value(cell.value, cell.number_format)
+
+
+def sync_to_sheets(
+    local_id: str, client: Any, sheet_names: list[str] | None = None
+) -> dict[str, int]:
+    """Push the formulas and values of a local workbook to a live spreadsheet.
+
+    Each tab is written in one values.update call (USER_ENTERED, with dates
+    sent as M/D/YYYY so they stay dates); tabs must already exist in the
+    target spreadsheet.
+
+    Args:
+        local_id: Local spreadsheet reference (e.g. "local:model.json").
+        client: SheetsClient connected to the target Google spreadsheet.
+        sheet_names: Tabs to sync (default: all).
+
+    Returns:
+        Dict mapping tab name to the number of cells written.
+    """
+    written = {}
+    for sheet in LocalSpreadsheets().workbook(local_id).sheets:
+        if sheet_names and sheet.name not in sheet_names:
+            continue
+        height, width = sheet.used_extent()
+        rows = [[""] * width for _ in range(height)]
+        for (r, c), cell in sheet.cells.items():
+            if cell.formula:
+                rows[r][c] = cell.formula
+            elif cell.number_format and _is_date_format(cell.number_format):
+                rows[r][c] = format_value(cell.value, cell.number_format)
+            else:
+                rows[r][c] = cell.value
+        if rows:
+            client.write_range(sheet.name, "A1", rows)
+        written[sheet.name] = len(sheet.cells)
+    return written
@@ -0,0 +1,109 @@
+"""Typed numeric grids read with valueRenderOption=UNFORMATTED_VALUE.
+
+Formatted reads return "$1,234" strings rounded to the display format.
+Unformatted reads return the underlying numbers (and dates as serial day
+numbers), which NumericRange holds in a float array with a mask for blank
+and non-numeric cells, plus an index of row labels from column A.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+# Google Sheets / Excel date serials count days from 1899-12-30
+SERIAL_EPOCH = np.datetime64("1899-12-30", "D")
+
+
+def serial_to_date(serial: float | np.ndarray) -> np.datetime64 | np.ndarray:
+    """Convert sheet date serial number(s) to numpy datetime64[D]."""
+    return SERIAL_EPOCH + np.floor(np.asarray(serial)).astype("timedelta64[D]")
+
+
+def date_to_serial(date: Any) -> float | np.ndarray:
+    """Convert date(s) (datetime.date, ISO string or datetime64) to sheet serials."""
+    days = np.asarray(date, dtype="datetime64[D]") - SERIAL_EPOCH
+    return days.astype(np.float64)
+
+
+@dataclass
+class NumericRange:
+    """A range read as a float array.
+
+    Attributes:
+        sheet_name: Sheet the range was read from.
+        range_spec: A1 range that was requested.
+        origin_row: 0-based sheet row of values[0].
+        origin_col: 0-based sheet column of values[:, 0].
+        values: 2D float64 array; NaN where mask is True.
+        mask: 2D bool array, True for blank or non-numeric cells.
+        row_labels: Column A text for each row ("" if blank).
+    """
+
+    sheet_name: str
+    range_spec: str
+    origin_row: int
+    origin_col: int
+    values: np.ndarray
+    mask: np.ndarray
+    row_labels: list[str]
+    labels: dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        # First occurrence wins — repeated labels (e.g. "Salary" under each
+        # department) are available through rows_for()
+        self.labels = {}
+        for i, label in enumerate(self.row_labels):
+            if label and label not in self.labels:
+                self.labels[label] = i
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    def row(self, label: str) -> np.ndarray:
+        """Values of the first row whose column A label matches (NaN where masked)."""
+        if label not in self.labels:
+            raise KeyError(f"Row label '{label}' not found in {self.sheet_name}!{self.range_spec}")
+        return self.values[self.labels[label]]
+
+    def rows_for(self, label: str) -> list[int]:
+        """All row indices (into values) with the given label."""
+        return [i for i, lbl in enumerate(self.row_labels) if lbl == label]
+
+    def filled(self, fill: float = 0.0) -> np.ndarray:
+        """Copy of values with masked cells replaced by fill."""
+        return np.where(self.mask, fill, self.values)
+
+
+def cell_to_serial(value: Any) -> float:
+    """Number or date serial for a cell (number, date, "1/15/2026", "$120,000"); NaN if blank.
+
+    Accepts both unformatted values and formatted display text.
+    """
+    from datetime import date as date_type
+    from datetime import datetime
+
+    from .local import parse_user_entered
+
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, datetime | date_type):
+        value = value.strftime("%m/%d/%Y")
+    if isinstance(value, str) and value.strip():
+        parsed, _, _ = parse_user_entered(value)
+        if isinstance(parsed, int | float) and not isinstance(parsed, bool):
+            return float(parsed)
+    return float("nan")
+
+
+def to_numeric_array(
+    rows: list[list[Any]], height: int, width: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convert unformatted rows (ragged, trailing blanks omitted) to (values, mask)."""
+    values = np.full((height, width), np.nan)
+    for r, row in enumerate(rows[:height]):
+        for c, cell in enumerate(row[:width]):
+            if isinstance(cell, int | float) and not isinstance(cell, bool):
+                values[r, c] = cell
+    return values, np.isnan(values)
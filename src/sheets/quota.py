@@ -0,0 +1,69 @@
+"""Client-side request quota shared across clients and threads.
+
+The Sheets API allows a fixed number of requests per minute per project
+and per user; going over returns HTTP 429 and SheetsClient backs off for
+seconds at a time. When many clients run at once (see
+src.analysis.portfolio), a shared QuotaBucket paces their requests to the
+quota instead, so the pool never trips it.
+"""
+
+import os
+import threading
+import time
+
+# Requests per minute; FPA_SHEETS_QUOTA overrides it (the API's default
+# per-user read quota is 60, per project 300)
+DEFAULT_PER_MINUTE = 60
+
+
+class QuotaBucket:
+    """Thread-safe token bucket: per_minute requests a minute, bursts up to burst."""
+
+    def __init__(
+        self,
+        per_minute: float | None = None,
+        burst: int | None = None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            per_minute: Sustained requests per minute (default FPA_SHEETS_QUOTA
+                or DEFAULT_PER_MINUTE).
+            burst: Requests allowed back to back when the bucket is full
+                (default: two seconds' worth, at least 1). Keeps any
+                rolling minute under per_minute + burst.
+            clock: Monotonic clock (injectable for tests).
+            sleep: Sleep function (injectable for tests).
+        """
+        per_minute = per_minute or float(os.getenv("FPA_SHEETS_QUOTA", DEFAULT_PER_MINUTE))
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60
+        self.burst = burst or max(1, int(self.rate * 2))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one request slot, sleeping until it is free.
+
+        Slots are reserved in call order under the lock and waited for
+        outside it, so concurrent callers queue fairly without serializing
+        on the sleep.
+
+        Returns:
+            Seconds waited.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
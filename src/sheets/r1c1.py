@@ -0,0 +1,179 @@
+"""A1 / R1C1 reference helpers.
+
+Converting a formula to relative R1C1 notation makes every copy of a
+dragged formula identical: =C5*12 in D5 and =D5*12 in E5 both become
+=R[0]C[-1]*12. That is the basis for detecting repeated formula rows.
+"""
+
+import re
+from collections.abc import Callable
+from typing import Any
+
+# Either a whole-column range (A:A, $B:$D) or a cell ref (A1, $A1, A$1, $A$1),
+# not part of a name, function call or number. One pass so rewritten output
+# is never matched again.
+_REF_RE = re.compile(
+    r"(?<![A-Za-z0-9_.$])"
+    r"(?:(\$?)([A-Z]{1,3}):(\$?)([A-Z]{1,3})|(\$?)([A-Z]{1,3})(\$?)(\d+))"
+    r"(?![A-Za-z0-9_(])"
+)
+
+# String literals ("..." with "" escapes) and quoted sheet names ('...')
+_LITERAL_RE = re.compile(r"\"(?:[^\"]|\"\")*\"|'(?:[^']|'')*'")
+
+
+def column_letter(index: int) -> str:
+    """Convert a 0-based column index to letters (0=A, 25=Z, 26=AA)."""
+    result = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        result = chr(65 + remainder) + result
+    return result
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 0-based index (A=0, Z=25, AA=26)."""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - ord("A") + 1)
+    return index - 1
+
+
+def split_literals(formula: str) -> list[tuple[str, bool]]:
+    """Split a formula into (text, is_literal) segments.
+
+    String literals and quoted sheet names are returned as literal segments
+    so reference rewriting never touches their contents.
+    """
+    segments: list[tuple[str, bool]] = []
+    pos = 0
+    for match in _LITERAL_RE.finditer(formula):
+        if match.start() > pos:
+            segments.append((formula[pos : match.start()], False))
+        segments.append((match.group(0), True))
+        pos = match.end()
+    if pos < len(formula):
+        segments.append((formula[pos:], False))
+    return segments
+
+
+def _rewrite(formula: str, replace) -> str:
+    """Apply a reference substitution outside string literals and sheet names."""
+    parts = []
+    for text, is_literal in split_literals(formula):
+        parts.append(text if is_literal else _REF_RE.sub(replace, text))
+    return "".join(parts)
+
+
+def _offset(prefix: str, absolute: bool, target: int, origin: int) -> str:
+    if absolute:
+        return f"{prefix}{target + 1}"
+    delta = target - origin
+    return f"{prefix}[{delta}]"
+
+
+def to_r1c1(formula: str, row: int, col: int) -> str:
+    """Convert an A1 formula to relative R1C1 notation.
+
+    Args:
+        formula: Formula text (e.g. "=SUM(B$2:B5)").
+        row: 0-based row index of the cell holding the formula.
+        col: 0-based column index of the cell holding the formula.
+
+    Returns:
+        The formula with every reference rewritten, e.g. "=SUM(R2C[0]:R[0]C[0])".
+    """
+
+    def replace(match: re.Match) -> str:
+        start_abs, start, end_abs, end, col_abs, letters, row_abs, digits = match.groups()
+        if start is not None:
+            return (
+                _offset("C", bool(start_abs), column_index(start), col)
+                + ":"
+                + _offset("C", bool(end_abs), column_index(end), col)
+            )
+        r = _offset("R", bool(row_abs), int(digits) - 1, row)
+        c = _offset("C", bool(col_abs), column_index(letters), col)
+        return r + c
+
+    return _rewrite(formula, replace)
+
+
+def formula_shifter(formula: str) -> Callable[[int, int], str]:
+    """Parse a formula once and return a fast shift(rows, cols) for it.
+
+    Filling one formula across a block shifts the same text many times;
+    parsing it once makes each copy a string join instead of a regex pass.
+    """
+    pieces: list[Any] = []  # Literal text, or the parsed groups of a reference
+    for text, is_literal in split_literals(formula):
+        if is_literal:
+            pieces.append(text)
+            continue
+        pos = 0
+        for match in _REF_RE.finditer(text):
+            pieces.append(text[pos : match.start()])
+            start_abs, start, end_abs, end, col_abs, letters, row_abs, digits = match.groups()
+            if start is not None:
+                pieces.append((start_abs, start, end_abs, end))
+            else:
+                pieces.append((col_abs, letters, row_abs, int(digits)))
+            pos = match.end()
+        pieces.append(text[pos:])
+
+    # Shifting by whole rows only changes relative row numbers: keep a
+    # %-template of everything else so it is one C-level format call
+    template_parts: list[str] = []
+    row_bases: list[int] = []
+    for piece in pieces:
+        if isinstance(piece, str):
+            template_parts.append(piece.replace("%", "%%"))
+        elif isinstance(piece[3], str):
+            template_parts.append(f"{piece[0]}{piece[1]}:{piece[2]}{piece[3]}")
+        elif piece[2]:
+            template_parts.append(f"{piece[0]}{piece[1]}{piece[2]}{piece[3]}")
+        else:
+            template_parts.append(f"{piece[0]}{piece[1]}%d")
+            row_bases.append(piece[3])
+    template = "".join(template_parts)
+
+    def shift(rows: int = 0, cols: int = 0) -> str:
+        if not cols:
+            return template % tuple([base + rows for base in row_bases])
+        parts = []
+        for piece in pieces:
+            if isinstance(piece, str):
+                parts.append(piece)
+                continue
+            if isinstance(piece[3], str):  # Whole columns: only columns move
+                start_abs, start, end_abs, end = piece
+                if cols and not start_abs:
+                    start = column_letter(column_index(start) + cols)
+                if cols and not end_abs:
+                    end = column_letter(column_index(end) + cols)
+                parts.append(f"{start_abs}{start}:{end_abs}{end}")
+                continue
+            col_abs, letters, row_abs, row = piece
+            if cols and not col_abs:
+                letters = column_letter(column_index(letters) + cols)
+            if not row_abs:
+                row += rows
+            parts.append(f"{col_abs}{letters}{row_abs}{row}")
+        return "".join(parts)
+
+    return shift
+
+
+def shift_formula(formula: str, rows: int = 0, cols: int = 0) -> str:
+    """Shift the relative references in an A1 formula, as a drag/fill would.
+
+    Args:
+        formula: Formula text in A1 notation.
+        rows: Number of rows to shift relative row references by.
+        cols: Number of columns to shift relative column references by.
+
+    Returns:
+        The shifted formula. Absolute ($) parts are left unchanged.
+    """
+    return formula_shifter(formula)(rows, cols)
@@ -10,6 +10,7 @@ def extract_spreadsheet_id(url_or_id: str) -> str:
         - Full URL: https://docs.google.com/spreadsheets/d/1ABC.../edit#gid=0
         - Short URL: https://docs.google.com/spreadsheets/d/1ABC...
         - Just the ID: 1ABC...
+        - Local workbook: local:exports/model.xlsx (see src.sheets.local)
 
     Args:
         url_or_id: A Google Sheets URL or spreadsheet ID.
@@ -20,6 +21,10 @@ def extract_spreadsheet_id(url_or_id: str) -> str:
     Raises:
         ValueError: If the URL format is not recognized.
     """
+    # Local workbook references (local:path/to/model.xlsx) are kept as-is
+    if url_or_id.startswith("local:"):
+        return url_or_id
+
     # If it doesn't look like a URL, assume it's already an ID
     if not url_or_id.startswith("http"):
         # Basic validation - IDs are typically 44 chars, alphanumeric with - and _
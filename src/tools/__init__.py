@@ -1,5 +1,6 @@
 """Agent tools for Google Sheets operations."""
 
 from .registry import TOOLS, execute_tool
+from .results import ResultStore
 
-__all__ = ["TOOLS", "execute_tool"]
+__all__ = ["TOOLS", "execute_tool", "ResultStore"]
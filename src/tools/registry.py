@@ -2,8 +2,12 @@
 
 from typing import Any
 
+from src.analysis.structure import get_structure
+from src.profiling import get_tracer
 from src.sheets import SheetsClient
 
+from .results import ResultStore
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Tool definitions (in Anthropic's tool format)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -44,16 +48,21 @@ TOOLS = [
                 },
                 "sample_rows": {
                     "type": "integer",
-                    "description": "Number of rows to sample (default 20). Increase for sheets with more data.",
+                    "description": "Number of rows to sample (default 20). Increase for sheets with more data. Ignored in compact mode.",
                     "default": 20,
                 },
+                "compact": {
+                    "type": "boolean",
+                    "description": "Return a compact structural encoding of the whole sheet (default true): per row, its label, dominant R1C1 formula pattern and column span, with only deviating cells listed; runs of identical rows and static data are collapsed into blocks. Covers at most 2,000 rows and 130 columns: truncated is true when the tab is larger, and estimated_row_count / grid_column_count give its real size. Set false to get raw sample_values/sample_formulas arrays.",
+                    "default": True,
+                },
             },
             "required": ["sheet_name"],
         },
     },
     {
         "name": "read_range",
-        "description": "Read values from a range of cells. Returns the displayed/formatted values.",
+        "description": "Read values from a range of cells. Returns the displayed/formatted values. Large results come back as a handle (shape, column types, first rows) — use page_result, filter_result or aggregate_result on it instead of re-reading.",
         "input_schema": {
             "type": "object",
             "properties": {
@@ -71,7 +80,7 @@ TOOLS = [
     },
     {
         "name": "read_formulas",
-        "description": "Read formulas from a range of cells. Returns the formula text (e.g., '=SUM(A1:A10)') rather than computed values. Use this to understand how cells are calculated.",
+        "description": "Read formulas from a range of cells. Returns the formula text (e.g., '=SUM(A1:A10)') rather than computed values. Use this to understand how cells are calculated. Large results come back as a handle, like read_range.",
         "input_schema": {
             "type": "object",
             "properties": {
@@ -87,6 +96,458 @@ TOOLS = [
             "required": ["sheet_name", "range"],
         },
     },
+    {
+        "name": "page_result",
+        "description": "Page through a large stored read result by handle. Returns rows with their sheet row numbers.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": "Result handle returned by read_range or read_formulas (e.g. 'h1').",
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Number of rows to skip (default 0).",
+                    "default": 0,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of rows to return (default 50, max 200).",
+                    "default": 50,
+                },
+            },
+            "required": ["handle"],
+        },
+    },
+    {
+        "name": "filter_result",
+        "description": "Find rows in a large stored read result whose first column (row label) matches. Case-insensitive substring match unless exact is true.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": "Result handle (e.g. 'h1').",
+                },
+                "label": {
+                    "type": "string",
+                    "description": "Row label to look for (e.g. 'Total COGS', 'Enterprise').",
+                },
+                "exact": {
+                    "type": "boolean",
+                    "description": "Require an exact (case-insensitive) label match.",
+                    "default": False,
+                },
+            },
+            "required": ["handle", "label"],
+        },
+    },
+    {
+        "name": "aggregate_result",
+        "description": "Aggregate numeric values per column of a large stored read result (sum, min, max, mean or count). Formatted values like '$1,234' and '15%' are parsed.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": "Result handle (e.g. 'h1').",
+                },
+                "op": {
+                    "type": "string",
+                    "enum": ["sum", "min", "max", "mean", "count"],
+                    "description": "Aggregate to compute per column.",
+                },
+                "columns": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Column letters to include (default: all).",
+                },
+                "skip_rows": {
+                    "type": "integer",
+                    "description": "Leading rows to skip, e.g. 1 for a header row (default 0).",
+                    "default": 0,
+                },
+            },
+            "required": ["handle", "op"],
+        },
+    },
+    {
+        "name": "get_model_structure",
+        "description": "Get the structure map of the spreadsheet: for every tab, the month header row and month -> column letters, the label column, label -> row for every labelled row, sections (e.g. per business line or department) and the CS/COGS split rows. Built once with a single read and cached on disk; each call checks label columns and header rows with one small read and re-reads only tabs whose shape changed. Call this instead of re-reading tabs to find rows and month columns.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_name": {
+                    "type": "string",
+                    "description": "Only return this tab's map (default: all tabs).",
+                },
+                "refresh": {
+                    "type": "boolean",
+                    "description": "Rebuild from the sheet, e.g. after adding rows or tabs (default false).",
+                    "default": False,
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "resolve_cell",
+        "description": "Resolve a row label and month to a cell reference using the cached structure map, after one small read confirming no tab changed shape (changed tabs are re-mapped first). Labels may include their section, e.g. 'Enterprise revenue' or 'CS Subtotal'.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "label": {
+                    "type": "string",
+                    "description": "Row label, optionally with its section (e.g. 'Enterprise revenue').",
+                },
+                "month": {
+                    "type": "string",
+                    "description": "Month, e.g. \"Mar'27\", '2027-03' or '3/31/2027'. Omit for the whole row.",
+                },
+                "sheet_name": {
+                    "type": "string",
+                    "description": "Tab to search when the label appears in several tabs.",
+                },
+            },
+            "required": ["label"],
+        },
+    },
+    {
+        "name": "scan_sheet",
+        "description": "Scan one tab for formula errors, static values inside formula rows and formula pattern breaks. The first scan reads every cell and saves per-row hashes; later scans re-check only rows that changed, including rows that recalculated because of an edit elsewhere, and merge them into the saved report. After a /modify, values are re-read but formulas only for the rows written or recalculated. The rescan field says how many rows were read and changed. Use after edits to confirm a fix.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_name": {"type": "string", "description": "Tab to scan."},
+                "full": {
+                    "type": "boolean",
+                    "description": "Ignore the saved scan and re-check every row (default false).",
+                },
+            },
+            "required": ["sheet_name"],
+        },
+    },
+    {
+        "name": "audit_workbook",
+        "description": "Run the deterministic audit rules over every cell of the workbook in one pass: formula errors, static values inside formula rows, pattern breaks, hardcoded constants and labels inside formulas, SUMIF/lookup ranges that stop above the end of their data, month header gaps/text dates/cross-tab month misalignment, and repeated sections missing rows. Returns findings per rule with tab and cell. Reads every tab in two batched calls; run it first in /audit and spend reading effort on what it flags.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Tabs to audit (default: all tabs).",
+                },
+                "rules": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Rules to run (default: all): errors, static_in_formula_rows, pattern_breaks, hardcoded_constants, capped_ranges, month_headers, unbalanced_sections.",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "portfolio_report",
+        "description": "Run one operation across many spreadsheets (e.g. every portfolio company's model) in parallel and return a consolidated table with one row per spreadsheet plus totals. operation \"metrics\" gives ARR, net new ARR, customers, burn, ending cash and runway at the latest closed month (template tabs ARR, Monthly Summary, Cash Flow); \"audit\" gives finding counts per audit rule; \"scan\" scans every tab for formula errors, static values in formula rows and pattern breaks and gives counts per check (saved, so a later rescan_sheet only re-checks changed rows); \"snapshot\" saves each model's monthly ARR and cash series as a snapshot and gives its snapshot_id with the metrics columns. Requests are paced under the Sheets per-minute quota; spreadsheets that fail are listed under errors. Does not change the connected spreadsheet.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "spreadsheet_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Spreadsheet IDs or URLs.",
+                },
+                "operation": {
+                    "type": "string",
+                    "enum": ["metrics", "audit", "scan", "snapshot"],
+                    "description": "What to extract from each spreadsheet (default metrics).",
+                },
+                "as_of": {
+                    "type": "string",
+                    "description": "metrics, snapshot: ISO date; report the last month ending on or before it (default today).",
+                },
+                "label": {
+                    "type": "string",
+                    "description": "snapshot: label saved with every snapshot (default 'portfolio').",
+                },
+                "workers": {
+                    "type": "integer",
+                    "description": "Spreadsheets processed at once (default 8).",
+                },
+            },
+            "required": ["spreadsheet_ids"],
+        },
+    },
+    {
+        "name": "profile_formula_costs",
+        "description": "Rank the formulas that make the spreadsheet slow to recalculate. Estimates each formula's cost from the cells its ranges cover, nesting depth, volatile functions (NOW, TODAY, INDIRECT, OFFSET, RAND) and whole-column references, and sums it per row, tab and formula pattern. Returns the most expensive rows first (hotspots) so you know which blocks to refactor. Reads every formula in one batched call.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Tabs to profile (default: all tabs).",
+                },
+                "top": {
+                    "type": "integer",
+                    "description": "Number of hotspot rows, patterns and formulas to return (default 20).",
+                    "default": 20,
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "compute_arr_metrics",
+        "description": "Compute MRR, ARR, active/new/churned customers and the New/Expansion/Churn ARR waterfall for every month directly from the ARR contracts (one read, computed locally). Use it to check or replace the ARR Summary tab without reading its formulas cell by cell.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "arr_sheet": {
+                    "type": "string",
+                    "description": "Tab with contracts in columns A-E (Customer, Type, Start Date, ARR, Churn Date). Default 'ARR'.",
+                },
+                "months_sheet": {
+                    "type": "string",
+                    "description": "Tab whose row 2 from column C holds the month-end dates. Default 'Monthly Summary'.",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "compute_headcount_rollup",
+        "description": "Compute headcount, Salary + Benefits, Bonus, Commission and Total Compensation by department for every month from Headcount Input (one read, prorated locally with the template formula). Use it to check Headcount Summary or to cost a hiring plan.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "headcount_sheet": {
+                    "type": "string",
+                    "description": "Tab with employees in columns A-I. Default 'Headcount Input'.",
+                },
+                "months_sheet": {
+                    "type": "string",
+                    "description": "Tab whose row 2 from column C holds the month-end dates. Default 'Monthly Summary'.",
+                },
+                "planned_hires": {
+                    "type": "array",
+                    "description": "Optional hires to add on top of current staff.",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "department": {"type": "string"},
+                            "start_date": {"type": "string", "description": "e.g. '4/1/2026'"},
+                            "salary": {"type": "number"},
+                            "bonus": {"type": "number"},
+                            "commission": {"type": "number"},
+                            "benefits": {"type": "number"},
+                            "count": {"type": "integer", "description": "Hires on this date (default 1)."},
+                        },
+                        "required": ["department", "start_date", "salary"],
+                    },
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "project_cash_runway",
+        "description": "Project Cash Collections, Burn and Beginning/Ending Cash from Revenue (MRR) and Operating Cash Out with the payment-terms lag (one read, computed locally), plus runway and the month cash hits zero. Pass payment_terms and/or burn_multipliers to sweep many scenarios at once and get runway for each.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "cash_sheet": {
+                    "type": "string",
+                    "description": "Cash Flow tab (row 3 Beginning Cash, row 6 Operating Cash Out, rows 8-10 other). Default 'Cash Flow'.",
+                },
+                "months_sheet": {
+                    "type": "string",
+                    "description": "Tab with month-end dates in row 2 and Revenue (MRR) in row 10. Default 'Monthly Summary'.",
+                },
+                "payment_terms": {
+                    "type": "array",
+                    "description": "Payment-term variants: shares collected 0, 1, 2... months after billing, e.g. [[0.4, 0.4, 0.2], [0.2, 0.5, 0.3]].",
+                    "items": {"type": "array", "items": {"type": "number"}},
+                },
+                "burn_multipliers": {
+                    "type": "array",
+                    "description": "Operating Cash Out multipliers to sweep, e.g. [0.8, 1.0, 1.2].",
+                    "items": {"type": "number"},
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "run_monte_carlo",
+        "description": "Monte Carlo what-if: sample thousands of paths over driver distributions (growth, churn, CAC, ASP, new customers, hiring delay) through local ARR, headcount and cash engines, and return p5/p25/p50/p75/p95 bands for ARR, EBITDA, cash, runway and breakeven month. Reads the model once and never writes to the sheet. Each driver is a number (fixed) or {dist, ...params}: normal {mean, sd}, uniform {low, high}, triangular {low, mode, high}, lognormal {median, sigma}.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "drivers": {
+                    "type": "object",
+                    "description": "Driver distributions; omitted drivers are 0 (the model as-is).",
+                    "properties": {
+                        "growth": {"description": "Monthly growth rate of new customer bookings, e.g. 0.03."},
+                        "churn": {"description": "Extra monthly MRR churn rate, e.g. 0.01."},
+                        "cac": {"description": "Acquisition cost per new customer."},
+                        "asp": {"description": "ARR per new customer."},
+                        "new_customers": {"description": "New customers booked in the first month."},
+                        "hiring_delay": {"description": "Months each planned hire slips."},
+                    },
+                },
+                "paths": {"type": "integer", "description": "Number of paths (default 10000)."},
+                "seed": {"type": "integer", "description": "Random seed (default 0)."},
+            },
+            "required": ["drivers"],
+        },
+    },
+    {
+        "name": "scenario_cache_lookup",
+        "description": "Before computing a /scenario, /breakeven or /snapshot, check the scenario cache. The key is a hash of every tab's inputs and formulas plus the canonicalized overrides, so a hit is exactly what recomputing would give. On a hit, use the returned result directly. On a miss, compute as usual, then call scenario_cache_store with the returned key. Misses also drop cached results built on inputs that have since been edited.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "kind": {
+                    "type": "string",
+                    "enum": ["scenario", "breakeven", "snapshot"],
+                },
+                "overrides": {
+                    "type": "object",
+                    "description": "Assumption overrides defining the scenario, e.g. {\"line\": \"Enterprise\", \"cac\": \"-20%\"}. Empty for the base case.",
+                },
+                "tabs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Tabs the result depends on (default: all tabs).",
+                },
+            },
+            "required": ["kind"],
+        },
+    },
+    {
+        "name": "scenario_cache_store",
+        "description": "Save a computed /scenario, /breakeven or /snapshot result under the key from a scenario_cache_lookup miss. Store per-line monthly arrays and breakeven in snapshot form: {months, by_line: {line: {rev, cogs, cac, gm_adj}}, total_gm_adj, breakeven}.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "key": {"type": "string", "description": "Key from scenario_cache_lookup"},
+                "result": {"type": "object", "description": "The computed result"},
+            },
+            "required": ["key", "result"],
+        },
+    },
+    {
+        "name": "build_model",
+        "description": "Build the full 9-tab model from the confirmed mapping in one structural batch and one values batch: every tab's values, formulas, number formats and frozen panes are generated from template_specs.md. Use this for /create Phase 2 instead of writing tabs range by range. Dates are M/D/YYYY strings.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "spec": {
+                    "type": "object",
+                    "description": "Confirmed mapping: start_year, start_month, months (default 24), departments (default G&A, Sales, Marketing, Product, Engineering, CS), cs_department, employees [{name, department, start, salary, title, end, bonus, commission, benefits}], contracts [{customer, start, arr, type, churn, contract_length}], opex [{scope (COGS/Dept/Overall), category, subcategory, scaling (Fixed/Per HC/% of Revenue/% of CS), rate}], starting_cash, payment_terms, hosting_pct, cs_cogs_pct.",
+                },
+                "replace": {
+                    "type": "boolean",
+                    "description": "Rebuild model tabs that already exist (default false: refuse).",
+                },
+                "arrays": {
+                    "type": "boolean",
+                    "description": "Emit one ARRAYFORMULA per helper block (Headcount Input, ARR, OpEx Assumptions rows) instead of per-cell formulas. Recommended for large models.",
+                },
+            },
+            "required": ["spec"],
+        },
+    },
+    {
+        "name": "ingest_source",
+        "description": "Stream a large CSV or XLSX export (CRM contracts, HRIS roster) into the ARR or Headcount Input tab of a built model, under the mapping the user confirmed in Phase 1. Rows are converted (ACV to ARR, dates, department names), validated, and appended in chunked writes with the helper formulas and formats; rejected rows come back with their source row numbers. Use this instead of append_rows/write_range with inline arrays for sources over a few hundred rows. An interrupted ingest resumes when called again with the same arguments. Afterwards run audit_workbook with the capped_ranges rule.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Path of the .csv or .xlsx source file"},
+                "target": {
+                    "type": "string",
+                    "enum": ["arr", "headcount"],
+                    "description": "arr: ARR tab; headcount: Headcount Input tab",
+                },
+                "columns": {
+                    "type": "object",
+                    "description": "Target field -> source column header. arr fields: customer, type, start, arr, churn, contract_length (customer, start, arr required). headcount fields: name, department, title, start, end, salary, bonus, commission, benefits (name, department, start, salary required).",
+                },
+                "acv": {
+                    "type": "boolean",
+                    "description": "The arr column holds contract value: ARR = ACV / contract months x 12 (default false).",
+                },
+                "departments": {
+                    "type": "object",
+                    "description": "Confirmed source department name -> standard department name.",
+                },
+                "benefits_rate": {
+                    "type": "number",
+                    "description": "Benefits as a share of salary where the source has none (default 0.2).",
+                },
+                "sheet": {"type": "string", "description": "Worksheet of an XLSX source (default: first)"},
+                "restart": {
+                    "type": "boolean",
+                    "description": "Ignore saved progress of an interrupted ingest and start from the first row.",
+                },
+            },
+            "required": ["path", "target", "columns"],
+        },
+    },
+    {
+        "name": "refactor_array_formulas",
+        "description": "Convert an existing model's per-cell helper blocks (Headcount Input J+, ARR G+, OpEx Assumptions F+) to one array formula each so large models recalculate faster. Only blocks still matching the template are converted; values are compared before and after and any block that differs is restored automatically.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "verify": {
+                    "type": "boolean",
+                    "description": "Compare values before/after and roll back mismatches (default true).",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "propose_formula_rewrites",
+        "description": "Propose cheaper equivalent formulas for slow blocks: conditional SUMPRODUCTs become SUMIFS/COUNTIFS, whole-column refs are bounded to the used rows, and a cross-sheet lookup repeated down a column moves to one helper row. Every rewrite is evaluated locally against the current values before it is offered; mismatches are listed as rejected. Writes nothing: present the rewrites as a /modify plan and call apply_formula_rewrites with the approved ids.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Tabs whose formulas to rewrite (default: all tabs).",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "apply_formula_rewrites",
+        "description": "Apply rewrites approved from propose_formula_rewrites in one batch. The plan is re-derived and re-validated first; if an id is no longer proposed (formulas or data changed) nothing is written and you should propose again.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Rewrite ids the user approved.",
+                },
+                "sheet_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "The sheet_names passed to propose_formula_rewrites, if any.",
+                },
+            },
+            "required": ["ids"],
+        },
+    },
     {
         "name": "write_range",
         "description": "Write values or formulas to a range of cells. Formulas should start with '=' and will be parsed. Values are written starting at the top-left cell of the range.",
@@ -113,6 +574,53 @@ TOOLS = [
             "required": ["sheet_name", "range", "values"],
         },
     },
+    {
+        "name": "fill_formula_row",
+        "description": "Write one formula and fill it across a row server-side, shifting relative references as a drag would. Use this instead of write_range for month-column rows: send the formula for the first month only.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_name": {"type": "string", "description": "Name of the sheet (tab)."},
+                "anchor_cell": {
+                    "type": "string",
+                    "description": "Cell the formula is written for, e.g. 'C4'.",
+                },
+                "formula": {
+                    "type": "string",
+                    "description": "Formula as it reads in the anchor cell, e.g. \"=SUM('ARR'!G2:G100)/12\".",
+                },
+                "span": {
+                    "type": "integer",
+                    "description": "Number of columns to fill, including the anchor (e.g. 24 for a 24-month horizon).",
+                },
+            },
+            "required": ["sheet_name", "anchor_cell", "formula", "span"],
+        },
+    },
+    {
+        "name": "fill_formula_block",
+        "description": "Copy an existing block of formulas into the next columns server-side, shifting relative references (no formula text is sent). Use it to extend the horizon: pass the last month column's rows, e.g. 'Z4:Z40', and the number of months to add.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sheet_name": {"type": "string", "description": "Name of the sheet (tab)."},
+                "source_range": {
+                    "type": "string",
+                    "description": "Block to replicate, e.g. 'Z1:Z47'.",
+                },
+                "span": {
+                    "type": "integer",
+                    "description": "Number of columns to fill after the block.",
+                },
+                "method": {
+                    "type": "string",
+                    "enum": ["copyPaste", "autoFill"],
+                    "description": "copyPaste (default) tiles formulas and formats; autoFill extends constants as a series.",
+                },
+            },
+            "required": ["sheet_name", "source_range", "span"],
+        },
+    },
     {
         "name": "append_rows",
         "description": "Append rows to the end of existing data in a sheet. Useful for adding new entries (employees, customers, etc.).",
@@ -229,13 +737,20 @@ TOOLS = [
 # Tool execution
 # ─────────────────────────────────────────────────────────────────────────────
 
-def execute_tool(client: SheetsClient, tool_name: str, tool_input: dict[str, Any]) -> Any:
+def execute_tool(
+    client: SheetsClient,
+    tool_name: str,
+    tool_input: dict[str, Any],
+    store: ResultStore | None = None,
+) -> Any:
     """Execute a tool by name with given inputs.
 
     Args:
         client: The SheetsClient instance.
         tool_name: Name of the tool to execute.
         tool_input: Dictionary of input parameters.
+        store: Optional session result store. When given, large reads are
+               kept in it and returned as handles.
 
     Returns:
         The result of the tool execution.
@@ -243,6 +758,17 @@ def execute_tool(client: SheetsClient, tool_name: str, tool_input: dict[str, Any
     Raises:
         ValueError: If tool_name is not recognized.
     """
+    with get_tracer().tool(tool_name):
+        return _dispatch(client, tool_name, tool_input, store)
+
+
+def _dispatch(
+    client: SheetsClient,
+    tool_name: str,
+    tool_input: dict[str, Any],
+    store: ResultStore | None,
+) -> Any:
+    """Run a tool (see execute_tool)."""
     match tool_name:
         case "connect_to_spreadsheet":
             return client.set_spreadsheet(tool_input["url_or_id"])
@@ -254,19 +780,198 @@ def execute_tool(client: SheetsClient, tool_name: str, tool_input: dict[str, Any
             return client.inspect_sheet(
                 sheet_name=tool_input["sheet_name"],
                 sample_rows=tool_input.get("sample_rows", 20),
+                compact=tool_input.get("compact", True),
             )
 
         case "read_range":
-            return client.read_range(
+            rows = client.read_range(
                 sheet_name=tool_input["sheet_name"],
                 range_spec=tool_input["range"],
             )
+            if store is None:
+                return rows
+            return store.maybe_store(tool_input["sheet_name"], tool_input["range"], rows)
 
         case "read_formulas":
-            return client.read_formulas(
+            rows = client.read_formulas(
                 sheet_name=tool_input["sheet_name"],
                 range_spec=tool_input["range"],
             )
+            if store is None:
+                return rows
+            return store.maybe_store(tool_input["sheet_name"], tool_input["range"], rows)
+
+        case "page_result":
+            return _require_store(store).page(
+                handle=tool_input["handle"],
+                offset=tool_input.get("offset", 0),
+                limit=tool_input.get("limit", 50),
+            )
+
+        case "filter_result":
+            return _require_store(store).filter(
+                handle=tool_input["handle"],
+                label=tool_input["label"],
+                exact=tool_input.get("exact", False),
+            )
+
+        case "aggregate_result":
+            return _require_store(store).aggregate(
+                handle=tool_input["handle"],
+                op=tool_input["op"],
+                columns=tool_input.get("columns"),
+                skip_rows=tool_input.get("skip_rows", 0),
+            )
+
+        case "get_model_structure":
+            structure = get_structure(client, refresh=tool_input.get("refresh", False))
+            return structure.summary(tool_input.get("sheet_name"))
+
+        case "resolve_cell":
+            return get_structure(client).resolve(
+                tool_input["label"],
+                month=tool_input.get("month"),
+                sheet_name=tool_input.get("sheet_name"),
+            )
+
+        case "scan_sheet":
+            from src.analysis.scan import rescan_sheet, scan_sheet
+
+            if tool_input.get("full"):
+                return scan_sheet(tool_input["sheet_name"], client)
+            return rescan_sheet(tool_input["sheet_name"], client)
+
+        case "audit_workbook":
+            from src.analysis.audit import audit_workbook
+
+            return audit_workbook(
+                client,
+                sheet_names=tool_input.get("sheet_names"),
+                rules=tool_input.get("rules"),
+            )
+
+        case "portfolio_report":
+            from src.analysis.portfolio import DEFAULT_WORKERS, Portfolio
+
+            operation = tool_input.get("operation", "metrics")
+            kwargs = {}
+            if operation in ("metrics", "snapshot"):
+                kwargs["as_of"] = tool_input.get("as_of")
+            if operation == "snapshot":
+                kwargs["label"] = tool_input.get("label", "portfolio")
+            return Portfolio(
+                tool_input["spreadsheet_ids"], workers=tool_input.get("workers", DEFAULT_WORKERS)
+            ).run(operation, **kwargs)
+
+        case "profile_formula_costs":
+            from src.analysis.formula_cost import profile_formulas
+
+            return profile_formulas(
+                client,
+                sheet_names=tool_input.get("sheet_names"),
+                top=tool_input.get("top", 20),
+            )
+
+        case "compute_arr_metrics":
+            from src.analysis.arr import arr_from_sheet
+
+            return arr_from_sheet(
+                client,
+                arr_sheet=tool_input.get("arr_sheet", "ARR"),
+                months_sheet=tool_input.get("months_sheet", "Monthly Summary"),
+            ).to_dict()
+
+        case "compute_headcount_rollup":
+            from src.analysis.headcount import headcount_from_sheet, hires_from_plan
+
+            return headcount_from_sheet(
+                client,
+                headcount_sheet=tool_input.get("headcount_sheet", "Headcount Input"),
+                months_sheet=tool_input.get("months_sheet", "Monthly Summary"),
+                hires=hires_from_plan(tool_input.get("planned_hires", [])),
+            ).to_dict()
+
+        case "project_cash_runway":
+            from src.analysis.cash import cash_from_sheet
+
+            return cash_from_sheet(
+                client,
+                cash_sheet=tool_input.get("cash_sheet", "Cash Flow"),
+                months_sheet=tool_input.get("months_sheet", "Monthly Summary"),
+                terms_variants=tool_input.get("payment_terms"),
+                burn_multipliers=tool_input.get("burn_multipliers"),
+            )
+
+        case "run_monte_carlo":
+            from src.analysis.montecarlo import monte_carlo_from_sheet
+
+            return monte_carlo_from_sheet(
+                client,
+                tool_input["drivers"],
+                paths=tool_input.get("paths", 10_000),
+                seed=tool_input.get("seed", 0),
+            )
+
+        case "scenario_cache_lookup":
+            from src.analysis import scenario_cache
+
+            return scenario_cache.lookup(
+                client,
+                tool_input["kind"],
+                overrides=tool_input.get("overrides"),
+                tabs=tool_input.get("tabs"),
+            )
+
+        case "scenario_cache_store":
+            from src.analysis import scenario_cache
+
+            return scenario_cache.store(tool_input["key"], tool_input["result"])
+
+        case "build_model":
+            from src.builder import ModelSpec, build_model
+
+            spec = ModelSpec.from_dict(tool_input["spec"])
+            return build_model(
+                client,
+                spec,
+                replace=tool_input.get("replace", False),
+                arrays=tool_input.get("arrays", False),
+            )
+
+        case "ingest_source":
+            from src.builder.ingest import DEFAULT_BENEFITS_RATE, IngestMapping, ingest_source
+
+            mapping = IngestMapping(
+                tool_input["target"],
+                tool_input["columns"],
+                acv=tool_input.get("acv", False),
+                departments=tool_input.get("departments") or {},
+                benefits_rate=tool_input.get("benefits_rate", DEFAULT_BENEFITS_RATE),
+            )
+            return ingest_source(
+                client,
+                tool_input["path"],
+                mapping,
+                sheet=tool_input.get("sheet"),
+                restart=tool_input.get("restart", False),
+            )
+
+        case "refactor_array_formulas":
+            from src.builder import refactor_to_arrays
+
+            return refactor_to_arrays(client, verify=tool_input.get("verify", True))
+
+        case "propose_formula_rewrites":
+            from src.analysis.optimizer import propose_rewrites
+
+            return propose_rewrites(client, sheet_names=tool_input.get("sheet_names"))
+
+        case "apply_formula_rewrites":
+            from src.analysis.optimizer import apply_rewrites
+
+            return apply_rewrites(
+                client, tool_input["ids"], sheet_names=tool_input.get("sheet_names")
+            )
 
         case "write_range":
             return client.write_range(
@@ -275,6 +980,22 @@ def execute_tool(client: SheetsClient, tool_name: str, tool_input: dict[str, Any
                 values=tool_input["values"],
             )
 
+        case "fill_formula_row":
+            return client.fill_formula_row(
+                sheet_name=tool_input["sheet_name"],
+                anchor_cell=tool_input["anchor_cell"],
+                formula=tool_input["formula"],
+                span=tool_input["span"],
+            )
+
+        case "fill_formula_block":
+            return client.fill_formula_block(
+                sheet_name=tool_input["sheet_name"],
+                source_range=tool_input["source_range"],
+                span=tool_input["span"],
+                method=tool_input.get("method", "copyPaste"),
+            )
+
         case "append_rows":
             return client.append_rows(
                 sheet_name=tool_input["sheet_name"],
@@ -306,3 +1027,10 @@ def execute_tool(client: SheetsClient, tool_name: str, tool_input: dict[str, Any
 
         case _:
             raise ValueError(f"Unknown tool: {tool_name}")
+
+
+def _require_store(store: ResultStore | None) -> ResultStore:
+    """Raise an error if result handles are not available in this session."""
+    if store is None:
+        raise ValueError("No result store in this session; result handles are unavailable.")
+    return store
@@ -0,0 +1,184 @@
+"""Session-side store for large tool results.
+
+Large read_range / read_formulas results are kept here and the model gets
+back a handle with the shape, a per-column type summary and the first few
+rows. The page_result, filter_result and aggregate_result tools then work
+on the stored grid without re-fetching from Google or flooding the context.
+"""
+
+from typing import Any
+
+from src.sheets.compact import cell_type, parse_number
+from src.sheets.r1c1 import column_index, column_letter
+
+# Results larger than this (in cells) are stored and returned as a handle
+DEFAULT_MAX_CELLS = 1000
+DEFAULT_HEAD_ROWS = 10
+MAX_PAGE_ROWS = 200
+
+_AGGREGATES = ("sum", "min", "max", "mean", "count")
+
+
+def _range_origin(range_spec: str) -> tuple[int, int]:
+    """0-based (row, col) of the top-left cell of an A1 range like 'C5:F10' or 'A:AZ'."""
+    start = range_spec.split(":")[0].replace("$", "")
+    letters = "".join(ch for ch in start if ch.isalpha())
+    digits = "".join(ch for ch in start if ch.isdigit())
+    col = column_index(letters) if letters else 0
+    row = int(digits) - 1 if digits else 0
+    return row, col
+
+
+class ResultStore:
+    """Holds large grids for the lifetime of an agent session."""
+
+    def __init__(self, max_cells: int = DEFAULT_MAX_CELLS, head_rows: int = DEFAULT_HEAD_ROWS):
+        """Initialize the store.
+
+        Args:
+            max_cells: Results with more cells than this are stored as handles.
+            head_rows: Number of leading rows included in a handle.
+        """
+        self.max_cells = max_cells
+        self.head_rows = head_rows
+        self._results: dict[str, dict[str, Any]] = {}
+
+    def maybe_store(self, sheet_name: str, range_spec: str, rows: list[list[Any]]) -> Any:
+        """Return the rows unchanged if small, otherwise store them and return a handle."""
+        if sum(len(r) for r in rows) <= self.max_cells:
+            return rows
+
+        handle = f"h{len(self._results) + 1}"
+        origin_row, origin_col = _range_origin(range_spec)
+        self._results[handle] = {
+            "sheet_name": sheet_name,
+            "range": range_spec,
+            "origin_row": origin_row,
+            "origin_col": origin_col,
+            "rows": rows,
+        }
+        return self.describe(handle)
+
+    def describe(self, handle: str) -> dict[str, Any]:
+        """Summary of a stored result: shape, column types and first rows."""
+        entry = self._get(handle)
+        rows = entry["rows"]
+        width = max((len(r) for r in rows), default=0)
+
+        dtypes: dict[str, str] = {}
+        for col in range(width):
+            types = {cell_type(r[col]) for r in rows if col < len(r)} - {"blank"}
+            letter = column_letter(entry["origin_col"] + col)
+            dtypes[letter] = "|".join(sorted(types)) or "blank"
+
+        return {
+            "handle": handle,
+            "sheet_name": entry["sheet_name"],
+            "range": entry["range"],
+            "shape": [len(rows), width],
+            "dtypes": dtypes,
+            "head": self._number_rows(entry, 0, rows[: self.head_rows]),
+            "note": (
+                "Result too large to return in full. Use page_result, filter_result "
+                "or aggregate_result with this handle."
+            ),
+        }
+
+    def page(self, handle: str, offset: int = 0, limit: int = 50) -> dict[str, Any]:
+        """Return a slice of rows from a stored result."""
+        entry = self._get(handle)
+        limit = max(1, min(limit, MAX_PAGE_ROWS))
+        rows = entry["rows"][offset : offset + limit]
+        return {
+            "handle": handle,
+            "offset": offset,
+            "total_rows": len(entry["rows"]),
+            "rows": self._number_rows(entry, offset, rows),
+        }
+
+    def filter(
+        self, handle: str, label: str, exact: bool = False, limit: int = 50
+    ) -> dict[str, Any]:
+        """Return rows whose first column matches a label (case-insensitive)."""
+        entry = self._get(handle)
+        needle = label.strip().lower()
+        matches = []
+        for i, row in enumerate(entry["rows"]):
+            cell = str(row[0]).strip().lower() if row else ""
+            if (cell == needle) if exact else (needle in cell):
+                matches.append((i, row))
+
+        limit = max(1, min(limit, MAX_PAGE_ROWS))
+        return {
+            "handle": handle,
+            "label": label,
+            "match_count": len(matches),
+            "rows": [
+                {"row": entry["origin_row"] + i + 1, "values": row} for i, row in matches[:limit]
+            ],
+        }
+
+    def aggregate(
+        self,
+        handle: str,
+        op: str,
+        columns: list[str] | None = None,
+        skip_rows: int = 0,
+    ) -> dict[str, Any]:
+        """Aggregate numeric values per column of a stored result.
+
+        Args:
+            handle: Result handle.
+            op: One of sum, min, max, mean, count.
+            columns: Column letters to include (default: all columns).
+            skip_rows: Leading rows to skip (e.g. 1 for a header row).
+
+        Returns:
+            Dict mapping column letter to the aggregate (None if no numbers).
+        """
+        if op not in _AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{op}'. Use one of: {', '.join(_AGGREGATES)}")
+
+        entry = self._get(handle)
+        rows = entry["rows"][skip_rows:]
+        width = max((len(r) for r in rows), default=0)
+        wanted = {c.upper() for c in columns} if columns else None
+
+        result: dict[str, float | int | None] = {}
+        for col in range(width):
+            letter = column_letter(entry["origin_col"] + col)
+            if wanted is not None and letter not in wanted:
+                continue
+            numbers = [
+                n for r in rows if col < len(r) and (n := parse_number(r[col])) is not None
+            ]
+            if op == "count":
+                result[letter] = len(numbers)
+            elif not numbers:
+                result[letter] = None
+            elif op == "sum":
+                result[letter] = sum(numbers)
+            elif op == "min":
+                result[letter] = min(numbers)
+            elif op == "max":
+                result[letter] = max(numbers)
+            else:
+                result[letter] = sum(numbers) / len(numbers)
+
+        return {"handle": handle, "op": op, "rows_aggregated": len(rows), "columns": result}
+
+    def clear(self):
+        """Drop all stored results."""
+        self._results = {}
+
+    def _get(self, handle: str) -> dict[str, Any]:
+        if handle not in self._results:
+            raise ValueError(f"Unknown result handle '{handle}'")
+        return self._results[handle]
+
+    def _number_rows(
+        self, entry: dict[str, Any], offset: int, rows: list[list[Any]]
+    ) -> list[dict[str, Any]]:
+        """Attach sheet row numbers so the model can address cells directly."""
+        first = entry["origin_row"] + offset + 1
+        return [{"row": first + i, "values": row} for i, row in enumerate(rows)]
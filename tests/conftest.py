@@ -0,0 +1,31 @@
+"""Shared fixtures: the in-memory Sheets service, a client on it, and local state dirs."""
+
+import pytest
+
+from src.analysis import scan, scenario_cache, snapshot, structure
+from src.builder import ingest
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+
+
+@pytest.fixture(autouse=True)
+def state_dirs(tmp_path, monkeypatch):
+    """Keep everything saved under ~/.fpa-agent/ inside the test's tmp_path."""
+    monkeypatch.setattr(structure, "STRUCTURE_DIR", str(tmp_path / "structure"))
+    monkeypatch.setattr(structure, "_memory", {})
+    monkeypatch.setattr(scan, "SCAN_DIR", str(tmp_path / "scans"))
+    monkeypatch.setattr(scenario_cache, "CACHE_DIR", str(tmp_path / "scenarios"))
+    monkeypatch.setattr(scenario_cache, "_pending", {})
+    monkeypatch.setattr(snapshot, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(ingest, "INGEST_DIR", str(tmp_path / "ingest"))
+
+
+@pytest.fixture
+def service():
+    return FakeSheetsService()
+
+
+@pytest.fixture
+def client(service):
+    """A client on an empty "Model" spreadsheet; test files add their tabs."""
+    return SheetsClient(service.create("Model"), service=service)
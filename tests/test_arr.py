@@ -0,0 +1,73 @@
+"""Tests for the vectorized ARR engine against the template's per-cell formulas."""
+
+import numpy as np
+
+from src.analysis.arr import Contracts, compute_arr, contracts_from_rows, month_boundaries
+
+MONTH_ENDS = np.array([46053.0, 46081.0, 46112.0, 46142.0, 46173.0])  # Jan-May 2026
+
+
+def _brute_force(contracts, month_ends):
+    """The template's IF / SUMPRODUCT formulas, one cell at a time."""
+    bounds = month_boundaries(month_ends)
+    arr, new, churned, active = [], [], [], []
+    for m, end in enumerate(month_ends):
+        prev = bounds[m]
+        total = new_m = churn_m = count = 0.0
+        for s, a, c in zip(contracts.start, contracts.arr, contracts.churn):
+            if np.isfinite(c) and c <= s:
+                continue
+            if s <= end and (np.isnan(c) or c > end):
+                total += a
+                count += a > 0
+            if prev < s <= end:
+                new_m += a
+            if np.isfinite(c) and prev < c <= end:
+                churn_m += a
+        arr.append(total)
+        new.append(new_m)
+        churned.append(churn_m)
+        active.append(count)
+    return np.array(arr), np.array(new), np.array(churned), np.array(active)
+
+
+def test_matches_per_cell_formulas_on_random_contracts():
+    rng = np.random.default_rng(3)
+    n = 500
+    start = rng.integers(45900, 46200, n).astype(float)
+    churn = np.where(rng.random(n) < 0.3, start + rng.integers(-20, 200, n), np.nan)
+    contracts = Contracts(
+        start=start,
+        arr=rng.choice([0.0, 12000.0, 60000.0], n),
+        churn=churn,
+        expansion=rng.random(n) < 0.2,
+    )
+    metrics = compute_arr(contracts, MONTH_ENDS)
+    arr, new, churned, active = _brute_force(contracts, MONTH_ENDS)
+
+    assert np.allclose(metrics.arr, arr)
+    assert np.allclose(metrics.mrr, arr / 12)
+    assert np.allclose(metrics.new_arr + metrics.expansion_arr, new)
+    assert np.allclose(metrics.churned_arr, churned)
+    assert np.array_equal(metrics.active_customers, active)
+    assert np.allclose(
+        metrics.starting_arr + metrics.net_new_arr, metrics.arr
+    )  # waterfall closes every month
+
+
+def test_contracts_from_formatted_rows_and_month_edges():
+    contracts = contracts_from_rows([
+        ["Acme", "New", "1/31/2026", "$120,000", ""],  # starts on a month end: counts in Jan
+        ["Acme", "Expansion", "2/1/2026", "$12,000", "3/31/2026"],  # churned Mar 31: gone in Mar
+        ["Beta", "New", 46000, 60000, 46000],  # churn on start day: never active
+        ["", "", "", ""],
+    ])
+    assert len(contracts) == 3
+    metrics = compute_arr(contracts, MONTH_ENDS)
+
+    assert metrics.arr.tolist() == [120000, 132000, 120000, 120000, 120000]
+    assert metrics.new_arr.tolist() == [120000, 0, 0, 0, 0]
+    assert metrics.expansion_arr.tolist() == [0, 12000, 0, 0, 0]
+    assert metrics.churned_arr.tolist() == [0, 0, 12000, 0, 0]
+    assert metrics.new_customers.tolist() == [1, 0, 0, 0, 0]
+    assert metrics.to_dict()["months"][0] == "2026-01-31"
@@ -0,0 +1,161 @@
+"""Tests for the single-pass audit rule engine and the scan_sheet rules built on it."""
+
+import pytest
+
+from src.analysis.audit import (
+    RULES,
+    Rule,
+    audit_workbook,
+    hardcoded_constants,
+    register,
+)
+from src.analysis.formula import parse
+from src.analysis.scan import scan_sheet
+from src.sheets.local import LocalCell
+
+MONTHS = ["1/31/2026", "2/28/2026", "3/31/2026", "5/31/2026"]  # April is missing
+
+
+@pytest.fixture
+def client(client, service):
+    client.batch_update([
+        {"addSheet": {"properties": {"title": title}}}
+        for title in ("ARR", "Plan", "Summary", "Costs", "Calc")
+    ])
+    client.write_range("ARR", "A1", [["Customer", "Type", "Start", "ARR"]] + [
+        [f"C{i}", "Enterprise" if i % 2 else "SMB", "1/15/2026", 1000 * i] for i in range(1, 131)
+    ])
+    client.write_range("Plan", "A1", [
+        ["Month", "Jan 2026", "Feb 2026", "Mar 2026", "Apr 2026"],  # Text, not dates
+        ["Bookings", 10, 20, 30, 40],
+    ])
+    client.write_range("Summary", "A1", [
+        ["Month", *MONTHS],
+        ["New ARR", *[
+            f"=SUMIFS(ARR!$D$2:$D$100,ARR!$C$2:$C$100,\"<=\"&{c}$1)" for c in "BCDE"
+        ]],
+        ["Commission", *[f"={c}2*0.1" for c in "BCDE"]],
+        ["Enterprise", *[
+            '=SUMIF(ARR!$B$2:$B$131,"Enterprise",ARR!$D$2:$D$131)/12' for _ in "BCDE"
+        ]],
+        ["Bookings", *[f"=Plan!{c}2" for c in "CDEF"]],  # One column to the right
+    ])
+    client.write_range("Costs", "A1", [
+        ["Sales", ""], ["Salary", 100], ["Benefits", 20], ["Travel", 5],
+        ["Marketing", ""], ["Salary", 80], ["Benefits", 16], ["Travel", 4],
+        ["G&A", ""], ["Salary", 60], ["Travel", 3],
+    ])
+    client.write_range("Calc", "A1", [
+        ["Margin", "=B2/B3", "=C2/C3", "=D2/D3", "=E2/E3", "=F2/F3", "=G2/G3"],
+        ["Revenue", 10, 20, 30, 40, 50, 0],
+        ["Cost", 1, 2, 3, 4, 5, 0],
+        ["Growth", "=B2", "=C2*2", 0.5, "=E2*2", "=F2*2", "=G2*2"],
+    ])
+    # The fake does not evaluate formulas: give G1 the error a real sheet shows
+    calc = service.workbooks[client.spreadsheet_id].sheet("Calc")
+    calc.set(0, 6, LocalCell("#DIV/0!", "=G2/G3"))
+    return client
+
+
+def test_audit_runs_every_rule_in_one_read(client, service):
+    service.reset_calls()
+    result = audit_workbook(client)
+
+    # Metadata, then one FORMULA and one values batchGet for every tab
+    assert service.calls_by_method() == {"spreadsheets.get": 1, "values.batchGet": 2}
+    assert [r["rule"] for r in result["rules"]] == list(RULES)
+    assert {t["tab"]: t["formulas"] for t in result["tabs"]}["Summary"] == 16
+    findings = result["findings"]
+
+    assert findings["capped_ranges"] == [{
+        "tab": "Summary",
+        "cell": "B2",
+        "row_label": "New ARR",
+        "range": "ARR!$D$2:$D$100",
+        "range_ends": 100,
+        "data_ends": 131,
+        "cells": 4,
+        "formula": '=SUMIFS(ARR!$D$2:$D$100,ARR!$C$2:$C$100,"<="&B$1)',
+    }]
+
+    constants = {(f["tab"], f["row_label"]): f for f in findings["hardcoded_constants"]}
+    assert set(constants) == {  # /12 is a unit conversion
+        ("Summary", "Commission"), ("Summary", "Enterprise"), ("Calc", "Growth"),
+    }
+    assert constants["Summary", "Commission"]["constants"] == ["0.1"]
+    assert constants["Summary", "Commission"]["range"] == "B3:E3"
+    assert constants["Summary", "Enterprise"]["constants"] == ['"Enterprise"']
+
+    headers = {(f["tab"], f["kind"]): f for f in findings["month_headers"]}
+    assert headers[("Summary", "sequence")] == {
+        "tab": "Summary",
+        "cell": "E1",
+        "kind": "sequence",
+        "month": "2026-05",
+        "expected": "2026-04",
+    }
+    text = [(f["tab"], f["cell"]) for f in findings["month_headers"] if f["kind"] == "text"]
+    assert text == [("Plan", "B1"), ("Plan", "C1"), ("Plan", "D1"), ("Plan", "E1")]
+    misaligned = headers[("Summary", "misaligned")]
+    assert misaligned["cell"] == "B5"
+    assert misaligned["references"] == "Plan!C2 (2026-02)"
+    assert (misaligned["offset_months"], misaligned["cells"]) == (1, 3)  # E is May: no match
+
+    assert findings["unbalanced_sections"] == [{
+        "tab": "Costs", "cell": "A9", "section": "G&A", "missing": ["Benefits"], "rows": "10-11",
+    }]
+
+
+def test_scan_sheet_keeps_its_output(client):
+    result = scan_sheet("Calc", client)
+
+    assert set(result) == {
+        "sheet_name", "rows_scanned", "cols_scanned",
+        "errors", "static_in_formula_rows", "pattern_breaks",
+    }
+    assert (result["rows_scanned"], result["cols_scanned"]) == (4, 7)
+    assert result["errors"] == [
+        {"cell": "G1", "row_label": "Margin", "error": "#DIV/0!", "formula": "=G2/G3"}
+    ]
+    assert result["static_in_formula_rows"] == [
+        {"cell": "D4", "row_label": "Growth", "value": "0.5"}
+    ]
+    assert result["pattern_breaks"] == [{
+        "cell": "B4", "row_label": "Growth", "formula": "=B2", "dominant_pattern": "=CELL*2",
+    }]
+    with pytest.raises(ValueError, match="not found"):
+        scan_sheet("Nope", client)
+
+
+def test_hardcoded_constants():
+    assert hardcoded_constants(parse("=EOMONTH(B$1,-1)+1")) == []
+    assert hardcoded_constants(parse("=VLOOKUP($A2,Rates!$A:$C,3,FALSE)*12")) == []
+    assert hardcoded_constants(parse("=ROUND(B2*1.05,2)")) == ["1.05"]
+    assert hardcoded_constants(parse('=COUNTIFS($B:$B,">5000",$C:$C,"<>")')) == ["5000"]
+    assert hardcoded_constants(parse('=IF($E2="","",IF($B2="Churn",-$D2,$D2))')) == ['"Churn"']
+
+
+def test_custom_rules_plug_in(client, service):
+    class LongFormulas(Rule):
+        name = "long_formulas"
+        needs = frozenset({"patterns"})
+
+        def check_row(self, workbook, tab, row):
+            return [
+                {"cell": row.cell(i), "pattern": pattern}
+                for i, pattern in enumerate(row.patterns)
+                if len(pattern) > 30
+            ]
+
+    service.reset_calls()
+    result = audit_workbook(client, ["Summary"], rules=[LongFormulas()])
+    # No rule needs values: the values read is skipped
+    assert service.calls_by_method() == {"spreadsheets.get": 1, "values.batchGet": 1}
+    assert [f["cell"] for f in result["findings"]["long_formulas"]] == [
+        "B2", "C2", "D2", "E2", "B4", "C4", "D4", "E4",
+    ]
+
+    with pytest.raises(ValueError, match="Unknown audit rule 'nope'"):
+        audit_workbook(client, rules=["nope"])
+    with pytest.raises(ValueError, match="unknown features"):
+        register(type("Bad", (Rule,), {"name": "bad", "needs": frozenset({"colors"})}))
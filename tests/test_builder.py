@@ -0,0 +1,255 @@
+"""Tests for the deterministic model builder."""
+
+import re
+
+import pytest
+
+from src.builder import (
+    Contract,
+    Employee,
+    ModelSpec,
+    OpexLine,
+    build_model,
+    build_tabs,
+    refactor_to_arrays,
+)
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+from src.sheets.r1c1 import column_index
+
+TEMPLATE_TABS = [
+    "Monthly Summary",
+    "Quarterly Summary",
+    "Headcount Input",
+    "Headcount Summary",
+    "ARR",
+    "ARR Summary",
+    "OpEx Assumptions",
+    "Costs by Department",
+    "Cash Flow",
+]
+
+
+@pytest.fixture
+def spec():
+    return ModelSpec(
+        start_year=2026,
+        start_month=1,
+        employees=[
+            Employee("Ann", "Sales", "1/1/2026", 120000, bonus=12000),
+            Employee("Bo", "CS", "3/15/2026", 90000, end="12/31/2026"),
+        ],
+        contracts=[
+            Contract("Acme", "1/1/2026", 60000),
+            Contract("Acme", "6/1/2026", 12000, type="Expansion"),
+            Contract("Beta", "2/1/2026", 24000, churn="9/30/2026"),
+        ],
+        opex=[
+            OpexLine("Overall", "Rent", 10000, "Office"),
+            OpexLine("Dept", "Marketing", 0.05, "Paid", "% of Revenue"),
+        ],
+        starting_cash=5_000_000,
+    )
+
+
+def _tabs(spec):
+    return {tab.name: tab for tab in build_tabs(spec)}
+
+
+def test_build_pushes_whole_model_in_one_batch_and_one_write(spec):
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Model"), service=service)
+    service.reset_calls()
+
+    result = build_model(client, spec)
+    assert service.calls_by_method() == {
+        "spreadsheets.get": 1,
+        "spreadsheets.batchUpdate": 1,
+        "values.batchUpdate": 1,
+    }
+    assert result["tabs"] == TEMPLATE_TABS
+    assert client.read_formulas("Costs by Department", "C41") == [["=C7+C13+C19+C25+C31+C39"]]
+    assert client.read_range("Headcount Input", "A3:B3") == [["Bo", "CS"]]
+
+    with pytest.raises(ValueError, match="Tabs already exist"):
+        build_model(client, spec)
+    assert build_model(client, spec, replace=True)["replaced"] == TEMPLATE_TABS
+    names = [s["name"] for s in client.get_spreadsheet_info()["sheets"]]
+    assert names == TEMPLATE_TABS
+
+
+def test_repeated_formulas_are_sent_once_as_fills(spec):
+    spec.months = 60
+    builds = {}
+    for fill in (False, True):
+        service = FakeSheetsService()
+        client = SheetsClient(service.create("Model"), service=service)
+        result = build_model(client, spec, fill=fill)
+        contents = {tab: client.read_formulas(tab, "A1:BZ60") for tab in result["tabs"]}
+        builds[fill] = (result, service.payload_bytes(), contents)
+
+    per_cell, per_cell_bytes, expected = builds[False]
+    filled, filled_bytes, actual = builds[True]
+    assert actual == expected
+    assert per_cell["fills"] == 0 and filled["filled_cells"] > 0.9 * filled["formulas"]
+    assert filled_bytes * 5 < per_cell_bytes  # ~60x on L-size builds
+
+
+def test_default_departments_reproduce_template_rows_and_formulas(spec):
+    tabs = _tabs(spec)
+    ms, hs, cd = tabs["Monthly Summary"], tabs["Headcount Summary"], tabs["Costs by Department"]
+    c, d, j = column_index("C"), column_index("D"), column_index("J")
+
+    assert ms.get(1, c) == '=IF(C2="","","Q"&ROUNDUP(MONTH(C2)/3,0)&"-"&RIGHT(YEAR(C2),2))'
+    assert (ms.get(2, c), ms.get(2, d)) == ("=DATE(2026,1,31)", "=EOMONTH(C2+1,0)")
+    assert (ms.get(4, d), ms.get(11, c)) == ("=C8", "='Costs by Department'!C46")
+    assert [ms.get(r, 0) for r in (22, 24, 29, 35)] == [
+        "Total Operating Expenses",
+        "Operating Income (EBITDA)",
+        "Magic Number",
+        "Ending Cash Balance",
+    ]
+    assert ms.get(21, c) == "='Costs by Department'!C39"  # CS contributes its OpEx share
+
+    assert hs.get(4, c) == (
+        "=SUMPRODUCT(('Headcount Input'!$B$2:$B$100=$A4)*('Headcount Input'!J$2:J$100>0))"
+    )
+    assert hs.get(13, c) == "=SUMIF('Headcount Input'!$B$2:$B$100,$A13,'Headcount Input'!J$2:J$100)"
+    assert [hs.get(r, 0) for r in (3, 10, 19, 28, 37, 46)] == [
+        "Month-ending Headcount",
+        "Total HC",
+        "Total Salary + Benefits",
+        "Total Bonus",
+        "Total Commission",
+        "Total",
+    ]
+    assert tabs["Headcount Input"].get(2, j) == (
+        '=IF(OR($D2>J$1,AND($E2<>"",$E2<EOMONTH(J$1,-1)+1)),0,'
+        'IF(AND($D2<=EOMONTH(J$1,-1)+1,OR($E2="",$E2>=J$1)),($F2+$I2)/12,'
+        '($F2+$I2)/12*(MIN(IF($E2="",J$1,$E2),J$1)-MAX($D2,EOMONTH(J$1,-1)+1)+1)/DAY(J$1)))'
+    )
+    assert tabs["ARR"].get(2, column_index("G")) == '=IF(AND($C2<=G$1,OR($E2="",$E2>G$1)),$D2,0)'
+
+    assert [cd.get(r, 0) for r in (3, 33, 37, 38, 39, 41, 43, 44, 45, 46, 47)] == [
+        "G&A",
+        "CS",
+        "CS Subtotal",
+        "Less: CS to COGS",
+        "CS Total (OpEx)",
+        "Total Operating Expenses",
+        "COGS",
+        "Hosting",
+        "CS (COGS)",
+        "Total COGS",
+        "Total Expenses",
+    ]
+    assert cd.get(38, c) == "=-C37*'OpEx Assumptions'!$E$4"
+    assert tabs["OpEx Assumptions"].get(3, column_index("F")) == "=$E3*'ARR Summary'!C4"
+    assert tabs["OpEx Assumptions"].get(6, column_index("F")) == "=$E6*'ARR Summary'!C4"
+
+    cash = tabs["Cash Flow"]
+    assert cash.get(3, c) == 5_000_000 and cash.get(3, d) == "=C13"
+    assert cash.get(5, c) == "='ARR Summary'!C4*0.4"  # No billing before the first month
+    assert cash.get(5, column_index("E")) == (
+        "='ARR Summary'!E4*0.4+'ARR Summary'!D4*0.4+'ARR Summary'!C4*0.2"
+    )
+    assert tabs["Quarterly Summary"].rows[0][2:] == [
+        f"Q{q}-{y}" for y in (26, 27) for q in range(1, 5)
+    ]
+
+
+def test_array_mode_emits_one_formula_per_helper_block(spec):
+    tabs = {tab.name: tab for tab in build_tabs(spec, arrays=True)}
+    formulas = {
+        name: [v for row in tabs[name].rows for v in row if str(v).startswith("=")]
+        for name in ("Headcount Input", "ARR", "OpEx Assumptions")
+    }
+    assert len(formulas["Headcount Input"]) == 24 + 1  # date header + one block
+    assert formulas["ARR"][-1] == (
+        '=ARRAYFORMULA(IF(($C2:$C4<=G$1:AD$1)*(($E2:$E4="")+($E2:$E4>G$1:AD$1)),$D2:$D4,0))'
+    )
+    assert formulas["OpEx Assumptions"][-2:] == [
+        '=MAP(F$1:AC$1,LAMBDA(month,$E5))',
+        "=ARRAYFORMULA($E6*'ARR Summary'!C4:Z4)",
+    ]
+
+
+@pytest.fixture
+def built(spec):
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Model"), service=service)
+    build_model(client, spec)
+    service.reset_calls()
+    return service, client
+
+
+def test_refactor_converts_template_blocks_and_skips_edited_ones(built):
+    service, client = built
+    client.write_range("ARR", "H3", [["=$D3*2"]])
+    client.get_spreadsheet_info()
+    service.reset_calls()
+
+    report = refactor_to_arrays(client)
+    assert service.calls_by_method() == {"values.batchGet": 3, "values.batchUpdate": 1}
+    assert [(b["tab"], b["range"]) for b in report["converted"]] == [
+        ("Headcount Input", "J2:AG3"),
+        *[("OpEx Assumptions", f"F{r}:AC{r}") for r in (3, 4, 5, 6)],
+    ]
+    assert report["skipped"] == [{"tab": "ARR", "reason": "H3 differs from the template formula"}]
+    assert report["formulas_before"] == 48 + 4 * 24 and report["formulas_after"] == 5
+    hi = client.read_formulas("Headcount Input", "J2:K3")
+    assert hi[0][0].startswith("=ARRAYFORMULA(") and hi == [[hi[0][0]]]
+
+
+def test_refactor_rolls_back_blocks_whose_values_change(built):
+    service, client = built
+    sheet = service.workbooks[client.spreadsheet_id].sheet("ARR")
+    for (_, c), cell in sheet.cells.items():
+        if cell.formula and c >= 6:
+            cell.value = 60000.0  # Computed per-cell results the array must reproduce
+
+    report = refactor_to_arrays(client)
+    assert report["rolled_back"] == [{"tab": "ARR", "range": "G2:AD4", "first_mismatch": "G2"}]
+    assert "ARR" not in {b["tab"] for b in report["converted"]}
+    restored = client.read_formulas("ARR", "G2:H2")[0]
+    assert restored == [f'=IF(AND($C2<={c}$1,OR($E2="",$E2>{c}$1)),$D2,0)' for c in "GH"]
+
+
+_CELL_REF = re.compile(r"'([^']+)'!\$?([A-Z]+)\$?(\d+)(?![\d:])")
+
+
+@pytest.mark.parametrize(
+    "departments", [None, ["Sales", "Engineering", "CS", "Ops"], ["Sales", "Engineering"]]
+)
+def test_every_cross_tab_cell_reference_points_at_a_built_cell(spec, departments):
+    if departments:
+        spec.departments = departments
+        spec.employees = [e for e in spec.employees if e.department in departments]
+        spec.validate()
+    tabs = _tabs(spec)
+    for tab in tabs.values():
+        for row in tab.rows:
+            for value in row:
+                if not (isinstance(value, str) and value.startswith("=")):
+                    continue
+                for name, col, r in _CELL_REF.findall(value):
+                    if f"{col}{r}:" in value or f"{col}${r}:" in value:
+                        continue  # Range start, e.g. 'ARR'!G2:G100
+                    target = tabs[name].get(int(r), column_index(col))
+                    assert target != "", f"{tab.name}: {value} -> empty {name}!{col}{r}"
+
+    if departments == ["Sales", "Engineering"]:  # No CS: no CS (COGS) row
+        cd = tabs["Costs by Department"]
+        labels = [row[0] for row in cd.rows if row and row[0]]
+        assert labels[-4:] == ["COGS", "Hosting", "Total COGS", "Total Expenses"]
+
+
+def test_spec_validation():
+    with pytest.raises(ValueError, match="unknown departments: Ops"):
+        ModelSpec(2026, 1, employees=[Employee("Ann", "Ops", "1/1/2026", 1)])
+    with pytest.raises(ValueError, match="OpEx scaling"):
+        ModelSpec.from_dict({"start_year": 2026, "start_month": 1, "opex": [
+            {"scope": "Overall", "category": "Rent", "rate": 1, "scaling": "Weekly"}
+        ]})
+    with pytest.raises(ValueError, match="Unknown model spec fields: horizon"):
+        ModelSpec.from_dict({"start_year": 2026, "start_month": 1, "horizon": 12})
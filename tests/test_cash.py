@@ -0,0 +1,106 @@
+"""Tests for the vectorized cash engine against the Cash Flow tab's formulas."""
+
+import numpy as np
+
+from src.analysis.cash import cash_from_sheet, collections, project_cash, sweep
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+
+MONTH_ENDS = np.array([46053.0, 46081.0, 46112.0, 46142.0, 46173.0])  # Jan-May 2026
+
+
+def _chain(revenue, cash_out, starting, other=0.0):
+    """The Cash Flow tab, one month (column) at a time."""
+    beginning, ending = [], []
+    cash = starting
+    for m in range(len(revenue)):
+        prior = revenue[m - 1] if m >= 1 else 0.0
+        prior2 = revenue[m - 2] if m >= 2 else 0.0
+        collected = revenue[m] * 0.4 + prior * 0.4 + prior2 * 0.2
+        beginning.append(cash)
+        cash = cash + collected - cash_out[m] + other
+        ending.append(cash)
+    return np.array(beginning), np.array(ending)
+
+
+def test_matches_month_by_month_chain():
+    rng = np.random.default_rng(2)
+    revenue = rng.uniform(100, 500, 24)
+    cash_out = rng.uniform(300, 700, 24)
+    projection = project_cash(np.arange(24.0), revenue, cash_out, 5000.0, other=10.0)
+    beginning, ending = _chain(revenue, cash_out, 5000.0, other=10.0)
+
+    assert np.allclose(projection.beginning, beginning)
+    assert np.allclose(projection.ending, ending)
+    assert np.allclose(projection.burn, cash_out - projection.collections)
+
+
+def test_collections_kernel_and_prior_revenue():
+    revenue = np.array([100.0, 200.0, 300.0])
+    assert np.allclose(collections(revenue), [40, 120, 220])
+    assert np.allclose(collections(revenue, prior_revenue=[50.0, 80.0]), [82, 136, 220])
+    assert np.allclose(collections(revenue, (1.0,)), revenue)  # cash up front
+
+
+def test_runway_and_cash_zero_month():
+    revenue = np.zeros(5)
+    projection = project_cash(MONTH_ENDS, revenue, np.full(5, 100.0), 250.0)
+    assert int(projection.cash_zero_month) == 2  # 250 -> 150 -> 50 -> -50
+    assert float(projection.runway_months) == 2.5
+    assert projection.to_dict()["cash_zero_month"] == "2026-03-31"
+
+    longer = project_cash(MONTH_ENDS, revenue, np.full(5, 100.0), 800.0)
+    assert int(longer.cash_zero_month) == -1
+    assert float(longer.runway_months) == 8.0  # 300 left at a burn of 100/month
+
+    profitable = project_cash(MONTH_ENDS, np.full(5, 200.0), np.full(5, 100.0), 1000.0)
+    assert profitable.to_dict()["runway_months"] is None
+
+
+def test_sweep_matches_individual_projections():
+    rng = np.random.default_rng(4)
+    revenue = rng.uniform(100, 200, 5)
+    cash_out = rng.uniform(200, 300, 5)
+    terms = [(0.4, 0.4, 0.2), (1.0,), (0.0, 0.5, 0.3, 0.2)]
+    variants, batch = sweep(MONTH_ENDS, revenue, cash_out, 600.0, terms, [0.5, 1.0])
+
+    assert len(variants) == 6 and batch.ending.shape == (6, 5)
+    for i, variant in enumerate(variants):
+        single = project_cash(
+            MONTH_ENDS,
+            revenue,
+            cash_out * variant["burn_multiplier"],
+            600.0,
+            variant["payment_terms"],
+        )
+        assert np.allclose(batch.scenario(i).ending, single.ending)
+        assert batch.runway_months[i] == single.runway_months
+
+
+def test_cash_from_sheet_reads_template_rows_once():
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Model"), service=service)
+    client.batch_update([
+        {"addSheet": {"properties": {"title": "Monthly Summary"}}},
+        {"addSheet": {"properties": {"title": "Cash Flow"}}},
+    ])
+    client.write_range("Monthly Summary", "A2", [["", "", "1/31/2026", "2/28/2026", "3/31/2026"]])
+    client.write_range("Monthly Summary", "A10", [["Revenue (MRR)", "", 100, 100, 100]])
+    client.write_range("Cash Flow", "A3", [
+        ["Beginning Cash Balance", "", 1000],
+        [],
+        ["Cash Collections"],
+        ["Operating Cash Out", "", 300, 300, 300],
+        [],
+        ["Interest Income", "", 5, 5, 5],
+    ])
+    service.reset_calls()
+
+    result = cash_from_sheet(client)
+    assert service.call_count == 1
+    assert result["collections"] == [40, 80, 100]
+    assert result["ending"] == [745, 530, 335]
+
+    swept = cash_from_sheet(client, burn_multipliers=[1.0, 2.0])
+    assert [v["burn_multiplier"] for v in swept["variants"]] == [1.0, 2.0]
+    assert swept["variants"][1]["cash_zero_month"] == "2026-02-28"
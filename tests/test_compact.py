@@ -0,0 +1,79 @@
+"""Tests for R1C1 normalization and the compact inspect_sheet encoding."""
+
+from src.sheets import client as client_module
+from src.sheets.compact import compact_rows
+from src.sheets.r1c1 import shift_formula, to_r1c1
+
+ARR_FORMULA = '=IF(AND($C{r}<={c}$1,OR($E{r}="",$E{r}>{c}$1)),$D{r},0)'
+MONTHS = ["G", "H", "I", "J", "K", "L"]
+
+
+def _arr_sheet(customers: int) -> tuple[list[list], list[list]]:
+    header = ["Customer", "Type", "Start Date", "ARR", "Churn Date", "Contract Length"]
+    values = [header + ["1/31/2026"] * len(MONTHS)]
+    formulas = [header + ["='Monthly Summary'!C$2"] * len(MONTHS)]
+    for i in range(customers):
+        r = i + 2
+        data = [f"Cust {i}", "New", "1/15/2026", 120000, "", 12]
+        values.append(data + [120000] * len(MONTHS))
+        formulas.append(data + [ARR_FORMULA.format(r=r, c=c) for c in MONTHS])
+    return values, formulas
+
+
+def test_r1c1_identical_across_dragged_copies():
+    g = to_r1c1(ARR_FORMULA.format(r=2, c="G"), 1, 6)
+    h = to_r1c1(ARR_FORMULA.format(r=3, c="H"), 2, 7)
+    assert g == h == '=IF(AND(R[0]C3<=R1C[0],OR(R[0]C5="",R[0]C5>R1C[0])),R[0]C4,0)'
+
+
+def test_r1c1_leaves_strings_sheet_names_and_functions_alone():
+    formula = "=SUMIF('Sheet A1'!$A:$A,\"B2\",F:F)+LOG10(A1)"
+    assert to_r1c1(formula, 0, 5) == "=SUMIF('Sheet A1'!C1:C1,\"B2\",C[0]:C[0])+LOG10(R[0]C[-5])"
+
+
+def test_shift_formula_respects_absolute_parts():
+    assert shift_formula(ARR_FORMULA.format(r=2, c="G"), rows=1, cols=1) == ARR_FORMULA.format(
+        r=3, c="H"
+    )
+
+
+def test_repeated_formula_rows_collapse_into_block():
+    values, formulas = _arr_sheet(50)
+    formulas[10][8] = 0  # overwritten formula in I11
+    rows = compact_rows(values, formulas)
+
+    assert len(rows) == 1
+    block = rows[0]
+    assert block["rows"] == "2-51"
+    assert block["labels"] == ["Cust 0", "...", "Cust 49"]
+    assert block["span"] == "G:L"
+    assert block["data"] == {"B": "text", "C": "date", "D": "number", "F": "number"}
+    assert block["exceptions"] == {"I11": 120000}
+
+
+def test_section_headers_stay_individual():
+    values = [["Header"], ["ARR Waterfall"], ["Starting ARR", 100], ["Cash"]]
+    formulas = [["Header"], ["ARR Waterfall"], ["Starting ARR", 100], ["Cash"]]
+    rows = compact_rows(values, formulas)
+    assert rows == [
+        {"row": 2, "label": "ARR Waterfall"},
+        {"row": 3, "label": "Starting ARR", "values": {"B": 100}},
+        {"row": 4, "label": "Cash"},
+    ]
+
+
+def test_compact_inspect_reports_the_real_extent_past_the_caps(client, monkeypatch):
+    monkeypatch.setattr(client_module, "_COMPACT_MAX_ROWS", 10)
+    client.batch_update([{"addSheet": {"properties": {"title": "ARR"}}}])
+    _, formulas = _arr_sheet(14)
+    client.write_range("ARR", "A1", formulas)
+
+    result = client.inspect_sheet("ARR", compact=True)
+    assert result["estimated_row_count"] == 15
+    assert result["truncated"]
+    assert result["rows"][-1]["rows"] == "2-10"  # Encoded up to the row cap
+
+    client.batch_update([{"addSheet": {"properties": {"title": "Small"}}}])
+    client.write_range("Small", "A1", formulas[:5])
+    small = client.inspect_sheet("Small", compact=True)
+    assert (small["estimated_row_count"], small["truncated"]) == (5, False)
@@ -0,0 +1,78 @@
+"""Tests for the warm daemon and its proxy client."""
+
+import threading
+
+import pytest
+
+from src.daemon import DaemonClient, DaemonServer, connect
+from src.sheets import SheetsClient
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = DaemonServer(tmp_path / "d.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def proxy(daemon, tmp_path):
+    client = DaemonClient(f"local:{tmp_path / 'model.json'}", socket_path=daemon.path)
+    client.batch_update([{"addSheet": {"properties": {"title": "ARR"}}}])
+    client.write_range("ARR", "A1", [["Customer", "ARR"], ["Acme", "$120,000"]])
+    yield client
+    client.close()
+
+
+def test_proxy_round_trips_client_calls(proxy):
+    assert proxy.read_range("ARR", "A2:B2") == [["Acme", "$120,000"]]
+    assert [s["name"] for s in proxy.get_spreadsheet_info()["sheets"]] == ["ARR"]
+
+    numeric = proxy.read_numeric("ARR", "B1:B2")
+    assert numeric.values[1, 0] == 120000.0
+    assert numeric.mask[:, 0].tolist() == [True, False]
+    assert numeric.labels == {"Customer": 0, "Acme": 1}
+
+
+def test_session_stays_warm_across_connections(daemon, proxy):
+    with DaemonClient(proxy.spreadsheet_id, socket_path=daemon.path) as second:
+        assert second.read_range("ARR", "A1") == [["Customer"]]
+        sessions = second.ping()["sessions"]
+    assert sessions[proxy.spreadsheet_id]["calls"] == 3  # proxy's two setup calls + this read
+
+    assert proxy.invalidate() == [proxy.spreadsheet_id]
+    assert proxy.ping()["sessions"] == {}
+
+
+def test_session_caches_structure_and_values(proxy):
+    assert proxy.resolve_cell("Acme", sheet_name="ARR")["row"] == 2
+    assert proxy.model_structure("ARR")["tabs"]["ARR"]["label_column"] == "A"
+    assert proxy.evaluate("=B2*2", "ARR") == 240000
+    assert proxy.evaluate("=1/0", "ARR") == "#DIV/0!"
+    sessions = proxy.ping()["sessions"]
+    assert sessions[proxy.spreadsheet_id]["cached"] == ["evaluator", "structure"]
+
+    # A write through the daemon drops the cached values
+    proxy.write_range("ARR", "B2", [[100]])
+    assert proxy.ping()["sessions"][proxy.spreadsheet_id]["cached"] == ["structure"]
+    assert proxy.evaluate("=B2*2", "ARR") == 200
+
+
+def test_errors_keep_their_type(proxy):
+    with pytest.raises(ValueError, match="not found"):
+        proxy.get_sheet_id("Nope")
+    with pytest.raises(AttributeError):
+        proxy.warm_up
+
+
+def test_connect_falls_back_without_daemon(tmp_path):
+    client = connect(f"local:{tmp_path / 'x.json'}", socket_path=tmp_path / "none.sock")
+    assert isinstance(client, SheetsClient)
+
+
+def test_refuses_second_daemon_on_same_socket(daemon):
+    with pytest.raises(RuntimeError, match="already listening"):
+        DaemonServer(daemon.path)
@@ -0,0 +1,73 @@
+"""Tests for the in-process fake Sheets service."""
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.sheets import SheetsClient
+from src.sheets import client as client_module
+from src.sheets.fake import FakeSheetsService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(service):
+    spreadsheet_id = service.create("Model")
+    client = SheetsClient(spreadsheet_id, service=service)
+    client.batch_update([{"addSheet": {"properties": {"title": "ARR"}}}])
+    client.write_range("ARR", "A1", [["Customer", "ARR"], ["Acme", 120000]])
+    service.reset_calls()
+    return client
+
+
+def test_records_calls_by_method():
+    service = FakeSheetsService()
+    client = _client(service)
+
+    client.read_range("ARR", "A1:B2")
+    client.read_formulas("ARR", "A1:B2")
+    client.write_range("ARR", "C1", [["x"]])
+
+    assert service.call_count == 3
+    assert service.calls_by_method() == {"values.get": 2, "values.update": 1}
+    assert service.calls[0]["range"] == "'ARR'!A1:B2"
+
+
+def test_read_quota_raises_429_until_window_rolls():
+    clock = FakeClock()
+    service = FakeSheetsService(read_quota_per_minute=2, clock=clock)
+    client = _client(service)
+    values = service.spreadsheets().values()
+
+    values.get(spreadsheetId=client.spreadsheet_id, range="ARR!A1").execute()
+    values.get(spreadsheetId=client.spreadsheet_id, range="ARR!A1").execute()
+    with pytest.raises(HttpError) as exc:
+        values.get(spreadsheetId=client.spreadsheet_id, range="ARR!A1").execute()
+    assert exc.value.status_code == 429
+
+    clock.now = 61
+    assert values.get(spreadsheetId=client.spreadsheet_id, range="ARR!A2").execute()["values"] == [
+        ["Acme"]
+    ]
+
+
+def test_client_retries_injected_503(monkeypatch):
+    monkeypatch.setattr(client_module.time, "sleep", lambda s: None)
+    service = FakeSheetsService(fail_every=2)
+    client = _client(service)
+
+    assert client.read_range("ARR", "B2") == [["120000"]]  # call 1 succeeds
+    assert client.read_range("ARR", "A2") == [["Acme"]]  # call 2 fails, call 3 retries
+    assert service.call_count == 3
+
+
+def test_unknown_spreadsheet_is_404():
+    service = FakeSheetsService()
+    with pytest.raises(HttpError) as exc:
+        SheetsClient("missing", service=service).get_spreadsheet_info()
+    assert exc.value.status_code == 404
@@ -0,0 +1,124 @@
+"""Tests for the formula parser and the recalculation cost profiler."""
+
+import pytest
+
+from src.analysis.formula import Call, Literal, Op, Ref, depth, functions, parse, references
+from src.analysis.formula_cost import VOLATILE_WEIGHT, formula_cost, profile_formulas
+
+MONTHS = 24
+
+
+def test_parse_precedence_references_and_nesting():
+    tree = parse("=1+2*3-4")
+    assert tree == Op("-", (
+        Op("+", (Literal(1.0), Op("*", (Literal(2.0), Literal(3.0))))),
+        Literal(4.0),
+    ))
+
+    tree = parse("=IFERROR(SUMIF('Headcount Input'!$B:$B,$A5,J$2:J$100),0)")
+    assert isinstance(tree, Call) and depth(tree) == 2
+    assert functions(tree) == ["IFERROR", "SUMIF"]
+    column, label, block = references(tree)
+    assert column == Ref("Headcount Input", 1, None, 1, None, "'Headcount Input'!$B:$B")
+    assert column.is_full_column and column.cells(row_count=5000) == 5000
+    assert label.is_cell
+    assert block.size() == (99, 1)
+
+    # Function names that look like cells, open-ended ranges, whole rows, arrays
+    assert functions(parse("=LOG10(A2)")) == ["LOG10"]
+    assert references(parse("=SUM(A2:A)"))[0].cells(row_count=1000) == 999
+    assert references(parse("=SUM(3:3)"))[0].cells(column_count=26) == 26
+    assert depth(parse('={1,2;3,"x"}')) == 0
+
+
+@pytest.mark.parametrize("formula", ["=SUM(A1", "=1+", "=A1 B1)", "=)"])
+def test_parse_rejects_malformed_formulas(formula):
+    with pytest.raises(ValueError):
+        parse(formula)
+
+
+def test_formula_cost_weights_ranges_nesting_and_volatility():
+    sizes = {"Data": (2000, 26)}
+    plain = formula_cost("=SUMPRODUCT(($B$2:$B$100=$A4)*C$2:C$100)", sizes, "Data")
+    assert plain["referenced_cells"] == 99 + 1 + 99
+    assert plain["array_work"] == 99 + 99  # The = and * arrays
+    assert plain["cost"] == 199 + 198 + 1
+    assert formula_cost('=SUMIFS(C$2:C$100,$B$2:$B$100,$A4)', sizes, "Data")["cost"] == 199 + 1
+
+    full = formula_cost("=SUMIF($B:$B,$A4,C:C)", sizes, "Data")
+    assert full["referenced_cells"] == 2000 + 1 + 2000
+    assert full["full_column_refs"] == ["$B:$B", "C:C"]
+
+    volatile = formula_cost("=OFFSET(A1,0,1)+TODAY()", sizes, "Data")
+    assert volatile["volatile"] == ["OFFSET", "TODAY"]
+    assert volatile["cost"] == (1 + 2) * VOLATILE_WEIGHT
+
+    assert formula_cost("=IF(AND(A1,B1),1,0)", sizes, "Data")["cost"] > formula_cost(
+        "=IF(A1,1,0)", sizes, "Data"
+    )["cost"]
+    assert formula_cost("=SUM(A1", sizes, "Data")["unparsed"]
+
+
+@pytest.fixture
+def client(client):
+    client.batch_update([
+        {"addSheet": {"properties": {"title": "Data"}}},
+        {"addSheet": {"properties": {"title": "Summary"}}},
+    ])
+    client.write_range("Data", "A1", [["Customer", "Segment", "ARR"]] + [
+        [f"Customer {i}", "Enterprise" if i % 2 else "SMB", 1000 * i] for i in range(1, 100)
+    ])
+    cols = [client._col_index_to_letter(c) for c in range(1, MONTHS + 1)]
+    client.write_range("Summary", "A1", [
+        ["Metric", *cols],
+        ["Enterprise ARR", *[
+            '=SUMPRODUCT((Data!$B$2:$B$100="Enterprise")*Data!$C$2:$C$100)' for _ in cols
+        ]],
+        ["Growth", *[f"={c}2*1.1" for c in cols]],
+        ["As of", "=TODAY()"],
+        ["All ARR", "=SUM(Data!C:C)"],
+    ])
+    return client
+
+
+def test_profile_ranks_rows_tabs_and_patterns(client, service):
+    service.reset_calls()
+    report = profile_formulas(client, top=3)
+
+    # One metadata read, then the formulas of every tab
+    assert service.calls_by_method() == {"spreadsheets.get": 1, "values.batchGet": 1}
+    assert report["formulas"] == MONTHS * 2 + 2
+
+    first = report["hotspots"][0]
+    assert (first["tab"], first["row"], first["row_label"]) == ("Summary", 2, "Enterprise ARR")
+    assert first["range"] == "B2:Y2"
+    assert first["formulas"] == MONTHS
+    assert first["cost"] == MONTHS * (99 + 99 + 198 + 1)
+    assert len(report["hotspots"]) == 3
+
+    by_label = {row["row_label"]: row for row in report["hotspots"]}
+    assert by_label["All ARR"]["full_column_refs"] == ["Data!C:C"]
+    assert [t["tab"] for t in report["tabs"]] == ["Summary", "Data"]
+    assert report["tabs"][0]["volatile_cells"] == 1
+    assert report["tabs"][0]["full_column_cells"] == 1
+    assert report["tabs"][1]["formulas"] == 0
+
+    growth = next(p for p in report["patterns"] if p["pattern"] == "=CELL*1.1")
+    assert growth["formulas"] == MONTHS and growth["example"] == "'Summary'!B3"
+    assert sum(t["share"] for t in report["tabs"]) == pytest.approx(1, abs=1e-3)
+
+
+def test_profile_reads_rows_past_1000(client):
+    client.batch_update([{"addSheet": {"properties": {"title": "Ledger"}}}])
+    client.write_range("Ledger", "A1", [["Customer", "ARR", "Share"]] + [
+        [f"Customer {i}", 1000 * i, f"=B{i + 1}/SUM(Data!C2:C100)"] for i in range(1, 1500)
+    ])
+    report = profile_formulas(client, ["Ledger"], top=2000)
+
+    assert report["formulas"] == 1499
+    assert max(row["row"] for row in report["hotspots"]) == 1500
+
+
+def test_profile_unknown_tab_raises(client):
+    with pytest.raises(ValueError, match="not found"):
+        profile_formulas(client, ["Nope"])
@@ -0,0 +1,46 @@
+"""Tests for the compact Grid data structure."""
+
+import sys
+from array import array
+
+import pytest
+
+from src.sheets.grid import Grid
+
+
+def test_ragged_rows_are_padded():
+    grid = Grid.from_rows([["Label", "=A1"], ["Other"]], height=3, width=4)
+    assert (grid.height, grid.width) == (3, 4)
+    assert grid[0, 1] == "=A1"
+    assert grid[1, 3] == ""
+    assert list(grid.row(2)) == ["", "", "", ""]
+
+
+def test_numeric_columns_stored_as_arrays_and_strings_interned():
+    rows = [["Revenue", 100, "$0"], ["COGS", "", "".join(["$", "0"])]]
+    grid = Grid.from_rows(rows)
+
+    assert grid.is_numeric(1) and isinstance(grid.column(1), array)
+    assert grid[0, 1] == 100.0
+    assert grid[1, 1] == ""
+    assert not grid.is_numeric(2)
+    assert grid.column(2)[0] is grid.column(2)[1] is sys.intern("$0")
+
+
+def test_label_lookup_and_slicing_share_storage():
+    rows = [["Header", "Jan"], ["Revenue", 10], ["COGS", 4], ["Gross Profit", 6]]
+    grid = Grid.from_rows(rows)
+    assert grid.find("COGS") == 2
+    assert grid.find("Missing") is None
+
+    sub = grid.slice(rows=slice(1, 3), cols=slice(1, 2))
+    assert (sub.height, sub.width, sub.origin_row, sub.origin_col) == (2, 1, 1, 1)
+    assert sub[1, 0] == 4.0
+    assert sub._columns[0] is grid._columns[1]
+    with pytest.raises(IndexError):
+        sub[2, 0]
+
+
+def test_to_rows_round_trip_trims_trailing_blanks():
+    rows = [["A", "", "x"], ["B"], []]
+    assert Grid.from_rows(rows).to_rows() == rows
@@ -0,0 +1,81 @@
+"""Tests for the vectorized headcount proration and department rollup."""
+
+import numpy as np
+import pytest
+
+from src.analysis.headcount import (
+    employees_from_rows,
+    hires_from_plan,
+    planned_hires,
+    proration_matrix,
+    rollup,
+)
+
+MONTH_ENDS = np.array([46053.0, 46081.0, 46112.0])  # Jan-Mar 2026 (31, 28, 31 days)
+FIRST_DAYS = np.array([46023.0, 46054.0, 46082.0])
+
+
+def _formula(d, e, f, i, j1, first):
+    """The Headcount Input proration formula, evaluated for one cell."""
+    if d > j1 or (e is not None and e < first):
+        return 0.0
+    if d <= first and (e is None or e >= j1):
+        return (f + i) / 12
+    return (f + i) / 12 * (min(j1 if e is None else e, j1) - max(d, first) + 1) / (j1 - first + 1)
+
+
+def test_proration_matches_formula_cell_by_cell():
+    rng = np.random.default_rng(5)
+    n = 300
+    start = rng.integers(45990, 46120, n).astype(float)
+    end = np.where(rng.random(n) < 0.4, start + rng.integers(-5, 90, n), np.nan)
+    rows = [
+        [f"E{k}", "Sales", "AE", start[k], "" if np.isnan(end[k]) else end[k], 120000, 0, 0, 24000]
+        for k in range(n)
+    ]
+    matrix = proration_matrix(employees_from_rows(rows), MONTH_ENDS)
+
+    for k in range(n):
+        e = None if np.isnan(end[k]) else end[k]
+        for m in range(3):
+            expected = _formula(start[k], e, 120000, 24000, MONTH_ENDS[m], FIRST_DAYS[m])
+            assert matrix[k, m] == expected  # same operation order: exact match
+
+
+def test_rollup_by_department_and_hiring_plan():
+    employees = employees_from_rows([
+        ["Ann", "Sales", "AE", "1/1/2026", "", "$120,000", "$12,000", "$24,000", "$0"],
+        ["Bo", "Engineering", "SWE", "2/15/2026", "", 180000, 0, 0, 36000],
+        ["Cy", "Sales", "SDR", "1/1/2026", "1/31/2026", 60000, 0, 0, 0],
+        ["", "", "", "", ""],
+    ])
+    result = rollup(employees, MONTH_ENDS)
+
+    assert result.departments == ["Sales", "Engineering"]
+    assert result.hc.tolist() == [[2, 1, 1], [0, 1, 1]]
+    assert result.salary_benefits[0].tolist() == [15000, 10000, 10000]
+    assert result.bonus[0].tolist() == [1000, 1000, 1000]
+    assert result.commission[0].tolist() == [2000, 2000, 2000]
+    assert result.salary_benefits[1, 1] == 18000 * 14 / 28  # Feb 15-28 of 28 days
+    assert np.allclose(
+        result.total_comp, result.salary_benefits + result.bonus + result.commission
+    )
+
+    plan = employees.extend(planned_hires("CS", [46054.0, 46082.0], salary=96000))
+    planned = rollup(plan, MONTH_ENDS)
+    assert planned.departments[-1] == "CS"
+    assert planned.hc[-1].tolist() == [0, 1, 2]
+    assert planned.totals()["hc"].tolist() == [2, 3, 4]
+
+
+def test_hires_from_plan():
+    hires = hires_from_plan([
+        {"department": "CS", "start_date": "2/1/2026", "salary": 96000, "count": 2},
+        {"department": "G&A", "start_date": 46082, "salary": 60000, "benefits": 12000},
+    ])
+    assert list(hires.departments) == ["CS", "CS", "G&A"]
+    assert hires.start.tolist() == [46054.0, 46054.0, 46082.0]
+    assert rollup(hires, MONTH_ENDS).hc.tolist() == [[0, 0, 1], [0, 2, 2]]
+
+    with pytest.raises(ValueError, match="start_date"):
+        hires_from_plan([{"department": "CS", "start_date": "", "salary": 1}])
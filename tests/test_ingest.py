@@ -0,0 +1,168 @@
+"""Tests for streaming CSV / XLSX ingestion into the model's input tabs."""
+
+import csv
+from datetime import date
+
+import pytest
+
+from src.builder import Contract, Employee, ModelSpec, build_model, ingest
+from src.builder.arrays import proration_block
+from src.builder.ingest import IngestMapping, coerce_date, ingest_source
+from src.builder.tabs import arr_formula
+
+
+def _model(client, arrays=False):
+    spec = ModelSpec(
+        2026, 1, 6,
+        employees=[Employee("Ann", "Sales", "1/1/2026", 100000)],
+        contracts=[Contract("Acme", "1/1/2026", 60000)],
+    )
+    build_model(client, spec, arrays=arrays)
+
+
+def _csv(path, header, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+ARR_COLUMNS = {
+    "customer": "Account", "type": "Deal Type", "start": "Close Date",
+    "arr": "ACV", "churn": "End", "contract_length": "Term",
+}
+
+
+def test_arr_ingest_converts_validates_and_chunks(client, service, tmp_path):
+    _model(client)
+    header = ["Account", "Deal Type", "Close Date", "ACV", "Term", "End"]
+    source = _csv(tmp_path / "crm.csv", header, [
+        ["Beta", "new", "2026-02-01", "$24,000", "24", ""],
+        ["Gamma", "Upsell", "3/15/26", "36000", "", "Mar 1, 2026"],  # Churn before start
+        ["", "", "", "", "", ""],
+        ["Delta", "", "04/01/2026", "n/a", "12", ""],
+        ["Eps", "Expansion", "5/1/2026", "12000", "6", "12/31/2026"],
+        ["Zeta", "", "someday", "1000", "", ""],
+        ["Eta", "", "1/1/2026", "9000", "", ""],
+        ["Theta", "", "1/1/2026", "", "", ""],
+    ])
+    service.reset_calls()
+    mapping = IngestMapping("arr", ARR_COLUMNS, acv=True)
+    result = ingest_source(client, source, mapping, chunk_rows=2)
+
+    # Layout read once, then a batchUpdate and a values write per chunk
+    assert service.calls_by_method() == {
+        "spreadsheets.get": 1,
+        "values.batchGet": 1,
+        "spreadsheets.batchUpdate": 2,
+        "values.update": 2,
+    }
+    assert {k: v for k, v in result.items() if k != "rejected"} == {
+        "tab": "ARR", "source": "crm.csv", "rows_read": 8, "rows_written": 3,
+        "rows_rejected": 4, "first_row": 3, "last_row": 5, "chunks": 2,
+        "resumed_from": 0, "helpers": "filled",
+    }
+    assert result["rejected"] == [
+        {"row": 3, "error": "churn 2026-03-01 is before start 2026-03-15"},
+        {"row": 5, "error": "arr is not a number: 'n/a'"},
+        {"row": 7, "error": "not a date: 'someday'"},
+        {"row": 9, "error": "missing arr"},
+    ]
+    (written,) = client.read_ranges([("ARR", "A3:F5")], "UNFORMATTED_VALUE")
+    assert written == [
+        ["Beta", "New", 46054, 12000, "", 24],
+        ["Eps", "Expansion", 46143, 24000, 46387, 6],
+        ["Eta", "New", 46023, 9000, "", 12],
+    ]
+    assert client.read_formulas("ARR", "G5:H5") == [[arr_formula(5, "G"), arr_formula(5, "H")]]
+    assert not any(ingest.os.listdir(ingest.INGEST_DIR))  # Progress removed when done
+
+
+def test_interrupted_ingest_resumes_without_duplicates(client, tmp_path, monkeypatch):
+    _model(client)
+    source = _csv(tmp_path / "crm.csv", ["Account", "Close Date", "ACV"], [
+        [f"Customer {i}", "1/1/2026", 1000 * (i + 1)] for i in range(10)
+    ])
+    mapping = IngestMapping("arr", {"customer": "Account", "start": "Close Date", "arr": "ACV"})
+    write_range = client.write_range
+
+    def fail_on(n):
+        calls = []
+
+        def flaky(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == n:
+                raise TimeoutError("network down")
+            return write_range(*args, **kwargs)
+
+        monkeypatch.setattr(client, "write_range", flaky)
+
+    fail_on(3)
+    with pytest.raises(TimeoutError):
+        ingest_source(client, source, mapping, chunk_rows=3)
+
+    monkeypatch.setattr(client, "write_range", write_range)
+    result = ingest_source(client, source, mapping, chunk_rows=3)
+    assert (result["resumed_from"], result["chunks"], result["rows_written"]) == (6, 2, 10)
+    assert (result["first_row"], result["last_row"]) == (3, 12)
+    customers = client.read_range("ARR", "A2:A20")
+    assert [row[0] for row in customers] == ["Acme", *[f"Customer {i}" for i in range(10)]]
+
+    # A source edited after an interruption is not mixed with the half-written one
+    fail_on(2)
+    with pytest.raises(TimeoutError):
+        ingest_source(client, source, mapping, chunk_rows=3)
+    monkeypatch.setattr(client, "write_range", write_range)
+    _csv(tmp_path / "crm.csv", ["Account", "Close Date", "ACV"], [["Other", "1/1/2026", 5]])
+    with pytest.raises(ValueError, match="restart=True"):
+        ingest_source(client, source, mapping)
+    assert ingest_source(client, source, mapping, restart=True)["rows_written"] == 1
+
+
+def test_headcount_xlsx_with_departments_and_arrays(client, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Employee", "Team", "Hire Date", "Base", "Benefits"])
+    sheet.append(["Bo", "eng", date(2026, 2, 1), 120000, None])
+    sheet.append(["Cy", "Customer Success", date(2026, 3, 1), 80000, 10000])
+    sheet.append(["Di", "Legal", date(2026, 3, 1), 90000, None])
+    sheet.append(["Ed", "Sales", date(2026, 3, 1), None, None])
+    path = str(tmp_path / "roster.xlsx")
+    workbook.save(path)
+
+    _model(client, arrays=True)
+    mapping = IngestMapping(
+        "headcount",
+        {"name": "Employee", "department": "Team", "start": "Hire Date", "salary": "Base",
+         "benefits": "Benefits"},
+        departments={"Eng": "Engineering", "Customer Success": "cs"},
+    )
+    result = ingest_source(client, path, mapping)
+    assert (result["rows_written"], result["helpers"]) == (2, "array")
+    assert result["rejected"] == [
+        {"row": 4, "error": "unknown department 'Legal'"},
+        {"row": 5, "error": "missing salary"},
+    ]
+    assert client.read_range("Headcount Input", "A3:I4") == [
+        ["Bo", "Engineering", "", "2/1/2026", "", "$120,000", "$0", "$0", "$24,000"],
+        ["Cy", "CS", "", "3/1/2026", "", "$80,000", "$0", "$0", "$10,000"],
+    ]
+    # The array block now reaches the new rows
+    assert client.read_formulas("Headcount Input", "J2")[0][0] == proration_block(2, 4, 9, 6)
+
+    with pytest.raises(ValueError, match="not one of"):
+        IngestMapping("headcount", mapping.columns, departments={"Ops": "Operations"})
+    with pytest.raises(ValueError, match="missing required fields: salary"):
+        IngestMapping("headcount", {"name": "Employee", "department": "Team", "start": "Hire"})
+    with pytest.raises(ValueError, match="no column 'Salary'"):
+        columns = {**mapping.columns, "salary": "Salary"}
+        ingest_source(client, path, IngestMapping("headcount", columns))
+
+
+def test_coerce_date():
+    assert coerce_date("2026-01-15T00:00:00Z") == date(2026, 1, 15)
+    assert coerce_date("15-Jan-2026") == date(2026, 1, 15)
+    assert coerce_date(46037) == date(2026, 1, 15)
+    assert coerce_date(" ") is None
@@ -0,0 +1,124 @@
+"""Tests for the offline local-workbook backend behind SheetsClient."""
+
+import pytest
+
+from src.sheets import SheetsClient
+from src.sheets.local import format_value
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = SheetsClient(f"local:{tmp_path / 'model.json'}")
+    client.batch_update([{"addSheet": {"properties": {"title": "ARR"}}}])
+    client.write_range(
+        "ARR",
+        "A1",
+        [
+            ["Customer", "Type", "Start Date", "ARR", "", "", "1/31/2026", "2/28/2026"],
+            ["Acme", "New", "1/15/2026", "$120,000", "", 12, "=$D2", "=$D2"],
+        ],
+    )
+    return client
+
+
+def test_reads_follow_render_options(client):
+    assert client.read_range("ARR", "A2:D2") == [["Acme", "New", "1/15/2026", "$120,000"]]
+    assert client.read_formulas("ARR", "G2:H2") == [["=$D2", "=$D2"]]
+
+    numeric = client.read_numeric("ARR", "C2:F2")
+    assert numeric.values[0, 0] == 46037.0  # date serial
+    assert numeric.values[0, 1] == 120000.0
+    assert numeric.mask[0].tolist() == [False, False, True, False]
+    assert numeric.labels == {"Acme": 0}
+
+
+def test_append_clear_and_repeat_cell_formula_fill(client):
+    client.append_rows("ARR", [["Beta", "Expansion", "2/1/2026", 5000]])
+    assert client.read_range("ARR", "A3:B3") == [["Beta", "Expansion"]]
+
+    sheet_id = client.get_sheet_id("ARR")
+    client.batch_update([
+        {
+            "repeatCell": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "startRowIndex": 1,
+                    "endRowIndex": 3,
+                    "startColumnIndex": 8,
+                    "endColumnIndex": 10,
+                },
+                "cell": {"userEnteredValue": {"formulaValue": "=G2+$D2"}},
+                "fields": "userEnteredValue",
+            }
+        }
+    ])
+    assert client.read_formulas("ARR", "I2:J3") == [["=G2+$D2", "=H2+$D2"], ["=G3+$D3", "=H3+$D3"]]
+
+    client.clear_range("ARR", "A3:D3")
+    assert client.read_range("ARR", "A3:D3") == []
+
+
+def test_server_side_formula_fills(client):
+    client.fill_formula_row("ARR", "G3", "=SUM(G$2:G2)+$D3", 3)
+    assert client.read_formulas("ARR", "G3:I3") == [
+        ["=SUM(G$2:G2)+$D3", "=SUM(H$2:H2)+$D3", "=SUM(I$2:I2)+$D3"]
+    ]
+
+    # Extend the horizon past the tab's 26 columns: the grid grows in the same batch
+    client.fill_formula_block("ARR", "H2:I3", 20)
+    assert client.get_spreadsheet_info()["sheets"][0]["column_count"] == 29
+    assert client.read_formulas("ARR", "AB2:AC3") == [
+        ["=$D2"],  # The block tiles: AC2 copies the empty I2
+        ["=SUM(AB$2:AB2)+$D3", "=SUM(AC$2:AC2)+$D3"],
+    ]
+    client.fill_formula_block("ARR", "I3:I3", 2, method="autoFill")
+    assert client.read_formulas("ARR", "J3:K3") == [["=SUM(J$2:J2)+$D3", "=SUM(K$2:K2)+$D3"]]
+
+    with pytest.raises(ValueError, match="Unknown fill method"):
+        client.fill_formula_block("ARR", "I3:I3", 2, method="drag")
+
+
+def test_save_and_reload(client, tmp_path):
+    client.save_local()
+    reloaded = SheetsClient(f"local:{tmp_path / 'model.json'}")
+    assert reloaded.get_spreadsheet_info()["sheets"][0]["name"] == "ARR"
+    assert reloaded.read_range("ARR", "D2") == [["$120,000"]]
+
+
+def test_xlsx_round_trip(client, tmp_path):
+    pytest.importorskip("openpyxl")
+    client.save_local(str(tmp_path / "model.xlsx"))
+    xlsx = SheetsClient(f"local:{tmp_path / 'model.xlsx'}")
+    assert xlsx.read_formulas("ARR", "A2:H2")[0][6:] == ["=$D2", "=$D2"]
+
+
+def test_unsupported_batch_request_is_rejected(client):
+    with pytest.raises(ValueError, match="not supported by the local backend"):
+        client.batch_update([{"mergeCells": {}}])
+
+
+def test_month_and_year_formats_render_as_months(tmp_path):
+    assert format_value(46053, "mmm yyyy") == "Jan 2026"
+    assert format_value(46053, "MMM-yy") == "Jan-26"
+    assert format_value(46053, "yyyy-mm") == "2026-01"
+    assert format_value(46053, "M/d/yyyy") == "1/31/2026"
+    assert format_value(5, '0 "days"') == "5"  # Literal text is not a date code
+
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Summary"
+    sheet.append(["Metric", 46053, 46081])
+    for cell in sheet[1][1:]:
+        cell.number_format = "mmm yyyy"
+    workbook.save(tmp_path / "export.xlsx")
+    client = SheetsClient(f"local:{tmp_path / 'export.xlsx'}")
+    assert client.read_range("Summary", "A1:C1") == [["Metric", "Jan 2026", "Feb 2026"]]
+
+
+def test_unknown_local_id_raises(tmp_path, monkeypatch):
+    monkeypatch.setenv("FPA_SHEETS_BACKEND", "local")
+    monkeypatch.setenv("FPA_LOCAL_DIR", str(tmp_path))
+    with pytest.raises(FileNotFoundError, match="No local workbook"):
+        SheetsClient("typo-id").get_spreadsheet_info()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,53 @@
+"""Tests for bounded conversation memory and tool-result compaction."""
+
+import json
+
+from src.agent.memory import ConversationMemory, estimate_tokens, summarize_result
+
+
+def _tool_turn(tool_use_id: str, rows: int) -> dict:
+    grid = [[f"Row {r}"] + [r * c for c in range(20)] for r in range(rows)]
+    return {
+        "role": "user",
+        "content": [
+            {"type": "tool_result", "tool_use_id": tool_use_id, "content": json.dumps(grid)}
+        ],
+    }
+
+
+def _assistant_turn(tool_use_id: str) -> dict:
+    return {
+        "role": "assistant",
+        "content": [{"type": "tool_use", "id": tool_use_id, "name": "read_range", "input": {}}],
+    }
+
+
+def test_old_results_compacted_recent_kept():
+    memory = ConversationMemory(budget_tokens=3_000, keep_recent=1, compact_threshold=100)
+    memory.append({"role": "user", "content": "read some ranges"})
+    original = _tool_turn("t1", 50)
+    for i in range(1, 4):
+        memory.append(_assistant_turn(f"t{i}"))
+        memory.append(_tool_turn(f"t{i}", 50) if i > 1 else original)
+
+    assert memory.total_tokens <= 3_000
+    first = memory.messages[2]["content"][0]["content"]
+    assert first.startswith("[Compacted result r1: 50 rows x 21 cols")
+    assert memory.recall("r1") == original["content"][0]["content"]
+    # Most recent result is untouched
+    assert not memory.messages[-1]["content"][0]["content"].startswith("[Compacted")
+
+
+def test_oldest_exchange_dropped_when_compaction_not_enough():
+    memory = ConversationMemory(budget_tokens=200, keep_recent=0, compact_threshold=10_000)
+    memory.append({"role": "user", "content": "x" * 900})
+    memory.append({"role": "assistant", "content": "ok"})
+    memory.append({"role": "user", "content": "second question"})
+
+    assert memory.messages[0] == {"role": "user", "content": "second question"}
+    assert memory.total_tokens == estimate_tokens("second question")
+
+
+def test_summarize_result_dict():
+    summary = summarize_result(json.dumps({"sheet_name": "ARR", "headers": [], "rows": []}))
+    assert summary == "'ARR' dict with keys [sheet_name, headers, rows]"
@@ -0,0 +1,117 @@
+"""Tests for the Monte Carlo scenario engine."""
+
+import numpy as np
+import pytest
+
+from src.analysis.cash import project_cash
+from src.analysis.montecarlo import (
+    Distribution,
+    Drivers,
+    MonteCarloModel,
+    model_from_sheet,
+    project_paths,
+    simulate,
+)
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+
+MONTHS = 6
+MONTH_ENDS = np.array([46053.0, 46081.0, 46112.0, 46142.0, 46173.0, 46203.0])  # Jan-Jun 2026
+
+
+@pytest.fixture
+def model():
+    return MonteCarloModel(
+        month_ends=MONTH_ENDS,
+        base_mrr=np.full(MONTHS, 100.0),
+        staff_cost=np.full(MONTHS, 150.0),
+        hires_cost=np.array([0.0, 0.0, 50.0, 50.0, 50.0, 50.0]),
+        other_opex=np.full(MONTHS, 20.0),
+        starting_cash=1000.0,
+    )
+
+
+def _draws(n=1, **values):
+    base = {"growth": 0.0, "churn": 0.0, "cac": 0.0, "asp": 0.0, "new_customers": 0.0}
+    draws = {k: np.full(n, float(v)) for k, v in {**base, **values}.items()}
+    draws["hiring_delay"] = np.full(n, int(values.get("hiring_delay", 0)))
+    return draws
+
+
+def test_fixed_zero_drivers_reproduce_the_deterministic_model(model):
+    paths = project_paths(model, _draws())
+    expenses = 20 + 150 + model.hires_cost
+    cash = project_cash(MONTH_ENDS, model.base_mrr, expenses, 1000.0)
+
+    assert np.allclose(paths["arr"][0], 1200)
+    assert np.allclose(paths["ebitda"][0], 100 - expenses)
+    assert np.allclose(paths["cash"][0], cash.ending)
+    assert paths["breakeven"][0] == -1
+
+
+def test_cohorts_churn_and_hiring_delay_match_month_by_month(model):
+    draws = _draws(growth=0.1, churn=0.05, cac=300, asp=1200, new_customers=2, hiring_delay=3)
+    paths = project_paths(model, draws)
+
+    book, base = 0.0, 100.0
+    for m in range(MONTHS):
+        customers = 2 * 1.1**m
+        book = book * 0.95 + customers * 100
+        base *= 0.95
+        hires = 50.0 if m >= 5 else 0.0  # planned from month 2, slipped 3 months
+        expenses = 20 + 150 + hires + customers * 300 + book * 0.15
+        assert paths["arr"][0, m] == pytest.approx((base + book) * 12)
+        assert paths["ebitda"][0, m] == pytest.approx(base + book - expenses)
+
+
+def test_results_do_not_depend_on_worker_count(model):
+    drivers = Drivers.from_spec({
+        "churn": {"dist": "uniform", "low": 0.0, "high": 0.05},
+        "asp": {"dist": "triangular", "low": 600, "mode": 1200, "high": 2400},
+        "new_customers": {"dist": "normal", "mean": 1, "sd": 0.5},
+        "hiring_delay": {"dist": "uniform", "low": 0, "high": 4},
+    })
+    inline = simulate(model, drivers, paths=500, seed=3, workers=1, chunk_size=100)
+    pooled = simulate(model, drivers, paths=500, seed=3, workers=2, chunk_size=100)
+
+    assert np.array_equal(inline.cash, pooled.cash)
+    assert np.array_equal(inline.breakeven_month, pooled.breakeven_month)
+    assert np.all(np.diff(inline.arr, axis=0) >= 0)  # bands are ordered p5 <= ... <= p95
+    result = inline.to_dict()
+    assert set(result["arr"]) == {"p5", "p25", "p50", "p75", "p95"}
+    assert 0 <= result["prob_breakeven"] <= 1
+
+
+def test_driver_spec_validation():
+    assert Distribution.from_spec(3) == Distribution("fixed", (3.0,))
+    with pytest.raises(ValueError, match="Unknown distribution"):
+        Distribution.from_spec({"dist": "poisson", "lam": 2})
+    with pytest.raises(ValueError, match="missing: sd"):
+        Distribution.from_spec({"dist": "normal", "mean": 1})
+    with pytest.raises(ValueError, match="Unknown drivers: price"):
+        Drivers.from_spec({"price": 1})
+
+
+def test_model_from_sheet_splits_staff_and_planned_hires():
+    service = FakeSheetsService()
+    client = SheetsClient(service.create("Model"), service=service)
+    client.batch_update([
+        {"addSheet": {"properties": {"title": title}}}
+        for title in ("Monthly Summary", "Cash Flow", "ARR", "Headcount Input")
+    ])
+    client.write_range("Monthly Summary", "C2", [["1/31/2026", "2/28/2026", "3/31/2026"]])
+    client.write_range("Cash Flow", "C3", [[5000], [], [], [400, 400, 500]])
+    client.write_range("ARR", "A2", [["Acme", "New", "1/1/2026", 12000, ""]])
+    client.write_range("Headcount Input", "A2", [
+        ["Ann", "Sales", "AE", "1/1/2026", "", 1200, 0, 0, 0],
+        ["Bo", "CS", "CSM", "3/1/2026", "", 1200, 1200, 0, 0],
+    ])
+    service.reset_calls()
+
+    model = model_from_sheet(client)
+    assert service.call_count == 1
+    assert model.base_mrr.tolist() == [1000, 1000, 1000]
+    assert model.staff_cost.tolist() == [100, 100, 100]
+    assert model.hires_cost.tolist() == [0, 0, 200]
+    assert model.other_opex.tolist() == [300, 300, 200]
+    assert model.starting_cash == 5000
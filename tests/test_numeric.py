@@ -0,0 +1,31 @@
+"""Tests for typed numeric grids."""
+
+import numpy as np
+
+from src.sheets.numeric import NumericRange, date_to_serial, serial_to_date, to_numeric_array
+
+
+def test_to_numeric_array_masks_blanks_and_text():
+    rows = [["Revenue", 1234.5, 99], ["Label only"], ["COGS", "n/a", True, 7]]
+    values, mask = to_numeric_array(rows, height=4, width=3)
+
+    assert values.shape == (4, 3)
+    np.testing.assert_array_equal(values[0], [np.nan, 1234.5, 99])
+    assert mask[1].all() and mask[3].all()
+    # Strings and booleans are masked, not coerced
+    assert mask[2].tolist() == [True, True, True]
+
+
+def test_label_index_and_row_lookup():
+    values, mask = to_numeric_array([["Salary", 10], ["Bonus", 2], ["Salary", 20]], 3, 2)
+    grid = NumericRange("HC", "A1:B3", 0, 0, values, mask, ["Salary", "Bonus", "Salary"])
+
+    assert grid.labels == {"Salary": 0, "Bonus": 1}
+    assert grid.rows_for("Salary") == [0, 2]
+    assert grid.row("Bonus")[1] == 2
+    assert grid.filled()[0, 0] == 0.0
+
+
+def test_serial_round_trip():
+    assert date_to_serial("2026-01-31") == 46053.0
+    assert serial_to_date(46053.0) == np.datetime64("2026-01-31")
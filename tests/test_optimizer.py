@@ -0,0 +1,161 @@
+"""Tests for the local formula evaluator and the validated formula optimizer."""
+
+import pytest
+
+from src.analysis.evaluator import Evaluator
+from src.analysis.formula import Error, parse, to_formula
+from src.analysis.optimizer import (
+    HELPER_LABEL,
+    apply_rewrites,
+    bound_ref,
+    conditional_sum,
+    propose_rewrites,
+)
+from src.sheets.grid import Grid
+
+MONTHS = [46053, 46081, 46112, 46142]  # 1/31/2026 .. 4/30/2026
+COLS = "BCDE"
+
+
+def _evaluator(rows):
+    return Evaluator({"Data": Grid.from_rows(rows)}, {"Data": (1000, 26)})
+
+
+def test_evaluator_semantics():
+    ev = _evaluator([
+        ["Type", "Start", "ARR"],
+        ["New", 46030, 1000],
+        ["new", 46070, 2000],
+        ["Expansion", 46100, 500],
+        ["", "", 7],
+    ])
+    assert ev.evaluate("=1+2*3^2-4/2", "Data") == 17
+    assert ev.evaluate('=SUMPRODUCT((A2:A5="New")*C2:C5)', "Data") == 3000  # Case-insensitive
+    assert ev.evaluate('=SUMIFS(C2:C5,A2:A5,"New",B2:B5,">"&EOMONTH(46053,-1))', "Data") == 3000
+    assert ev.evaluate('=COUNTIFS(A2:A5,"<>",B2:B5,"<=46100")', "Data") == 3
+    assert ev.evaluate('=SUMIF(A2:A5,"Exp*",C2:C5)', "Data") == 500
+    assert ev.evaluate("=SUMPRODUCT((B2:B5<=46100)*C2:C5)", "Data") == 3507  # Blank counts as 0
+    assert ev.evaluate("=EOMONTH(46053,1)", "Data") == 46081
+    assert ev.evaluate("=DATE(2026,14,1)", "Data") == ev.evaluate("=DATE(2027,2,1)", "Data")
+    assert ev.evaluate('=VLOOKUP("expansion",A2:C5,3,FALSE)', "Data") == 500
+    assert ev.evaluate("=INDEX(C2:C5,MATCH(46070,B2:B5,0))", "Data") == 2000
+    assert ev.evaluate("=IFERROR(1/0,-1)", "Data") == -1
+    assert ev.evaluate("=1/0", "Data") == Error("#DIV/0!")
+    assert ev.evaluate('=IF(AND(A2="New",OR(C2>5000,B2<46053)),"yes","no")', "Data") == "yes"
+    assert ev.evaluate('=A2&"-"&C2', "Data") == "New-1000"
+    with pytest.raises(ValueError, match="Unsupported function"):
+        ev.evaluate("=XIRR(C2:C5,B2:B5)", "Data")
+
+
+def test_rewrites_on_the_tree():
+    tree = parse('=SUMPRODUCT((D!$B$2:$B$100="New")*(D!$C$2:$C$100>EOMONTH(C$2,-1))*D!$D$2:$D$100)')
+    assert to_formula(conditional_sum(tree)) == (
+        '=SUMIFS(D!$D$2:$D$100,D!$B$2:$B$100,"New",D!$C$2:$C$100,">"&EOMONTH(C$2,-1))'
+    )
+    # Flipped comparisons and --() coercion
+    assert to_formula(conditional_sum(parse("=SUMPRODUCT(--(5<$B$2:$B$9))"))) == (
+        '=COUNTIFS($B$2:$B$9,">5")'
+    )
+    # Not conditional sums: mismatched shapes, two value ranges, wildcard text
+    for formula in (
+        '=SUMPRODUCT(($B$2:$B$9="x")*$C$2:$C$10)',
+        "=SUMPRODUCT($B$2:$B$9*$C$2:$C$9)",
+        '=SUMPRODUCT(($B$2:$B$9="a*")*$C$2:$C$9)',
+    ):
+        assert conditional_sum(parse(formula)) is None
+
+    ref = parse("=SUM(Data!$B:$B)").args[0]
+    assert bound_ref(ref, "S", {"Data": 40}, {"Data": 1000}).text == "Data!$B$1:$B$140"
+    ref = parse("=SUM(C2:C)").args[0]
+    assert bound_ref(ref, "S", {"S": 40}, {"S": 1000}).text == "C2:C$140"
+    assert bound_ref(ref, "S", {"S": 950}, {"S": 1000}) is ref  # Nothing to skip
+
+
+@pytest.fixture
+def client(client):
+    client.batch_update([
+        {"addSheet": {"properties": {"title": title}}} for title in ("ARR", "Rates", "Summary")
+    ])
+    client.write_range("ARR", "A1", [["Customer", "Type", "Start", "ARR"]] + [
+        [f"C{i}", "New" if i % 3 else "Expansion", 46000 + 20 * i, 1000 * i] for i in range(1, 30)
+    ] + [["Pending", "New", "", 999]])  # No start date: SUMPRODUCT counts it, SUMIFS does not
+    client.write_range("Rates", "A1", [["Key", "Rate"], ["Sales", 0.1], ["CS", 0.2]])
+    lookup = 'VLOOKUP("Sales",Rates!$A$1:$B$10,2,FALSE)'
+    client.write_range("Summary", "A1", [
+        ["Month", *MONTHS],
+        ["New ARR", *[
+            f'=SUMPRODUCT((ARR!$B$2:$B$100="New")*(ARR!$C$2:$C$100>EOMONTH({c}$1,-1))'
+            f"*(ARR!$C$2:$C$100<={c}$1)*ARR!$D$2:$D$100)"
+            for c in COLS
+        ]],
+        ["Booked", *[f"=SUMPRODUCT((ARR!$C$2:$C$100<={c}$1)*ARR!$D$2:$D$100)" for c in COLS]],
+        ["All New", *['=SUMIF(ARR!$B:$B,"New",ARR!$D:$D)' for _ in COLS]],
+        ["Commission", *[f"={c}2*{lookup}" for c in COLS]],
+        ["Commission 2", *[f"={c}4*{lookup}" for c in COLS]],
+    ])
+    return client
+
+
+def test_propose_validates_and_ranks_rewrites(client, service):
+    service.reset_calls()
+    plan = propose_rewrites(client, ["Summary"])
+
+    # Metadata, formulas, then values of every tab involved
+    assert service.calls_by_method() == {"spreadsheets.get": 1, "values.batchGet": 2}
+    proposals = {p["id"]: p for p in plan["rewrites"]}
+    assert set(proposals) == {"Summary!B2:E2", "Summary!B4:E4", "Summary!B8:E8"}
+    savings = [p["cost_before"] - p["cost_after"] for p in plan["rewrites"]]
+    assert savings == sorted(savings, reverse=True) and all(s > 0 for s in savings)
+
+    assert proposals["Summary!B2:E2"]["rewrites"] == ["conditional_sum"]
+    assert proposals["Summary!B4:E4"]["example"]["after"] == (
+        '=SUMIF(ARR!$B$1:$B$131,"New",ARR!$D$1:$D$131)'
+    )
+    helper = proposals["Summary!B8:E8"]
+    assert helper["rewrites"] == ["helper_row"]
+    assert helper["example"] == {
+        "cell": "B5",
+        "before": '=B2*VLOOKUP("Sales",Rates!$A$1:$B$10,2,FALSE)',
+        "after": "=B2*B$8",
+    }
+
+    # The blank start date makes SUMIFS disagree with SUMPRODUCT on this data
+    assert plan["rejected"] == [{
+        "id": "Summary!B3:E3",
+        "rewrites": ["conditional_sum"],
+        "reason": "Rewrite changes the result",
+        "cell": "B3",
+    }]
+
+
+def test_apply_writes_approved_rewrites_in_one_batch(client, service):
+    ids = ["Summary!B2:E2", "Summary!B8:E8"]
+    service.reset_calls()
+    result = apply_rewrites(client, ids, ["Summary"])
+
+    assert result["applied"] == ids
+    assert service.calls_by_method()["values.batchUpdate"] == 1
+    assert "spreadsheets.batchUpdate" not in service.calls_by_method()
+    rows = client.read_formulas("Summary", "A1:E8")
+    assert rows[1][1].startswith("=SUMIFS(ARR!$D$2:$D$100,")
+    assert rows[3][1] == '=SUMIF(ARR!$B:$B,"New",ARR!$D:$D)'  # Not approved
+    assert rows[4][1:] == ["=B2*B$8", "=C2*C$8", "=D2*D$8", "=E2*E$8"]
+    assert rows[7] == [HELPER_LABEL] + ['=VLOOKUP("Sales",Rates!$A$1:$B$10,2,FALSE)'] * 4
+
+    # Applied rewrites are no longer proposed
+    with pytest.raises(ValueError, match="no longer proposed"):
+        apply_rewrites(client, ["Summary!B2:E2"], ["Summary"])
+
+
+def test_helper_row_rejected_where_a_range_reads_it(client):
+    # Totals far below the data on another tab sum Summary down to row 20
+    client.batch_update([{"addSheet": {"properties": {"title": "Checks"}}}])
+    client.write_range("Checks", "A1500", [["Commission total", "=SUM(Summary!B5:E20)"]])
+    plan = propose_rewrites(client, ["Summary"])
+
+    assert "Summary!B8:E8" not in {p["id"] for p in plan["rewrites"]}
+    assert {
+        "id": "Summary!B8:E8",
+        "rewrites": ["helper_row"],
+        "reason": "Helper row would fall inside Summary!B5:E20 read by Checks!B1500",
+    } in plan["rejected"]
@@ -0,0 +1,162 @@
+"""Tests for the request quota bucket and parallel portfolio operations."""
+
+import threading
+
+import pytest
+
+from src.analysis.portfolio import Portfolio
+from src.analysis.scan import SCAN_RULES
+from src.analysis.snapshot import diff_snapshots, load_snapshot
+from src.sheets import SheetsClient
+from src.sheets.fake import FakeSheetsService
+from src.sheets.quota import QuotaBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_quota_bucket_paces_requests():
+    clock = FakeClock()
+    bucket = QuotaBucket(per_minute=60, burst=2, clock=clock, sleep=clock.sleep)
+    # A full bucket lets the burst through, then one request a second
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 1.0, 1.0]
+    assert clock.now == 2.0
+    clock.now += 10  # Idle time refills up to the burst only
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+    service = FakeSheetsService()
+    quota = QuotaBucket(per_minute=60, burst=1, clock=clock, sleep=clock.sleep)
+    client = SheetsClient(service.create("Model"), service=service, quota=quota)
+    client.get_spreadsheet_info()
+    client.batch_update([{"addSheet": {"properties": {"title": "Plan"}}}])
+    assert clock.slept[-1] == 1.0  # The second request waited for its slot
+
+    with pytest.raises(ValueError, match="positive"):
+        QuotaBucket(per_minute=-1)
+
+
+def _model(service: FakeSheetsService, title: str, scale: int) -> str:
+    client = SheetsClient(service.create(title), service=service)
+    client.batch_update([
+        {"addSheet": {"properties": {"title": name}}}
+        for name in ("Monthly Summary", "Cash Flow", "ARR")
+    ])
+    client.write_range("Monthly Summary", "A2", [["", "", "1/31/2026", "2/28/2026", "3/31/2026"]])
+    client.write_range("Monthly Summary", "A10", [["Revenue (MRR)", "", *[100 * scale] * 3]])
+    client.write_range("Cash Flow", "A3", [
+        ["Beginning Cash Balance", "", 1000 * scale],
+        [],
+        ["Cash Collections"],
+        ["Operating Cash Out", "", *[300 * scale] * 3],
+        [],
+        ["Interest Income", "", *[5 * scale] * 3],
+    ])
+    client.write_range("ARR", "A2", [
+        [f"Customer {i}", "New", "1/1/2026", 12000, ""] for i in range(scale)
+    ])
+    return client.spreadsheet_id
+
+
+@pytest.fixture
+def quota():
+    return QuotaBucket(per_minute=60_000)
+
+
+def test_metrics_table_across_models(service, quota):
+    ids = [_model(service, f"Co {k}", k) for k in (1, 2, 3)]
+    service.create("Empty", "emptymodel")
+    service.reset_calls()
+    table = Portfolio(ids + ["missingmodel", "emptymodel"], service=service, quota=quota).run(
+        "metrics", as_of="2026-02-15"
+    )
+
+    # Metadata and one batchGet per model
+    assert service.calls_by_method() == {"spreadsheets.get": 5, "values.batchGet": 3}
+    assert table["columns"] == [
+        "spreadsheet_id", "title", "month", "arr", "net_new_arr", "customers",
+        "burn", "ending_cash", "runway_months",
+    ]
+    assert [row["title"] for row in table["rows"]] == ["Co 1", "Co 2", "Co 3"]
+    assert table["rows"][0] == {
+        "spreadsheet_id": ids[0],
+        "title": "Co 1",
+        "month": "2026-01-31",
+        "arr": 12000.0,
+        "net_new_arr": 12000.0,
+        "customers": 1,
+        "burn": 260.0,  # 300 out less 40 collected
+        "ending_cash": 745.0,
+        "runway_months": 3.7,  # From the end of January
+    }
+    assert table["totals"] == {
+        "arr": 72000.0, "net_new_arr": 72000.0, "customers": 6,
+        "burn": 1560.0, "ending_cash": 4470.0,
+    }
+    assert [(e["spreadsheet_id"], e["title"]) for e in table["errors"]] == [
+        ("missingmodel", ""), ("emptymodel", "Empty"),
+    ]
+    assert "Monthly Summary" in table["errors"][1]["error"]
+
+
+def test_operations_run_in_parallel(service, quota):
+    ids = [_model(service, f"Co {k}", 1) for k in range(4)]
+    barrier = threading.Barrier(4, timeout=5)
+
+    def tabs(client):
+        barrier.wait()  # Breaks unless all four models are in flight at once
+        return {"tabs": len(client.get_spreadsheet_info()["sheets"])}
+
+    table = Portfolio(ids, service=service, workers=4, quota=quota).run(tabs)
+    assert table["errors"] == []
+    assert table["operation"] == "tabs"
+    assert [row["tabs"] for row in table["rows"]] == [3, 3, 3, 3]
+
+    audit = Portfolio(ids[:1], service=service, quota=quota).run("audit", rules=["errors"])
+    assert audit["rows"][0]["errors"] == 0
+    with pytest.raises(ValueError, match="Unknown portfolio operation"):
+        Portfolio(ids, service=service).run("nope")
+
+
+def test_scan_and_snapshot_operations(service, quota):
+    ids = [_model(service, f"Co {k}", k) for k in (1, 2)]
+    service.reset_calls()
+    scans = Portfolio(ids, service=service, quota=quota).run("scan")
+
+    # Metadata, then every tab's formulas and values in two batchGets per model
+    assert service.calls_by_method() == {"spreadsheets.get": 2, "values.batchGet": 4}
+    assert scans["columns"][2:] == ["tabs", *SCAN_RULES]
+    assert [row["tabs"] for row in scans["rows"]] == [3, 3]
+
+    table = Portfolio(ids, service=service, quota=quota).run("snapshot", as_of="2026-02-15")
+    assert table["errors"] == []
+    first, second = (load_snapshot(row["snapshot_id"]) for row in table["rows"])
+    assert table["rows"][0]["arr"] == 12000.0
+    assert first["spreadsheet_title"] == "Co 1" and first["label"] == "portfolio"
+    assert first["metrics"]["months"] == ["2026-01-31", "2026-02-28", "2026-03-31"]
+    assert first["metrics"]["series"]["arr"] == [12000.0] * 3
+    assert diff_snapshots(first, second)["series_diffs"]["arr"]["delta"] == [12000.0] * 3
+
+
+def test_local_models_are_not_paced(tmp_path):
+    ids = []
+    for k in range(3):
+        client = SheetsClient(f"local:{tmp_path / f'co{k}.json'}")
+        client.batch_update([{"addSheet": {"properties": {"title": "ARR"}}}])
+        client.save_local()
+        ids.append(client.spreadsheet_id)
+    clock = FakeClock()
+    quota = QuotaBucket(per_minute=60, burst=1, clock=clock, sleep=clock.sleep)
+
+    table = Portfolio(ids, quota=quota).run(lambda client: {"tabs": 1})
+    assert [row["tabs"] for row in table["rows"]] == [1, 1, 1]
+    assert clock.slept == []  # No API traffic, so nothing waited for the quota
@@ -0,0 +1,122 @@
+"""Tests for tool/API span instrumentation and the profiling report."""
+
+import json
+
+import pytest
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence, HttpRequest
+from googleapiclient.model import JsonModel
+
+from src.profiling import JsonlSink, MemorySink, build_report, format_report, get_tracer
+from src.sheets import SheetsClient
+from src.sheets import client as client_module
+from src.sheets.fake import FakeSheetsService
+from src.tools import execute_tool
+
+
+@pytest.fixture
+def spans():
+    sink = MemorySink()
+    get_tracer().add_sink(sink)
+    yield sink
+    get_tracer().remove_sink(sink)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(client_module.time, "sleep", lambda s: None)
+    return FakeSheetsService()
+
+
+@pytest.fixture
+def client(service):
+    client = SheetsClient(service.create("Model"), service=service)
+    client.batch_update([{"addSheet": {"properties": {"title": "ARR"}}}])
+    client.write_range("ARR", "A1", [["Customer", "ARR"], ["Acme", 120000]])
+    return client
+
+
+def test_api_spans_nest_under_tool_span(client, spans):
+    execute_tool(client, "read_range", {"sheet_name": "ARR", "range": "A1:B2"})
+
+    api, tool = list(spans.spans)
+    assert (tool.kind, tool.name) == ("tool", "read_range")
+    assert (api.kind, api.name) == ("api", "values.get")
+    assert api.parent_id == tool.span_id and api.tool == "read_range"
+    assert api.ranges == ["'ARR'!A1:B2"]
+    assert api.response_bytes > 0 and api.status == "ok"
+
+
+def test_retries_and_throttling_are_recorded(service, client, spans):
+    service.read_quota_per_minute = 0  # every read is throttled
+    with pytest.raises(HttpError):
+        execute_tool(client, "read_range", {"sheet_name": "ARR", "range": "A1:B2"})
+
+    api, tool = list(spans.spans)
+    assert api.retries == 4 and api.status == "429"
+    assert api.throttled == 1 + 2 + 4 + 8
+    assert tool.throttled == api.throttled and tool.status == "HttpError"
+
+    report = build_report(spans.spans)
+    assert report["totals"]["throttled"] == 15
+    assert report["calls_per_tab"]["ARR"]["calls"] == 1
+    assert "Throttled: 15.00s" in format_report(report)
+
+
+def test_report_groups_by_tool_and_tab(client, spans, tmp_path):
+    trace = JsonlSink(tmp_path / "trace.jsonl")
+    get_tracer().add_sink(trace)
+    try:
+        execute_tool(client, "read_range", {"sheet_name": "ARR", "range": "A1:B2"})
+        execute_tool(client, "write_range", {"sheet_name": "ARR", "range": "C1", "values": [[1]]})
+    finally:
+        get_tracer().remove_sink(trace)
+
+    report = build_report(spans.spans)
+    assert report["totals"]["tool_calls"] == 2
+    assert {t["tool"] for t in report["slowest_tools"]} == {"read_range", "write_range"}
+    assert report["calls_per_method"]["values.update"]["calls"] == 1
+
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    assert [json.loads(line)["kind"] for line in lines] == ["api", "tool", "api", "tool"]
+
+
+def test_http_sizes_come_from_the_wire(spans):
+    body = json.dumps({"data": [{"range": "'ARR'!A1", "values": [['say "range": "X!A1"']]}]})
+    content = b'{"totalUpdatedCells": 1}'
+    request = HttpRequest(
+        HttpMockSequence([({"status": "200"}, content)]),
+        JsonModel().response,
+        "https://sheets.googleapis.com/v4/spreadsheets/abc/values:batchUpdate",
+        method="POST",
+        body=body,
+        methodId="sheets.spreadsheets.values.batchUpdate",
+    )
+    tracer = get_tracer()
+    tracer.watch(request)
+    tracer.record_api(request, request.execute(), 0.1)
+
+    (api,) = spans.spans
+    assert api.name == "values.batchUpdate"
+    assert api.ranges == ["'ARR'!A1"]
+    assert (api.request_bytes, api.response_bytes) == (len(body), len(content))
+
+
+def test_session_sink_skips_local_payload_sizes(client):
+    sink = MemorySink(payload_sizes=False)
+    get_tracer().add_sink(sink)
+    try:
+        execute_tool(client, "write_range", {"sheet_name": "ARR", "range": "C1", "values": [[1]]})
+    finally:
+        get_tracer().remove_sink(sink)
+
+    api, tool = list(sink.spans)
+    assert api.ranges == ["'ARR'!C1"]
+    assert (api.request_bytes, api.response_bytes) == (0, 0)
+
+
+def test_no_sinks_records_nothing(client):
+    assert not get_tracer().enabled
+    with get_tracer().tool("read_range") as span:
+        client.read_range("ARR", "A1")
+    assert span is None
@@ -0,0 +1,49 @@
+"""Tests for the session result store behind large read tool results."""
+
+import pytest
+
+from src.tools.results import ResultStore
+
+
+def _grid(rows: int) -> list[list]:
+    grid = [["Line", "Jan", "Feb"]]
+    for i in range(1, rows):
+        grid.append([f"Line {i}", f"${i * 1000:,}", f"{i}%"])
+    return grid
+
+
+def test_small_results_pass_through():
+    store = ResultStore(max_cells=100)
+    grid = _grid(10)
+    assert store.maybe_store("ARR", "A1:C10", grid) is grid
+
+
+def test_large_result_returns_handle_with_summary():
+    store = ResultStore(max_cells=100, head_rows=2)
+    handle = store.maybe_store("ARR", "B5:D504", _grid(500))
+
+    assert handle["handle"] == "h1"
+    assert handle["shape"] == [500, 3]
+    assert handle["dtypes"] == {"B": "text", "C": "number|text", "D": "number|text"}
+    assert handle["head"][1] == {"row": 6, "values": ["Line 1", "$1,000", "1%"]}
+
+
+def test_page_filter_aggregate():
+    store = ResultStore(max_cells=100)
+    store.maybe_store("ARR", "A1:C500", _grid(500))
+
+    page = store.page("h1", offset=100, limit=2)
+    assert [r["row"] for r in page["rows"]] == [101, 102]
+
+    found = store.filter("h1", "line 42", exact=True)
+    assert found["match_count"] == 1
+    assert found["rows"][0]["row"] == 43
+
+    agg = store.aggregate("h1", "sum", columns=["B", "C"], skip_rows=1)
+    assert agg["columns"]["B"] == sum(i * 1000 for i in range(1, 500))
+    assert agg["columns"]["C"] == pytest.approx(sum(i / 100 for i in range(1, 500)))
+
+
+def test_unknown_handle_raises():
+    with pytest.raises(ValueError, match="Unknown result handle"):
+        ResultStore().page("h9")
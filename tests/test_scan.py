@@ -0,0 +1,97 @@
+"""Tests for scan_sheet's saved scans and incremental rescans."""
+
+import pytest
+
+from src.analysis.scan import rescan_sheet, scan_sheet
+from src.sheets.local import LocalCell
+
+
+@pytest.fixture
+def client(client):
+    client.batch_update([{"addSheet": {"properties": {"title": "Calc"}}}])
+    client.write_range("Calc", "A1", [
+        ["Revenue", *range(10, 70, 10)],
+        ["Cost", *range(1, 7)],
+        ["Margin", "=B1-B2", "=C1-C2", 18, "=E1-E2", "=F1-F2", "=G1-G2"],
+        ["Growth", "=B1", "=C1*2", "=D1*2", "=E1*2", "=F1*2", "=G1*2"],
+        ["Ratio", *[f"={c}2/{c}1" for c in "BCDEFG"]],
+    ])
+    return client
+
+
+def test_rescan_reads_formulas_of_written_rows_only(client, service):
+    first = rescan_sheet("Calc", client)
+    assert first["rescan"] == {"mode": "full", "rows_read": 5, "rows_changed": 5}
+    assert [f["cell"] for f in first["static_in_formula_rows"]] == ["D3"]
+    assert [f["cell"] for f in first["pattern_breaks"]] == ["B4"]
+
+    # Fix D3 and add a row with an error; rows 1-2 and 4-5 are not read again
+    client.write_range("Calc", "D3", [["=D1-D2"]])
+    client.write_range("Calc", "A6", [["Check", *[f"={c}5*2" for c in "BCDEFG"]]])
+    calc = service.workbooks[client.spreadsheet_id].sheet("Calc")
+    calc.set(5, 3, LocalCell("#REF!", "=D5*2"))
+    service.reset_calls()
+    result = rescan_sheet("Calc", client)
+
+    assert service.calls_by_method() == {"values.batchGet": 2}
+    assert result["rescan"] == {"mode": "writes", "rows_read": 2, "rows_changed": 2}
+    assert (result["rows_scanned"], result["cols_scanned"]) == (6, 7)
+    assert result["static_in_formula_rows"] == []
+    assert result["errors"] == [
+        {"cell": "D6", "row_label": "Check", "error": "#REF!", "formula": "=D5*2"}
+    ]
+    assert [f["cell"] for f in result["pattern_breaks"]] == ["B4"]  # Kept from the first scan
+
+    # Same report as a full scan of the edited tab
+    full = scan_sheet("Calc", client)
+    assert {k: v for k, v in result.items() if k != "rescan"} == full
+
+
+def test_rescan_rechecks_rows_that_recalculated(client, service):
+    scan_sheet("Calc", client)
+    # Zeroing C1 makes the Ratio row's C5 (=C2/C1) recalculate to an error
+    client.write_range("Calc", "C1", [[0]])
+    calc = service.workbooks[client.spreadsheet_id].sheet("Calc")
+    calc.set(4, 2, LocalCell("#DIV/0!", "=C2/C1"))
+    service.reset_calls()
+    result = rescan_sheet("Calc", client)
+
+    assert service.calls_by_method() == {"values.batchGet": 2}
+    assert result["rescan"] == {"mode": "writes", "rows_read": 2, "rows_changed": 2}
+    assert result["errors"] == [
+        {"cell": "C5", "row_label": "Ratio", "error": "#DIV/0!", "formula": "=C2/C1"}
+    ]
+    assert {k: v for k, v in result.items() if k != "rescan"} == scan_sheet("Calc", client)
+
+
+def test_rescan_compares_hashes_after_outside_edits(client, service):
+    scan_sheet("Calc", client)
+    # Edited in the browser: the client logged nothing
+    calc = service.workbooks[client.spreadsheet_id].sheet("Calc")
+    calc.set(3, 1, LocalCell("", "=B1*2"))
+    calc.set(4, 3, LocalCell(0.1))
+    service.reset_calls()
+    result = rescan_sheet("Calc", client)
+
+    assert service.calls_by_method() == {"values.batchGet": 2}
+    assert result["rescan"] == {"mode": "hashes", "rows_read": 5, "rows_changed": 2}
+    assert result["pattern_breaks"] == []
+    assert result["static_in_formula_rows"] == [
+        {"cell": "D3", "row_label": "Margin", "value": "18"},
+        {"cell": "D5", "row_label": "Ratio", "value": "0.1"},
+    ]
+
+
+def test_write_log(client):
+    client.pop_written("Calc")
+    client.write_ranges([("Calc", "B2:C3", [[1, 2]]), ("Calc", "A9", [[1], [2], [3]])])
+    client.clear_range("Calc", "A20:B21")
+    client.fill_formula_row("Calc", "B7", "=B1", 3)
+    assert client.pop_written("Calc") == [[1, 2], [6, 6], [8, 10], [19, 20]]
+    assert client.pop_written("Calc") is None
+
+    client.clear_range("Calc", "B:B")  # Whole columns: rows unknown
+    client.write_range("Calc", "A1", [[1]])
+    assert client.pop_written("Calc") is None
+    client.append_rows("Calc", [["Total", 1]])  # The API picks the rows
+    assert client.pop_written("Calc") is None
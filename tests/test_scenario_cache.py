@@ -0,0 +1,80 @@
+"""Tests for the content-addressed scenario result cache."""
+
+import os
+
+import pytest
+
+from src.analysis.scenario_cache import canonical_overrides, lookup, store
+
+RESULT = {"months": ["Jan'26"], "by_line": {"Enterprise": {"rev": [100.0]}}, "breakeven": None}
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "scenarios"  # Where conftest points scenario_cache.CACHE_DIR
+
+
+@pytest.fixture
+def client(client, service):
+    client.batch_update([
+        {"addSheet": {"properties": {"title": "Assumptions"}}},
+        {"addSheet": {"properties": {"title": "Revenue Build"}}},
+    ])
+    client.write_range("Assumptions", "A1", [["CAC", 5000], ["ASP", 24000]])
+    client.write_range("Revenue Build", "A1", [["Revenue", "=Assumptions!B2*10"]])
+    service.reset_calls()
+    return client
+
+
+def test_canonical_overrides_ignore_order_case_and_formatting():
+    a = canonical_overrides({"Line": " Enterprise", "CAC": "-20%", "Budget": "$1,200"})
+    b = canonical_overrides({"budget": 1200, "cac": -0.2, "line": "enterprise"})
+    assert a == b
+    assert canonical_overrides({"cac": "-20%"}) != canonical_overrides({"cac": "-25%"})
+
+
+def test_repeat_lookup_hits_with_one_read(client, service):
+    miss = lookup(client, "scenario", {"cac": "-20%"})
+    assert miss["hit"] is False
+    store(miss["key"], RESULT)
+    service.reset_calls()
+
+    hit = lookup(client, "scenario", {"CAC": -0.2})
+    assert hit["hit"] is True and hit["result"] == RESULT
+    assert service.calls_by_method() == {"values.batchGet": 1}
+    assert lookup(client, "breakeven", {"cac": "-20%"})["hit"] is False  # kinds are separate
+
+
+def test_editing_a_driving_input_invalidates_affected_entries(client, cache_dir):
+    store(lookup(client, "scenario", {"cac": "-20%"})["key"], RESULT)
+    store(lookup(client, "snapshot", tabs=["Revenue Build"])["key"], RESULT)
+
+    client.write_range("Assumptions", "B1", [[4000]])
+    miss = lookup(client, "scenario", {"cac": "-20%"})
+    assert miss["hit"] is False
+    assert miss["invalidated"] == 1  # Only the entry that read Assumptions
+    assert lookup(client, "snapshot", tabs=["Revenue Build"])["hit"] is True
+
+    client.write_range("Revenue Build", "B1", [["=Assumptions!B2*12"]])  # Formula edits count
+    assert lookup(client, "snapshot", tabs=["Revenue Build"])["hit"] is False
+
+
+def test_store_requires_lookup_and_evicts_least_recently_used(client, cache_dir, monkeypatch):
+    with pytest.raises(ValueError, match="Call lookup first"):
+        store("nope", RESULT)
+
+    keys = []
+    for i in range(3):
+        key = lookup(client, "scenario", {"cac": i})["key"]
+        store(key, RESULT)
+        path = next(p for p in cache_dir.rglob(f"{key}.json"))
+        os.utime(path, (i, i))  # Deterministic access order
+        keys.append(key)
+    lookup(client, "scenario", {"cac": 0})  # Touch the oldest entry
+
+    size = path.stat().st_size
+    monkeypatch.setenv("FPA_SCENARIO_CACHE_MB", str(2.5 * size / 1024 / 1024))
+    extra = lookup(client, "scenario", {"cac": 9})["key"]
+    assert store(extra, RESULT)["evicted"] == 2
+    remaining = {p.stem for p in cache_dir.rglob("*.json")}
+    assert remaining == {keys[0], extra}
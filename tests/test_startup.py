@@ -0,0 +1,57 @@
+"""Startup guards: the CLI module must not import heavy SDKs or connect eagerly."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from src.sheets import SheetsClient
+from src.sheets import client as client_module
+
+REPO_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = [
+    "anthropic",
+    "dotenv",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "google.oauth2",
+    "httplib2",
+    "numpy",
+]
+
+
+def test_importing_cli_skips_heavy_modules():
+    code = (
+        "import json, sys\n"
+        "import src.agent.core as core\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "print(json.dumps({'loaded': [m for m in heavy if m in sys.modules],\n"
+        "                  'prompt_built': core.build_system_prompt.cache_info().currsize}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    result = json.loads(out.stdout)
+    assert result == {"loaded": [], "prompt_built": 0}
+
+
+def test_client_connects_on_first_use_not_construction(monkeypatch):
+    calls = []
+
+    def fake_credentials(interactive=True):
+        calls.append(interactive)
+        raise RuntimeError("no token")
+
+    monkeypatch.setattr(client_module, "get_credentials", fake_credentials)
+    client = SheetsClient("abc123")
+    assert calls == []
+
+    client.warm_up().join()
+    assert calls == [False]  # background warm-up never starts the browser flow
+
+    try:
+        client.get_spreadsheet_info()
+    except RuntimeError:
+        pass
+    assert calls == [False, True]
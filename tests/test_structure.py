@@ -0,0 +1,125 @@
+"""Tests for model structure discovery, caching and cell resolution."""
+
+import pytest
+
+from src.analysis import structure
+from src.analysis.structure import get_structure, parse_month, stale_tabs
+
+MONTHS = ["1/31/2026", "2/28/2026", "3/31/2026", "4/30/2026"]
+
+
+@pytest.fixture
+def client(client, service):
+    client.batch_update([
+        {"addSheet": {"properties": {"title": "Revenue Build"}}},
+        {"addSheet": {"properties": {"title": "Costs by Department"}}},
+    ])
+    client.write_range("Revenue Build", "A1", [
+        ["", "", "Q1-26", "Q1-26", "Q1-26", "Q2-26"],
+        ["Line", "Driver", *MONTHS],
+        ["Enterprise"],
+        ["Revenue", "ASP", 100, 110, 120, 130],
+        ["COGS", "", 10, 11, 12, 13],
+        ["CAC", "", 5, 5, 5, 5],
+        [],
+        ["SMB"],
+        ["Revenue", "ASP", 50, 55, 60, 65],
+        ["COGS", "", 5, 5, 6, 6],
+        [],
+        ["Total Revenue", "", 150, 165, 180, 195],
+    ])
+    client.write_range("Costs by Department", "A1", [
+        ["", "", "Jan'26", "Feb'26", "Mar'26"],
+        ["CS"],
+        ["Salary", "", 10, 10, 10],
+        ["CS Subtotal", "", 10, 10, 10],
+        ["Less: CS to COGS", "", -4, -4, -4],
+        ["CS Total (OpEx)", "", 6, 6, 6],
+        [],
+        ["COGS"],
+        ["Hosting", "", 1, 1, 1],
+        ["CS (COGS)", "", 4, 4, 4],
+        ["Total COGS", "", 5, 5, 5],
+    ])
+    service.reset_calls()
+    return client
+
+
+def test_parse_month_formats():
+    for text in ("3/31/2027", "2027-03-31", "Mar'27", "Mar-27", "Mar 2027", "March 2027"):
+        assert parse_month(text) == (2027, 3), text
+    assert parse_month("Revenue") is None
+    assert parse_month("Q1-26") is None
+
+
+def test_build_maps_rows_months_and_sections(client, service):
+    model = get_structure(client)
+    assert service.calls_by_method() == {"spreadsheets.get": 1, "values.batchGet": 1}
+
+    rev = model.tabs["Revenue Build"]
+    assert rev.header_row == 2 and rev.label_column == "A"
+    assert rev.months == {"Jan'26": "C", "Feb'26": "D", "Mar'26": "E", "Apr'26": "F"}
+    assert [(s.name, s.start_row, s.end_row) for s in rev.sections] == [
+        ("Enterprise", 4, 6),
+        ("SMB", 9, 10),
+    ]
+    assert rev.find_row("Revenue", section="SMB") == 9
+    assert rev.rows["Total Revenue"] == 12
+
+    costs = model.tabs["Costs by Department"]
+    assert costs.cogs_splits == {"CS": {"to_cogs": 5, "subtotal": 4, "opex_total": 6, "cogs": 10}}
+
+
+def test_resolve_uses_cache_after_a_shape_check(client, service):
+    get_structure(client)
+    structure._memory.clear()  # force the on-disk copy
+    service.reset_calls()
+
+    model = get_structure(client)
+    assert service.calls_by_method() == {"values.batchGet": 1}  # Labels and headers only
+    assert model.resolve("Enterprise revenue, Mar'26")["cell"] == "'Revenue Build'!E4"
+    assert model.resolve("revenue smb", month="2026-04")["cell"] == "'Revenue Build'!F9"
+    assert model.resolve("CS Subtotal", "Feb'26")["cell"] == "'Costs by Department'!D4"
+    assert service.call_count == 1
+
+    with pytest.raises(ValueError, match="No row labelled"):
+        model.resolve("Enterprise revenue", "Dec'30")
+    with pytest.raises(ValueError, match="several tabs"):
+        structure.ModelStructure(
+            model.spreadsheet_id,
+            model.built_at,
+            {**model.tabs, "Copy": structure.TabStructure("Copy", rows={"CS Subtotal": 3})},
+        ).resolve("CS Subtotal")
+
+
+def test_stale_tabs_detects_structural_edits(client):
+    model = get_structure(client)
+    assert stale_tabs(client, model) == []
+
+    client.write_range("Revenue Build", "C5", [[99]])  # values only: still current
+    assert stale_tabs(client, model) == []
+
+    client.append_rows("Revenue Build", [["Mid-Market"]])
+    assert stale_tabs(client, model) == ["Revenue Build"]
+
+
+def test_get_structure_rebuilds_only_stale_tabs(client, service):
+    get_structure(client)
+    # A /modify inserts a row above SMB: its rows move down one
+    client.write_range("Revenue Build", "A8", [
+        ["Mid-Market", "", 1, 1, 1, 1],
+        [""] * 6,
+        ["SMB", "", "", "", "", ""],
+        ["Revenue", "ASP", 50, 55, 60, 65],
+        ["COGS", "", 5, 5, 6, 6],
+        [""] * 6,
+        ["Total Revenue", "", 151, 166, 181, 196],
+    ])
+    service.reset_calls()
+
+    model = get_structure(client)
+    # The shape check, then one read of the changed tab only
+    assert service.calls_by_method() == {"values.batchGet": 2}
+    assert model.resolve("revenue smb", month="2026-04")["cell"] == "'Revenue Build'!F11"
+    assert model.resolve("CS Subtotal", "Feb'26")["cell"] == "'Costs by Department'!D4"
+    assert get_structure(client) is model  # Saved: current again